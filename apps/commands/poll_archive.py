@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import io
 
 import discord
@@ -14,7 +15,7 @@ from apps.commands import with_default_suffix
 from apps.utils.archive import (
     append_week_snapshot_scoped,
     archive_exists_scoped,
-    create_archive,
+    export_archive,
     open_archive_bytes_scoped,
 )
 from apps.utils.i18n import t
@@ -85,7 +86,9 @@ class PollArchive(commands.Cog):
 
             # Genereer weekend archief (altijd aanwezig)
             weekend_view = ArchiveView(gid, cid, weekday=False)
-            weekend_csv = create_archive(gid, cid, weekend_view.selected_delimiter, weekday=False)
+            weekend_csv = await asyncio.to_thread(
+                export_archive, gid, cid, weekend_view.selected_delimiter, weekday=False
+            )
 
             if not weekend_csv:
                 await interaction.followup.send(
@@ -99,18 +102,22 @@ class PollArchive(commands.Cog):
             weekend_filename = f"dmk_archive_{gid}_{cid}_weekend.csv"
             await interaction.followup.send(
                 content=weekend_content,
-                file=File(io.BytesIO(weekend_csv), filename=weekend_filename),
+                file=File(weekend_csv, filename=weekend_filename),
                 view=weekend_view,
                 ephemeral=True,
             )
 
             # Check of er ook weekday archief is
-            weekday_csv_check = create_archive(gid, cid, ",", weekday=True)
+            weekday_csv_check = await asyncio.to_thread(
+                export_archive, gid, cid, ",", weekday=True
+            )
 
             if weekday_csv_check:
                 # Weekday archief bestaat - stuur tweede bericht
                 weekday_view = ArchiveView(gid, cid, weekday=True)
-                weekday_csv = create_archive(gid, cid, weekday_view.selected_delimiter, weekday=True)
+                weekday_csv = await asyncio.to_thread(
+                    export_archive, gid, cid, weekday_view.selected_delimiter, weekday=True
+                )
 
                 if weekday_csv:  # Type guard voor None check
                     weekday_content = t(cid, "ARCHIVE.archive_message_weekday")
@@ -118,7 +125,7 @@ class PollArchive(commands.Cog):
                     weekday_filename = f"dmk_archive_{gid}_{cid}_weekday.csv"
                     await interaction.followup.send(
                         content=weekday_content,
-                        file=File(io.BytesIO(weekday_csv), filename=weekday_filename),
+                        file=File(weekday_csv, filename=weekday_filename),
                         view=weekday_view,
                         ephemeral=True,
                     )
@@ -15,6 +15,7 @@ from discord.ext import commands
 from apps import scheduler
 from apps.commands import with_default_suffix
 from apps.ui.poll_buttons import OneStemButtonView
+from apps.utils.channel_index import refresh_channel
 from apps.utils.discord_client import fetch_message_or_none, safe_call
 from apps.utils.message_builder import build_poll_message_for_day_async
 from apps.utils.poll_message import (
@@ -321,6 +322,7 @@ class PollLifecycle(commands.Cog):
             schedule_message = await self._save_schedule(
                 channel.id, dag, datum, tijd, frequentie
             )
+            refresh_channel(channel)
             # Alleen bevestigingsbericht tonen, poll niet plaatsen
             await interaction.followup.send(schedule_message, ephemeral=True)
             return
@@ -662,6 +664,8 @@ class PollLifecycle(commands.Cog):
                 # No message ID, create new one
                 await create_notification_message(channel)
 
+            refresh_channel(channel)
+
             # Stuur bevestiging (alleen als we direct vanuit on() komen, niet via opschoon-knoppen)
             try:
                 confirmation = i18n_t(channel_id, "COMMANDS.polls_enabled")
@@ -820,6 +824,7 @@ class PollLifecycle(commands.Cog):
         try:
             # 1) Toggle pauze-status
             paused = toggle_paused(channel.id)  # True = nu gepauzeerd
+            refresh_channel(channel)
 
             # 2) Stemmen-bericht updaten (knop disabled + tekst)
             key = "stemmen"
@@ -1114,6 +1119,8 @@ class PollLifecycle(commands.Cog):
                 except Exception:  # pragma: no cover
                     pass
 
+            refresh_channel(channel)
+
             # 3) BELANGRIJK: Scheduler blijft actief - NIET uitschakelen!
             # Voor permanent uitschakelen, gebruik /dmk-poll-stopzetten
 
@@ -1279,6 +1286,7 @@ class PollLifecycle(commands.Cog):
                 clear_scheduled_activation(channel.id)
             except Exception:  # pragma: no cover
                 pass
+            refresh_channel(channel)
 
             # 5) Terugkoppeling
             await interaction.followup.send(
@@ -33,6 +33,13 @@ _TIJD_TO_I18N_KEY = {
 
 
 class PollOption:
+    """
+    Eén stemoptie (dag + tijd). Onveranderlijk: instanties uit de catalogus
+    worden gedeeld tussen alle aanroepers.
+    """
+
+    __slots__ = ("dag", "tijd", "emoji", "stijl", "_channel_id", "label")
+
     def __init__(
         self,
         dag: str,
@@ -40,14 +47,21 @@ class PollOption:
         emoji: str,
         stijl=ButtonStyle.secondary,
         channel_id: int = 0,
+        label: str | None = None,
     ):
-        self.dag = dag
-        self.tijd = tijd
-        self.emoji = emoji
-        self.stijl = stijl
-        self._channel_id = channel_id
-        # Generate localized label
-        self.label = self._make_label()
+        object.__setattr__(self, "dag", dag)
+        object.__setattr__(self, "tijd", tijd)
+        object.__setattr__(self, "emoji", emoji)
+        object.__setattr__(self, "stijl", stijl)
+        object.__setattr__(self, "_channel_id", channel_id)
+        # Generate localized label (tenzij al bekend uit de labelcache)
+        object.__setattr__(self, "label", label if label is not None else self._make_label())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PollOption is immutable")
+
+    def __repr__(self) -> str:
+        return f"PollOption({self.dag!r}, {self.tijd!r}, {self.emoji!r})"
 
     def _make_label(self) -> str:
         """Generate localized button label."""
@@ -77,29 +91,103 @@ def _load_raw_options():
         return list(_DEFAULTS)
 
 
+# -----------------------------
+# Catalogus-cache
+# -----------------------------
+# poll_options.json wordt alleen opnieuw ingelezen als het bestand wijzigt
+# (pad, mtime, grootte). PollOption-objecten worden per taal gebouwd en
+# gedeeld, zodat labels niet bij elke aanroep via i18n opnieuw ontstaan.
+
+
+class _Catalogue:
+    __slots__ = ("raw", "days", "by_day", "slots")
+
+    def __init__(self, raw: list[dict]):
+        self.raw: tuple[tuple[str, str, str], ...] = tuple(
+            (o["dag"], o["tijd"], o["emoji"]) for o in raw
+        )
+        by_day: dict[str, list[tuple[str, str, str]]] = {}
+        for item in self.raw:
+            by_day.setdefault(item[0], []).append(item)
+        # dict behoudt invoegvolgorde → dagen in JSON-volgorde
+        self.days: tuple[str, ...] = tuple(by_day)
+        self.by_day: dict[str, tuple[tuple[str, str, str], ...]] = {
+            dag: tuple(items) for dag, items in by_day.items()
+        }
+        self.slots: frozenset[tuple[str, str]] = frozenset(
+            (dag, tijd) for dag, tijd, _ in self.raw
+        )
+
+
+_CATALOGUE: _Catalogue | None = None
+_CATALOGUE_KEY: tuple | None = None
+# taal → (alle opties in JSON-volgorde, opties per dag)
+_OPTIONS_BY_LANG: dict[
+    str, tuple[tuple[PollOption, ...], dict[str, tuple[PollOption, ...]]]
+] = {}
+
+
+def _catalogue_key() -> tuple:
+    try:
+        st = os.stat(OPTIONS_FILE)
+        return (OPTIONS_FILE, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (OPTIONS_FILE, None, None)
+
+
+def _get_catalogue() -> _Catalogue:
+    global _CATALOGUE, _CATALOGUE_KEY
+    key = _catalogue_key()
+    if _CATALOGUE is None or key != _CATALOGUE_KEY:
+        _CATALOGUE = _Catalogue(_load_raw_options())
+        _CATALOGUE_KEY = key
+        _OPTIONS_BY_LANG.clear()
+    return _CATALOGUE
+
+
+def invalidate_poll_options_cache() -> None:
+    """Forceer opnieuw inlezen bij de volgende aanroep."""
+    global _CATALOGUE, _CATALOGUE_KEY
+    _CATALOGUE = None
+    _CATALOGUE_KEY = None
+    _OPTIONS_BY_LANG.clear()
+
+
+def _options_for_channel(
+    channel_id: int,
+) -> tuple[tuple[PollOption, ...], dict[str, tuple[PollOption, ...]]]:
+    from apps.utils.poll_settings import get_language
+
+    catalogue = _get_catalogue()
+    lang = get_language(channel_id)
+    entry = _OPTIONS_BY_LANG.get(lang)
+    if entry is None:
+        options = tuple(
+            PollOption(dag, tijd, emoji, channel_id=channel_id)
+            for dag, tijd, emoji in catalogue.raw
+        )
+        by_day: dict[str, list[PollOption]] = {}
+        for o in options:
+            by_day.setdefault(o.dag, []).append(o)
+        entry = (options, {dag: tuple(items) for dag, items in by_day.items()})
+        _OPTIONS_BY_LANG[lang] = entry
+    return entry
+
+
 def get_poll_options(channel_id: int = 0) -> list[PollOption]:
-    """Live inladen bij elke aanroep, with localized labels."""
-    items = _load_raw_options()
-    return [
-        PollOption(o["dag"], o["tijd"], o["emoji"], channel_id=channel_id)
-        for o in items
-    ]
+    """Alle opties (gedeelde, onveranderlijke objecten) with localized labels."""
+    return list(_options_for_channel(channel_id)[0])
+
+
+def get_options_for_day(dag: str, channel_id: int = 0) -> list[PollOption]:
+    """Opties voor één dag, in JSON-volgorde."""
+    return list(_options_for_channel(channel_id)[1].get(dag, ()))
 
 
 def list_days() -> list[str]:
     """Unieke dagen in JSON-volgorde."""
-    seen = set()
-    days = []
-    for o in _load_raw_options():
-        d = o["dag"]
-        if d not in seen:
-            seen.add(d)
-            days.append(d)
-    return days
+    return list(_get_catalogue().days)
 
 
 def is_valid_option(dag: str, tijd: str) -> bool:
-    for o in _load_raw_options():
-        if o["dag"] == dag and o["tijd"] == tijd:
-            return True
-    return False
+    return (dag, tijd) in _get_catalogue().slots
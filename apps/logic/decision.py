@@ -20,6 +20,7 @@ async def build_decision_line(
     dag: str,
     now: datetime | None = None,
     channel: Any = None,
+    ctx: Any = None,
 ) -> str | None:
     """
     Geeft 1 regel terug die onder het pollbericht kan.
@@ -29,14 +30,27 @@ async def build_decision_line(
     - Als drempel niet gehaald: duidelijk melden dat het niet doorgaat.
     - Voor de deadline (op de dag zelf): aankondigen dat beslissing om <tijd> komt.
     - Op dagen vóór de dag zelf: niets tonen.
+
+    Met een RenderContext (ctx) komen deadline-vlag, aantallen en klok uit de
+    gedeelde update-ronde in plaats van uit losse lookups.
     """
+    if ctx is not None:
+        now = now or ctx.now
     now = now or datetime.now(ZoneInfo("Europe/Amsterdam"))
 
     # Voor/na de deadline bepalen met bestaande logica:
     # should_hide_counts == True  -> vóór deadline
     # should_hide_counts == False -> ná deadline (of niet in deadline-modus)
     chan_int: int = int(channel_id) if not isinstance(channel_id, int) else channel_id
-    voor_deadline = should_hide_counts(chan_int, dag, now)
+    if ctx is not None:
+        voor_deadline = ctx.hide_counts(dag)
+    else:
+        voor_deadline = should_hide_counts(chan_int, dag, now)
+
+    def _t(key: str, **kwargs: Any) -> str:
+        if ctx is not None:
+            return ctx.t(key, **kwargs)
+        return t(chan_int, key, **kwargs)
 
     # Check of het vandaag die dag is; anders geen tekst
     WEEKDAG_INDEX = {
@@ -55,11 +69,13 @@ async def build_decision_line(
 
     # Op de dag zelf maar vóór deadline → aankondigen
     if voor_deadline:
-        return t(chan_int, "NOTIFICATIONS.decision_pending")
+        return _t("NOTIFICATIONS.decision_pending")
 
     # Ná de deadline → echte beslissing tonen (gescope per guild en channel)
     # Use category-scoped counts for dual language support
-    if channel:
+    if ctx is not None:
+        counts = ctx.counts_for_day(dag)
+    elif channel:
         from apps.utils.poll_settings import get_vote_scope_channels
 
         scope_ids = get_vote_scope_channels(channel)
@@ -74,12 +90,12 @@ async def build_decision_line(
     c2030 = counts.get(T2030, 0)
 
     if c19 < MIN_STEMMEN and c2030 < MIN_STEMMEN:
-        return t(chan_int, "NOTIFICATIONS.decision_not_happening")
+        return _t("NOTIFICATIONS.decision_not_happening")
 
     # Winnaar bepalen (gelijk → 20:30)
     if c2030 >= max(c19, MIN_STEMMEN):
-        return t(chan_int, "NOTIFICATIONS.decision_happening_2030", count=c2030)
+        return _t("NOTIFICATIONS.decision_happening_2030", count=c2030)
     elif c19 >= MIN_STEMMEN:
-        return t(chan_int, "NOTIFICATIONS.decision_happening_1900", count=c19)
+        return _t("NOTIFICATIONS.decision_happening_1900", count=c19)
     else:  # pragma: no cover
-        return t(chan_int, "NOTIFICATIONS.decision_not_happening")
+        return _t("NOTIFICATIONS.decision_not_happening")
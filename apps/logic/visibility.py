@@ -2,7 +2,7 @@
 
 from datetime import datetime, time
 
-from apps.entities.poll_option import get_poll_options
+from apps.entities.poll_option import get_options_for_day
 from apps.utils.poll_settings import get_setting
 
 # We roepen een interne helper aan om te bepalen of er een expliciete instelling is opgeslagen.
@@ -98,8 +98,8 @@ def is_vote_button_visible(channel_id: int, dag: str, tijd: str, now: datetime)
         try:
             tijden = [
                 TIJD_LABELS[o.tijd]
-                for o in get_poll_options()
-                if o.dag == dag and o.tijd in TIJD_LABELS
+                for o in get_options_for_day(dag)
+                if o.tijd in TIJD_LABELS
             ]
         except Exception:
             tijden = []
@@ -12,21 +12,29 @@ import pytz
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from apps.utils import channel_index
 from apps.utils.constants import DAG_MAPPING
 from apps.utils.discord_client import fetch_message_or_none, get_channels, safe_call
 from apps.utils.logger import log_job, log_startup
+from apps.utils.member_roster import channel_roster
 from apps.utils.mention_utils import (
     send_persistent_mention,
     send_temporary_mention,
 )
 from apps.utils.message_builder import build_doorgaan_participant_list
+from apps.utils.outbound_queue import background_priority
+from apps.utils.schedule_timer import start_schedule_timer
+from apps.utils.sweep import run_sweep
 from apps.utils.poll_message import (
     clear_message_id,
+    clear_message_id_async,
     get_message_id,
     is_channel_disabled,
     save_message_id,
+    save_message_id_async,
     schedule_poll_update,
-    set_channel_disabled,
+    set_channel_disabled_async,
+    update_channel_polls,
 )
 from apps.utils.poll_settings import (
     get_enabled_poll_days,
@@ -37,6 +45,7 @@ from apps.utils.poll_settings import (
 from apps.utils.poll_storage import (
     calculate_leading_time,
     calculate_leading_time_scoped,
+    compact_votes_journal,
     load_votes,
     load_votes_for_scope,
     reset_votes,
@@ -192,6 +201,65 @@ def _is_deadline_mode(channel_id: int, dag: str) -> bool:
 # ============================================================================
 
 
+# Kanaalstatussen die een sweep nodig heeft (zie channel_index)
+ACTIVE_STATES = (channel_index.ACTIVE,)
+# Notificaties werken op stemdata: ook gesloten kanalen met een eigen schema
+VOTE_STATES = (channel_index.ACTIVE, channel_index.SCHEDULED)
+POLL_STATES = (channel_index.ACTIVE, channel_index.PAUSED)
+ACTIVATABLE_STATES = (
+    channel_index.ACTIVE,
+    channel_index.PAUSED,
+    channel_index.SCHEDULED,
+)
+
+
+def _index_lookups() -> dict:
+    # Via de scheduler-namespace, zodat gepatchte helpers ook voor de index gelden
+    return {
+        "disabled": is_channel_disabled,
+        "paused": is_paused,
+        "message_id": get_message_id,
+    }
+
+
+def prime_channel_index(bot) -> int:
+    """Vul de kanaalindex met één volledige scan (bij on_ready)."""
+    total = channel_index.prime_channel_index(
+        getattr(bot, "guilds", []) or [], get_channels, **_index_lookups()
+    )
+    log_job("channel_index", status=f"primed: {total} kanalen")
+    return total
+
+
+def _index_channel(channel) -> None:
+    """Werk de index bij na een scheduler-overgang (activatie/deactivatie)."""
+    try:
+        channel_index.refresh_channel(channel, **_index_lookups())
+    except Exception:  # pragma: no cover
+        pass
+
+
+def _channels_in(guild, states: Optional[tuple] = None) -> list:
+    """
+    Kanalen van één guild voor een sweep. Met 'states' en een gevulde
+    kanaalindex alleen de geïndexeerde kanalen met die status, anders alle.
+    """
+    if states is None or not channel_index.is_ready():
+        return list(get_channels(guild) or [])
+    return channel_index.indexed_channels(
+        guild, states, get_channels, **_index_lookups()
+    )
+
+
+def _guild_channels(bot, states: Optional[tuple] = None) -> List[tuple]:
+    """(guild, kanaal)-paren voor een sweep, in vaste volgorde."""
+    return [
+        (guild, channel)
+        for guild in getattr(bot, "guilds", []) or []
+        for channel in _channels_in(guild, states)
+    ]
+
+
 def _get_deny_channel_names() -> set[str]:
     """Load en parse DENY_CHANNEL_NAMES environment variable."""
     return set(
@@ -253,20 +321,11 @@ async def _get_voted_ids(
 
 def _get_non_voter_mentions(channel, voted_ids: set[int]) -> List[str]:
     """Haal mentions op voor kanaalleden die niet hebben gestemd."""
-    mentions = []
-    members = getattr(channel, "members", [])
-
-    for member in members:
-        if getattr(member, "bot", False):
-            continue
-
-        mid = getattr(member, "id", None)
-        if mid and mid not in voted_ids:
-            mention = getattr(member, "mention", f"<@{mid}>")
-            if mention:
-                mentions.append(mention)
-
-    return mentions
+    return [
+        mention
+        for member_id, (_name, mention) in channel_roster(channel).items()
+        if int(member_id) not in voted_ids and mention
+    ]
 
 
 async def _delete_poll_message(
@@ -336,7 +395,7 @@ async def notify_non_voters_thursday(bot) -> None:  # pragma: no cover
     deny_names = _get_deny_channel_names()
 
     for guild in getattr(bot, "guilds", []) or []:
-        for channel in get_channels(guild):
+        for channel in _channels_in(guild, VOTE_STATES):
             cid = getattr(channel, "id", 0)
             if is_channel_disabled(cid):
                 continue
@@ -823,23 +882,9 @@ def setup_scheduler(bot) -> None:  # pragma: no cover
         name=f"Herinnering {WEEKEND_REMINDER_DAY}",
         misfire_grace_time=60,
     )
-    # Scheduled poll activation check (every minute)
-    # misfire_grace_time=30: deactivate_scheduled_polls duurt ~2s en blokkeert anders deze job
-    scheduler.add_job(
-        activate_scheduled_polls,
-        CronTrigger(minute="*"),
-        args=[bot],
-        name="Scheduled poll activation check",
-        misfire_grace_time=30,
-    )
-    # Scheduled poll deactivation check (every minute)
-    scheduler.add_job(
-        deactivate_scheduled_polls,
-        CronTrigger(minute="*"),
-        args=[bot],
-        name="Scheduled poll deactivation check",
-        misfire_grace_time=30,
-    )
+    # Geplande (de)activaties: geen minuut-jobs maar één timer die slaapt tot
+    # het eerstvolgende schema en opnieuw wordt ingesteld bij elke wijziging
+    start_schedule_timer(bot, activate_scheduled_polls, deactivate_scheduled_polls)
     # Retry failed operations (conversions + resets, every minute)
     scheduler.add_job(
         retry_failed_operations,
@@ -848,10 +893,26 @@ def setup_scheduler(bot) -> None:  # pragma: no cover
         name="Retry failed operations",
         misfire_grace_time=30,
     )
+    # Stemmen-journal compacteren naar votes.json (alleen bij VOTES_PERSISTENCE=journal)
+    scheduler.add_job(
+        compact_votes_journal_job,
+        CronTrigger(minute="*/15"),
+        name="Compacteer stemmen-journal",
+        misfire_grace_time=60,
+    )
     scheduler.start()
     asyncio.create_task(_run_catch_up_with_lock(bot))
 
 
+async def compact_votes_journal_job() -> None:  # pragma: no cover
+    """Schrijf het stemmen-journal weg als snapshot zodat het niet onbeperkt groeit."""
+    try:
+        if await compact_votes_journal():
+            log_job("compact_votes_journal", status="compacted")
+    except Exception as e:
+        log_job("compact_votes_journal", status=f"error: {e}")
+
+
 async def update_all_polls(bot) -> None:  # pragma: no cover
     """
     Update per kanaal de poll-berichten binnen rolling window en verwijder oude berichten.
@@ -859,68 +920,53 @@ async def update_all_polls(bot) -> None:  # pragma: no cover
     log_job("update_all_polls", status="executed")
     tasks: List[asyncio.Task] = []
 
-    deny_names = set(
-        n.strip().lower()
-        for n in os.getenv("DENY_CHANNEL_NAMES", "").split(",")
-        if n.strip()
-    )
-    allow_from_per_channel_only = os.getenv(
-        "ALLOW_FROM_PER_CHANNEL_ONLY", "true"
-    ).lower() in {"1", "true", "yes", "y"}
+    # Sweep: alle Discord-calls (ook in de taken hieronder) krijgen lagere
+    # prioriteit dan stemfeedback in de outbound-wachtrij.
+    with background_priority():
+        deny_names = set(
+            n.strip().lower()
+            for n in os.getenv("DENY_CHANNEL_NAMES", "").split(",")
+            if n.strip()
+        )
+        allow_from_per_channel_only = os.getenv(
+            "ALLOW_FROM_PER_CHANNEL_ONLY", "true"
+        ).lower() in {"1", "true", "yes", "y"}
 
-    for guild in getattr(bot, "guilds", []) or []:
-        for channel in get_channels(guild):
-            try:
-                cid = int(getattr(channel, "id", 0))
-            except Exception:  # pragma: no cover
-                cid = 0
+        states = ACTIVE_STATES if allow_from_per_channel_only else None
+        for guild in getattr(bot, "guilds", []) or []:
+            for channel in _channels_in(guild, states):
+                try:
+                    cid = int(getattr(channel, "id", 0))
+                except Exception:  # pragma: no cover
+                    cid = 0
 
-            if is_channel_disabled(cid):
-                continue
+                if is_channel_disabled(cid):
+                    continue
 
-            # Skip if channel is paused
-            if is_paused(cid):
-                continue
+                # Skip if channel is paused
+                if is_paused(cid):
+                    continue
 
-            ch_name = (getattr(channel, "name", "") or "").lower()
-            if ch_name in deny_names:
-                continue
+                ch_name = (getattr(channel, "name", "") or "").lower()
+                if ch_name in deny_names:
+                    continue
 
-            has_poll = False
-            try:
-                for key in ("vrijdag", "zaterdag", "zondag", "stemmen"):
-                    if get_message_id(cid, key):
-                        has_poll = True
-                        break
-            except Exception:  # pragma: no cover
                 has_poll = False
+                try:
+                    for key in ("vrijdag", "zaterdag", "zondag", "stemmen"):
+                        if get_message_id(cid, key):
+                            has_poll = True
+                            break
+                except Exception:  # pragma: no cover
+                    has_poll = False
 
-            if allow_from_per_channel_only and not has_poll:
-                continue
-
-            # Gebruik rolling window logica (altijd huidige dag)
-            from apps.utils.poll_settings import get_enabled_rolling_window_days
-
-            dagen_info = get_enabled_rolling_window_days(cid, dag_als_vandaag=None)
-
-            # Verwijder oude dag-berichten die niet meer in de rolling window zitten
-            from apps.utils.constants import DAG_NAMEN
-            from apps.utils.discord_client import fetch_message_or_none, safe_call
-
-            enabled_dagen_set = {day_info["dag"] for day_info in dagen_info}
-            for dag_naam in DAG_NAMEN:
-                if dag_naam not in enabled_dagen_set:
-                    mid = get_message_id(cid, dag_naam)
-                    if mid:
-                        msg = await fetch_message_or_none(channel, mid)
-                        if msg is not None:
-                            await safe_call(msg.delete)
-                        clear_message_id(cid, dag_naam)
+                if allow_from_per_channel_only and not has_poll:
+                    continue
 
-            # Update poll-berichten voor dagen in rolling window
-            for day_info in dagen_info:
-                dag = day_info["dag"]
-                tasks.append(schedule_poll_update(channel, dag, delay=0.0))
+                # Eén batch per kanaal: rolling window, opruimen van oude
+                # dag-berichten en alleen de nodige edits/creates. De taak
+                # start hier, zodat hij de achtergrondprioriteit erft.
+                tasks.append(asyncio.create_task(update_channel_polls(channel)))
 
     if tasks:
         await asyncio.gather(*tasks, return_exceptions=True)
@@ -963,7 +1009,7 @@ async def notify_non_or_maybe_voters(  # pragma: no cover
         # Scheduler-modus: alle actieve poll-kanalen
         candidates = [
             ch
-            for ch in (get_channels(guild) or [])
+            for ch in _channels_in(guild, VOTE_STATES)
             if not is_channel_disabled(getattr(ch, "id", 0))
             and not is_paused(getattr(ch, "id", 0))
         ]
@@ -978,222 +1024,225 @@ async def notify_non_or_maybe_voters(  # pragma: no cover
             filtered.append(ch)
         return filtered
 
-    for guild in guilds_to_process:
-        for ch in channels_for_guild(guild):
-            cid = getattr(ch, "id", "0") or "0"
-            cid_int = int(cid) if cid != "0" else 0
+    async def _process(guild, ch) -> None:
+        nonlocal sent_any
+        cid = getattr(ch, "id", "0") or "0"
+        cid_int = int(cid) if cid != "0" else 0
 
-            # Check notification settings: check both reminders AND misschien settings
-            # In command mode (channel provided), always enable both notification types
-            if channel:
-                # Command mode: always allow both types
-                reminders_enabled = True
-                misschien_enabled = True
-            else:
-                # Scheduler mode: respect notification settings
-                reminders_enabled = is_notification_enabled(cid_int, "reminders")
-                misschien_enabled = is_notification_enabled(cid_int, "misschien")
+        # Check notification settings: check both reminders AND misschien settings
+        # In command mode (channel provided), always enable both notification types
+        if channel:
+            # Command mode: always allow both types
+            reminders_enabled = True
+            misschien_enabled = True
+        else:
+            # Scheduler mode: respect notification settings
+            reminders_enabled = is_notification_enabled(cid_int, "reminders")
+            misschien_enabled = is_notification_enabled(cid_int, "misschien")
 
-                # Skip if neither notification type is enabled
-                if not reminders_enabled and not misschien_enabled:
-                    continue
+            # Skip if neither notification type is enabled
+            if not reminders_enabled and not misschien_enabled:
+                return
 
-                # Reminder is altijd 2 uur vóór deadline (16:00, deadline is 18:00)
-                # Haal huidige tijd op in NL timezone
-                from datetime import datetime
+            # Reminder is altijd 2 uur vóór deadline (16:00, deadline is 18:00)
+            # Haal huidige tijd op in NL timezone
+            from datetime import datetime
 
-                now_nl = datetime.now(TZ)
+            now_nl = datetime.now(TZ)
 
-                # Controleer of het 16:00 is (check alleen uur)
-                # Scheduler draait elk uur op XX:00, dus we checken alleen of het uur matcht
-                if now_nl.hour != 16:
-                    continue
+            # Controleer of het 16:00 is (check alleen uur)
+            # Scheduler draait elk uur op XX:00, dus we checken alleen of het uur matcht
+            if now_nl.hour != 16:
+                return
 
-            # Skip kanalen die niet in 'deadline' modus staan (alleen voor scheduler, niet voor commando)
-            if not channel and dag:  # Scheduler-modus met specifieke dag
-                if not _is_deadline_mode(int(cid) if cid != "0" else 0, dag):
-                    continue
-                # Check of de dag enabled is voor dit kanaal
-                enabled_days = get_enabled_poll_days(int(cid) if cid != "0" else 0)
-                if dag not in enabled_days:
-                    continue
+        # Skip kanalen die niet in 'deadline' modus staan (alleen voor scheduler, niet voor commando)
+        if not channel and dag:  # Scheduler-modus met specifieke dag
+            if not _is_deadline_mode(int(cid) if cid != "0" else 0, dag):
+                return
+            # Check of de dag enabled is voor dit kanaal
+            enabled_days = get_enabled_poll_days(int(cid) if cid != "0" else 0)
+            if dag not in enabled_days:
+                return
 
-            # Alleen leden die toegang hebben tot dit specifieke kanaal
-            members_src = getattr(ch, "members", [])
-            all_members = [m for m in members_src if not getattr(m, "bot", False)]
+        # Alleen leden die toegang hebben tot dit specifieke kanaal
+        members_src = getattr(ch, "members", [])
+        all_members = [m for m in members_src if not getattr(m, "bot", False)]
 
-            gid = getattr(guild, "id", "0")
+        gid = getattr(guild, "id", "0")
 
-            # Use category-scoped votes for dual language support
-            from apps.utils.poll_settings import get_vote_scope_channels
+        # Use category-scoped votes for dual language support
+        from apps.utils.poll_settings import get_vote_scope_channels
 
-            scope_ids = get_vote_scope_channels(ch)
-            if len(scope_ids) > 1:
-                # Multiple channels share votes - use aggregated votes
-                votes = await load_votes_for_scope(gid, scope_ids) or {}
-            else:
-                votes = await load_votes(gid, cid) or {}
+        scope_ids = get_vote_scope_channels(ch)
+        if len(scope_ids) > 1:
+            # Multiple channels share votes - use aggregated votes
+            votes = await load_votes_for_scope(gid, scope_ids) or {}
+        else:
+            votes = await load_votes(gid, cid) or {}
 
-            # Calculate leading time at 17:00 for vote analysis
-            # Use scoped version for dual language support
-            if dag:
+        # Calculate leading time at 17:00 for vote analysis
+        # Use scoped version for dual language support
+        if dag:
+            try:
+                if len(scope_ids) > 1:
+                    leading_time = await calculate_leading_time_scoped(
+                        gid, scope_ids, dag
+                    )
+                else:
+                    leading_time = await calculate_leading_time(gid, cid, dag)
+                if leading_time:
+                    print(
+                        f"📊 Leading time voor {dag} in channel {cid}: {leading_time}"
+                    )
+            except Exception:  # pragma: no cover
+                pass  # Silent fail, this is informational only
+
+        # Bepaal stemmers
+        voted_ids: set[int] = set()
+        if dag:
+            # dag-specifiek
+            for uid, dagen_map in votes.items():
+                owner_str = _extract_owner_id(uid)
                 try:
-                    if len(scope_ids) > 1:
-                        leading_time = await calculate_leading_time_scoped(
-                            gid, scope_ids, dag
-                        )
-                    else:
-                        leading_time = await calculate_leading_time(gid, cid, dag)
-                    if leading_time:
-                        print(
-                            f"📊 Leading time voor {dag} in channel {cid}: {leading_time}"
-                        )
+                    owner = int(owner_str)
                 except Exception:  # pragma: no cover
-                    pass  # Silent fail, this is informational only
-
-            # Bepaal stemmers
-            voted_ids: set[int] = set()
-            if dag:
-                # dag-specifiek
-                for uid, dagen_map in votes.items():
-                    owner_str = _extract_owner_id(uid)
-                    try:
-                        owner = int(owner_str)
-                    except Exception:  # pragma: no cover
-                        continue
-                    if isinstance(dagen_map, dict):
-                        tijden = (dagen_map or {}).get(dag, [])
+                    continue
+                if isinstance(dagen_map, dict):
+                    tijden = (dagen_map or {}).get(dag, [])
+                    if isinstance(tijden, list) and tijden:
+                        voted_ids.add(owner)
+        else:
+            # weekend-breed (oud gedrag)
+            for uid, dagen_map in votes.items():
+                owner_str = _extract_owner_id(uid)
+                try:
+                    owner = int(owner_str)
+                except Exception:  # pragma: no cover
+                    continue
+                if isinstance(dagen_map, dict):
+                    for tijden in dagen_map.values():
                         if isinstance(tijden, list) and tijden:
                             voted_ids.add(owner)
-            else:
-                # weekend-breed (oud gedrag)
-                for uid, dagen_map in votes.items():
-                    owner_str = _extract_owner_id(uid)
-                    try:
-                        owner = int(owner_str)
-                    except Exception:  # pragma: no cover
-                        continue
-                    if isinstance(dagen_map, dict):
-                        for tijden in dagen_map.values():
-                            if isinstance(tijden, list) and tijden:
-                                voted_ids.add(owner)
-                                break
-
-            # Non-stemmers (only if reminders enabled)
-            to_mention = []
-            if reminders_enabled:
-                for m in all_members:
-                    mid = getattr(m, "id", None)
-                    if mid and mid not in voted_ids:
-                        to_mention.append(getattr(m, "mention", f"<@{mid}>"))
-
-            # Maybe-voters (only if misschien enabled)
-            maybe_mentions = []
-            if misschien_enabled and dag:
-                misschien_voter_ids = await _get_voted_ids(
-                    votes, dag=dag, vote_type="misschien"
-                )
-                for m in all_members:
-                    mid = getattr(m, "id", None)
-                    if mid and mid in misschien_voter_ids:
-                        maybe_mentions.append(getattr(m, "mention", f"<@{mid}>"))
+                            break
+
+        # Non-stemmers (only if reminders enabled)
+        to_mention = []
+        if reminders_enabled:
+            for m in all_members:
+                mid = getattr(m, "id", None)
+                if mid and mid not in voted_ids:
+                    to_mention.append(getattr(m, "mention", f"<@{mid}>"))
+
+        # Maybe-voters (only if misschien enabled)
+        maybe_mentions = []
+        if misschien_enabled and dag:
+            misschien_voter_ids = await _get_voted_ids(
+                votes, dag=dag, vote_type="misschien"
+            )
+            for m in all_members:
+                mid = getattr(m, "id", None)
+                if mid and mid in misschien_voter_ids:
+                    maybe_mentions.append(getattr(m, "mention", f"<@{mid}>"))
 
-            # Skip if no one to notify
-            if not to_mention and not maybe_mentions:
-                continue
+        # Skip if no one to notify
+        if not to_mention and not maybe_mentions:
+            return
+
+        # Tekst
+        from apps.utils.i18n import get_day_name, t
+
+        dag_display = get_day_name(cid_int, dag) if dag else ""
 
-            # Tekst
-            from apps.utils.i18n import get_day_name, t
+        # Build notification text with separate sections for each group
+        # Format:
+        # 📣 DMK-poll – **zondag**
+        # @non_voter1, @non_voter2
+        # Als je nog niet gestemd hebt voor **zondag**, doe dat dan a.u.b. zo snel mogelijk.
+        # @maybe_voter1, @maybe_voter2
+        # Als je op **Misschien** hebt gestemd: wil je vanavond meedoen?
+        # Klik op **Stem nu** om je stem te bevestigen.
 
-            dag_display = get_day_name(cid_int, dag) if dag else ""
+        # Header line
+        if dag:
+            header = f"📣 DMK-poll – **{dag_display}**"
+        else:
+            header = "📣 DMK-poll – herinnering"
 
-            # Build notification text with separate sections for each group
-            # Format:
-            # 📣 DMK-poll – **zondag**
-            # @non_voter1, @non_voter2
-            # Als je nog niet gestemd hebt voor **zondag**, doe dat dan a.u.b. zo snel mogelijk.
-            # @maybe_voter1, @maybe_voter2
-            # Als je op **Misschien** hebt gestemd: wil je vanavond meedoen?
-            # Klik op **Stem nu** om je stem te bevestigen.
+        text_parts = [header]
 
-            # Header line
+        # Non-voters section
+        if to_mention:
+            non_voter_mentions = ", ".join(to_mention)
             if dag:
-                header = f"📣 DMK-poll – **{dag_display}**"
+                non_voter_text = t(
+                    cid_int,
+                    "NOTIFICATIONS.reminder_day",
+                    dag=dag_display,
+                    count_text="",
+                )
+                # Extract just the instruction part (after the header line)
+                # "📣 DMK-poll – **{dag}**\n{count_text}Als je nog niet gestemd hebt..."
+                # We want: "Als je nog niet gestemd hebt voor **{dag}**, doe dat dan a.u.b. zo snel mogelijk."
+                instruction = (
+                    non_voter_text.split("\n", 1)[-1]
+                    if "\n" in non_voter_text
+                    else non_voter_text
+                )
             else:
-                header = "📣 DMK-poll – herinnering"
-
-            text_parts = [header]
-
-            # Non-voters section
-            if to_mention:
-                non_voter_mentions = ", ".join(to_mention)
-                if dag:
-                    non_voter_text = t(
-                        cid_int,
-                        "NOTIFICATIONS.reminder_day",
-                        dag=dag_display,
-                        count_text="",
-                    )
-                    # Extract just the instruction part (after the header line)
-                    # "📣 DMK-poll – **{dag}**\n{count_text}Als je nog niet gestemd hebt..."
-                    # We want: "Als je nog niet gestemd hebt voor **{dag}**, doe dat dan a.u.b. zo snel mogelijk."
-                    instruction = (
-                        non_voter_text.split("\n", 1)[-1]
-                        if "\n" in non_voter_text
-                        else non_voter_text
+                instruction = t(
+                    cid_int,
+                    "NOTIFICATIONS.reminder_weekend",
+                    count_text="",
+                ).split("\n", 1)[-1]
+            text_parts.append(non_voter_mentions)
+            text_parts.append(instruction)
+
+        # Maybe-voters section
+        if maybe_mentions:
+            maybe_mentions_str = ", ".join(maybe_mentions)
+            maybe_text = t(cid_int, "NOTIFICATIONS.maybe_confirm")
+            text_parts.append(maybe_mentions_str)
+            text_parts.append(maybe_text)
+
+        # Final text (mentions zijn al opgenomen in text_parts per sectie)
+        text = "\n".join(text_parts)
+
+        # Calculate leading time for "Stem nu" button (only if maybe-voters exist)
+        # Default to "20:30" if no clear winner (like tie-breaker behavior)
+        leading_time = "20:30"  # Default
+        if maybe_mentions and dag:
+            try:
+                if len(scope_ids) > 1:
+                    calculated_time = await calculate_leading_time_scoped(
+                        gid, scope_ids, dag
                     )
                 else:
-                    instruction = t(
-                        cid_int,
-                        "NOTIFICATIONS.reminder_weekend",
-                        count_text="",
-                    ).split("\n", 1)[-1]
-                text_parts.append(non_voter_mentions)
-                text_parts.append(instruction)
-
-            # Maybe-voters section
-            if maybe_mentions:
-                maybe_mentions_str = ", ".join(maybe_mentions)
-                maybe_text = t(cid_int, "NOTIFICATIONS.maybe_confirm")
-                text_parts.append(maybe_mentions_str)
-                text_parts.append(maybe_text)
-
-            # Final text (mentions zijn al opgenomen in text_parts per sectie)
-            text = "\n".join(text_parts)
-
-            # Calculate leading time for "Stem nu" button (only if maybe-voters exist)
-            # Default to "20:30" if no clear winner (like tie-breaker behavior)
-            leading_time = "20:30"  # Default
-            if maybe_mentions and dag:
-                try:
-                    if len(scope_ids) > 1:
-                        calculated_time = await calculate_leading_time_scoped(
-                            gid, scope_ids, dag
-                        )
-                    else:
-                        calculated_time = await calculate_leading_time(gid, cid, dag)
-                    if calculated_time:
-                        leading_time = calculated_time
-                except Exception:  # pragma: no cover
-                    pass  # Keep default "20:30"
+                    calculated_time = await calculate_leading_time(gid, cid, dag)
+                if calculated_time:
+                    leading_time = calculated_time
+            except Exception:  # pragma: no cover
+                pass  # Keep default "20:30"
 
-            try:
-                # Gebruik send_temporary_mention met optionele "Stem nu" knop
-                # De knop wordt ALTIJD getoond als er misschien-stemmers zijn
-                show_button = bool(maybe_mentions)
+        try:
+            # Gebruik send_temporary_mention met optionele "Stem nu" knop
+            # De knop wordt ALTIJD getoond als er misschien-stemmers zijn
+            show_button = bool(maybe_mentions)
+
+            await send_temporary_mention(
+                ch,
+                mentions="",  # Mentions zijn al in de text opgenomen per sectie
+                text=text,
+                show_button=show_button,
+                dag=dag or "",
+                leading_time=leading_time,
+            )
 
-                await send_temporary_mention(
-                    ch,
-                    mentions="",  # Mentions zijn al in de text opgenomen per sectie
-                    text=text,
-                    show_button=show_button,
-                    dag=dag or "",
-                    leading_time=leading_time,
-                )
+            sent_any = True
+        except Exception:  # pragma: no cover
+            pass
 
-                sent_any = True
-            except Exception:  # pragma: no cover
-                pass
+    targets = [(g, ch) for g in guilds_to_process for ch in channels_for_guild(g)]
+    await run_sweep("reminder", targets, _process)
 
     return sent_any
 
@@ -1213,131 +1262,132 @@ async def notify_voters_if_avond_gaat_door(bot, dag: str) -> None:  # pragma: no
     # DENY_CHANNEL_NAMES check
     deny_names = _get_deny_channel_names()
 
-    for guild in getattr(bot, "guilds", []) or []:
-        for channel in get_channels(guild):
-            cid = getattr(channel, "id", 0)
-            if is_channel_disabled(cid):
-                continue
+    async def _process(guild, channel) -> None:
+        cid = getattr(channel, "id", 0)
+        if is_channel_disabled(cid):
+            return
 
-            # Skip if channel is paused
-            if is_paused(cid):
-                continue
+        # Skip if channel is paused
+        if is_paused(cid):
+            return
 
-            # Check DENY_CHANNEL_NAMES
-            ch_name = (getattr(channel, "name", "") or "").lower()
-            if ch_name in deny_names:
-                continue
+        # Check DENY_CHANNEL_NAMES
+        ch_name = (getattr(channel, "name", "") or "").lower()
+        if ch_name in deny_names:
+            return
 
-            # ALLOW_FROM_PER_CHANNEL_ONLY check verwijderd:
-            # Notificaties werken op data-niveau (votes), niet afhankelijk van berichten
+        # ALLOW_FROM_PER_CHANNEL_ONLY check verwijderd:
+        # Notificaties werken op data-niveau (votes), niet afhankelijk van berichten
 
-            # Use category-scoped votes for dual language support
-            from apps.utils.poll_settings import get_vote_scope_channels
+        # Use category-scoped votes for dual language support
+        from apps.utils.poll_settings import get_vote_scope_channels
 
-            scope_ids = get_vote_scope_channels(channel)
-            guild_id = getattr(guild, "id", "0")
+        scope_ids = get_vote_scope_channels(channel)
+        guild_id = getattr(guild, "id", "0")
 
-            if len(scope_ids) > 1:
-                # Multiple channels share votes - use aggregated votes
-                scoped = await load_votes_for_scope(guild_id, scope_ids) or {}
-            else:
-                scoped = (
-                    await load_votes(
-                        guild_id,
-                        getattr(channel, "id", "0"),
-                    )
-                    or {}
+        if len(scope_ids) > 1:
+            # Multiple channels share votes - use aggregated votes
+            scoped = await load_votes_for_scope(guild_id, scope_ids) or {}
+        else:
+            scoped = (
+                await load_votes(
+                    guild_id,
+                    getattr(channel, "id", "0"),
                 )
+                or {}
+            )
 
-            # Tel totale stemmen (inclusief gasten), niet alleen unieke eigenaren
-            c19 = 0
-            c2030 = 0
-            for _uid, per_dag in scoped.items():
-                tijden = (per_dag or {}).get(dag, [])
-                if not isinstance(tijden, list):
-                    continue
-                if KEY_19 in tijden:
-                    c19 += 1  # Tel elke stem (inclusief gasten)
-                if KEY_2030 in tijden:
-                    c2030 += 1  # Tel elke stem (inclusief gasten)
-            if c19 < MIN_NOTIFY_VOTES and c2030 < MIN_NOTIFY_VOTES:
+        # Tel totale stemmen (inclusief gasten), niet alleen unieke eigenaren
+        c19 = 0
+        c2030 = 0
+        for _uid, per_dag in scoped.items():
+            tijden = (per_dag or {}).get(dag, [])
+            if not isinstance(tijden, list):
                 continue
+            if KEY_19 in tijden:
+                c19 += 1  # Tel elke stem (inclusief gasten)
+            if KEY_2030 in tijden:
+                c2030 += 1  # Tel elke stem (inclusief gasten)
+        if c19 < MIN_NOTIFY_VOTES and c2030 < MIN_NOTIFY_VOTES:
+            return
+
+        # Bepaal winnende tijd
+        if c2030 >= c19:
+            winnaar_tijd_str = "20:30"
+            winnaar_key = KEY_2030
+        else:
+            winnaar_tijd_str = "19:00"
+            winnaar_key = KEY_19
+
+        # Bereken datum en converteer naar Hammertime
+        # Gebruik rolling window om correcte datum te krijgen
+        from apps.utils.poll_settings import get_enabled_rolling_window_days
+
+        dagen_info = get_enabled_rolling_window_days(cid, dag_als_vandaag=None)
+        datum_iso = None
+        for day_info in dagen_info:
+            if day_info["dag"] == dag.lower():
+                datum_iso = day_info["datum_iso"]
+                break
+        # Dag moet altijd in rolling window zitten - als niet, dan is er een bug
+        if datum_iso is None:
+            # Stuur foutmelding naar kanaal (zichtbaar voor gebruikers)
+            try:
+                await channel.send(
+                    f"⚠️ **Fout bij beslissing aankondiging:** Dag '{dag}' niet gevonden in rolling window. "
+                    f"Dit zou niet moeten gebeuren. Neem contact op met de beheerder.",
+                    delete_after=300,
+                )
+            except Exception:  # pragma: no cover
+                pass
+            return  # Skip deze dag, ga door met andere enabled dagen
 
-            # Bepaal winnende tijd
-            if c2030 >= c19:
-                winnaar_tijd_str = "20:30"
-                winnaar_key = KEY_2030
-            else:
-                winnaar_tijd_str = "19:00"
-                winnaar_key = KEY_19
-
-            # Bereken datum en converteer naar Hammertime
-            # Gebruik rolling window om correcte datum te krijgen
-            from apps.utils.poll_settings import get_enabled_rolling_window_days
-
-            dagen_info = get_enabled_rolling_window_days(cid, dag_als_vandaag=None)
-            datum_iso = None
-            for day_info in dagen_info:
-                if day_info["dag"] == dag.lower():
-                    datum_iso = day_info["datum_iso"]
-                    break
-            # Dag moet altijd in rolling window zitten - als niet, dan is er een bug
-            if datum_iso is None:
-                # Stuur foutmelding naar kanaal (zichtbaar voor gebruikers)
-                try:
-                    await channel.send(
-                        f"⚠️ **Fout bij beslissing aankondiging:** Dag '{dag}' niet gevonden in rolling window. "
-                        f"Dit zou niet moeten gebeuren. Neem contact op met de beheerder.",
-                        delete_after=300,
-                    )
-                except Exception:  # pragma: no cover
-                    pass
-                continue  # Skip deze dag, ga door met andere enabled dagen
+        winnaar_hammertime = TimeZoneHelper.nl_tijd_naar_hammertime(
+            datum_iso, winnaar_tijd_str, style="t"
+        )
 
-            winnaar_hammertime = TimeZoneHelper.nl_tijd_naar_hammertime(
-                datum_iso, winnaar_tijd_str, style="t"
+        # Bouw deelnemerslijst met gasten
+        channel_members = getattr(channel, "members", [])
+        channel_member_ids = {str(getattr(m, "id", "")): m for m in channel_members}
+
+        totaal, mentions_str, participant_list = (
+            await build_doorgaan_participant_list(
+                dag,
+                winnaar_key,
+                guild,
+                scoped,
+                channel_member_ids,
             )
+        )
 
-            # Bouw deelnemerslijst met gasten
-            channel_members = getattr(channel, "members", [])
-            channel_member_ids = {str(getattr(m, "id", "")): m for m in channel_members}
-
-            totaal, mentions_str, participant_list = (
-                await build_doorgaan_participant_list(
-                    dag,
-                    winnaar_key,
-                    guild,
-                    scoped,
-                    channel_member_ids,
-                )
+        # Berichttekst - gebruik unified notification layout (5 uur lifetime) met Hammertime
+        from apps.utils.i18n import get_day_name, t
+
+        dag_display = get_day_name(cid, dag)
+        if participant_list:
+            text = t(
+                cid,
+                "NOTIFICATIONS.event_proceeding_with_count",
+                totaal=totaal,
+                participants=participant_list,
+                dag=dag_display,
+                tijd=winnaar_hammertime,
+            )
+        else:
+            text = t(
+                cid,
+                "NOTIFICATIONS.event_proceeding",
+                dag=dag_display,
+                tijd=winnaar_hammertime,
             )
 
-            # Berichttekst - gebruik unified notification layout (5 uur lifetime) met Hammertime
-            from apps.utils.i18n import get_day_name, t
-
-            dag_display = get_day_name(cid, dag)
-            if participant_list:
-                text = t(
-                    cid,
-                    "NOTIFICATIONS.event_proceeding_with_count",
-                    totaal=totaal,
-                    participants=participant_list,
-                    dag=dag_display,
-                    tijd=winnaar_hammertime,
-                )
-            else:
-                text = t(
-                    cid,
-                    "NOTIFICATIONS.event_proceeding",
-                    dag=dag_display,
-                    tijd=winnaar_hammertime,
-                )
+        try:
+            await send_persistent_mention(channel, mentions_str, text)
+        except Exception:  # pragma: no cover
+            # Tests willen dat dit niet crasht
+            return
 
-            try:
-                await send_persistent_mention(channel, mentions_str, text)
-            except Exception:  # pragma: no cover
-                # Tests willen dat dit niet crasht
-                return
+    await run_sweep("notify", _guild_channels(bot, VOTE_STATES), _process)
 
 
 async def reset_polls(bot) -> bool:  # pragma: no cover
@@ -1374,78 +1424,80 @@ async def reset_polls(bot) -> bool:  # pragma: no cover
     log_job("reset_polls", status="executed")
     any_reset = False
 
-    for guild in getattr(bot, "guilds", []) or []:
-        for channel in get_channels(guild):
-            try:
-                cid = int(getattr(channel, "id"))
-                gid = int(getattr(guild, "id"))
-            except Exception:  # pragma: no cover
-                continue
+    async def _process(guild, channel) -> None:
+        nonlocal any_reset
+        try:
+            cid = int(getattr(channel, "id"))
+            gid = int(getattr(guild, "id"))
+        except Exception:  # pragma: no cover
+            return
 
-            # Skip als kanaal uitgeschakeld is
-            if is_channel_disabled(cid):
-                continue
+        # Skip als kanaal uitgeschakeld is
+        if is_channel_disabled(cid):
+            return
 
-            # Skip als kanaal gepauzeerd is
-            if is_paused(cid):
-                continue
+        # Skip als kanaal gepauzeerd is
+        if is_paused(cid):
+            return
 
-            # Skip als activate_scheduled_polls dit kanaal al heeft afgehandeld
-            # (voorkomt dubbele @everyone notificatie bij gelijktijdige uitvoering)
-            activated = state.get("activated_channels_this_reset", {})
-            if str(cid) in activated:
-                any_reset = True  # activate_scheduled_polls heeft al gereset
-                continue
+        # Skip als activate_scheduled_polls dit kanaal al heeft afgehandeld
+        # (voorkomt dubbele @everyone notificatie bij gelijktijdige uitvoering)
+        activated = state.get("activated_channels_this_reset", {})
+        if str(cid) in activated:
+            any_reset = True  # activate_scheduled_polls heeft al gereset
+            return
 
-            # Reset votes voor dit specifieke kanaal
+        # Reset votes voor dit specifieke kanaal
+        try:
+            await reset_votes_scoped(gid, cid)
+            any_reset = True
+        except Exception:  # pragma: no cover
+            # Fallback naar lege votes voor dit kanaal
             try:
-                await reset_votes_scoped(gid, cid)
+                from apps.utils.poll_storage import save_votes_scoped
+
+                await save_votes_scoped(gid, cid, {})
                 any_reset = True
             except Exception:  # pragma: no cover
-                # Fallback naar lege votes voor dit kanaal
-                try:
-                    from apps.utils.poll_storage import save_votes_scoped
+                # Beide pogingen gefaald - voeg toe aan retry queue
+                from apps.utils.retry_queue import add_failed_reset
 
-                    await save_votes_scoped(gid, cid, {})
-                    any_reset = True
-                except Exception:  # pragma: no cover
-                    # Beide pogingen gefaald - voeg toe aan retry queue
-                    from apps.utils.retry_queue import add_failed_reset
+                add_failed_reset(str(gid), str(cid))
+                pass
 
-                    add_failed_reset(str(gid), str(cid))
-                    pass
+        # NIET: dag_als_vandaag opslaan in state
+        # We gebruiken altijd de huidige dag bij updates (berekend on-the-fly)
 
-            # NIET: dag_als_vandaag opslaan in state
-            # We gebruiken altijd de huidige dag bij updates (berekend on-the-fly)
+        # Wis celebration message
+        try:
+            from apps.utils.poll_message import remove_celebration_message
 
-            # Wis celebration message
-            try:
-                from apps.utils.poll_message import remove_celebration_message
+            await remove_celebration_message(channel, cid)
+        except Exception:  # pragma: no cover
+            pass
+
+        # Wis bekende message IDs (alle weekdagen + stemmen)
+        from apps.utils.constants import DAG_NAMEN
 
-                await remove_celebration_message(channel, cid)
+        for key in [*DAG_NAMEN, "stemmen"]:
+            try:
+                clear_message_id(cid, key)
             except Exception:  # pragma: no cover
                 pass
 
-            # Wis bekende message IDs (alle weekdagen + stemmen)
-            from apps.utils.constants import DAG_NAMEN
-
-            for key in [*DAG_NAMEN, "stemmen"]:
-                try:
-                    clear_message_id(cid, key)
-                except Exception:  # pragma: no cover
-                    pass
+        # Stuur resetbericht alleen in dit kanaal via notificatiebericht
+        try:
+            from apps.utils.i18n import t
 
-            # Stuur resetbericht alleen in dit kanaal via notificatiebericht
-            try:
-                from apps.utils.i18n import t
+            await send_temporary_mention(
+                channel,
+                mentions="@everyone",
+                text=t(cid, "NOTIFICATIONS.poll_reset"),
+            )
+        except Exception:  # pragma: no cover
+            return
 
-                await send_temporary_mention(
-                    channel,
-                    mentions="@everyone",
-                    text=t(cid, "NOTIFICATIONS.poll_reset"),
-                )
-            except Exception:  # pragma: no cover
-                continue
+    await run_sweep("reset_polls", _guild_channels(bot, ACTIVE_STATES), _process)
 
     # Als geen enkel kanaal gereset werd, val terug op globale reset
     if not any_reset:
@@ -1558,7 +1610,7 @@ async def notify_misschien_voters(bot, dag: str) -> None:  # pragma: no cover
     deny_names = _get_deny_channel_names()
 
     for guild in getattr(bot, "guilds", []) or []:
-        for channel in get_channels(guild):
+        for channel in _channels_in(guild, VOTE_STATES):
             cid = getattr(channel, "id", 0)
             if is_channel_disabled(cid):
                 continue
@@ -1667,7 +1719,7 @@ async def deactivate_scheduled_polls(bot) -> None:  # pragma: no cover
     Dit is de tegenhanger van activate_scheduled_polls voor /dmk-poll-off.
     """
     from apps.utils.poll_settings import (
-        clear_scheduled_deactivation,
+        clear_scheduled_deactivation_async,
         get_effective_activation,
         get_effective_deactivation,
     )
@@ -1688,155 +1740,163 @@ async def deactivate_scheduled_polls(bot) -> None:  # pragma: no cover
     current_dag = weekday_names[current_weekday]
 
     log_job("deactivate_scheduled_polls", status="executed")
+    to_archive: list = []
 
     # Doorloop alle guilds en kanalen
-    for guild in getattr(bot, "guilds", []) or []:
-        for channel in get_channels(guild):
-            cid = getattr(channel, "id", 0)
-
-            # Skip disabled channels (al uitgeschakeld)
-            if is_channel_disabled(cid):
-                continue
+    async def _process(guild, channel) -> None:
+        cid = getattr(channel, "id", 0)
+
+        # Skip disabled channels (al uitgeschakeld)
+        if is_channel_disabled(cid):
+            return
+
+        # KRITIEK: Skip channels die nooit geactiveerd zijn geweest
+        # Een channel is alleen "actief" als het minimaal 1 poll message heeft
+        # Dit voorkomt dat de scheduler leaked naar kanalen waar de bot nooit is aangezet
+        dagen = get_enabled_poll_days(cid)
+        has_any_poll_message = any(get_message_id(cid, dag) for dag in dagen)
+        if not has_any_poll_message:
+            # Channel heeft geen poll messages, dus is nooit geactiveerd
+            return
+
+        # Haal effective deactivation schedule op (met fallback naar default)
+        schedule, _is_default = get_effective_deactivation(cid)
+        if not schedule:
+            return
+
+        activation_type = schedule.get("type")
+        scheduled_time = schedule.get("tijd", "00:00")
+
+        # Check of het tijd is om te deactiveren
+        should_deactivate = False
+
+        if activation_type == "datum":
+            # Eenmalige deactivatie op specifieke datum
+            scheduled_date = schedule.get("datum")
+            if scheduled_date == current_date and scheduled_time == current_time:
+                should_deactivate = True
+                # Na deactivatie: wis de eenmalige schedule
+                try:
+                    await clear_scheduled_deactivation_async(cid)
+                except Exception:  # pragma: no cover
+                    pass
 
-            # KRITIEK: Skip channels die nooit geactiveerd zijn geweest
-            # Een channel is alleen "actief" als het minimaal 1 poll message heeft
-            # Dit voorkomt dat de scheduler leaked naar kanalen waar de bot nooit is aangezet
-            dagen = get_enabled_poll_days(cid)
-            has_any_poll_message = any(get_message_id(cid, dag) for dag in dagen)
-            if not has_any_poll_message:
-                # Channel heeft geen poll messages, dus is nooit geactiveerd
-                continue
+        elif activation_type == "wekelijks":
+            # Wekelijkse deactivatie op specifieke dag
+            scheduled_dag = schedule.get("dag")
+            if scheduled_dag == current_dag and scheduled_time == current_time:
+                should_deactivate = True
 
-            # Haal effective deactivation schedule op (met fallback naar default)
-            schedule, _is_default = get_effective_deactivation(cid)
-            if not schedule:
-                continue
+        if should_deactivate:
+            # Deactiveer de polls: kanaal leegmaken + scheduler uitschakelen
+            try:
+                dagen = get_enabled_poll_days(cid)
 
-            activation_type = schedule.get("type")
-            scheduled_time = schedule.get("tijd", "00:00")
+                # 0) Opening bericht verwijderen
+                opening_mid = get_message_id(cid, "opening")
+                if opening_mid:
+                    opening_msg = await fetch_message_or_none(channel, opening_mid)
+                    if opening_msg is not None:
+                        try:
+                            await safe_call(opening_msg.delete)
+                        except Exception:  # pragma: no cover
+                            await safe_call(
+                                opening_msg.edit,
+                                content="📴 Poll gesloten.",
+                                view=None,
+                            )
+                    await clear_message_id_async(cid, "opening")
 
-            # Check of het tijd is om te deactiveren
-            should_deactivate = False
+                # 1) Dag-berichten verwijderen
+                for dag in dagen:
+                    mid = get_message_id(cid, dag)
+                    if not mid:
+                        continue
+                    msg = await fetch_message_or_none(channel, mid)
+                    if msg is not None:
+                        try:
+                            await safe_call(msg.delete)
+                        except Exception:  # pragma: no cover
+                            afsluit_tekst = (
+                                "📴 Deze poll is gesloten. Dank voor je deelname."
+                            )
+                            await safe_call(
+                                msg.edit, content=afsluit_tekst, view=None
+                            )
+                    await clear_message_id_async(cid, dag)
 
-            if activation_type == "datum":
-                # Eenmalige deactivatie op specifieke datum
-                scheduled_date = schedule.get("datum")
-                if scheduled_date == current_date and scheduled_time == current_time:
-                    should_deactivate = True
-                    # Na deactivatie: wis de eenmalige schedule
-                    try:
-                        clear_scheduled_deactivation(cid)
-                    except Exception:  # pragma: no cover
-                        pass
+                # 2) Stemmen-bericht verwijderen
+                s_mid = get_message_id(cid, "stemmen")
+                if s_mid:
+                    s_msg = await fetch_message_or_none(channel, s_mid)
+                    if s_msg is not None:
+                        try:
+                            await safe_call(s_msg.delete)
+                        except Exception:  # pragma: no cover
+                            await safe_call(
+                                s_msg.edit,
+                                content="📴 Stemmen gesloten.",
+                                view=None,
+                            )
+                    await clear_message_id_async(cid, "stemmen")
 
-            elif activation_type == "wekelijks":
-                # Wekelijkse deactivatie op specifieke dag
-                scheduled_dag = schedule.get("dag")
-                if scheduled_dag == current_dag and scheduled_time == current_time:
-                    should_deactivate = True
+                # 3) Notificatieberichten verwijderen (temp, persistent en legacy)
+                await _clear_notification_messages(channel, cid)
 
-            if should_deactivate:
-                # Deactiveer de polls: kanaal leegmaken + scheduler uitschakelen
+                # 3b) Celebration berichten verwijderen (embed + GIF)
                 try:
-                    dagen = get_enabled_poll_days(cid)
-
-                    # 0) Opening bericht verwijderen
-                    opening_mid = get_message_id(cid, "opening")
-                    if opening_mid:
-                        opening_msg = await fetch_message_or_none(channel, opening_mid)
-                        if opening_msg is not None:
-                            try:
-                                await safe_call(opening_msg.delete)
-                            except Exception:  # pragma: no cover
-                                await safe_call(
-                                    opening_msg.edit,
-                                    content="📴 Poll gesloten.",
-                                    view=None,
-                                )
-                        clear_message_id(cid, "opening")
-
-                    # 1) Dag-berichten verwijderen
-                    for dag in dagen:
-                        mid = get_message_id(cid, dag)
-                        if not mid:
-                            continue
-                        msg = await fetch_message_or_none(channel, mid)
-                        if msg is not None:
-                            try:
-                                await safe_call(msg.delete)
-                            except Exception:  # pragma: no cover
-                                afsluit_tekst = (
-                                    "📴 Deze poll is gesloten. Dank voor je deelname."
-                                )
-                                await safe_call(
-                                    msg.edit, content=afsluit_tekst, view=None
-                                )
-                        clear_message_id(cid, dag)
-
-                    # 2) Stemmen-bericht verwijderen
-                    s_mid = get_message_id(cid, "stemmen")
-                    if s_mid:
-                        s_msg = await fetch_message_or_none(channel, s_mid)
-                        if s_msg is not None:
-                            try:
-                                await safe_call(s_msg.delete)
-                            except Exception:  # pragma: no cover
-                                await safe_call(
-                                    s_msg.edit,
-                                    content="📴 Stemmen gesloten.",
-                                    view=None,
-                                )
-                        clear_message_id(cid, "stemmen")
-
-                    # 3) Notificatieberichten verwijderen (temp, persistent en legacy)
-                    await _clear_notification_messages(channel, cid)
-
-                    # 3b) Celebration berichten verwijderen (embed + GIF)
-                    try:
-                        from apps.utils.poll_message import remove_celebration_message
+                    from apps.utils.poll_message import remove_celebration_message
 
-                        await remove_celebration_message(channel, cid)
-                    except Exception:  # pragma: no cover
-                        pass
+                    await remove_celebration_message(channel, cid)
+                except Exception:  # pragma: no cover
+                    pass
 
-                    # 4) Archiveer huidige week's data voordat we deactiveren
-                    try:
-                        from apps.utils.archive import append_week_snapshot_scoped
+                # 4) Archiveer huidige week's data: na de sweep in één batch
+                to_archive.append((getattr(guild, "id", 0), cid, channel))
 
-                        gid = getattr(guild, "id", 0)
-                        await append_week_snapshot_scoped(gid, cid, channel=channel)
-                    except Exception as e:  # pragma: no cover
-                        print(f"⚠️ Archiveren bij deactivatie mislukt: {e}")
+                # 5) Post sluitingsbericht met heropening tijd
+                try:
+                    from apps.utils.notification_texts import (
+                        format_opening_time_from_schedule,
+                        get_text_poll_gesloten,
+                    )
 
-                    # 5) Post sluitingsbericht met heropening tijd
-                    try:
-                        from apps.utils.notification_texts import (
-                            format_opening_time_from_schedule,
-                            get_text_poll_gesloten,
-                        )
+                    act_schedule, _ = get_effective_activation(cid)
+                    opening_time = format_opening_time_from_schedule(act_schedule)
+                    sluitingsbericht = get_text_poll_gesloten(opening_time)
+
+                    send = getattr(channel, "send", None)
+                    if send:
+                        await safe_call(send, content=sluitingsbericht)
+                except Exception as e:  # pragma: no cover
+                    print(f"⚠️ Sluitingsbericht versturen mislukt: {e}")
 
-                        act_schedule, _ = get_effective_activation(cid)
-                        opening_time = format_opening_time_from_schedule(act_schedule)
-                        sluitingsbericht = get_text_poll_gesloten(opening_time)
+                # BELANGRIJK: Kanaal NIET disablen bij automatische deactivatie!
+                # Het kanaal moet automatisch weer geopend kunnen worden op de geplande tijd.
+                # Alleen handmatige /dmk-poll-stopzetten mag het kanaal permanent disablen.
 
-                        send = getattr(channel, "send", None)
-                        if send:
-                            await safe_call(send, content=sluitingsbericht)
-                    except Exception as e:  # pragma: no cover
-                        print(f"⚠️ Sluitingsbericht versturen mislukt: {e}")
+                _index_channel(channel)
+                print(
+                    f"✅ Automatisch gedeactiveerd: kanaal {cid} volgens schedule"
+                )
 
-                    # BELANGRIJK: Kanaal NIET disablen bij automatische deactivatie!
-                    # Het kanaal moet automatisch weer geopend kunnen worden op de geplande tijd.
-                    # Alleen handmatige /dmk-poll-stopzetten mag het kanaal permanent disablen.
+            except Exception as e:  # pragma: no cover
+                print(
+                    f"❌ Fout bij automatische deactivatie voor kanaal {cid}: {e}"
+                )
 
-                    print(
-                        f"✅ Automatisch gedeactiveerd: kanaal {cid} volgens schedule"
-                    )
+    await run_sweep(
+        "deactivate_scheduled_polls", _guild_channels(bot, POLL_STATES), _process
+    )
 
-                except Exception as e:  # pragma: no cover
-                    print(
-                        f"❌ Fout bij automatische deactivatie voor kanaal {cid}: {e}"
-                    )
+    # Eén momentopname van alle gedeactiveerde kanalen, alle rijen in één batch
+    if to_archive:
+        try:
+            from apps.utils.archive import archive_channels
+
+            await archive_channels(to_archive, now)
+        except Exception as e:  # pragma: no cover
+            print(f"⚠️ Archiveren bij deactivatie mislukt: {e}")
 
 
 async def activate_scheduled_polls(bot) -> None:  # pragma: no cover
@@ -1855,7 +1915,7 @@ async def activate_scheduled_polls(bot) -> None:  # pragma: no cover
     (Handmatige activatie wordt afgehandeld door /dmk-poll-on zelf)
     """
     from apps.utils.poll_settings import (
-        clear_scheduled_activation,
+        clear_scheduled_activation_async,
         get_effective_activation,
     )
 
@@ -1876,215 +1936,222 @@ async def activate_scheduled_polls(bot) -> None:  # pragma: no cover
     log_job("activate_scheduled_polls", status="executed")
 
     # Doorloop alle guilds en kanalen
-    for guild in getattr(bot, "guilds", []) or []:
-        for channel in get_channels(guild):
-            cid = getattr(channel, "id", 0)
+    async def _process(guild, channel) -> None:
+        cid = getattr(channel, "id", 0)
 
-            # Skip disabled channels (permanent uitgeschakeld met /dmk-poll-stopzetten)
-            # Let op: /dmk-poll-off (tijdelijk sluiten) zet disabled NIET op True,
-            # dus die channels worden hier NIET geskipt en kunnen automatisch heropenen
-            if is_channel_disabled(cid):
-                continue
+        # Skip disabled channels (permanent uitgeschakeld met /dmk-poll-stopzetten)
+        # Let op: /dmk-poll-off (tijdelijk sluiten) zet disabled NIET op True,
+        # dus die channels worden hier NIET geskipt en kunnen automatisch heropenen
+        if is_channel_disabled(cid):
+            return
 
-            # Haal effective schedule op (met fallback naar default)
-            schedule, _is_default = get_effective_activation(cid)
-            if not schedule:
-                continue
-
-            activation_type = schedule.get("type")
-            scheduled_time = schedule.get("tijd", "20:00")
+        # Haal effective schedule op (met fallback naar default)
+        schedule, _is_default = get_effective_activation(cid)
+        if not schedule:
+            return
 
-            # Check of het tijd is om te activeren
-            should_activate = False
+        activation_type = schedule.get("type")
+        scheduled_time = schedule.get("tijd", "20:00")
 
-            if activation_type == "datum":
-                # Eenmalige activatie op specifieke datum
-                scheduled_date = schedule.get("datum")
+        # Check of het tijd is om te activeren
+        should_activate = False
 
-                # Parse scheduled datetime voor vergelijking
-                try:
-                    scheduled_datetime_str = f"{scheduled_date} {scheduled_time}"
-                    scheduled_dt = datetime.strptime(
-                        scheduled_datetime_str, "%Y-%m-%d %H:%M"
-                    )
-                    scheduled_dt = TZ.localize(scheduled_dt)
+        if activation_type == "datum":
+            # Eenmalige activatie op specifieke datum
+            scheduled_date = schedule.get("datum")
 
-                    # Check of scheduled tijd in het verleden ligt (gemist)
-                    if now >= scheduled_dt:
-                        should_activate = True
-                        # Na activatie: wis de eenmalige schedule
-                        try:
-                            clear_scheduled_activation(cid)
-                        except Exception:  # pragma: no cover
-                            pass
-                except (ValueError, TypeError):  # pragma: no cover
-                    # Invalid date format, skip
-                    pass
+            # Parse scheduled datetime voor vergelijking
+            try:
+                scheduled_datetime_str = f"{scheduled_date} {scheduled_time}"
+                scheduled_dt = datetime.strptime(
+                    scheduled_datetime_str, "%Y-%m-%d %H:%M"
+                )
+                scheduled_dt = TZ.localize(scheduled_dt)
 
-            elif activation_type == "wekelijks":
-                # Wekelijkse activatie op specifieke dag
-                scheduled_dag = schedule.get("dag")
+                # Check of scheduled tijd in het verleden ligt (gemist)
+                if now >= scheduled_dt:
+                    should_activate = True
+                    # Na activatie: wis de eenmalige schedule
+                    try:
+                        await clear_scheduled_activation_async(cid)
+                    except Exception:  # pragma: no cover
+                        pass
+            except (ValueError, TypeError):  # pragma: no cover
+                # Invalid date format, skip
+                pass
 
-                # Exact match: activeer op de juiste tijd
-                if scheduled_dag == current_dag and scheduled_time == current_time:
+        elif activation_type == "wekelijks":
+            # Wekelijkse activatie op specifieke dag
+            scheduled_dag = schedule.get("dag")
+
+            # Exact match: activeer op de juiste tijd
+            if scheduled_dag == current_dag and scheduled_time == current_time:
+                should_activate = True
+            # Catch-up: scheduled dag is vandaag maar tijd is al geweest
+            # EN het kanaal heeft geen actieve poll messages (anders zou het al actief zijn)
+            elif scheduled_dag == current_dag and scheduled_time < current_time:
+                # Check of kanaal poll messages heeft (dan is het al actief)
+                dagen = get_enabled_poll_days(cid)
+                has_any_poll_message = any(
+                    get_message_id(cid, dag) for dag in dagen
+                )
+                if not has_any_poll_message:
+                    # Geen poll messages: poll is niet actief, dus activeer nu (catch-up)
                     should_activate = True
-                # Catch-up: scheduled dag is vandaag maar tijd is al geweest
-                # EN het kanaal heeft geen actieve poll messages (anders zou het al actief zijn)
-                elif scheduled_dag == current_dag and scheduled_time < current_time:
-                    # Check of kanaal poll messages heeft (dan is het al actief)
-                    dagen = get_enabled_poll_days(cid)
-                    has_any_poll_message = any(
-                        get_message_id(cid, dag) for dag in dagen
-                    )
-                    if not has_any_poll_message:
-                        # Geen poll messages: poll is niet actief, dus activeer nu (catch-up)
-                        should_activate = True
-
-            if should_activate:
-                # Activeer de polls via een mock interaction
-                # We kunnen niet de normale _plaats_polls gebruiken zonder interaction,
-                # dus we moeten de activatie-logica hier dupliceren of een helper maken
+
+        if should_activate:
+            # Activeer de polls via een mock interaction
+            # We kunnen niet de normale _plaats_polls gebruiken zonder interaction,
+            # dus we moeten de activatie-logica hier dupliceren of een helper maken
+            try:
+                # Import hier om circular dependency te voorkomen
+                from apps.ui.poll_buttons import OneStemButtonView
+                from apps.utils.poll_message import update_poll_message
+
+                # Kanaal activeren
+                await set_channel_disabled_async(cid, False)
+
+                # Unpause
                 try:
-                    # Import hier om circular dependency te voorkomen
-                    from apps.ui.poll_buttons import OneStemButtonView
-                    from apps.utils.poll_message import update_poll_message
+                    from apps.utils.poll_settings import set_paused_async
 
-                    # Kanaal activeren
-                    set_channel_disabled(cid, False)
+                    await set_paused_async(cid, False)
+                except Exception:  # pragma: no cover
+                    pass
 
-                    # Unpause
-                    try:
-                        from apps.utils.poll_settings import set_paused
+                # Reset votes voor schone start (Bug #3 fix)
+                # Dit zorgt ervoor dat de poll altijd met 0 stemmen start,
+                # ongeacht wanneer de activatie plaatsvindt (bijv. dinsdag 13:33)
+                try:
+                    gid = getattr(guild, "id", 0)
+                    await reset_votes_scoped(gid, cid)
+                except Exception:  # pragma: no cover
+                    pass
 
-                        set_paused(cid, False)
-                    except Exception:  # pragma: no cover
-                        pass
+                send = getattr(channel, "send", None)
 
-                    # Reset votes voor schone start (Bug #3 fix)
-                    # Dit zorgt ervoor dat de poll altijd met 0 stemmen start,
-                    # ongeacht wanneer de activatie plaatsvindt (bijv. dinsdag 13:33)
+                # STAP 1: Verwijder ALLE bestaande bot-berichten (opschonen)
+                # Dit zorgt voor een schone start zoals /dmk-poll-on doet
+                try:
+                    bot_user = getattr(bot, "user", None)
+                    if bot_user:
+                        bot_user_id = getattr(bot_user, "id", None)
+                        if bot_user_id and hasattr(channel, "history"):
+                            # channel.history returns AsyncIterator[discord.Message]
+                            async for bericht in channel.history(limit=100):  # type: ignore[attr-defined]
+                                author = getattr(bericht, "author", None)
+                                if author:
+                                    author_id = getattr(author, "id", None)
+                                    if author_id == bot_user_id:
+                                        try:
+                                            await bericht.delete()
+                                        except Exception:  # pragma: no cover
+                                            pass
+                except Exception as e:  # pragma: no cover
+                    print(f"⚠️ Kon bot-berichten niet verwijderen: {e}")
+
+                # Wis alle message IDs na cleanup
+                for key in [
+                    "opening",
+                    "vrijdag",
+                    "zaterdag",
+                    "zondag",
+                    "maandag",
+                    "dinsdag",
+                    "woensdag",
+                    "donderdag",
+                    "stemmen",
+                    "notification",
+                    "notification_persistent",
+                ]:
                     try:
-                        gid = getattr(guild, "id", 0)
-                        await reset_votes_scoped(gid, cid)
+                        await clear_message_id_async(cid, key)
                     except Exception:  # pragma: no cover
                         pass
 
-                    send = getattr(channel, "send", None)
+                # STAP 2: Opening bericht met @everyone (zichtbaar, permanent)
+                # De @everyone in de i18n header is de daadwerkelijke ping.
+                # Als reset_polls al eerder heeft gedraaid in dit resetvenster,
+                # onderdruk de ping met AllowedMentions.none() (tekst blijft zichtbaar).
+                import discord as _discord
 
-                    # STAP 1: Verwijder ALLE bestaande bot-berichten (opschonen)
-                    # Dit zorgt voor een schone start zoals /dmk-poll-on doet
-                    try:
-                        bot_user = getattr(bot, "user", None)
-                        if bot_user:
-                            bot_user_id = getattr(bot_user, "id", None)
-                            if bot_user_id and hasattr(channel, "history"):
-                                # channel.history returns AsyncIterator[discord.Message]
-                                async for bericht in channel.history(limit=100):  # type: ignore[attr-defined]
-                                    author = getattr(bericht, "author", None)
-                                    if author:
-                                        author_id = getattr(author, "id", None)
-                                        if author_id == bot_user_id:
-                                            try:
-                                                await bericht.delete()
-                                            except Exception:  # pragma: no cover
-                                                pass
-                    except Exception as e:  # pragma: no cover
-                        print(f"⚠️ Kon bot-berichten niet verwijderen: {e}")
-
-                    # Wis alle message IDs na cleanup
-                    for key in [
-                        "opening",
-                        "vrijdag",
-                        "zaterdag",
-                        "zondag",
-                        "maandag",
-                        "dinsdag",
-                        "woensdag",
-                        "donderdag",
-                        "stemmen",
-                        "notification",
-                        "notification_persistent",
-                    ]:
+                from apps.commands.poll_lifecycle import _load_opening_message
+
+                suppress_ping = False
+                if _within_reset_window(now):
+                    rstate = _read_state()
+                    lr = rstate.get("reset_polls")
+                    if lr:
                         try:
-                            clear_message_id(cid, key)
+                            lr_dt = datetime.fromisoformat(str(lr))
+                            if lr_dt.tzinfo is None:
+                                lr_dt = TZ.localize(lr_dt)
+                            if (now - lr_dt).total_seconds() < 300:
+                                suppress_ping = True
                         except Exception:  # pragma: no cover
                             pass
 
-                    # STAP 2: Opening bericht met @everyone (zichtbaar, permanent)
-                    # De @everyone in de i18n header is de daadwerkelijke ping.
-                    # Als reset_polls al eerder heeft gedraaid in dit resetvenster,
-                    # onderdruk de ping met AllowedMentions.none() (tekst blijft zichtbaar).
-                    import discord as _discord
-
-                    from apps.commands.poll_lifecycle import _load_opening_message
-
-                    suppress_ping = False
-                    if _within_reset_window(now):
-                        rstate = _read_state()
-                        lr = rstate.get("reset_polls")
-                        if lr:
-                            try:
-                                lr_dt = datetime.fromisoformat(str(lr))
-                                if lr_dt.tzinfo is None:
-                                    lr_dt = TZ.localize(lr_dt)
-                                if (now - lr_dt).total_seconds() < 300:
-                                    suppress_ping = True
-                            except Exception:  # pragma: no cover
-                                pass
-
-                    opening_text = _load_opening_message(channel_id=cid)
-                    if send:
-                        if suppress_ping:
-                            opening_msg = await safe_call(
-                                send,
-                                content=opening_text,
-                                allowed_mentions=_discord.AllowedMentions.none(),
-                            )
-                        else:
-                            opening_msg = await safe_call(send, content=opening_text)
-                        if opening_msg is not None:
-                            save_message_id(cid, "opening", opening_msg.id)
+                opening_text = _load_opening_message(channel_id=cid)
+                if send:
+                    if suppress_ping:
+                        opening_msg = await safe_call(
+                            send,
+                            content=opening_text,
+                            allowed_mentions=_discord.AllowedMentions.none(),
+                        )
+                    else:
+                        opening_msg = await safe_call(send, content=opening_text)
+                    if opening_msg is not None:
+                        await save_message_id_async(cid, "opening", opening_msg.id)
 
-                    # STAP 3: Dag-berichten creëren (nieuw)
-                    for dag in get_enabled_poll_days(cid):
-                        await update_poll_message(channel, dag)
+                # STAP 3: Dag-berichten creëren (nieuw)
+                for dag in get_enabled_poll_days(cid):
+                    await update_poll_message(channel, dag)
 
-                    # STAP 4: Stemmen-knop bericht (nieuw aanmaken)
-                    from apps.utils.i18n import t
+                # STAP 4: Stemmen-knop bericht (nieuw aanmaken)
+                from apps.utils.i18n import t
 
-                    key = "stemmen"
-                    tekst = t(cid, "UI.click_vote_button")
-                    paused = is_paused(cid)
-                    view = OneStemButtonView(paused=paused, channel_id=cid)
+                key = "stemmen"
+                tekst = t(cid, "UI.click_vote_button")
+                paused = is_paused(cid)
+                view = OneStemButtonView(paused=paused, channel_id=cid)
 
-                    if send:
-                        s_msg = await safe_call(send, content=tekst, view=view)
-                        if s_msg is not None:
-                            save_message_id(cid, key, s_msg.id)
-
-                    # STAP 5+6+7: (verwijderd) @everyone-ping zit nu in het
-                    # welkomstbericht (STAP 2), zodat de @everyone altijd zichtbaar
-                    # blijft. HammerTime-berekening en send_temporary_mention zijn
-                    # niet meer nodig.
-
-                    # Registreer activatie voor coördinatie met reset_polls
-                    # (voorkomt dat reset_polls opnieuw @everyone stuurt)
-                    if _within_reset_window(now):
-                        try:
-                            act_state = _read_state()
-                            activated = act_state.get(
-                                "activated_channels_this_reset", {}
-                            )
-                            activated[str(cid)] = now.isoformat()
-                            act_state["activated_channels_this_reset"] = activated
-                            _write_state(act_state)
-                        except Exception:  # pragma: no cover
-                            pass
+                if send:
+                    s_msg = await safe_call(send, content=tekst, view=view)
+                    if s_msg is not None:
+                        await save_message_id_async(cid, key, s_msg.id)
+
+                # STAP 5+6+7: (verwijderd) @everyone-ping zit nu in het
+                # welkomstbericht (STAP 2), zodat de @everyone altijd zichtbaar
+                # blijft. HammerTime-berekening en send_temporary_mention zijn
+                # niet meer nodig.
+
+                # Registreer activatie voor coördinatie met reset_polls
+                # (voorkomt dat reset_polls opnieuw @everyone stuurt)
+                if _within_reset_window(now):
+                    try:
+                        act_state = _read_state()
+                        activated = act_state.get(
+                            "activated_channels_this_reset", {}
+                        )
+                        activated[str(cid)] = now.isoformat()
+                        act_state["activated_channels_this_reset"] = activated
+                        _write_state(act_state)
+                    except Exception:  # pragma: no cover
+                        pass
 
-                    print(f"✅ Automatisch geactiveerd: kanaal {cid} volgens schedule")
+                _index_channel(channel)
+                print(f"✅ Automatisch geactiveerd: kanaal {cid} volgens schedule")
 
-                except Exception as e:  # pragma: no cover
-                    print(f"❌ Fout bij automatische activatie voor kanaal {cid}: {e}")
+            except Exception as e:  # pragma: no cover
+                print(f"❌ Fout bij automatische activatie voor kanaal {cid}: {e}")
+
+    # Een default-schema geldt voor elk niet-uitgeschakeld kanaal; alleen
+    # zonder default kunnen we ons tot de geïndexeerde kanalen beperken.
+    from apps.utils.poll_settings import get_default_activation
+
+    states = None if get_default_activation() else ACTIVATABLE_STATES
+    await run_sweep("activate_scheduled_polls", _guild_channels(bot, states), _process)
 
 
 async def convert_remaining_misschien(bot, dag: str) -> None:  # pragma: no cover
@@ -2107,77 +2174,78 @@ async def convert_remaining_misschien(bot, dag: str) -> None:  # pragma: no cove
     # DENY_CHANNEL_NAMES check
     deny_names = _get_deny_channel_names()
 
-    for guild in getattr(bot, "guilds", []) or []:
-        for channel in get_channels(guild):
-            cid = getattr(channel, "id", 0)
-            if is_channel_disabled(cid):
-                continue
+    async def _process(guild, channel) -> None:
+        cid = getattr(channel, "id", 0)
+        if is_channel_disabled(cid):
+            return
 
-            # Skip if channel is paused
-            if is_paused(cid):
-                continue
+        # Skip if channel is paused
+        if is_paused(cid):
+            return
 
-            # Skip kanalen die niet in 'deadline' modus staan
-            # (misschien-conversie is alleen relevant voor deadline-scenario)
-            if not _is_deadline_mode(cid, dag):
-                continue
-
-            # Check DENY_CHANNEL_NAMES
-            ch_name = (getattr(channel, "name", "") or "").lower()
-            if ch_name in deny_names:
-                continue
-
-            # ALLOW_FROM_PER_CHANNEL_ONLY check verwijderd:
-            # Notificaties werken op data-niveau (votes), niet afhankelijk van berichten
-
-            gid = getattr(guild, "id", "0")
-            votes = await load_votes(gid, cid) or {}
+        # Skip kanalen die niet in 'deadline' modus staan
+        # (misschien-conversie is alleen relevant voor deadline-scenario)
+        if not _is_deadline_mode(cid, dag):
+            return
 
-            # Find remaining "misschien" voters and convert them
-            converted_any = False
-            converted_user_ids: list[str] = []
-            for uid, per_dag in votes.items():
-                tijden = (per_dag or {}).get(dag, [])
-                if not isinstance(tijden, list):
-                    continue
+        # Check DENY_CHANNEL_NAMES
+        ch_name = (getattr(channel, "name", "") or "").lower()
+        if ch_name in deny_names:
+            return
 
-                if "misschien" in tijden:
-                    # Convert to "niet meedoen"
-                    try:
-                        from apps.utils.poll_storage import add_vote, remove_vote
+        # ALLOW_FROM_PER_CHANNEL_ONLY check verwijderd:
+        # Notificaties werken op data-niveau (votes), niet afhankelijk van berichten
 
-                        await remove_vote(str(uid), dag, "misschien", gid, cid)
-                        await add_vote(str(uid), dag, "niet meedoen", gid, cid)
-                        converted_any = True
-                        converted_user_ids.append(str(uid))
-                    except Exception:  # pragma: no cover
-                        # Voeg toe aan retry queue voor 2 uur retry window
-                        from apps.utils.retry_queue import add_failed_conversion
+        gid = getattr(guild, "id", "0")
+        votes = await load_votes(gid, cid) or {}
 
-                        add_failed_conversion(str(gid), str(cid), str(uid), dag)
-                        continue
+        # Find remaining "misschien" voters and convert them
+        converted_any = False
+        converted_user_ids: list[str] = []
+        for uid, per_dag in votes.items():
+            tijden = (per_dag or {}).get(dag, [])
+            if not isinstance(tijden, list):
+                continue
 
-            # Store the user IDs of converted misschien votes
-            if converted_user_ids:
+            if "misschien" in tijden:
+                # Convert to "niet meedoen"
                 try:
-                    from apps.utils.poll_storage import set_was_misschien_user_ids
+                    from apps.utils.poll_storage import add_vote, remove_vote
 
-                    await set_was_misschien_user_ids(dag, converted_user_ids, gid, cid)
+                    await remove_vote(str(uid), dag, "misschien", gid, cid)
+                    await add_vote(str(uid), dag, "niet meedoen", gid, cid)
+                    converted_any = True
+                    converted_user_ids.append(str(uid))
                 except Exception:  # pragma: no cover
-                    pass
+                    # Voeg toe aan retry queue voor 2 uur retry window
+                    from apps.utils.retry_queue import add_failed_conversion
 
-            # Update poll message if we converted anyone
-            if converted_any:
-                try:
-                    await schedule_poll_update(channel, dag, delay=0.0)
-                except Exception:  # pragma: no cover
-                    pass
+                    add_failed_conversion(str(gid), str(cid), str(uid), dag)
+                    continue
 
-            # Delete notification messages if they still exist (should auto-delete anyway)
-            # Since misschien notification is at 17:00 and conversion is at 18:00,
-            # the notification will be auto-deleted. This is a safety cleanup.
-            # Wis alle notificatieberichten (temp, persistent en legacy)
+        # Store the user IDs of converted misschien votes
+        if converted_user_ids:
             try:
-                await _clear_notification_messages(channel, cid)
+                from apps.utils.poll_storage import set_was_misschien_user_ids
+
+                await set_was_misschien_user_ids(dag, converted_user_ids, gid, cid)
             except Exception:  # pragma: no cover
                 pass
+
+        # Update poll message if we converted anyone
+        if converted_any:
+            try:
+                await schedule_poll_update(channel, dag, delay=0.0)
+            except Exception:  # pragma: no cover
+                pass
+
+        # Delete notification messages if they still exist (should auto-delete anyway)
+        # Since misschien notification is at 17:00 and conversion is at 18:00,
+        # the notification will be auto-deleted. This is a safety cleanup.
+        # Wis alle notificatieberichten (temp, persistent en legacy)
+        try:
+            await _clear_notification_messages(channel, cid)
+        except Exception:  # pragma: no cover
+            pass
+
+    await run_sweep("convert_misschien", _guild_channels(bot, VOTE_STATES), _process)
@@ -1,12 +1,12 @@
 # apps/ui/archive_view.py
 
-import io
+import asyncio
 
 import discord
 from discord import File
 from discord.ui import Button, Select, View
 
-from apps.utils.archive import create_archive, delete_archive_scoped
+from apps.utils.archive import delete_archive_scoped, export_archive
 from apps.utils.i18n import t
 
 
@@ -66,15 +66,16 @@ class DelimiterSelectMenu(Select):
         for option in self.options:
             option.default = option.value == self.values[0]
 
-        # Genereer CSV met gekozen delimiter
-        csv_data = create_archive(
+        # Genereer CSV met gekozen delimiter (gestreamd naar een gecachte export)
+        csv_path = await asyncio.to_thread(
+            export_archive,
             self.parent_view.guild_id,
             self.parent_view.channel_id,
             self.parent_view.selected_delimiter,
             self.parent_view.weekday,
         )
 
-        if not csv_data:
+        if not csv_path:
             await interaction.response.send_message(
                 t(cid, "ERRORS.archive_generate_failed"), ephemeral=True
             )
@@ -95,7 +96,7 @@ class DelimiterSelectMenu(Select):
         # Update bericht met nieuw CSV bestand
         await interaction.response.edit_message(
             content=message_content,
-            attachments=[File(io.BytesIO(csv_data), filename=filename)],
+            attachments=[File(csv_path, filename=filename)],
             view=self.parent_view,
         )
 
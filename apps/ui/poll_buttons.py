@@ -9,7 +9,7 @@ from zoneinfo import ZoneInfo
 from discord import ButtonStyle, Interaction
 from discord.ui import Button, View
 
-from apps.entities.poll_option import get_poll_options
+from apps.entities.poll_option import get_options_for_day, get_poll_options
 from apps.logic.visibility import is_vote_button_visible
 from apps.utils.discord_client import safe_call
 from apps.utils.poll_message import (
@@ -188,13 +188,13 @@ def _get_timezone_legend(dag: str, channel_id: int) -> str:
     from apps.utils.poll_settings import get_poll_option_state
 
     # Haal emoji's uit poll_options.json (centrale bron)
-    all_options = get_poll_options()
+    day_options = get_options_for_day(dag.lower())
     emoji_1900 = next(
-        (opt.emoji for opt in all_options if opt.dag == dag.lower() and opt.tijd == "om 19:00 uur"),
+        (opt.emoji for opt in day_options if opt.tijd == "om 19:00 uur"),
         "🔴"
     )
     emoji_2030 = next(
-        (opt.emoji for opt in all_options if opt.dag == dag.lower() and opt.tijd == "om 20:30 uur"),
+        (opt.emoji for opt in day_options if opt.tijd == "om 20:30 uur"),
         "🟠"
     )
 
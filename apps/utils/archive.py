@@ -1,23 +1,42 @@
 # apps/utils/archive.py
 
+import asyncio
 import csv
+import hashlib
+import io
+import itertools
 import os
+import tempfile
+import threading
 from datetime import datetime, timedelta
-from typing import Any, Optional, Tuple
+from typing import Any, Iterator, Optional, Tuple
 
 import pytz
 
 from apps.entities.poll_option import get_poll_options
+from apps.utils.archive_stats import delete_stats, record_csv_row
+from apps.utils.archive_writer import forget_index, upsert_week_row
 from apps.utils.poll_settings import WEEK_DAYS
+from apps.utils.member_roster import channel_roster
 from apps.utils.poll_storage import (
+    ChannelTally,
     get_non_voters_for_day,
     get_was_misschien_count,
     load_votes,
+    snapshot_channel_tallies,
 )
 
 ARCHIVE_DIR = "archive"
 ARCHIVE_CSV = os.path.join(ARCHIVE_DIR, "dmk_archive.csv")
 
+# Gecachte CSV-exports (per archief en delimiter), zie export_archive()
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "dmk_archive_exports")
+_EXPORTS: dict[tuple[str, str], tuple[tuple[int, int], str]] = {}
+# Eén lock per (archief, delimiter): gelijktijdige downloads wachten op
+# dezelfde export in plaats van elkaars bestand te overschrijven
+_EXPORT_LOCKS: dict[tuple[str, str], threading.Lock] = {}
+_EXPORT_LOCKS_GUARD = threading.Lock()
+
 VOLGORDE = [
     "om 19:00 uur",
     "om 20:30 uur",
@@ -143,7 +162,7 @@ async def _count_non_voters(
     if guild_id is not None and channel_id is not None:
         try:
             count, _ = await get_non_voters_for_day(dag, guild_id, channel_id)
-            if count > 0:
+            if count:
                 return count
         except Exception:  # pragma: no cover
             pass
@@ -270,16 +289,8 @@ def _week_dates_weekdays(now):
 # === SCOPED ARCHIVE FUNCTIONS (PER GUILD+CHANNEL) met backward compat ===
 
 
-async def _archive_weekend(
-    telling: dict,
-    guild_id: Optional[int | str],
-    channel_id: Optional[int | str],
-    now: datetime,
-) -> None:
-    """
-    Archiveer weekend data (vrijdag, zaterdag, zondag) naar weekend CSV.
-    Dit is het standaard archief dat altijd wordt gebruikt (backward compatible).
-    """
+def _weekend_record(telling: dict, now: datetime) -> tuple[str, list, list]:
+    """(week, header, rij) voor het weekend archief (vrijdag, zaterdag, zondag)."""
     week, vr, za, zo = _week_dates_eu(now)
 
     header = [
@@ -331,20 +342,11 @@ async def _archive_weekend(
         telling["zondag"]["niet gestemd"],
     ]
 
-    csv_path = get_archive_path_scoped(guild_id, channel_id, weekday=False)
-    await _write_archive_csv(csv_path, header, row, week)
+    return week, header, row
 
 
-async def _archive_weekdays(
-    telling: dict,
-    guild_id: Optional[int | str],
-    channel_id: Optional[int | str],
-    now: datetime,
-) -> None:
-    """
-    Archiveer weekday data (maandag, dinsdag, woensdag, donderdag) naar weekday CSV.
-    Dit archief wordt alleen gebruikt als er weekday polls zijn ingeschakeld.
-    """
+def _weekday_record(telling: dict, now: datetime) -> tuple[str, list, list]:
+    """(week, header, rij) voor het weekday archief (maandag t/m donderdag)."""
     week, ma, di, wo, do = _week_dates_weekdays(now)
 
     header = [
@@ -410,8 +412,41 @@ async def _archive_weekdays(
         telling["donderdag"]["niet gestemd"],
     ]
 
+    return week, header, row
+
+
+async def _archive_weekend(
+    telling: dict,
+    guild_id: Optional[int | str],
+    channel_id: Optional[int | str],
+    now: datetime,
+) -> None:
+    """
+    Archiveer weekend data (vrijdag, zaterdag, zondag) naar weekend CSV.
+    Dit is het standaard archief dat altijd wordt gebruikt (backward compatible).
+    """
+    week, header, row = _weekend_record(telling, now)
+    csv_path = get_archive_path_scoped(guild_id, channel_id, weekday=False)
+    await _write_archive_csv(csv_path, header, row, week)
+    if guild_id is not None and channel_id is not None:
+        await asyncio.to_thread(record_csv_row, guild_id, channel_id, header, row)
+
+
+async def _archive_weekdays(
+    telling: dict,
+    guild_id: Optional[int | str],
+    channel_id: Optional[int | str],
+    now: datetime,
+) -> None:
+    """
+    Archiveer weekday data (maandag, dinsdag, woensdag, donderdag) naar weekday CSV.
+    Dit archief wordt alleen gebruikt als er weekday polls zijn ingeschakeld.
+    """
+    week, header, row = _weekday_record(telling, now)
     csv_path = get_archive_path_scoped(guild_id, channel_id, weekday=True)
     await _write_archive_csv(csv_path, header, row, week)
+    if guild_id is not None and channel_id is not None:
+        await asyncio.to_thread(record_csv_row, guild_id, channel_id, header, row)
 
 
 async def _write_archive_csv(
@@ -422,118 +457,12 @@ async def _write_archive_csv(
     Gebruikt voor zowel weekend als weekday archieven.
     Ondersteunt update van bestaande week of append van nieuwe week.
 
-    Voor weekend archief: migreert automatisch van V1/V2 → V3 formaat.
-    Voor weekday archief: altijd V1 formaat (nieuw).
+    Zie archive_writer: nieuwe weken worden toegevoegd, de huidige week wordt
+    ter plekke herschreven. De bestands-I/O draait buiten de event loop.
+    Oude formaten (V1-V3) worden niet meer hier gemigreerd maar eenmalig met
+    migrate_archives.py.
     """
-    if os.path.exists(csv_path):
-        # Lees bestaande CSV
-        with open(csv_path, "r", newline="", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-
-        if rows:
-            existing_header = rows[0]
-
-            # Migratie logica voor weekend archief (V1/V2 → V3)
-            # Check: weekend archief heeft "vr_" kolommen, weekday heeft "ma_"
-            is_weekend_archive = any("vr_" in col for col in existing_header)
-
-            if is_weekend_archive and "vr_was_misschien" not in existing_header:
-                # Migreer oude data naar nieuwe structuur
-                # V1 (16 columns): no niet_gestemd, no was_misschien
-                # V2 (19 columns): has niet_gestemd, no was_misschien
-                # V3 (22 columns): has niet_gestemd and was_misschien (current)
-
-                rows[0] = header  # Update header
-
-                # Migreer data rijen
-                for i in range(1, len(rows)):
-                    old_row = rows[i]
-
-                    if len(old_row) >= 19:
-                        # V2 → V3: Add was_misschien columns
-                        new_row = [
-                            old_row[0],
-                            old_row[1],
-                            old_row[2],
-                            old_row[3],
-                            old_row[4],
-                            old_row[5],
-                            old_row[6],
-                            "",  # vr_was_misschien
-                            old_row[7],
-                            old_row[8],
-                            old_row[9],
-                            old_row[10],
-                            old_row[11],
-                            "",  # za_was_misschien
-                            old_row[12],
-                            old_row[13],
-                            old_row[14],
-                            old_row[15],
-                            old_row[16],
-                            "",  # zo_was_misschien
-                            old_row[17],
-                            old_row[18],
-                        ]
-                        rows[i] = new_row
-                    elif len(old_row) >= 16:
-                        # V1 → V3: Add beide niet_gestemd en was_misschien
-                        new_row = [
-                            old_row[0],
-                            old_row[1],
-                            old_row[2],
-                            old_row[3],
-                            old_row[4],
-                            old_row[5],
-                            old_row[6],
-                            "",  # vr_was_misschien
-                            old_row[7],
-                            "",  # vr_niet_gestemd
-                            old_row[8],
-                            old_row[9],
-                            old_row[10],
-                            "",  # za_was_misschien
-                            old_row[11],
-                            "",  # za_niet_gestemd
-                            old_row[12],
-                            old_row[13],
-                            old_row[14],
-                            "",  # zo_was_misschien
-                            old_row[15],
-                            "",  # zo_niet_gestemd
-                        ]
-                        rows[i] = new_row
-
-            # Check of deze week al bestaat, zo ja: update die rij, anders: append
-            week_exists = False
-            for i in range(1, len(rows)):
-                if rows[i] and rows[i][0] == week:
-                    # Update bestaande rij voor deze week
-                    rows[i] = row
-                    week_exists = True
-                    break
-
-            if not week_exists:
-                # Week bestaat nog niet, append nieuwe rij
-                rows.append(row)
-
-            # Herschrijf het hele bestand
-            with open(csv_path, "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f)
-                w.writerows(rows)
-        else:
-            # Leeg bestand (geen header): schrijf header + eerste rij
-            with open(csv_path, "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f)
-                w.writerow(header)
-                w.writerow(row)
-    else:
-        # Nieuw bestand: schrijf header + eerste rij
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(header)
-            w.writerow(row)
+    await asyncio.to_thread(upsert_week_row, csv_path, header, row, week)
 
 
 async def append_week_snapshot_scoped(
@@ -586,6 +515,87 @@ async def append_week_snapshot_scoped(
             await _archive_weekdays(telling, guild_id, channel_id, now)
 
 
+def _telling_from_tally(tally: ChannelTally, channel: Any = None) -> dict:
+    """
+    Tellingen per dag zoals _build_counts_from_votes, maar uit bevroren tellers.
+    Niet-stemmers volgens dezelfde regel als _count_non_voters: bekende leden,
+    anders de kanaalleden, anders 0.
+    """
+    telling = _empty_counts()
+    members = tally.members
+    if members is None:
+        members = list(channel_roster(channel)) if channel is not None else []
+    for dag in DAGEN:
+        per_tijd = tally.counts.get(dag, {})
+        for key in VOLGORDE:
+            if key in per_tijd:
+                telling[dag][key] = per_tijd[key]
+        voted = tally.voters.get(dag, set())
+        telling[dag]["niet gestemd"] = sum(1 for uid in members if uid not in voted)
+        telling[dag]["was misschien"] = tally.was_misschien.get(dag, 0)
+    return telling
+
+
+def _write_archive_batch(jobs: list[tuple[str, str, str, list, list, str]]) -> int:
+    """
+    Schrijf de archiefrijen (CSV + kolomopslag) in één thread-hop. Een fout bij
+    één kanaal stopt de rest niet. Geeft het aantal geschreven rijen terug.
+    """
+    written = 0
+    for gid, cid, csv_path, header, row, week in jobs:
+        try:
+            upsert_week_row(csv_path, header, row, week)
+            record_csv_row(gid, cid, header, row)
+            written += 1
+        except Exception as e:
+            print(f"⚠️ Archiveren mislukt voor kanaal {cid} ({week}): {e}")
+    return written
+
+
+async def archive_channels(
+    scopes: list[tuple[int | str, int | str, Any]],
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Archiveer de huidige week van veel kanalen tegelijk (deactivatie-sweep):
+    één consistente momentopname van alle tellers, daarna alle rijen in één
+    batch geschreven. Zelfde rijen als append_week_snapshot_scoped per kanaal.
+    scopes: (guild_id, channel_id, channel) per kanaal.
+    Geeft het aantal geschreven rijen terug.
+    """
+    if not scopes:
+        return 0
+    _ensure_dir()
+    if now is None:
+        now = datetime.now(pytz.timezone("Europe/Amsterdam"))
+
+    # Import hier om circulaire import te voorkomen
+    from apps.utils.poll_settings import get_enabled_poll_days
+
+    tallies = await snapshot_channel_tallies((gid, cid) for gid, cid, _ in scopes)
+    jobs: list[tuple[str, str, str, list, list, str]] = []
+    for guild_id, channel_id, channel in scopes:
+        gid, cid = str(guild_id), str(channel_id)
+        try:
+            telling = _telling_from_tally(tallies[(gid, cid)], channel)
+
+            # Altijd weekend archief (backward compatible)
+            week, header, row = _weekend_record(telling, now)
+            jobs.append((gid, cid, get_archive_path_scoped(gid, cid), header, row, week))
+
+            # Weekday archief alleen als er weekday polls ingeschakeld zijn
+            enabled_days = get_enabled_poll_days(int(channel_id))
+            if any(day in enabled_days for day in WEEKDAY_DAYS):
+                week, header, row = _weekday_record(telling, now)
+                jobs.append(
+                    (gid, cid, get_archive_path_scoped(gid, cid, weekday=True), header, row, week)
+                )
+        except Exception as e:
+            print(f"⚠️ Archiveren mislukt voor kanaal {cid}: {e}")
+
+    return await asyncio.to_thread(_write_archive_batch, jobs)
+
+
 def archive_exists_scoped(
     guild_id: Optional[int | str] = None, channel_id: Optional[int | str] = None
 ) -> bool:
@@ -593,6 +603,80 @@ def archive_exists_scoped(
     return os.path.exists(get_archive_path_scoped(guild_id, channel_id))
 
 
+def iter_archive_rows(
+    guild_id: Optional[int | str] = None,
+    channel_id: Optional[int | str] = None,
+    weekday: bool = False,
+) -> Iterator[list[str]]:
+    """Lees het archief rij voor rij (header eerst), zonder alles in het geheugen."""
+    csv_path = get_archive_path_scoped(guild_id, channel_id, weekday=weekday)
+    if not os.path.exists(csv_path):
+        return
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.reader(f, delimiter=","):
+            if row:
+                yield row
+
+
+def _export_path(csv_path: str, delimiter: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(csv_path).encode("utf-8")).hexdigest()[:12]
+    name = "semicolon" if delimiter == ";" else "comma"
+    return os.path.join(EXPORT_DIR, f"{digest}_{name}.csv")
+
+
+def export_archive(
+    guild_id: Optional[int | str] = None,
+    channel_id: Optional[int | str] = None,
+    delimiter: str = ",",
+    weekday: bool = False,
+) -> Optional[str]:
+    """
+    Pad naar een CSV-export met de gekozen delimiter, of None als het archief
+    niet bestaat (of leeg is).
+
+    De export wordt rij voor rij geschreven (csv.writer, met quoting waar nodig)
+    en bewaard tot het archief wijzigt (mtime/grootte); daarna wordt hij bij de
+    volgende aanvraag opnieuw gemaakt. Synchroon: vanuit async code via
+    asyncio.to_thread aanroepen.
+    """
+    csv_path = get_archive_path_scoped(guild_id, channel_id, weekday=weekday)
+    try:
+        st = os.stat(csv_path)
+    except FileNotFoundError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = (os.path.abspath(csv_path), delimiter)
+    with _EXPORT_LOCKS_GUARD:
+        lock = _EXPORT_LOCKS.setdefault(key, threading.Lock())
+
+    with lock:
+        cached = _EXPORTS.get(key)
+        if cached is not None and cached[0] == stamp and os.path.exists(cached[1]):
+            return cached[1]
+
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        out_path = _export_path(csv_path, delimiter)
+        # Eigen tijdelijk bestand per aanroep (ook veilig tussen processen)
+        fd, tmp = tempfile.mkstemp(dir=EXPORT_DIR, suffix=".tmp")
+        wrote_any = False
+        try:
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as out:
+                writer = csv.writer(out, delimiter=delimiter, lineterminator="\n")
+                for row in iter_archive_rows(guild_id, channel_id, weekday):
+                    writer.writerow(row)
+                    wrote_any = True
+            if wrote_any:
+                os.replace(tmp, out_path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        if not wrote_any:
+            _EXPORTS.pop(key, None)
+            return None
+        _EXPORTS[key] = (stamp, out_path)
+        return out_path
+
+
 def create_archive(
     guild_id: Optional[int | str] = None,
     channel_id: Optional[int | str] = None,
@@ -610,26 +694,14 @@ def create_archive(
 
     Returns:
         CSV data als bytes, of None als archief niet bestaat
-    """
-    csv_path = get_archive_path_scoped(guild_id, channel_id, weekday=weekday)
-
-    if not os.path.exists(csv_path):
-        return None
-
-    # Lees originele CSV (altijd met komma delimiter)
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.reader(f, delimiter=",")
-        rows = list(reader)
 
-    if not rows:
+    Voor Discord-bijlagen liever export_archive() gebruiken (pad, geen bytes).
+    """
+    export_path = export_archive(guild_id, channel_id, delimiter, weekday)
+    if export_path is None:
         return None
-
-    # Herschrijf met gewenste delimiter
-    output = []
-    for row in rows:
-        output.append(delimiter.join(str(cell) for cell in row))
-
-    return "\n".join(output).encode("utf-8")
+    with open(export_path, "rb") as f:
+        return f.read()
 
 
 def generate_csv_preview(
@@ -650,14 +722,15 @@ def generate_csv_preview(
     Returns:
         Preview string voor codeblock
     """
-    csv_data = create_archive(guild_id, channel_id, delimiter)
-    if not csv_data:
+    buf = io.StringIO()
+    writer = csv.writer(buf, delimiter=delimiter, lineterminator="\n")
+    # Alleen de eerste N rijen lezen, niet het hele archief
+    for row in itertools.islice(iter_archive_rows(guild_id, channel_id), max_lines):
+        writer.writerow(row)
+    preview = buf.getvalue()
+    if not preview:
         return "Geen archief beschikbaar."
-
-    lines = csv_data.decode("utf-8").split("\n")
-    preview_lines = lines[:max_lines]
-
-    return "\n".join(preview_lines)
+    return preview.rstrip("\n")
 
 
 def open_archive_bytes_scoped(
@@ -689,12 +762,18 @@ def delete_archive_scoped(
     weekend_path = get_archive_path_scoped(guild_id, channel_id, weekday=False)
     if os.path.exists(weekend_path):
         os.remove(weekend_path)
+        forget_index(weekend_path)
         deleted_any = True
 
     # Verwijder weekday archief (indien aanwezig)
     weekday_path = get_archive_path_scoped(guild_id, channel_id, weekday=True)
     if os.path.exists(weekday_path):
         os.remove(weekday_path)
+        forget_index(weekday_path)
         deleted_any = True
 
+    # Kolomopslag is afgeleid van de CSV's en gaat mee
+    if guild_id is not None and channel_id is not None:
+        delete_stats(guild_id, channel_id)
+
     return deleted_any
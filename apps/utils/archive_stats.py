@@ -0,0 +1,340 @@
+# apps/utils/archive_stats.py
+#
+# Kolomopslag naast de CSV-archieven, voor snelle statistieken over de
+# weekarchieven (opkomst per week, voortschrijdend gemiddelde, hoe vaak een
+# dag doorging).
+#
+# Per guild/kanaal één bestand archive/dmk_stats_<guild>_<channel>.bin met
+# één rij per (week, dag) en per veld een array:
+#   dag    → index in WEEK_DAYS            (array 'b')
+#   datum  → date.toordinal()             (array 'i')
+#   één kolom per telling in COLUMNS       (array 'i'; -1 = niet bijgehouden,
+#                                           zoals de lege cellen van oude CSV's)
+# plus de weeklabels. Formaat: één JSON-regel met metadata, daarna de ruwe
+# bytes van de arrays. Het bestand is klein (±40 bytes per rij) en wordt bij
+# elke weekrij in zijn geheel atomisch herschreven.
+#
+# De CSV blijft de bron voor export. Ontbreekt het stats-bestand maar is er
+# wel een CSV, dan wordt het één keer uit de CSV('s) opgebouwd.
+#
+# Alles hier is synchroon; archive.py roept het aan via asyncio.to_thread.
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sys
+import threading
+from array import array
+from datetime import date
+from typing import Any, Optional
+
+from apps.utils.poll_settings import WEEK_DAYS
+
+FORMAT_VERSION = 1
+
+# Tellingen in dezelfde volgorde als archive.VOLGORDE
+COLUMNS = (
+    "om 19:00 uur",
+    "om 20:30 uur",
+    "misschien",
+    "was misschien",
+    "niet meedoen",
+    "niet gestemd",
+)
+
+# CSV-kolomsuffix → telling
+_CSV_SUFFIX = {
+    "19": "om 19:00 uur",
+    "2030": "om 20:30 uur",
+    "misschien": "misschien",
+    "was_misschien": "was misschien",
+    "niet": "niet meedoen",
+    "niet_gestemd": "niet gestemd",
+}
+
+# CSV-prefix → dag
+_CSV_PREFIX = {
+    "ma": "maandag",
+    "di": "dinsdag",
+    "wo": "woensdag",
+    "do": "donderdag",
+    "vr": "vrijdag",
+    "za": "zaterdag",
+    "zo": "zondag",
+}
+
+MISSING = -1
+
+
+class _Columns:
+    """Alle (week, dag)-rijen van één kanaal, kolom per veld."""
+
+    __slots__ = ("weeks", "dag", "datum", "counts", "_pos")
+
+    def __init__(self) -> None:
+        self.weeks: list[str] = []
+        self.dag = array("b")
+        self.datum = array("i")
+        self.counts: dict[str, array] = {col: array("i") for col in COLUMNS}
+        self._pos: dict[tuple[str, int], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.weeks)
+
+    def reindex(self) -> None:
+        self._pos = {(w, d): i for i, (w, d) in enumerate(zip(self.weeks, self.dag))}
+
+    def upsert(self, week: str, dag_idx: int, datum: int, values: dict[str, int]) -> None:
+        i = self._pos.get((week, dag_idx))
+        if i is None:
+            self._pos[(week, dag_idx)] = len(self.weeks)
+            self.weeks.append(week)
+            self.dag.append(dag_idx)
+            self.datum.append(datum)
+            for col in COLUMNS:
+                self.counts[col].append(values.get(col, MISSING))
+            return
+        self.datum[i] = datum
+        for col in COLUMNS:
+            self.counts[col][i] = values.get(col, MISSING)
+
+
+_CACHE: dict[str, _Columns] = {}
+_LOCK = threading.Lock()
+
+
+def get_stats_path(guild_id: int | str, channel_id: int | str) -> str:
+    # Import hier om circulaire import te voorkomen
+    from apps.utils.archive import ARCHIVE_DIR, _sanitize_id
+
+    return os.path.join(
+        ARCHIVE_DIR, f"dmk_stats_{_sanitize_id(guild_id)}_{_sanitize_id(channel_id)}.bin"
+    )
+
+
+def reset_archive_stats() -> None:
+    """Vergeet de in-memory kolommen (tests, of na handmatig opruimen)."""
+    with _LOCK:
+        _CACHE.clear()
+
+
+# ---------- CSV → rijen ----------
+
+
+def _to_int(cell: str) -> int:
+    try:
+        return int(cell)
+    except (TypeError, ValueError):
+        return MISSING
+
+
+def _to_ordinal(cell: str) -> int:
+    try:
+        return date.fromisoformat(cell).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+def rows_from_csv(header: list[str], row: list) -> list[tuple[str, int, int, dict[str, int]]]:
+    """
+    Zet één CSV-weekrij (weekend- of weekdag-archief, elke versie) om naar
+    (week, dag-index, datum, tellingen) per dag.
+    """
+    if not header or not row:
+        return []
+    cells = dict(zip(header, (str(c) for c in row)))
+    week = cells.get("week", "")
+    per_dag: dict[str, dict[str, int]] = {}
+    for col, cell in cells.items():
+        prefix, _, suffix = col.partition("_")
+        dag = _CSV_PREFIX.get(prefix)
+        key = _CSV_SUFFIX.get(suffix)
+        if dag and key:
+            per_dag.setdefault(dag, {})[key] = _to_int(cell)
+    result = []
+    for dag, values in per_dag.items():
+        datum = _to_ordinal(cells.get(f"datum_{dag}", ""))
+        result.append((week, WEEK_DAYS.index(dag), datum, values))
+    return result
+
+
+def _csv_paths(guild_id: int | str, channel_id: int | str) -> list[str]:
+    from apps.utils.archive import get_archive_path_scoped
+
+    return [
+        get_archive_path_scoped(guild_id, channel_id, weekday=False),
+        get_archive_path_scoped(guild_id, channel_id, weekday=True),
+    ]
+
+
+def _build_from_csv(guild_id: int | str, channel_id: int | str) -> _Columns:
+    cols = _Columns()
+    for path in _csv_paths(guild_id, channel_id):
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            for row in reader:
+                for week, dag_idx, datum, values in rows_from_csv(header, row):
+                    cols.upsert(week, dag_idx, datum, values)
+    return cols
+
+
+# ---------- opslag ----------
+
+
+def _save(path: str, cols: _Columns) -> None:
+    meta = {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "rows": len(cols),
+        "columns": list(COLUMNS),
+        "weeks": cols.weeks,
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n")
+        f.write(cols.dag.tobytes())
+        f.write(cols.datum.tobytes())
+        for col in COLUMNS:
+            f.write(cols.counts[col].tobytes())
+    os.replace(tmp, path)
+
+
+def _load_file(path: str) -> Optional[_Columns]:
+    try:
+        with open(path, "rb") as f:
+            meta = json.loads(f.readline().decode("utf-8"))
+            if meta.get("version") != FORMAT_VERSION or list(meta.get("columns", [])) != list(
+                COLUMNS
+            ):
+                return None
+            n = int(meta["rows"])
+            cols = _Columns()
+            cols.weeks = list(meta["weeks"])
+            cols.dag.fromfile(f, n)
+            cols.datum.fromfile(f, n)
+            for col in COLUMNS:
+                cols.counts[col].fromfile(f, n)
+    except (OSError, ValueError, KeyError, EOFError):
+        return None
+    if meta.get("byteorder") != sys.byteorder:
+        cols.datum.byteswap()
+        for col in COLUMNS:
+            cols.counts[col].byteswap()
+    cols.reindex()
+    return cols
+
+
+def _columns(guild_id: int | str, channel_id: int | str) -> _Columns:
+    """Kolommen uit cache, bestand of (eenmalig) de CSV's. Aanroepen onder _LOCK."""
+    path = get_stats_path(guild_id, channel_id)
+    cols = _CACHE.get(path)
+    if cols is None:
+        cols = _load_file(path) if os.path.exists(path) else None
+        if cols is None:
+            cols = _build_from_csv(guild_id, channel_id)
+            if len(cols):
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                _save(path, cols)
+        _CACHE[path] = cols
+    return cols
+
+
+def record_csv_row(guild_id: int | str, channel_id: int | str, header: list, row: list) -> None:
+    """Neem een zojuist geschreven CSV-weekrij op in de kolomopslag."""
+    with _LOCK:
+        cols = _columns(guild_id, channel_id)
+        for week, dag_idx, datum, values in rows_from_csv(header, row):
+            cols.upsert(week, dag_idx, datum, values)
+        path = get_stats_path(guild_id, channel_id)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        _save(path, cols)
+
+
+def delete_stats(guild_id: int | str, channel_id: int | str) -> None:
+    path = get_stats_path(guild_id, channel_id)
+    with _LOCK:
+        _CACHE.pop(path, None)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# ---------- aggregaties ----------
+
+
+def _day_filter(dag: Optional[str]) -> Optional[int]:
+    return WEEK_DAYS.index(dag) if dag else None
+
+
+def _per_week(
+    cols: _Columns, dag: Optional[str], value: Any
+) -> list[tuple[str, int]]:
+    """Som van value(i) per week, op volgorde van datum."""
+    want = _day_filter(dag)
+    totals: dict[str, int] = {}
+    first: dict[str, int] = {}
+    for i, week in enumerate(cols.weeks):
+        if want is not None and cols.dag[i] != want:
+            continue
+        totals[week] = totals.get(week, 0) + value(i)
+        first[week] = min(first.get(week, cols.datum[i]), cols.datum[i])
+    return [(week, totals[week]) for week in sorted(totals, key=lambda w: (first[w], w))]
+
+
+def attendance_trend(
+    guild_id: int | str, channel_id: int | str, dag: Optional[str] = None
+) -> list[tuple[str, int]]:
+    """
+    Opkomst per week: som van 19:00- en 20:30-stemmen (over alle dagen, of
+    alleen 'dag'), oplopend op datum.
+    """
+    with _LOCK:
+        cols = _columns(guild_id, channel_id)
+        c19 = cols.counts["om 19:00 uur"]
+        c2030 = cols.counts["om 20:30 uur"]
+        return _per_week(cols, dag, lambda i: max(c19[i], 0) + max(c2030[i], 0))
+
+
+def rolling_average(
+    guild_id: int | str,
+    channel_id: int | str,
+    window: int = 4,
+    dag: Optional[str] = None,
+) -> list[tuple[str, float]]:
+    """Voortschrijdend gemiddelde van attendance_trend over 'window' weken."""
+    window = max(1, int(window))
+    trend = attendance_trend(guild_id, channel_id, dag)
+    result: list[tuple[str, float]] = []
+    running = 0
+    for n, (week, total) in enumerate(trend):
+        running += total
+        if n >= window:
+            running -= trend[n - window][1]
+        result.append((week, running / min(n + 1, window)))
+    return result
+
+
+def go_rate(guild_id: int | str, channel_id: int | str) -> dict[str, float]:
+    """
+    Per dag het aandeel gearchiveerde weken waarin de avond doorging
+    (19:00 of 20:30 haalde de drempel uit decision.py).
+    """
+    # Import hier om circulaire import te voorkomen
+    from apps.logic.decision import MIN_STEMMEN
+
+    with _LOCK:
+        cols = _columns(guild_id, channel_id)
+        c19 = cols.counts["om 19:00 uur"]
+        c2030 = cols.counts["om 20:30 uur"]
+        seen = [0] * len(WEEK_DAYS)
+        went = [0] * len(WEEK_DAYS)
+        for i in range(len(cols)):
+            d = cols.dag[i]
+            seen[d] += 1
+            if c19[i] >= MIN_STEMMEN or c2030[i] >= MIN_STEMMEN:
+                went[d] += 1
+    return {dag: went[d] / seen[d] for d, dag in enumerate(WEEK_DAYS) if seen[d]}
@@ -0,0 +1,189 @@
+# apps/utils/archive_writer.py
+#
+# Schrijver voor de CSV-archieven: één rij per week, toevoegen of bijwerken
+# zonder het hele bestand opnieuw te schrijven.
+#
+# Per bestand houden we een kleine index bij: week → (byte-offset, lengte)
+# van de rij, plus de bestandsgrootte/mtime waarmee die index klopte. Daarmee:
+#   - nieuwe week      → append aan het eind (O(1))
+#   - laatste week     → alleen de laatste rij herschrijven (truncate + write)
+#   - oudere week      → alleen de staart vanaf die rij herschrijven (zeldzaam)
+# Wijzigt het bestand buiten ons om (andere grootte/mtime), dan scannen we het
+# één keer opnieuw (streaming, zonder alle rijen in het geheugen te houden).
+#
+# Formaatmigratie (oude weekend-headers zonder was_misschien/niet_gestemd,
+# oude weeknummers) gebeurt hier niet: draai daarvoor eenmalig
+# migrate_archives.py over de archive-map.
+#
+# Alles hier is synchroon; archive.py roept het aan via asyncio.to_thread.
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+import threading
+from typing import Optional
+
+# Wat csv.writer standaard als regeleinde schrijft (zoals de bestaande archieven)
+LINE_END = b"\r\n"
+
+
+class _WeekIndex:
+    """Offsets van de weekrijen in één archiefbestand."""
+
+    __slots__ = ("stamp", "header", "weeks", "last_week", "size", "ends_with_newline")
+
+    def __init__(self) -> None:
+        self.stamp: Optional[tuple[int, int]] = None
+        self.header: list[str] = []
+        self.weeks: dict[str, tuple[int, int]] = {}
+        self.last_week: Optional[str] = None
+        self.size = 0
+        self.ends_with_newline = True
+
+
+_INDEXES: dict[str, _WeekIndex] = {}
+_LOCKS: dict[str, threading.Lock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(path: str) -> threading.Lock:
+    key = os.path.abspath(path)
+    with _LOCKS_GUARD:
+        lock = _LOCKS.get(key)
+        if lock is None:
+            lock = _LOCKS[key] = threading.Lock()
+        return lock
+
+
+def forget_index(path: Optional[str] = None) -> None:
+    """Vergeet de index van één bestand (of alle); volgende schrijfactie scant opnieuw."""
+    if path is None:
+        _INDEXES.clear()
+    else:
+        _INDEXES.pop(os.path.abspath(path), None)
+
+
+def _stamp(path: str) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _encode_row(row: list) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\r\n").writerow(row)
+    return buf.getvalue().encode("utf-8")
+
+
+def _week_of(line: bytes) -> str:
+    first = line.split(b",", 1)[0].strip().strip(b'"')
+    return first.decode("utf-8", errors="replace")
+
+
+def _scan(path: str) -> _WeekIndex:
+    """Eén streaming pass over het bestand: header + offset per week."""
+    index = _WeekIndex()
+    offset = 0
+    last = b""
+    with open(path, "rb") as f:
+        for n, line in enumerate(f):
+            if n == 0:
+                text = line.decode("utf-8").rstrip("\r\n")
+                index.header = next(csv.reader([text]), []) if text else []
+            elif line.strip():
+                week = _week_of(line)
+                index.weeks[week] = (offset, len(line))
+                index.last_week = week
+            offset += len(line)
+            last = line
+    index.size = offset
+    index.ends_with_newline = not last or last.endswith(b"\n")
+    index.stamp = _stamp(path)
+    return index
+
+
+def _get_index(path: str) -> _WeekIndex:
+    key = os.path.abspath(path)
+    index = _INDEXES.get(key)
+    if index is None or index.stamp != _stamp(path):
+        index = _INDEXES[key] = _scan(path)
+    return index
+
+
+def _atomic_write(path: str, chunks: list[bytes]) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ---------- schrijven ----------
+
+
+def upsert_week_row(path: str, header: list, row: list, week: str) -> str:
+    """
+    Voeg de rij voor 'week' toe of vervang hem. Geeft 'created', 'appended' of
+    'replaced' terug.
+    """
+    with _lock_for(path):
+        stamp = _stamp(path)
+        if stamp is None or stamp[1] == 0:
+            _atomic_write(path, [_encode_row(header), _encode_row(row)])
+            _INDEXES[os.path.abspath(path)] = _scan(path)
+            return "created"
+
+        index = _get_index(path)
+        data = _encode_row(row)
+        existing = index.weeks.get(str(week))
+
+        if existing is None:
+            with open(path, "ab") as f:
+                if not index.ends_with_newline:
+                    f.write(LINE_END)
+                f.write(data)
+            result = "appended"
+        else:
+            offset, length = existing
+            with open(path, "r+b") as f:
+                f.seek(offset + length)
+                tail = f.read()  # leeg als dit de laatste rij is
+                f.seek(offset)
+                f.truncate()
+                f.write(data)
+                f.write(tail)
+            result = "replaced"
+
+        if existing is not None and index.last_week != str(week):
+            # Oudere rij herschreven: de offsets van de staart zijn verschoven
+            index = _scan(path)
+        else:
+            index = _after_write(path, index, str(week), data, existing)
+        _INDEXES[os.path.abspath(path)] = index
+        return result
+
+
+def _after_write(
+    path: str,
+    index: _WeekIndex,
+    week: str,
+    data: bytes,
+    replaced: Optional[tuple[int, int]],
+) -> _WeekIndex:
+    """Werk de index bij na een append of herschreven laatste rij (zonder scan)."""
+    if replaced is None:
+        start = index.size + (0 if index.ends_with_newline else len(LINE_END))
+    else:
+        start = replaced[0]
+    index.weeks[week] = (start, len(data))
+    index.last_week = week
+    index.size = start + len(data)
+    index.ends_with_newline = True
+    index.stamp = _stamp(path)
+    return index
@@ -0,0 +1,80 @@
+# apps/utils/atomic_json.py
+#
+# Atomisch JSON schrijven (tmp-bestand + fsync + os.replace) en een writer die
+# schrijfacties per bestand serialiseert en samenvoegt.
+#
+# JsonWriter.write() schrijft synchroon (voor sync code en tests),
+# JsonWriter.write_async() doet hetzelfde via asyncio.to_thread zodat de event
+# loop niet blokkeert. Beide schrijven altijd de nieuwste data voor een pad:
+# een oudere schrijfactie kan een nieuwere dus nooit overschrijven, en
+# meerdere wachtende schrijfacties worden samengevoegd tot één.
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any
+
+
+def write_json_atomic(path: str, data: Any, indent: int | None = 2) -> None:
+    """Schrijf JSON naar een tmp-bestand en vervang 'path' daarna in één stap."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # Retry logic for Windows file locking issues
+    max_retries = 5
+    for attempt in range(max_retries):  # pragma: no branch
+        try:
+            os.replace(tmp_path, path)
+            break
+        except PermissionError:  # pragma: no cover
+            if attempt < max_retries - 1:  # pragma: no cover
+                time.sleep(0.01 * (attempt + 1))  # Exponential backoff
+            else:  # pragma: no cover
+                raise
+
+
+class JsonWriter:
+    """Serialiseert en coalesceert schrijfacties per pad."""
+
+    def __init__(self) -> None:
+        self._latest: dict[str, Any] = {}
+        self._versions: dict[str, int] = {}
+        self._written: dict[str, int] = {}
+        self._io_lock = threading.Lock()
+
+    def _set(self, path: str, data: Any) -> None:
+        self._latest[path] = data
+        self._versions[path] = self._versions.get(path, 0) + 1
+
+    def _flush(self, path: str) -> None:
+        with self._io_lock:
+            version = self._versions.get(path, 0)
+            if self._written.get(path, 0) >= version:
+                return  # Al weggeschreven door een latere aanroep
+            data = self._latest.get(path)
+            write_json_atomic(path, data)
+            self._written[path] = version
+            if self._versions.get(path) == version:
+                self._latest.pop(path, None)
+
+    def write(self, path: str, data: Any) -> None:
+        """
+        Schrijf synchroon. 'data' mag na deze aanroep niet meer gemuteerd worden
+        zolang er nog een async schrijfactie voor dit pad loopt.
+        """
+        self._set(path, data)
+        self._flush(path)
+
+    async def write_async(self, path: str, data: Any) -> None:
+        """Schrijf buiten de event loop; keert terug zodra 'data' (of nieuwer) op schijf staat."""
+        self._set(path, data)
+        await asyncio.to_thread(self._flush, path)
+
+
+# Gedeelde writer voor settings en bericht-IDs
+json_writer = JsonWriter()
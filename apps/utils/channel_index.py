@@ -0,0 +1,208 @@
+# apps/utils/channel_index.py
+#
+# Bijgehouden index van poll-kanalen: guild → kanaal → status.
+#
+# Statussen:
+#   active    - kanaal heeft poll-berichten en is niet gepauzeerd
+#   paused    - kanaal heeft poll-berichten maar is gepauzeerd (/dmk-poll-pauze)
+#   disabled  - permanent uitgeschakeld (/dmk-poll-stopzetten)
+#   scheduled - geen poll-berichten, wel een eigen activatieschema
+#
+# Kanalen zonder een van deze statussen staan niet in de index. De index wordt
+# één keer gevuld met prime_channel_index(bot) (bij on_ready) en daarna
+# bijgewerkt door de lifecycle-commando's en scheduler-overgangen via
+# refresh_channel(). Sweeps lopen met indexed_channels() alleen de geïndexeerde
+# kanalen af en herclassificeren die onderweg, zodat pauze/reset vanzelf
+# doorwerken. Zolang de index niet gevuld is, vallen sweeps terug op alle
+# kanalen (zie scheduler._guild_channels).
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Optional
+
+ACTIVE = "active"
+PAUSED = "paused"
+DISABLED = "disabled"
+SCHEDULED = "scheduled"
+
+STATES = (ACTIVE, PAUSED, DISABLED, SCHEDULED)
+
+# Berichtsleutels die aangeven dat er een poll in het kanaal staat
+POLL_MESSAGE_KEYS = (
+    "maandag",
+    "dinsdag",
+    "woensdag",
+    "donderdag",
+    "vrijdag",
+    "zaterdag",
+    "zondag",
+    "stemmen",
+)
+
+Lookup = Optional[Callable[..., Any]]
+
+_INDEX: dict[int, dict[int, str]] = {}
+_SCANNED: set[int] = set()  # guilds die volledig zijn gescand
+_READY = False
+
+
+def reset_channel_index() -> None:
+    """Leeg de index; sweeps vallen terug op alle kanalen tot de volgende prime."""
+    global _READY
+    _INDEX.clear()
+    _SCANNED.clear()
+    _READY = False
+
+
+def is_ready() -> bool:
+    return _READY
+
+
+def _id(obj: Any) -> int:
+    try:
+        return int(getattr(obj, "id", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def classify_channel(
+    channel_id: int,
+    *,
+    disabled: Lookup = None,
+    paused: Lookup = None,
+    message_id: Lookup = None,
+    scheduled: Lookup = None,
+) -> Optional[str]:
+    """
+    Bepaal de status van een kanaal uit de opgeslagen state, of None als het
+    geen poll-kanaal is. De lookups zijn te vervangen zodat aanroepers hun
+    eigen (gepatchte) imports kunnen doorgeven.
+    """
+    # Lazy imports: poll_message gebruikt deze module zelf ook
+    if disabled is None or message_id is None:
+        from apps.utils.poll_message import get_message_id, is_channel_disabled
+
+        disabled = disabled or is_channel_disabled
+        message_id = message_id or get_message_id
+    if paused is None or scheduled is None:
+        from apps.utils.poll_settings import get_scheduled_activation, is_paused
+
+        paused = paused or is_paused
+        scheduled = scheduled or get_scheduled_activation
+
+    if disabled(channel_id):
+        return DISABLED
+    if any(message_id(channel_id, key) for key in POLL_MESSAGE_KEYS):
+        return PAUSED if paused(channel_id) else ACTIVE
+    if scheduled(channel_id) is not None:
+        return SCHEDULED
+    return None
+
+
+def set_channel_state(guild_id: int, channel_id: int, state: Optional[str]) -> None:
+    """Zet de status van één kanaal; None haalt het kanaal uit de index."""
+    if state is None:
+        channels = _INDEX.get(guild_id)
+        if channels is not None:
+            channels.pop(channel_id, None)
+        return
+    if state not in STATES:
+        raise ValueError(f"Onbekende kanaalstatus: {state!r}")
+    _INDEX.setdefault(guild_id, {})[channel_id] = state
+
+
+def get_channel_state(guild_id: int, channel_id: int) -> Optional[str]:
+    return _INDEX.get(guild_id, {}).get(channel_id)
+
+
+def refresh_channel(channel: Any, **lookups: Lookup) -> Optional[str]:
+    """Herclassificeer één kanaal (na een lifecycle-wijziging) en werk de index bij."""
+    guild_id = _id(getattr(channel, "guild", None))
+    channel_id = _id(channel)
+    if not guild_id or not channel_id:
+        return None
+    state = classify_channel(channel_id, **lookups)
+    set_channel_state(guild_id, channel_id, state)
+    return state
+
+
+def scan_guild(
+    guild: Any, list_channels: Callable[[Any], Iterable[Any]], **lookups: Lookup
+) -> list[tuple[Any, str]]:
+    """Volledige scan van één guild; vervangt de index voor die guild."""
+    guild_id = _id(guild)
+    found: dict[int, str] = {}
+    result: list[tuple[Any, str]] = []
+    for channel in list_channels(guild) or []:
+        channel_id = _id(channel)
+        state = classify_channel(channel_id, **lookups)
+        if state is None:
+            continue
+        found[channel_id] = state
+        result.append((channel, state))
+    _INDEX[guild_id] = found
+    _SCANNED.add(guild_id)
+    return result
+
+
+def prime_channel_index(
+    guilds: Iterable[Any], list_channels: Callable[[Any], Iterable[Any]], **lookups: Lookup
+) -> int:
+    """Bouw de index op uit een volledige scan; geeft het aantal poll-kanalen terug."""
+    global _READY
+    _INDEX.clear()
+    _SCANNED.clear()
+    total = 0
+    for guild in guilds or []:
+        total += len(scan_guild(guild, list_channels, **lookups))
+    _READY = True
+    return total
+
+
+def indexed_channels(
+    guild: Any,
+    states: Iterable[str],
+    list_channels: Callable[[Any], Iterable[Any]],
+    **lookups: Lookup,
+) -> list[Any]:
+    """
+    Kanalen van deze guild met een status uit 'states', in vaste volgorde.
+    Elk geïndexeerd kanaal wordt opnieuw geclassificeerd; verdwenen kanalen
+    en kanalen zonder status vallen uit de index. Een guild die nog niet
+    gescand is (bijv. net gejoind) wordt eerst volledig gescand.
+    """
+    wanted = set(states)
+    guild_id = _id(guild)
+
+    if guild_id not in _SCANNED:
+        return [ch for ch, state in scan_guild(guild, list_channels, **lookups) if state in wanted]
+
+    known = _INDEX.get(guild_id, {})
+    if not known:
+        return []
+
+    get_channel = getattr(guild, "get_channel", None)
+    if callable(get_channel):
+        resolved = {cid: get_channel(cid) for cid in known}
+    else:
+        resolved = {cid: None for cid in known}
+        for channel in list_channels(guild) or []:
+            if _id(channel) in resolved:
+                resolved[_id(channel)] = channel
+
+    result: list[Any] = []
+    for channel_id in sorted(resolved):
+        channel = resolved[channel_id]
+        if channel is None:
+            known.pop(channel_id, None)
+            continue
+        state = classify_channel(channel_id, **lookups)
+        set_channel_state(guild_id, channel_id, state)
+        if state in wanted:
+            result.append(channel)
+    return result
+
+
+def get_index_snapshot() -> dict[int, dict[int, str]]:
+    """Kopie van de index (voor status/debug)."""
+    return {gid: dict(channels) for gid, channels in _INDEX.items()}
@@ -6,6 +6,8 @@ import random
 import time
 from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar, cast
 
+from apps.utils.outbound_queue import outbound_queue
+
 try:
     import discord  # type: ignore
 
@@ -146,6 +148,8 @@ async def safe_call(
             code = getattr(e, "code", None)
             retry_after = getattr(e, "retry_after", None)
             transient = status in (429, 500, 502, 503, 504) or code in (110000, 200000)
+            if status == 429:
+                outbound_queue.note_rate_limited(retry_after)
             if not transient or attempt >= retries:
                 raise
             delay = _compute_delay(attempt, retry_after)
@@ -163,6 +167,8 @@ async def safe_call(
             # Ondersteun test-FakeHTTPException met attribuut 'status'
             status = getattr(e, "status", None)
             retry_after = getattr(e, "retry_after", None)
+            if status == 429:
+                outbound_queue.note_rate_limited(retry_after)
             if status in (429, 500, 502, 503, 504):
                 if attempt >= retries:
                     raise
@@ -42,10 +42,14 @@ INTERNAL_DAY_TO_KEY = {
 }
 
 
+def get_language_module(lang: str | None) -> Any:
+    """Get the translation module for a language code (falls back to Dutch)."""
+    return LANGUAGES.get(lang or DEFAULT_LANGUAGE, LANGUAGES[DEFAULT_LANGUAGE])
+
+
 def _get_module(channel_id: int) -> Any:
     """Get the translation module for a channel."""
-    lang = get_language(channel_id)
-    return LANGUAGES.get(lang, LANGUAGES[DEFAULT_LANGUAGE])
+    return get_language_module(get_language(channel_id))
 
 
 def t(channel_id: int, key: str, **kwargs: Any) -> str:
@@ -60,8 +64,15 @@ def t(channel_id: int, key: str, **kwargs: Any) -> str:
     Returns:
         Translated string with placeholders filled in
     """
-    module = _get_module(channel_id)
+    return translate(_get_module(channel_id), key, **kwargs)
+
+
+def translate(module: Any, key: str, **kwargs: Any) -> str:
+    """
+    Like t(), but with an already resolved translation module.
 
+    Used by renders that look up the channel language once per pass.
+    """
     # Parse dot-notation key (e.g., "UI.vote_success")
     parts = key.split(".", 1)
     if len(parts) != 2:
@@ -100,7 +111,11 @@ def get_day_name(channel_id: int, internal_name: str) -> str:
     Returns:
         Localized day name
     """
-    module = _get_module(channel_id)
+    return day_name_for(_get_module(channel_id), internal_name)
+
+
+def day_name_for(module: Any, internal_name: str) -> str:
+    """Like get_day_name(), but with an already resolved translation module."""
     key = INTERNAL_DAY_TO_KEY.get(internal_name.lower(), internal_name)
     return module.DAY_NAMES.get(key, internal_name.capitalize())
 
@@ -116,8 +131,11 @@ def get_time_label(channel_id: int, internal_time: str) -> str:
     Returns:
         Localized time label
     """
-    module = _get_module(channel_id)
+    return time_label_for(_get_module(channel_id), internal_time)
+
 
+def time_label_for(module: Any, internal_time: str) -> str:
+    """Like get_time_label(), but with an already resolved translation module."""
     # Map internal Dutch time formats to translation keys
     time_map = {
         "om 19:00 uur": "19:00",
@@ -163,5 +181,9 @@ __all__ = [
     "get_time_label",
     "get_count_text",
     "get_language",
+    "get_language_module",
+    "translate",
+    "day_name_for",
+    "time_label_for",
     "LANGUAGES",
 ]
@@ -0,0 +1,314 @@
+# apps/utils/member_roster.py
+#
+# Ledenlijst per kanaal (niet-bots: ID → naam en mention) en namen per guild,
+# bijgehouden vanuit gateway-events.
+#
+# channel.members loopt bij discord.py alle guildleden af met een
+# permissiecheck per lid, en onbekende stemmers kostten per render een
+# fetch_member (REST). Zodra enable_member_roster() gedraaid heeft (bij
+# on_ready) onthouden we:
+#   - per kanaal de roster (opgebouwd bij eerste gebruik),
+#   - per guild de namen van leden die niet in de guild-cache zitten; die
+#     worden in één batch opgehaald met prefetch_members().
+#
+# Events houden de cache actueel (zie main.py):
+#   member join/rol-wijziging - rosters van die guild opnieuw opbouwen
+#   member remove             - lid uit alle rosters en namen
+#   naamwijziging             - naam bijwerken waar hij voorkomt
+#   permission overwrites     - roster van dat kanaal opnieuw opbouwen
+#   rol-permissies gewijzigd  - rosters van die guild opnieuw opbouwen
+#
+# Zonder enable_member_roster() wordt niets onthouden en gedraagt alles zich
+# als voorheen (live channel.members, get_member of fetch_member).
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Iterable, Optional
+
+# Discord beperkt query_members tot 100 user-IDs per aanvraag
+PREFETCH_BATCH = 100
+
+# (naam, mention) per lid
+RosterEntry = tuple[str, str]
+
+_ROSTERS: dict[int, dict[str, RosterEntry]] = {}  # kanaal → lid → entry
+_CHANNEL_GUILD: dict[int, int] = {}  # kanaal → guild (voor invalidatie per guild)
+_NAMES: dict[int, dict[str, str]] = {}  # guild → lid → naam (buiten guild-cache)
+_MISSING: dict[int, set[str]] = {}  # guild → IDs die niet (meer) bestaan
+_READY = False
+# Verhoogd bij elke naam- of roster-wijziging uit een gateway-event; hoort in
+# de render-sleutel van poll_message (namen staan in de berichten)
+_GENERATION = 0
+
+
+def reset_member_roster() -> None:
+    """Vergeet alles; tot de volgende enable geldt het oude gedrag."""
+    global _READY
+    _bump()
+    _ROSTERS.clear()
+    _CHANNEL_GUILD.clear()
+    _NAMES.clear()
+    _MISSING.clear()
+    _READY = False
+
+
+def enable_member_roster() -> None:
+    """
+    Zet de cache aan; vanaf nu houden gateway-events hem bij. Draait bij elke
+    on_ready: ontbrekende leden worden dan opnieuw geprobeerd.
+    """
+    global _READY
+    _MISSING.clear()
+    _READY = True
+
+
+def is_ready() -> bool:
+    return _READY
+
+
+def roster_generation() -> int:
+    """Teller die verandert zodra namen of rosters gewijzigd zijn."""
+    return _GENERATION
+
+
+def _bump() -> None:
+    global _GENERATION
+    _GENERATION += 1
+
+
+def _id(obj: Any) -> int:
+    try:
+        return int(getattr(obj, "id", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def display_name(member: Any) -> str:
+    return (
+        getattr(member, "display_name", None)
+        or getattr(member, "global_name", None)
+        or getattr(member, "name", "Lid")
+    )
+
+
+def _entry(member: Any) -> Optional[tuple[str, RosterEntry]]:
+    if getattr(member, "bot", False):
+        return None
+    member_id = getattr(member, "id", None)
+    if not member_id:
+        return None
+    return str(member_id), (display_name(member), getattr(member, "mention", f"<@{member_id}>"))
+
+
+def _build_roster(channel: Any) -> dict[str, RosterEntry]:
+    roster: dict[str, RosterEntry] = {}
+    for member in getattr(channel, "members", []) or []:
+        item = _entry(member)
+        if item is not None:
+            roster[item[0]] = item[1]
+    return roster
+
+
+def channel_roster(channel: Any) -> dict[str, RosterEntry]:
+    """
+    Niet-bot leden van een kanaal als {lid-ID: (naam, mention)}, in de volgorde
+    van channel.members. Alleen-lezen; met actieve cache één keer opgebouwd.
+    """
+    if not _READY:
+        return _build_roster(channel)
+    channel_id = _id(channel)
+    if not channel_id:
+        return _build_roster(channel)
+    roster = _ROSTERS.get(channel_id)
+    if roster is None:
+        roster = _ROSTERS[channel_id] = _build_roster(channel)
+        guild_id = _id(getattr(channel, "guild", None))
+        if guild_id:
+            _CHANNEL_GUILD[channel_id] = guild_id
+    return roster
+
+
+def roster_member_ids(channels: Iterable[Any]) -> list[str]:
+    """Vereniging van de roster-IDs van één of meer kanalen (volgorde behouden)."""
+    ids: dict[str, None] = {}
+    for channel in channels:
+        for member_id in channel_roster(channel):
+            ids[member_id] = None
+    return list(ids)
+
+
+# ---------- namen ----------
+
+
+def lookup_name(guild: Any, member_id: Any) -> Optional[str]:
+    """Naam uit de guild-cache of de eigen namen-cache; nooit een REST-call."""
+    if guild is None:
+        return None
+    try:
+        member = guild.get_member(int(member_id))
+    except Exception:
+        member = None
+    if member:
+        return display_name(member)
+    return _NAMES.get(_id(guild), {}).get(str(member_id))
+
+
+async def prefetch_members(guild: Any, member_ids: Iterable[Any]) -> None:
+    """
+    Haal onbekende leden in batches op (query_members over de gateway) en
+    onthoud hun namen; IDs die niet gevonden worden onthouden we als ontbrekend.
+    """
+    if not _READY or guild is None:
+        return
+    guild_id = _id(guild)
+    names = _NAMES.setdefault(guild_id, {})
+    missing = _MISSING.setdefault(guild_id, set())
+
+    todo: list[int] = []
+    for raw in member_ids:
+        key = str(raw)
+        if key in names or key in missing or lookup_name(guild, key) is not None:
+            continue
+        try:
+            todo.append(int(key))
+        except (TypeError, ValueError):
+            continue
+    if not todo:
+        return
+
+    query = getattr(guild, "query_members", None)
+    for start in range(0, len(todo), PREFETCH_BATCH):
+        batch = todo[start : start + PREFETCH_BATCH]
+        found: list[Any] = []
+        # Alleen IDs waarvan zeker is dat ze niet bestaan; een timeout of andere
+        # fout betekent "volgende render opnieuw proberen"
+        gone: list[int] = []
+        try:
+            found = list(await query(user_ids=batch, limit=len(batch), cache=True))
+            gone = batch
+        except Exception:
+            # Geen gateway-query mogelijk: per lid, maar wel gelijktijdig en één keer
+            fetch = getattr(guild, "fetch_member", None)
+            if fetch is not None:
+                results = await asyncio.gather(
+                    *(fetch(member_id) for member_id in batch), return_exceptions=True
+                )
+                found = [m for m in results if m and not isinstance(m, BaseException)]
+                # discord.NotFound (404): lid bestaat echt niet (meer)
+                gone = [
+                    member_id
+                    for member_id, result in zip(batch, results)
+                    if getattr(result, "status", None) == 404
+                ]
+        seen = set()
+        for member in found:
+            key = str(getattr(member, "id", ""))
+            if key:
+                names[key] = display_name(member)
+                seen.add(key)
+        missing.update(str(member_id) for member_id in gone if str(member_id) not in seen)
+
+
+async def resolve_names(guild: Any, member_ids: Iterable[Any]) -> dict[str, Optional[str]]:
+    """
+    {lid-ID: naam of None} voor een render. Met actieve cache: één batch
+    prefetch en daarna alleen lookups; anders het oude get_member/fetch_member.
+    """
+    ids = [str(member_id) for member_id in member_ids]
+    result: dict[str, Optional[str]] = {}
+    if guild is None:
+        return {member_id: None for member_id in ids}
+
+    if _READY:
+        await prefetch_members(guild, ids)
+        for member_id in ids:
+            result[member_id] = lookup_name(guild, member_id)
+        return result
+
+    for member_id in ids:
+        if member_id in result:
+            continue
+        try:
+            member = guild.get_member(int(member_id)) or await guild.fetch_member(
+                int(member_id)
+            )
+        except Exception:
+            member = None
+        result[member_id] = display_name(member) if member else None
+    return result
+
+
+# ---------- gateway-events ----------
+
+
+def _forget_guild_rosters(guild_id: int) -> None:
+    _bump()
+    for channel_id in [cid for cid, gid in _CHANNEL_GUILD.items() if gid == guild_id]:
+        _ROSTERS.pop(channel_id, None)
+        _CHANNEL_GUILD.pop(channel_id, None)
+
+
+def forget_channel(channel: Any) -> None:
+    """Roster van één kanaal opnieuw opbouwen (overwrites gewijzigd, kanaal weg)."""
+    channel_id = _id(channel)
+    _bump()
+    _ROSTERS.pop(channel_id, None)
+    _CHANNEL_GUILD.pop(channel_id, None)
+
+
+def on_member_join(member: Any) -> None:
+    if not _READY:
+        return
+    guild_id = _id(getattr(member, "guild", None))
+    _MISSING.get(guild_id, set()).discard(str(getattr(member, "id", "")))
+    # Welke kanalen het lid ziet hangt van rollen/overwrites af: lui herbouwen
+    _forget_guild_rosters(guild_id)
+
+
+def on_member_remove(member: Any) -> None:
+    if not _READY:
+        return
+    guild_id = _id(getattr(member, "guild", None))
+    member_id = str(getattr(member, "id", ""))
+    _bump()
+    _NAMES.get(guild_id, {}).pop(member_id, None)
+    for channel_id, gid in _CHANNEL_GUILD.items():
+        if gid == guild_id:
+            _ROSTERS.get(channel_id, {}).pop(member_id, None)
+
+
+def on_member_update(before: Any, after: Any) -> None:
+    if not _READY:
+        return
+    guild_id = _id(getattr(after, "guild", None))
+    if list(getattr(before, "roles", []) or []) != list(getattr(after, "roles", []) or []):
+        _forget_guild_rosters(guild_id)
+        return
+    if display_name(before) == display_name(after):
+        return
+    item = _entry(after)
+    if item is None:
+        return
+    member_id, entry = item
+    _bump()
+    if member_id in _NAMES.get(guild_id, {}):
+        _NAMES[guild_id][member_id] = entry[0]
+    for channel_id, gid in _CHANNEL_GUILD.items():
+        roster = _ROSTERS.get(channel_id)
+        if gid == guild_id and roster is not None and member_id in roster:
+            roster[member_id] = entry
+
+
+def on_channel_update(before: Any, after: Any) -> None:
+    if not _READY:
+        return
+    if getattr(before, "overwrites", None) != getattr(after, "overwrites", None):
+        forget_channel(after)
+
+
+def on_role_update(before: Any, after: Any) -> None:
+    if not _READY:
+        return
+    if getattr(before, "permissions", None) != getattr(after, "permissions", None):
+        _forget_guild_rosters(_id(getattr(after, "guild", None)))
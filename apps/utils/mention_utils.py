@@ -12,6 +12,7 @@ from zoneinfo import ZoneInfo
 
 from apps.utils.discord_client import safe_call
 from apps.utils.i18n import t
+from apps.utils.outbound_queue import outbound_queue
 from apps.utils.poll_message import clear_message_id, get_message_id, save_message_id
 
 
@@ -577,7 +578,11 @@ async def update_non_voter_notification(channel: Any, dag: str, guild_id: int) -
         # Haal huidige niet-stemmers op
         from apps.utils.poll_storage import get_non_voters_for_day
 
-        count, non_voter_ids = await get_non_voters_for_day(dag, guild_id, cid)
+        count, non_voter_ids = await get_non_voters_for_day(dag, guild_id, cid, channel)
+
+        if count is None:
+            # Leden onbekend: notificatie laten staan
+            return
 
         if count == 0:
             # Iedereen heeft gestemd! Delete deze notificatie (celebration neemt over)
@@ -625,7 +630,12 @@ async def update_non_voter_notification(channel: Any, dag: str, guild_id: int) -
             footer=None,
         )
 
-        await safe_call(message.edit, content=content)
+        # Bij een reeks stemmen alleen de nieuwste stand posten (samengevoegd per bericht)
+        await outbound_queue.submit(
+            ("edit", int(cid)),
+            lambda: safe_call(message.edit, content=content),
+            coalesce_key=("edit", meta["message_id"]),
+        )
 
     except Exception as e:  # pragma: no cover
         print(f"⚠️ Fout bij updaten non-voter notification: {e}")
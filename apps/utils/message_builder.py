@@ -1,5 +1,6 @@
 # apps/utils/message_builder.py
 
+import functools
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -7,12 +8,13 @@ import discord
 import pytz
 
 from apps.entities.poll_option import get_poll_options
+from apps.utils.member_roster import channel_roster, resolve_names
 from apps.utils.poll_settings import get_setting
 from apps.utils.poll_storage import (
     get_counts_for_day,
     get_counts_for_day_scoped,
+    get_scope_snapshot,
     load_votes,
-    load_votes_for_scope,
 )
 from apps.utils.poll_storage import (
     get_non_voters_for_day as get_non_voters_from_storage,
@@ -148,6 +150,7 @@ async def build_poll_message_for_day_async(
     guild: discord.Guild | None = None,
     channel: Any = None,
     datum_iso: str | None = None,
+    ctx: Any = None,
 ) -> str:
     """
     Bouwt de tekst van het pollbericht voor één dag, GESCOPED per guild+channel.
@@ -162,10 +165,20 @@ async def build_poll_message_for_day_async(
     - guild: optioneel, voor mentions in andere helpers
     - channel: optioneel, voor niet-stemmers tracking
     - datum_iso: optioneel, YYYY-MM-DD datum (voor rolling window). Als None, gebruik oude logica.
+    - ctx: optioneel, RenderContext van de update-ronde (poll_message); levert
+      instellingen, taal, scope en het stemmen-snapshot zonder losse lookups.
     """
-    from apps.utils.i18n import get_day_name, t
+    from apps.utils.i18n import get_day_name, get_time_label, t
 
     cid = int(channel_id)
+    if ctx is not None:
+        settings = ctx.settings
+        tr, day_name, time_label = ctx.t, ctx.day_name, ctx.time_label
+    else:
+        settings = None
+        tr = functools.partial(t, cid)
+        day_name = functools.partial(get_day_name, cid)
+        time_label = functools.partial(get_time_label, cid)
 
     # Genereer Hammertime voor de datum (18:00 = deadline tijd)
     if datum_iso is None:
@@ -185,10 +198,10 @@ async def build_poll_message_for_day_async(
     datum_hammertime = TimeZoneHelper.nl_tijd_naar_hammertime(
         datum_iso, "18:00", style="D"  # D = long date format (bijv. "28 november 2025")
     )
-    dag_display = get_day_name(cid, dag)
-    title = t(cid, "UI.poll_title", dag=dag_display, datum=datum_hammertime)
+    dag_display = day_name(dag)
+    title = tr("UI.poll_title", dag=dag_display, datum=datum_hammertime)
     if pauze:
-        title += " " + t(cid, "UI.poll_title_paused")
+        title += " " + tr("UI.poll_title_paused")
     message = f"{title}\n"
 
     # Gebruik de hide_counts en hide_ghosts parameters direct
@@ -208,13 +221,17 @@ async def build_poll_message_for_day_async(
         # Skip tijd-opties die disabled zijn (19:00 of 20:30)
         if opt.tijd in ["om 19:00 uur", "om 20:30 uur"]:
             tijd_short = "19:00" if "19:00" in opt.tijd else "20:30"
-            if not get_poll_option_state(int(channel_id), dag, tijd_short):
+            if settings is not None:
+                enabled = settings.get_poll_option_state(dag, tijd_short)
+            else:
+                enabled = get_poll_option_state(int(channel_id), dag, tijd_short)
+            if not enabled:
                 continue  # Skip deze optie
 
         opties.append(opt)
 
     if not opties:
-        message += t(cid, "UI.no_options")
+        message += tr("UI.no_options")
         return message
 
     # Aantallen per tijd (scoped), tenzij verborgen
@@ -222,6 +239,10 @@ async def build_poll_message_for_day_async(
     # Use category-scoped counts for dual language support
     if effective_hide_counts:
         counts = {}
+    elif ctx is not None:
+        if ctx.snapshot is None:
+            await ctx.load_snapshot()
+        counts = ctx.counts_for_day(dag)
     else:
         from apps.utils.poll_settings import get_vote_scope_channels
         if channel:
@@ -235,7 +256,10 @@ async def build_poll_message_for_day_async(
             counts = await get_counts_for_day(dag, guild_id, channel_id)
 
     # Bepaal of we in deadline-modus zitten (voor misschien-filtering)
-    setting = get_setting(int(channel_id), dag) or {}
+    if settings is not None:
+        setting = settings.get_setting(dag) or {}
+    else:
+        setting = get_setting(int(channel_id), dag) or {}
     is_deadline_mode = isinstance(setting, dict) and setting.get("modus") == "deadline"
 
     # Bereken datum voor Hammertime conversie (gebruik datum_iso parameter als beschikbaar)
@@ -253,8 +277,6 @@ async def build_poll_message_for_day_async(
                 f"Dit zou niet moeten gebeuren - bug in get_rolling_window_days()."
             )
 
-    from apps.utils.i18n import get_time_label
-
     for opt in opties:
         # Filter "misschien" uit resultaten in deadline-modus:
         # - Bij verborgen counts: toont toch alleen "(stemmen verborgen)", geen meerwaarde
@@ -267,48 +289,55 @@ async def build_poll_message_for_day_async(
             tijd_display = TimeZoneHelper.nl_tijd_naar_hammertime(
                 datum_iso, "19:00", style="t"
             )
-            label = f"{opt.emoji} {t(cid, 'COMMON.at_time', tijd=tijd_display)}"
+            label = f"{opt.emoji} {tr('COMMON.at_time', tijd=tijd_display)}"
         elif opt.tijd == "om 20:30 uur":
             tijd_display = TimeZoneHelper.nl_tijd_naar_hammertime(
                 datum_iso, "20:30", style="t"
             )
-            label = f"{opt.emoji} {t(cid, 'COMMON.at_time', tijd=tijd_display)}"
+            label = f"{opt.emoji} {tr('COMMON.at_time', tijd=tijd_display)}"
         else:
             # Voor "misschien", "niet meedoen", etc.: gebruik localized label
-            localized_label = get_time_label(cid, opt.tijd)
+            localized_label = time_label(opt.tijd)
             label = f"{opt.emoji} {localized_label.capitalize()}"
 
         if effective_hide_counts:
-            message += f"{label} ({t(cid, 'UI.votes_hidden')})\n"
+            message += f"{label} ({tr('UI.votes_hidden')})\n"
         else:
             n = int(counts.get(opt.tijd, 0))
             if n == 1:
-                message += f"{label} ({t(cid, 'UI.vote_count_singular', n=n)})\n"
+                message += f"{label} ({tr('UI.vote_count_singular', n=n)})\n"
             else:
-                message += f"{label} ({t(cid, 'UI.votes_count', n=n)})\n"
+                message += f"{label} ({tr('UI.votes_count', n=n)})\n"
 
     # Voeg niet-stemmers toe (tenzij verborgen via hide_ghosts)
     # Voor verleden dagen: altijd niet-stemmers tonen (effective_hide_ghosts is False)
     # Use category-scoped votes for dual language support
     if guild and channel and not effective_hide_ghosts:
         from apps.utils.poll_settings import get_vote_scope_channels
-        scope_ids = get_vote_scope_channels(channel)
-        if len(scope_ids) > 1:
-            # Multiple channels share votes - use aggregated votes
-            all_votes = await load_votes_for_scope(guild_id, scope_ids)
+        if ctx is not None:
+            # Scope en snapshot van de update-ronde (alleen-lezen)
+            if ctx.snapshot is None:
+                await ctx.load_snapshot()
+            all_votes = ctx.snapshot.votes
         else:
-            all_votes = await load_votes(guild_id, channel_id)
+            scope_ids = get_vote_scope_channels(channel)
+            if len(scope_ids) > 1:
+                # Multiple channels share votes - use the shared scope snapshot
+                # (same object as the counts above; read-only)
+                all_votes = (await get_scope_snapshot(guild_id, scope_ids)).votes
+            else:
+                all_votes = await load_votes(guild_id, channel_id)
         non_voter_count, _ = await get_non_voters_for_day(
             dag, guild, channel, all_votes
         )
 
         if non_voter_count == 0:
-            message += f"{t(cid, 'UI.everyone_voted')} - *{t(cid, 'UI.everyone_voted_thanks')}*\n"
+            message += f"{tr('UI.everyone_voted')} - *{tr('UI.everyone_voted_thanks')}*\n"
         else:
             if non_voter_count == 1:
-                message += t(cid, "UI.not_voted_singular", count=non_voter_count) + "\n"
+                message += tr("UI.not_voted_singular", count=non_voter_count) + "\n"
             else:
-                message += t(cid, "UI.not_voted_count", count=non_voter_count) + "\n"
+                message += tr("UI.not_voted_count", count=non_voter_count) + "\n"
 
     return f"{message}\u200b"
 
@@ -331,68 +360,43 @@ async def build_grouped_names_for(
 
     groepen: dict[str, dict] = {}
 
+    # Eerst alle stemmers voor deze tijd, dan alle namen in één keer
+    # (roster-cache + batch-prefetch; geen REST-call per lid)
+    stemmers: list[tuple[str, str | None]] = []
     for raw_id, user_votes in all_votes.items():
         try:
             tijden = user_votes.get(dag, [])
             if not isinstance(tijden, list) or tijd not in tijden:
                 continue
-
-            # Gast-key: "<ownerId>_guest::<gastnaam>"
-            if isinstance(raw_id, str) and "_guest::" in raw_id:
-                owner_id, guest_name = raw_id.split("_guest::", 1)
-                guest_name = (guest_name or "Gast").strip()
-
-                mention = "Gast"
-                if guild:
-                    try:
-                        owner_member = guild.get_member(
-                            int(owner_id)
-                        ) or await guild.fetch_member(int(owner_id))
-                        if owner_member:
-                            # Gebruik displaynaam in plaats van mention
-                            display = (
-                                getattr(owner_member, "display_name", None)
-                                or getattr(owner_member, "global_name", None)
-                                or getattr(owner_member, "name", "Lid")
-                            )
-                            mention = f"@{display}"
-                    except Exception:
-                        pass
-
-                g = groepen.setdefault(
-                    owner_id, {"voted": False, "guests": [], "mention": mention}
-                )
-                g["guests"].append(guest_name)
-
+            raw = str(raw_id)
+            if "_guest::" in raw:
+                owner_id, guest_name = raw.split("_guest::", 1)
+                stemmers.append((owner_id, (guest_name or "Gast").strip()))
             else:
-                # Normale stemmer (lid)
-                mention = None
-                if guild:
-                    try:
-                        member = guild.get_member(
-                            int(raw_id)
-                        ) or await guild.fetch_member(int(raw_id))
-                        if member:
-                            # Gebruik displaynaam in plaats van mention
-                            display = (
-                                getattr(member, "display_name", None)
-                                or getattr(member, "global_name", None)
-                                or getattr(member, "name", "Lid")
-                            )
-                            mention = f"@{display}"
-                    except Exception:
-                        pass
-
-                key = str(raw_id)
-                g = groepen.setdefault(
-                    key, {"voted": False, "guests": [], "mention": mention or "Lid"}
-                )
-                g["voted"] = True
-
+                stemmers.append((raw, None))
         except Exception:
             # Onbekende of niet-parsbare id; negeren
             continue
 
+    names = await resolve_names(guild, [uid for uid, _ in stemmers]) if guild else {}
+
+    for user_id, guest_name in stemmers:
+        name = names.get(user_id)
+        if guest_name is not None:
+            # Gast-key: "<ownerId>_guest::<gastnaam>"
+            g = groepen.setdefault(
+                user_id,
+                {"voted": False, "guests": [], "mention": f"@{name}" if name else "Gast"},
+            )
+            g["guests"].append(guest_name)
+        else:
+            # Normale stemmer (lid)
+            g = groepen.setdefault(
+                user_id,
+                {"voted": False, "guests": [], "mention": f"@{name}" if name else "Lid"},
+            )
+            g["voted"] = True
+
     # Totaal = leden die stemden + alle gasten
     totaal = sum(1 for g in groepen.values() if g["voted"]) + sum(
         len(g["guests"]) for g in groepen.values()
@@ -583,26 +587,15 @@ async def get_non_voters_for_day(
             dag, guild_id, channel_id
         )
 
-        # If we have stored non-voters, use them
-        if count > 0 and non_voter_ids:
-            # Build display names for non-voters
-            non_voters: list[str] = []
-
-            for member_id in non_voter_ids:
-                try:
-                    member = guild.get_member(
-                        int(member_id)
-                    ) or await guild.fetch_member(int(member_id))
-                    if member:
-                        display = (
-                            getattr(member, "display_name", None)
-                            or getattr(member, "global_name", None)
-                            or getattr(member, "name", "Lid")
-                        )
-                        non_voters.append(f"@{display}")
-                except Exception:  # pragma: no cover
-                    # If member not found, skip
-                    continue
+        # If we have stored non-voters, use them (None = members unknown)
+        if count and non_voter_ids:
+            # Build display names for non-voters (één batch, geen REST per lid)
+            names = await resolve_names(guild, non_voter_ids)
+            non_voters: list[str] = [
+                f"@{names[str(member_id)]}"
+                for member_id in non_voter_ids
+                if names.get(str(member_id))
+            ]
 
             count = len(non_voters)
             text = ", ".join(non_voters) if non_voters else ""
@@ -633,25 +626,12 @@ async def get_non_voters_for_day(
         except Exception:  # pragma: no cover
             continue
 
-    # Alleen leden die toegang hebben tot dit specifieke kanaal
-    members = getattr(channel, "members", [])
-    non_voters: list[str] = []
-
-    for member in members:
-        # Skip bots
-        if getattr(member, "bot", False):
-            continue
-
-        # Check of dit lid heeft gestemd
-        member_id = str(getattr(member, "id", ""))
-        if member_id not in voted_ids:
-            # Gebruik displaynaam in plaats van mention (consistent met build_grouped_names_for)
-            display = (
-                getattr(member, "display_name", None)
-                or getattr(member, "global_name", None)
-                or getattr(member, "name", "Lid")
-            )
-            non_voters.append(f"@{display}")
+    # Alleen leden die toegang hebben tot dit specifieke kanaal (roster, zonder bots)
+    non_voters = [
+        f"@{name}"
+        for member_id, (name, _mention) in channel_roster(channel).items()
+        if member_id not in voted_ids
+    ]
 
     count = len(non_voters)
     text = ", ".join(non_voters) if non_voters else ""
@@ -686,27 +666,16 @@ async def get_was_misschien_for_day(
             return 0, ""
 
         # Bouw display names voor was_misschien gebruikers
-        names: list[str] = []
-
-        for member_id in user_ids:
-            if guild:
-                try:
-                    member = guild.get_member(
-                        int(member_id)
-                    ) or await guild.fetch_member(int(member_id))
-                    if member:
-                        display = (
-                            getattr(member, "display_name", None)
-                            or getattr(member, "global_name", None)
-                            or getattr(member, "name", "Lid")
-                        )
-                        names.append(f"@{display}")
-                except Exception:  # pragma: no cover
-                    # Lid niet gevonden, skip
-                    continue
-            else:
-                # Geen guild, gebruik ID als fallback
-                names.append(f"<@{member_id}>")
+        if guild:
+            resolved = await resolve_names(guild, user_ids)
+            names = [
+                f"@{resolved[str(member_id)]}"
+                for member_id in user_ids
+                if resolved.get(str(member_id))
+            ]
+        else:
+            # Geen guild, gebruik ID als fallback
+            names = [f"<@{member_id}>" for member_id in user_ids]
 
         count = len(names)
         text = ", ".join(names) if names else ""
@@ -0,0 +1,394 @@
+# apps/utils/outbound_queue.py
+#
+# Centrale wachtrij voor uitgaande Discord-calls (edits, sends, deletes).
+#
+# - Token bucket per route (soort call + kanaal) plus één globale bucket, zodat
+#   een sweep over alle kanalen niet in één klap tegen de limieten aanloopt.
+# - Prioriteiten: PRIORITY_INTERACTIVE (stemfeedback) gaat vóór
+#   PRIORITY_BACKGROUND (sweeps). De prioriteit volgt de context: zet
+#   `with background_priority():` om een sweep heen; taken die daarbinnen
+#   worden aangemaakt erven die.
+# - Samenvoegen: een nog wachtende job met dezelfde coalesce_key (bijv. een edit
+#   van hetzelfde bericht) voert alleen de nieuwste call uit; alle wachtende
+#   aanroepers krijgen dat resultaat. Per coalesce_key geldt bovendien een
+#   minimale tussenpoos (OUTBOUND_COALESCE_INTERVAL); edits die in die tijd
+#   binnenkomen worden samengevoegd en daarna altijd nog één keer uitgevoerd.
+#   flush() wacht tot alles wat in de wachtrij staat is weggeschreven.
+# - 429's: safe_call meldt retry_after via note_rate_limited(), waarna de hele
+#   route pauzeert in plaats van alleen de mislukte call.
+# - get_metrics(): wachtrijlengte, wachttijden en tellers.
+#
+# Configuratie via env:
+# - OUTBOUND_ROUTE_BURST (standaard 5) / OUTBOUND_ROUTE_PER_SECOND (standaard 1.0)
+# - OUTBOUND_GLOBAL_BURST (standaard 40) / OUTBOUND_GLOBAL_PER_SECOND (standaard 40.0)
+# - OUTBOUND_COALESCE_INTERVAL (standaard 1.0 seconde per bericht)
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Hashable, Iterator, Optional
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+Route = tuple[str, int]
+
+_priority_var: ContextVar[int] = ContextVar(
+    "outbound_priority", default=PRIORITY_INTERACTIVE
+)
+_route_var: ContextVar[Optional[Route]] = ContextVar("outbound_route", default=None)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Alle calls binnen dit blok (en taken die hier starten) krijgen achtergrondprioriteit."""
+    token = _priority_var.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority_var.reset(token)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    """Klassieke token bucket: 'capacity' burst, 'rate' tokens per seconde."""
+
+    __slots__ = ("rate", "capacity", "tokens", "stamp", "blocked_until")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if now > self.stamp:
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+
+    def delay(self, now: float) -> float:
+        """Seconden tot er een token is (0 = nu beschikbaar)."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1.0
+
+    def block(self, now: float, seconds: float) -> None:
+        """Pauzeer de bucket (na een 429) en begin daarna leeg."""
+        self.blocked_until = max(self.blocked_until, now + max(0.0, seconds))
+        self.tokens = 0.0
+        self.stamp = self.blocked_until
+
+
+class _Job:
+    __slots__ = ("priority", "seq", "route", "factory", "key", "futures", "enqueued")
+
+    def __init__(
+        self,
+        priority: int,
+        seq: int,
+        route: Route,
+        factory: Callable[[], Awaitable[Any]],
+        key: Optional[Hashable],
+        enqueued: float,
+    ) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.route = route
+        self.factory = factory
+        self.key = key
+        self.futures: list[asyncio.Future] = []
+        self.enqueued = enqueued
+
+
+def _job_order(job: _Job) -> tuple[int, int]:
+    return (job.priority, job.seq)
+
+
+class OutboundQueue:
+    """Prioriteitswachtrij met een dispatcher die per route op tokens wacht."""
+
+    def __init__(
+        self,
+        route_rate: float = 1.0,
+        route_burst: float = 5.0,
+        global_rate: float = 40.0,
+        global_burst: float = 40.0,
+        coalesce_interval: float = 1.0,
+    ) -> None:
+        self.route_rate = route_rate
+        self.route_burst = route_burst
+        self.global_rate = global_rate
+        self.global_burst = global_burst
+        self.coalesce_interval = coalesce_interval
+        self._init_state()
+
+    def _init_state(self) -> None:
+        self._global = TokenBucket(self.global_rate, self.global_burst)
+        self._buckets: dict[Route, TokenBucket] = {}
+        self._pending: list[_Job] = []
+        self._by_key: dict[Hashable, _Job] = {}
+        self._key_ready: dict[Hashable, float] = {}
+        self._running: set[asyncio.Task] = set()
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._in_flight = 0
+        self._stats = {
+            "submitted": 0,
+            "executed": 0,
+            "coalesced": 0,
+            "failed": 0,
+            "rate_limited": 0,
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @classmethod
+    def from_env(cls) -> "OutboundQueue":
+        return cls(
+            route_rate=_env_float("OUTBOUND_ROUTE_PER_SECOND", 1.0),
+            route_burst=_env_float("OUTBOUND_ROUTE_BURST", 5.0),
+            global_rate=_env_float("OUTBOUND_GLOBAL_PER_SECOND", 40.0),
+            global_burst=_env_float("OUTBOUND_GLOBAL_BURST", 40.0),
+            coalesce_interval=_env_float("OUTBOUND_COALESCE_INTERVAL", 1.0),
+        )
+
+    # ---------- publieke API ----------
+
+    async def submit(
+        self,
+        route: Route,
+        factory: Callable[[], Awaitable[Any]],
+        *,
+        priority: Optional[int] = None,
+        coalesce_key: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Plan factory() in op 'route' en wacht op het resultaat.
+
+        factory moet bij elke aanroep een nieuwe awaitable maken (bijv. een
+        lambda rond safe_call); bij samenvoegen wordt alleen de nieuwste gebruikt.
+        """
+        return await self.enqueue(
+            route, factory, priority=priority, coalesce_key=coalesce_key
+        )
+
+    def enqueue(
+        self,
+        route: Route,
+        factory: Callable[[], Awaitable[Any]],
+        *,
+        priority: Optional[int] = None,
+        coalesce_key: Optional[Hashable] = None,
+    ) -> asyncio.Future:
+        """
+        Zoals submit(), maar plaatst de job direct (synchroon) en geeft de future
+        terug. Handig om onder een lock in te plannen en daarbuiten te wachten.
+        """
+        loop = asyncio.get_running_loop()
+        self._ensure_dispatcher(loop)
+        prio = _priority_var.get() if priority is None else priority
+        fut: asyncio.Future = loop.create_future()
+        self._stats["submitted"] += 1
+
+        job = self._by_key.get(coalesce_key) if coalesce_key is not None else None
+        if job is not None:
+            job.factory = factory
+            job.futures.append(fut)
+            self._stats["coalesced"] += 1
+            if prio < job.priority:
+                self._pending.remove(job)
+                job.priority = prio
+                bisect.insort(self._pending, job, key=_job_order)
+        else:
+            job = _Job(prio, next(self._seq), route, factory, coalesce_key, time.monotonic())
+            job.futures.append(fut)
+            bisect.insort(self._pending, job, key=_job_order)
+            if coalesce_key is not None:
+                self._by_key[coalesce_key] = job
+
+        assert self._wakeup is not None
+        self._wakeup.set()
+        return fut
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wacht tot alle nu wachtende en lopende jobs klaar zijn (ook samengevoegde
+        edits die nog op hun tussenpoos wachten). False bij timeout.
+        """
+        waiters: list[Any] = [f for job in self._pending for f in job.futures]
+        waiters.extend(self._running)
+        if not waiters:
+            return True
+        _done, not_done = await asyncio.wait(waiters, timeout=timeout)
+        return not not_done
+
+    def note_rate_limited(self, retry_after: Optional[float]) -> None:
+        """Pauzeer de route van de lopende call na een 429 (aangeroepen door safe_call)."""
+        route = _route_var.get()
+        if route is None:
+            return
+        self._stats["rate_limited"] += 1
+        delay = float(retry_after) if retry_after else 1.0
+        self._bucket(route).block(time.monotonic(), delay)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def get_metrics(self) -> dict[str, Any]:
+        executed = self._stats["executed"] + self._stats["failed"]
+        by_priority: dict[int, int] = {}
+        for job in self._pending:
+            by_priority[job.priority] = by_priority.get(job.priority, 0) + 1
+        oldest = min((j.enqueued for j in self._pending), default=None)
+        return {
+            "queue_depth": len(self._pending),
+            "queue_depth_by_priority": by_priority,
+            "in_flight": self._in_flight,
+            **self._stats,
+            "wait_avg_ms": (self._wait_total / executed * 1000.0) if executed else 0.0,
+            "wait_max_ms": self._wait_max * 1000.0,
+            "oldest_wait_ms": (
+                (time.monotonic() - oldest) * 1000.0 if oldest is not None else 0.0
+            ),
+        }
+
+    def reset(self) -> None:
+        """Vergeet buckets, wachtrij en statistieken (handig in tests)."""
+        if self._dispatcher is not None and not self._dispatcher.done():
+            self._dispatcher.cancel()
+        self._init_state()
+
+    # ---------- intern ----------
+
+    def _bucket(self, route: Route) -> TokenBucket:
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            bucket = self._buckets[route] = TokenBucket(self.route_rate, self.route_burst)
+        return bucket
+
+    def _ensure_dispatcher(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is not loop:
+            # Nieuwe event loop (herstart/tests): jobs van de oude loop zijn dood
+            self._pending.clear()
+            self._by_key.clear()
+            self._key_ready.clear()
+            self._running.clear()
+            self._in_flight = 0
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._run())
+
+    def _next_ready(self, now: float) -> tuple[Optional[_Job], float]:
+        wait = self._global.delay(now)
+        if wait > 0:
+            return None, wait
+        seen: set[Route] = set()
+        best = float("inf")
+        for job in self._pending:  # al gesorteerd op (prioriteit, volgorde)
+            if job.route in seen:
+                continue  # FIFO binnen een route
+            if job.key is not None:
+                key_wait = self._key_ready.get(job.key, 0.0) - now
+                if key_wait > 0:
+                    # Dit bericht is net ge-edit; laat andere jobs op de route voorgaan
+                    best = min(best, key_wait)
+                    continue
+            seen.add(job.route)
+            delay = self._bucket(job.route).delay(now)
+            if delay <= 0:
+                return job, 0.0
+            best = min(best, delay)
+        return None, best
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None and self._loop is not None
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            now = time.monotonic()
+            job, wait = self._next_ready(now)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._pending.remove(job)
+            if job.key is not None:
+                if self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+                self._mark_key(job.key, now)
+            self._global.take(now)
+            self._bucket(job.route).take(now)
+            waited = now - job.enqueued
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._in_flight += 1
+            task = self._loop.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    def _mark_key(self, key: Hashable, now: float) -> None:
+        if len(self._key_ready) > 1024:
+            # Opruimen: verlopen tussenpozen hoeven we niet te onthouden
+            for k in [k for k, ready in self._key_ready.items() if ready <= now]:
+                del self._key_ready[k]
+        self._key_ready[key] = now + self.coalesce_interval
+
+    async def _execute(self, job: _Job) -> None:
+        token = _route_var.set(job.route)
+        try:
+            result = await job.factory()
+        except asyncio.CancelledError:
+            for fut in job.futures:
+                if not fut.done():
+                    fut.cancel()
+            raise
+        except Exception as e:
+            self._stats["failed"] += 1
+            for fut in job.futures:
+                if not fut.done():
+                    fut.set_exception(e)
+        else:
+            self._stats["executed"] += 1
+            for fut in job.futures:
+                if not fut.done():
+                    fut.set_result(result)
+        finally:
+            self._in_flight -= 1
+            _route_var.reset(token)
+
+
+# Gedeelde wachtrij voor de hele bot
+outbound_queue = OutboundQueue.from_env()
+
+
+def get_metrics() -> dict[str, Any]:
+    """Metrics van de gedeelde wachtrij."""
+    return outbound_queue.get_metrics()
@@ -1,6 +1,9 @@
 # apps/utils/poll_message.py
 
 import asyncio
+import copy
+import functools
+import hashlib
 import json
 import os
 from datetime import datetime
@@ -10,19 +13,29 @@ from zoneinfo import ZoneInfo
 import discord
 
 from apps.logic.decision import build_decision_line
+from apps.utils.atomic_json import json_writer
 from apps.utils.celebration_gif import get_celebration_gif_url
 from apps.utils.discord_client import fetch_message_or_none, safe_call
+from apps.utils.member_roster import roster_generation
 from apps.utils.message_builder import build_poll_message_for_day_async
+from apps.utils.outbound_queue import outbound_queue
 from apps.utils.poll_settings import (
     get_enabled_poll_days,
-    is_paused,
     should_hide_counts,
     should_hide_ghosts,
 )
 from apps.utils.poll_storage import (
     get_non_voters_for_day,
+    get_scope_snapshot,
+    get_scope_version,
     update_non_voters,
 )
+from apps.utils.sqlite_store import (
+    get_store,
+    is_sqlite_backend,
+    load_poll_message_data,
+    save_poll_message_data,
+)
 
 POLL_MESSAGE_FILE = os.getenv("POLL_MESSAGE_FILE", "poll_message.json")
 # Lokale fallback afbeelding als Tenor niet werkt
@@ -32,6 +45,20 @@ LOCAL_CELEBRATION_IMAGE = "resources/bedankt-puppies-kitties.jpg"
 _update_locks: dict[tuple[int, str], asyncio.Lock] = {}
 _pending_tasks: dict[tuple[int, str], asyncio.Task] = {}
 
+# Render-cache per (kanaal, dag): (render-sleutel, hash van de geposte content).
+# Zelfde sleutel → niets opnieuw bouwen of editen. Andere sleutel maar dezelfde
+# content → wel opnieuw gebouwd, maar geen edit naar Discord.
+_render_cache: dict[tuple[int, str], tuple[tuple, str]] = {}
+
+# In-memory kopie van POLL_MESSAGE_FILE (of de SQLite-tabellen); opnieuw gelezen
+# als (pad, mtime, grootte) resp. het databasepad wijzigt. Zolang er async
+# schrijfacties lopen is de cache leidend.
+_DATA_CACHE: dict[str, Any] | None = None
+_DATA_CACHE_KEY: tuple | None = None
+_PENDING_WRITES = 0
+# Verhoogd bij elke (bekende) wijziging van de data; zie get_data_generation
+_DATA_GENERATION = 0
+
 
 def is_channel_disabled(channel_id: int) -> bool:
     """
@@ -46,7 +73,7 @@ def is_channel_disabled(channel_id: int) -> bool:
     Returns:
         True als het kanaal permanent uitgeschakeld is, anders False.
     """
-    data = _load()
+    data = _read_data()
     # Backwards compatibility: check beide oude en nieuwe key
     shutdown_channels = data.get("permanently_shutdown_channels", [])
     if not shutdown_channels:
@@ -67,6 +94,15 @@ def set_channel_disabled(channel_id: int, disabled: bool) -> None:
         channel_id: Het numerieke ID van het kanaal.
         disabled: True om permanent uit te schakelen, False om weer in te schakelen.
     """
+    _save(_with_channel_disabled(channel_id, disabled))
+
+
+async def set_channel_disabled_async(channel_id: int, disabled: bool) -> None:
+    """Als set_channel_disabled, maar schrijft buiten de event loop."""
+    await _save_async(_with_channel_disabled(channel_id, disabled))
+
+
+def _with_channel_disabled(channel_id: int, disabled: bool) -> dict[str, Any]:
     data = _load()
     shutdown_channels = data.get("permanently_shutdown_channels", [])
     cid_str = str(channel_id)
@@ -80,7 +116,7 @@ def set_channel_disabled(channel_id: int, disabled: bool) -> None:
             c for c in shutdown_channels if c != cid_str and c != channel_id
         ]
     data["permanently_shutdown_channels"] = shutdown_channels
-    _save(data)
+    return data
 
 
 def get_dag_als_vandaag(channel_id: int) -> str | None:
@@ -93,7 +129,7 @@ def get_dag_als_vandaag(channel_id: int) -> str | None:
     Returns:
         De dag naam (bijv. "dinsdag") of None als niet ingesteld.
     """
-    data = _load()
+    data = _read_data()
     dag_als_vandaag_map = data.get("dag_als_vandaag", {})
     cid_str = str(channel_id)
     return dag_als_vandaag_map.get(cid_str)
@@ -124,7 +160,19 @@ def set_dag_als_vandaag(channel_id: int, dag: str | None) -> None:
     _save(data)
 
 
-def _load() -> dict[str, Any]:
+def _cache_key() -> tuple:
+    if is_sqlite_backend():
+        return ("sqlite", get_store().path)
+    try:
+        st = os.stat(POLL_MESSAGE_FILE)
+    except OSError:
+        return (POLL_MESSAGE_FILE, None, None)
+    return (POLL_MESSAGE_FILE, st.st_mtime_ns, st.st_size)
+
+
+def _read_from_disk() -> dict[str, Any]:
+    if is_sqlite_backend():
+        return load_poll_message_data()
     if os.path.exists(POLL_MESSAGE_FILE):
         try:
             with open(POLL_MESSAGE_FILE, "r", encoding="utf-8") as f:
@@ -134,27 +182,92 @@ def _load() -> dict[str, Any]:
     return {}
 
 
+def _read_data() -> dict[str, Any]:
+    """Gedeelde data uit de cache (alleen-lezen)."""
+    global _DATA_CACHE, _DATA_CACHE_KEY, _DATA_GENERATION
+    if _DATA_CACHE is not None and _PENDING_WRITES:
+        return _DATA_CACHE
+    key = _cache_key()
+    if _DATA_CACHE is None or key != _DATA_CACHE_KEY:
+        _DATA_CACHE = _read_from_disk()
+        _DATA_CACHE_KEY = key
+        _DATA_GENERATION += 1
+    return _DATA_CACHE
+
+
+def get_data_generation() -> int:
+    """Teller die verhoogd wordt bij elke (bekende) wijziging van POLL_MESSAGE_FILE."""
+    _read_data()
+    return _DATA_GENERATION
+
+
+def _load() -> dict[str, Any]:
+    """Kopie van alle data; veilig om te muteren en met _save op te slaan."""
+    return copy.deepcopy(_read_data())
+
+
 def _save(data: dict[str, Any]) -> None:
-    with open(POLL_MESSAGE_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    global _DATA_CACHE, _DATA_CACHE_KEY, _DATA_GENERATION
+    _DATA_GENERATION += 1
+    _DATA_CACHE = copy.deepcopy(data)
+    if is_sqlite_backend():
+        save_poll_message_data(_DATA_CACHE)
+    else:
+        json_writer.write(POLL_MESSAGE_FILE, _DATA_CACHE)
+    _DATA_CACHE_KEY = _cache_key()
 
 
-def save_message_id(channel_id: int, key: str, message_id: int) -> None:
+async def _save_async(data: dict[str, Any]) -> None:
+    """Als _save, maar de schijf-I/O gebeurt buiten de event loop."""
+    global _DATA_CACHE, _DATA_CACHE_KEY, _PENDING_WRITES, _DATA_GENERATION
+    _DATA_GENERATION += 1
+    # Cache meteen bijwerken: lezers zien de wijziging direct
+    _DATA_CACHE = snapshot = copy.deepcopy(data)
+    _PENDING_WRITES += 1
+    try:
+        if is_sqlite_backend():
+            # Altijd de nieuwste cache schrijven, zodat volgorde niet uitmaakt
+            await asyncio.to_thread(lambda: save_poll_message_data(_DATA_CACHE or {}))
+        else:
+            await json_writer.write_async(POLL_MESSAGE_FILE, snapshot)
+    finally:
+        _PENDING_WRITES -= 1
+    if not _PENDING_WRITES:
+        _DATA_CACHE_KEY = _cache_key()
+
+
+def _with_message_id(channel_id: int, key: str, message_id: int) -> dict[str, Any]:
     data = _load()
     data.setdefault("per_channel", {}).setdefault(str(channel_id), {})[key] = message_id
-    _save(data)
+    return data
 
 
-def get_message_id(channel_id: int, key: str) -> Optional[int]:
+def _without_message_id(channel_id: int, key: str) -> dict[str, Any]:
     data = _load()
+    per = data.setdefault("per_channel", {}).setdefault(str(channel_id), {})
+    per.pop(key, None)
+    return data
+
+
+def save_message_id(channel_id: int, key: str, message_id: int) -> None:
+    _save(_with_message_id(channel_id, key, message_id))
+
+
+async def save_message_id_async(channel_id: int, key: str, message_id: int) -> None:
+    await _save_async(_with_message_id(channel_id, key, message_id))
+
+
+def get_message_id(channel_id: int, key: str) -> Optional[int]:
+    data = _read_data()
     return data.get("per_channel", {}).get(str(channel_id), {}).get(key)
 
 
 def clear_message_id(channel_id: int, key: str) -> None:
-    data = _load()
-    per = data.setdefault("per_channel", {}).setdefault(str(channel_id), {})
-    per.pop(key, None)
-    _save(data)
+    _save(_without_message_id(channel_id, key))
+
+
+async def clear_message_id_async(channel_id: int, key: str) -> None:
+    await _save_async(_without_message_id(channel_id, key))
 
 
 async def create_notification_message(
@@ -260,7 +373,11 @@ async def update_notification_message(
         view = create_stem_nu_view(dag, leading_time)
 
     try:
-        await safe_call(msg.edit, content=content, view=view)
+        await outbound_queue.submit(
+            ("edit", cid),
+            lambda: safe_call(msg.edit, content=content, view=view),
+            coalesce_key=("edit", mid),
+        )
     except Exception as e:  # pragma: no cover
         print(f"❌ Fout bij updaten notificatiebericht: {e}")
 
@@ -341,97 +458,319 @@ def schedule_poll_update(channel: Any, dag: str, delay: float = 0.3) -> asyncio.
     return task
 
 
-async def update_poll_message(channel: Any, dag: str | None = None) -> None:
+def _day_lock(channel_id: int, dag: str) -> asyncio.Lock:
+    """Per (kanaal, dag) lock, gedeeld door stem-updates en batch-updates."""
+    key = (int(channel_id), dag)
+    lock = _update_locks.get(key)
+    if lock is None:
+        lock = _update_locks[key] = asyncio.Lock()
+    return lock
+
+
+def mark_render_dirty(channel_id: int, dag: str | None = None) -> None:
+    """Vergeet de laatste render zodat de volgende update opnieuw bouwt en edit."""
+    cid = int(channel_id)
+    if dag is not None:
+        _render_cache.pop((cid, dag), None)
+        return
+    for key in [k for k in _render_cache if k[0] == cid]:
+        del _render_cache[key]
+
+
+async def _apply_edit(
+    msg: Any, content: str, cache_key: tuple[int, str], entry: tuple[tuple, str]
+) -> None:
+    """
+    Edit een dag-bericht en onthoud de render. Bij samengevoegde edits draait
+    alleen de nieuwste, dus de render-cache volgt altijd de geposte content.
+    """
+    try:
+        await safe_call(msg.edit, content=content, view=None)
+    except Exception:
+        mark_render_dirty(*cache_key)
+        raise
+    _render_cache[cache_key] = entry
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class RenderContext:
+    """
+    Gedeelde toestand voor één update-ronde van een kanaal.
+
+    Klok, rolling window, instellingen-momentopname, stem-scope en taal worden
+    één keer bepaald; deadline-vlaggen per dag worden onthouden. Het
+    stemmen-snapshot komt uit get_scope_snapshot (gecached per scope-versie)
+    en wordt per dag onder de lock ververst met load_snapshot(). Builders die
+    een ctx krijgen lezen hieruit in plaats van zelf op te zoeken.
+    """
+
+    __slots__ = (
+        "channel",
+        "guild",
+        "guild_id",
+        "channel_id",
+        "now",
+        "settings",
+        "window",
+        "scope_ids",
+        "language",
+        "snapshot",
+        "_hide",
+        "_hide_ghosts",
+    )
+
+    def __init__(self, channel: Any, now: datetime | None = None) -> None:
+        from apps.utils.i18n import get_language_module
+        from apps.utils.poll_settings import (
+            get_channel_settings,
+            get_enabled_rolling_window_days,
+            get_vote_scope_channels,
+        )
+
+        self.channel = channel
+        self.guild = getattr(channel, "guild", None)
+        self.guild_id = int(getattr(self.guild, "id", 0))
+        self.channel_id = int(getattr(channel, "id", 0))
+        self.now = now or datetime.now(ZoneInfo("Europe/Amsterdam"))
+        self.settings = get_channel_settings(self.channel_id)
+        self.window: dict[str, str] = {
+            info["dag"]: info["datum_iso"]
+            for info in get_enabled_rolling_window_days(self.channel_id, dag_als_vandaag=None)
+        }
+        self.scope_ids = [
+            int(sid) for sid in (get_vote_scope_channels(channel) or [self.channel_id])
+        ]
+        self.language = get_language_module(self.settings.language)
+        self.snapshot: Any = None
+        self._hide: dict[str, bool] = {}
+        self._hide_ghosts: dict[str, bool] = {}
+
+    @property
+    def paused(self) -> bool:
+        return self.settings.paused
+
+    @property
+    def generation(self) -> int:
+        return self.settings.generation
+
+    def hide_counts(self, dag: str) -> bool:
+        if dag not in self._hide:
+            self._hide[dag] = should_hide_counts(self.channel_id, dag, self.now)
+        return self._hide[dag]
+
+    def hide_ghosts(self, dag: str) -> bool:
+        if dag not in self._hide_ghosts:
+            self._hide_ghosts[dag] = should_hide_ghosts(self.channel_id, dag, self.now)
+        return self._hide_ghosts[dag]
+
+    def scope_versions(self) -> tuple:
+        return tuple(
+            (sid, get_scope_version(self.guild_id, sid)) for sid in self.scope_ids
+        )
+
+    async def load_snapshot(self) -> Any:
+        """Haal het (gecachte) stemmen-snapshot van de scope op en onthoud het."""
+        self.snapshot = await get_scope_snapshot(self.guild_id, self.scope_ids)
+        return self.snapshot
+
+    def counts_for_day(self, dag: str) -> dict[str, int]:
+        return self.snapshot.counts_for_day(dag) if self.snapshot is not None else {}
+
+    def t(self, key: str, **kwargs: Any) -> str:
+        from apps.utils.i18n import translate
+
+        return translate(self.language, key, **kwargs)
+
+    def day_name(self, dag: str) -> str:
+        from apps.utils.i18n import day_name_for
+
+        return day_name_for(self.language, dag)
+
+    def time_label(self, tijd: str) -> str:
+        from apps.utils.i18n import time_label_for
+
+        return time_label_for(self.language, tijd)
+
+
+def _render_key(ctx: RenderContext, mid: Any, dag: str) -> tuple:
+    """
+    Alles waar de content van een dag-bericht van afhangt: stemmen en leden van
+    de (categorie-)scope, ledennamen, instellingen, datum en de deadline-toestand.
+    """
+    return (
+        mid,
+        ctx.window.get(dag),
+        ctx.hide_counts(dag),
+        ctx.hide_ghosts(dag),
+        ctx.paused,
+        ctx.now.date().isoformat(),
+        ctx.generation,
+        ctx.scope_versions(),
+        roster_generation(),
+    )
+
+
+async def update_poll_message(
+    channel: Any, dag: str | None = None, ctx: RenderContext | None = None
+) -> None:
     """
     Update (of maak aan) de dag-berichten.
 
     Toont/verbergt aantallen per dag via should_hide_counts(...).
     Als er geen message_id is of het bericht bestaat niet meer,
     wordt het bericht opnieuw aangemaakt en opgeslagen.
-    """
-    cid_val_temp = int(getattr(channel, "id", 0))
 
-    # Gebruik rolling window om correcte datums te krijgen
-    from apps.utils.poll_settings import get_enabled_rolling_window_days
-    dagen_info = get_enabled_rolling_window_days(cid_val_temp, dag_als_vandaag=None)
+    Ongewijzigde dagen (zie _render_key) en identieke content worden
+    overgeslagen, zodat er geen onnodige edits naar Discord gaan.
+
+    Alle dagen van één ronde delen één RenderContext; een aanroeper kan er
+    zelf een meegeven.
+    """
+    # Als dit kanaal uitgeschakeld is (via /dmk-poll-verwijderen), niets doen.
+    if is_channel_disabled(int(getattr(channel, "id", 0))):
+        return
 
-    # Maak een mapping van dag naar datum
-    dag_naar_datum = {day_info["dag"]: day_info["datum_iso"] for day_info in dagen_info}
+    if ctx is None:
+        ctx = RenderContext(channel)
 
     if dag:
         # Filter alleen de gevraagde dag (als die in de rolling window zit)
-        if dag not in dag_naar_datum:
+        if dag not in ctx.window:
             # Dag zit niet in rolling window, negeer
             return
         keys = [dag]
     else:
         # Alle enabled dagen uit rolling window
-        keys = [day_info["dag"] for day_info in dagen_info]
+        keys = list(ctx.window)
 
-    now = datetime.now(ZoneInfo("Europe/Amsterdam"))
-    guild_obj = getattr(channel, "guild", None)
-    gid_val: int | str = int(getattr(guild_obj, "id", 0))
-    cid_val: int | str = int(getattr(channel, "id", 0))
+    gid_val = ctx.guild_id
+    cid_val = ctx.channel_id
 
-    # Als dit kanaal uitgeschakeld is (via /dmk-poll-verwijderen), niets doen.
-    if is_channel_disabled(cid_val):
-        return
+    # Update non-voters in storage before building the messages (één keer per ronde)
+    await update_non_voters(gid_val, cid_val, channel)
 
+    # Edits worden onder de lock ingepland maar pas na alle dagen afgewacht:
+    # zo staan ze samen in de wachtrij en kan een volgende update (nieuwere
+    # content) nog in dezelfde edit opgaan.
+    pending_edits: list[asyncio.Future] = []
+    pending_days: list[str] = []
     for d in keys:
         # Per (kanaal, dag) lock om overlap te voorkomen
-        lock_key = (int(cid_val), d)
-        lock = _update_locks.get(lock_key)
-        if lock is None:
-            lock = _update_locks[lock_key] = asyncio.Lock()
-
-        async with lock:
+        async with _day_lock(cid_val, d):
             mid = get_message_id(cid_val, d)
 
-            # Update non-voters in storage before building the message
-            await update_non_voters(gid_val, cid_val, channel)
+            cache_key = (cid_val, d)
+            render_key = _render_key(ctx, mid, d)
+            cached = _render_cache.get(cache_key)
+            if mid and cached is not None and cached[0] == render_key:
+                continue  # Niets veranderd sinds de laatste geposte versie
 
-            # Haal datum op uit rolling window
-            datum_iso = dag_naar_datum.get(d)
+            # Snapshot verversen onder de lock: stemmen kunnen sinds de vorige dag veranderd zijn
+            await ctx.load_snapshot()
 
-            # Bepaal content (zowel voor edit als create)
-            hide = should_hide_counts(cid_val, d, now)
-            hide_ghosts_val = should_hide_ghosts(cid_val, d, now)
-            paused = is_paused(cid_val)
             content = await build_poll_message_for_day_async(
                 d,
                 guild_id=gid_val,
                 channel_id=cid_val,
-                hide_counts=hide,
-                hide_ghosts=hide_ghosts_val,
-                pauze=paused,
-                guild=getattr(channel, "guild", None),  # Voor namen
+                hide_counts=ctx.hide_counts(d),
+                hide_ghosts=ctx.hide_ghosts(d),
+                pauze=ctx.paused,
+                guild=ctx.guild,  # Voor namen
                 channel=channel,  # Voor niet-stemmers tracking
-                datum_iso=datum_iso,  # Correcte datum uit rolling window
+                datum_iso=ctx.window.get(d),  # Correcte datum uit rolling window
+                ctx=ctx,
             )
 
-            decision = await build_decision_line(gid_val, cid_val, d, now, channel=channel)
+            decision = await build_decision_line(
+                gid_val, cid_val, d, ctx.now, channel=channel, ctx=ctx
+            )
             if decision:
                 content = content.rstrip() + ":arrow_up: " + decision + "\n\u200b"
 
+            content_hash = _content_hash(content)
+
             if mid:
+                if cached is not None and cached[1] == content_hash:
+                    # Content byte-identiek aan wat er al staat: geen edit
+                    _render_cache[cache_key] = (render_key, content_hash)
+                    continue
                 # Bericht ID bestaat - probeer te updaten
                 msg = await fetch_message_or_none(channel, mid)
                 if msg is not None:
-                    await safe_call(msg.edit, content=content, view=None)
+                    pending = outbound_queue.enqueue(
+                        ("edit", cid_val),
+                        functools.partial(
+                            _apply_edit, msg, content, cache_key, (render_key, content_hash)
+                        ),
+                        coalesce_key=("edit", mid),
+                    )
+                    pending_edits.append(pending)
+                    pending_days.append(d)
                 # Als msg is None (fetch failed), NIET opnieuw aanmaken (Bug #4 fix)
                 # Vertrouw op message ID - tijdelijke Discord API fout is geen reden om te recreëren
-                continue
+            else:
+                # Create-pad: alleen als er GEEN mid is (eerste keer)
+                try:
+                    send = getattr(channel, "send", None)
+                    new_msg = (
+                        await outbound_queue.submit(
+                            ("send", cid_val),
+                            lambda: safe_call(send, content=content, view=None),
+                        )
+                        if send
+                        else None
+                    )
+                    if new_msg is not None:
+                        await save_message_id_async(cid_val, d, new_msg.id)
+                        # Sleutel met het nieuwe bericht-ID, anders matcht hij nooit
+                        _render_cache[cache_key] = ((new_msg.id,) + render_key[1:], content_hash)
+                except Exception as e:  # pragma: no cover
+                    print(f"❌ Fout bij aanmaken bericht voor {d}: {e}")
+
+    # Alle edits afwachten, ook als er één faalt (anders gaan fouten verloren)
+    results = await asyncio.gather(*pending_edits, return_exceptions=True)
+    for d, result in zip(pending_days, results):
+        if isinstance(result, BaseException):
+            print(f"❌ Fout bij updaten bericht voor {d}: {result}")
+
+
+async def update_channel_polls(channel: Any) -> None:
+    """
+    Batch-update van alle dag-berichten van één kanaal (scheduler-sweep).
 
-            # Create-pad: alleen als er GEEN mid is (eerste keer)
-            try:
-                send = getattr(channel, "send", None)
-                new_msg = (
-                    await safe_call(send, content=content, view=None) if send else None
+    Eén RenderContext voor de hele ronde, dus stemmen, leden en instellingen
+    worden één keer geladen. Dag-berichten die buiten de rolling window
+    vallen worden verwijderd; de dagen erbinnen gaan via update_poll_message,
+    waarbij alleen gewijzigde dagen een edit (of create) krijgen. Per dag
+    geldt dezelfde lock als bij stem-updates.
+    """
+    from apps.utils.constants import DAG_NAMEN
+
+    cid = int(getattr(channel, "id", 0))
+    if is_channel_disabled(cid):
+        return
+
+    ctx = RenderContext(channel)
+
+    for dag in DAG_NAMEN:
+        if dag in ctx.window or not get_message_id(cid, dag):
+            continue
+        async with _day_lock(cid, dag):
+            mid = get_message_id(cid, dag)  # kan intussen al opgeruimd zijn
+            if not mid:
+                continue
+            msg = await fetch_message_or_none(channel, mid)
+            if msg is not None:
+                await outbound_queue.submit(
+                    ("delete", cid), functools.partial(safe_call, msg.delete)
                 )
-                if new_msg is not None:
-                    save_message_id(cid_val, d, new_msg.id)
-            except Exception as e:  # pragma: no cover
-                print(f"❌ Fout bij aanmaken bericht voor {d}: {e}")
+            await clear_message_id_async(cid, dag)
+            mark_render_dirty(cid, dag)
+
+    await update_poll_message(channel, ctx=ctx)
 
 
 def create_celebration_embed() -> discord.Embed:
@@ -454,7 +793,10 @@ async def check_all_voted_celebration(
 
         all_voted = True
         for dag in dagen:
-            count, _ = await get_non_voters_for_day(dag, guild_id, channel_id)
+            count, _ = await get_non_voters_for_day(dag, guild_id, channel_id, channel)
+            if count is None:
+                # Leden onbekend: geen "iedereen gestemd" en niets opruimen
+                return
             if count > 0:
                 all_voted = False
                 break
@@ -1,9 +1,25 @@
 # apps/utils/poll_settings.py
-
+#
+# Instellingen per kanaal (poll_settings.json of SQLite).
+#
+# Lezen gaat via een in-memory cache: de JSON wordt alleen opnieuw geparsed als
+# het bestand (pad, mtime, grootte) verandert. _save_data vult de cache direct en
+# verhoogt een generatieteller (get_settings_generation) voor afgeleide caches.
+# get_channel_settings(channel_id) geeft een ChannelSettings-momentopname waarmee
+# alle instellingen van één kanaal zonder verdere lookups uit te lezen zijn.
+#
+# Schrijven is atomisch (atomic_json). In async code gebruik je de *_async-
+# varianten; die schrijven via een thread zodat de event loop niet blokkeert.
+
+import asyncio
+import copy
 import json
 import os
 from datetime import datetime, time
 
+from apps.utils.atomic_json import json_writer
+from apps.utils.sqlite_store import get_store, is_sqlite_backend
+
 SETTINGS_FILE = os.getenv("SETTINGS_FILE", "poll_settings.json")
 
 DAYS_INDEX = {
@@ -28,7 +44,48 @@ WEEK_DAYS = [
 ]
 
 
-def _load_data():
+# Gedeelde cache; nooit direct muteren (gebruik _load_data voor een kopie)
+_SETTINGS_CACHE: dict | None = None
+_SETTINGS_CACHE_KEY: tuple | None = None
+_SETTINGS_GENERATION = 0
+# Aantal lopende async schrijfacties; zolang > 0 is de cache leidend
+_PENDING_WRITES = 0
+# Callbacks (zonder argumenten) die na elke wijziging van de settings draaien
+_CHANGE_LISTENERS: list = []
+# Per guild: (stempel, {categorie-ID: [geactiveerde kanaal-IDs]}); zie
+# get_activated_channels_in_category. Kanaalwijzigingen in Discord verhogen
+# _CHANNEL_LAYOUT_EPOCH via invalidate_category_scopes.
+_CATEGORY_SCOPES: dict[int, tuple[tuple, dict[int, list[int]]]] = {}
+_CHANNEL_LAYOUT_EPOCH = 0
+
+DEFAULT_VISIBILITY = {"modus": "deadline", "tijd": "18:00"}
+DEFAULT_ENABLED_DAYS = ["vrijdag", "zaterdag", "zondag"]
+DEFAULT_NOTIFICATION_STATES = {
+    "poll_opened": True,
+    "poll_reset": True,
+    "poll_closed": True,
+    "reminders": False,
+    "thursday_reminder": False,
+    "misschien": False,
+    "doorgaan": True,
+    "celebration": True,
+}
+
+
+def _cache_key() -> tuple:
+    """Sleutel waarmee een wijziging van de opslag buiten dit proces herkend wordt."""
+    if is_sqlite_backend():
+        return ("sqlite", get_store().path)
+    try:
+        st = os.stat(SETTINGS_FILE)
+    except OSError:
+        return (SETTINGS_FILE, None, None)
+    return (SETTINGS_FILE, st.st_mtime_ns, st.st_size)
+
+
+def _read_from_disk() -> dict:
+    if is_sqlite_backend():
+        return get_store().load_document("settings")
     if os.path.exists(SETTINGS_FILE):
         with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
             try:
@@ -38,9 +95,216 @@ def _load_data():
     return {}
 
 
+def _read_data() -> dict:
+    """Gedeelde settings uit de cache (alleen-lezen)."""
+    global _SETTINGS_CACHE, _SETTINGS_CACHE_KEY, _SETTINGS_GENERATION
+    if _SETTINGS_CACHE is not None and _PENDING_WRITES:
+        return _SETTINGS_CACHE
+    key = _cache_key()
+    if _SETTINGS_CACHE is None or key != _SETTINGS_CACHE_KEY:
+        _SETTINGS_CACHE = _read_from_disk()
+        _SETTINGS_CACHE_KEY = key
+        _SETTINGS_GENERATION += 1
+        _notify_listeners()
+    return _SETTINGS_CACHE
+
+
+def _load_data():
+    """Kopie van alle settings; veilig om te muteren en met _save_data op te slaan."""
+    return copy.deepcopy(_read_data())
+
+
+def _set_cache(data) -> dict:
+    """Maak 'data' (als kopie) de nieuwe gedeelde cache en geef die terug."""
+    global _SETTINGS_CACHE, _SETTINGS_GENERATION
+    _SETTINGS_CACHE = copy.deepcopy(data)
+    _SETTINGS_GENERATION += 1
+    _notify_listeners()
+    return _SETTINGS_CACHE
+
+
 def _save_data(data):
-    with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    global _SETTINGS_CACHE_KEY
+    snapshot = _set_cache(data)
+    if is_sqlite_backend():
+        get_store().save_document("settings", snapshot)
+    else:
+        json_writer.write(SETTINGS_FILE, snapshot)
+    _SETTINGS_CACHE_KEY = _cache_key()
+
+
+async def _save_data_async(data) -> None:
+    """Als _save_data, maar de schijf-I/O gebeurt buiten de event loop."""
+    global _SETTINGS_CACHE_KEY, _PENDING_WRITES
+    # Cache meteen bijwerken: lezers zien de wijziging direct
+    snapshot = _set_cache(data)
+    _PENDING_WRITES += 1
+    try:
+        if is_sqlite_backend():
+            # Altijd de nieuwste cache schrijven, zodat volgorde niet uitmaakt
+            await asyncio.to_thread(
+                lambda: get_store().save_document("settings", _SETTINGS_CACHE or {})
+            )
+        else:
+            await json_writer.write_async(SETTINGS_FILE, snapshot)
+    finally:
+        _PENDING_WRITES -= 1
+    if not _PENDING_WRITES:
+        _SETTINGS_CACHE_KEY = _cache_key()
+
+
+def _invalidate_settings_cache() -> None:
+    global _SETTINGS_CACHE, _SETTINGS_CACHE_KEY, _SETTINGS_GENERATION
+    _SETTINGS_CACHE = None
+    _SETTINGS_CACHE_KEY = None
+    _SETTINGS_GENERATION += 1
+    _notify_listeners()
+
+
+def get_settings_generation() -> int:
+    """Teller die verhoogd wordt bij elke (bekende) wijziging van de settings."""
+    _read_data()
+    return _SETTINGS_GENERATION
+
+
+def add_settings_listener(callback) -> None:
+    """Registreer een callback die na elke (bekende) settings-wijziging wordt aangeroepen."""
+    if callback not in _CHANGE_LISTENERS:
+        _CHANGE_LISTENERS.append(callback)
+
+
+def remove_settings_listener(callback) -> None:
+    if callback in _CHANGE_LISTENERS:
+        _CHANGE_LISTENERS.remove(callback)
+
+
+def _notify_listeners() -> None:
+    for callback in list(_CHANGE_LISTENERS):
+        try:
+            callback()
+        except Exception:  # pragma: no cover
+            pass
+
+
+class ChannelSettings:
+    """
+    Momentopname van alle instellingen van één kanaal.
+
+    Haal hem één keer op met get_channel_settings() en lees daarna zonder
+    verdere lookups; een wijziging via de set_*-functies maakt een nieuwe
+    momentopname nodig (zie 'generation').
+    """
+
+    __slots__ = ("channel_id", "generation", "_ch", "_defaults")
+
+    def __init__(self, channel_id: int, data: dict, generation: int = 0):
+        self.channel_id = channel_id
+        self.generation = generation
+        self._ch = data.get(str(channel_id), {}) or {}
+        self._defaults = data.get("defaults", {}) or {}
+
+    @property
+    def has_settings(self) -> bool:
+        return bool(self._ch)
+
+    @property
+    def paused(self) -> bool:
+        return bool(self._ch.get("__paused__", False))
+
+    @property
+    def language(self) -> str:
+        return self._ch.get("__language__", DEFAULT_LANGUAGE)
+
+    def get_setting(self, dag: str) -> dict:
+        return dict(self._ch.get(dag, DEFAULT_VISIBILITY))
+
+    @property
+    def scheduled_activation(self) -> dict | None:
+        return copy.deepcopy(self._ch.get("__scheduled_activation__"))
+
+    @property
+    def scheduled_deactivation(self) -> dict | None:
+        return copy.deepcopy(self._ch.get("__scheduled_deactivation__"))
+
+    @property
+    def notification_states(self) -> dict[str, bool]:
+        notif_data = self._ch.get("__notification_states__", {})
+        return {
+            key: notif_data.get(key, default)
+            for key, default in DEFAULT_NOTIFICATION_STATES.items()
+        }
+
+    def is_notification_enabled(self, key: str) -> bool:
+        return self.notification_states.get(key, False)
+
+    @property
+    def enabled_days(self) -> list[str]:
+        enabled = self._ch.get("__enabled_days__")
+        if isinstance(enabled, list):
+            return list(enabled)
+        return DEFAULT_ENABLED_DAYS.copy()
+
+    def get_poll_option_state(self, dag: str, tijd: str) -> bool:
+        options = self._ch.get("__poll_options__", {})
+        # Key format: "vrijdag_19:00" of "zaterdag_20:30"
+        key = f"{dag.lower()}_{tijd}"
+        # Default: alleen vrijdag, zaterdag, zondag enabled
+        return options.get(key, dag.lower() in DEFAULT_ENABLED_DAYS)
+
+    @property
+    def poll_options_state(self) -> dict:
+        return {
+            f"{dag}_{tijd}": self.get_poll_option_state(dag, tijd)
+            for dag in WEEK_DAYS
+            for tijd in ["19:00", "20:30"]
+        }
+
+    def is_day_completely_disabled(self, dag: str) -> bool:
+        from apps.entities.poll_option import get_options_for_day
+
+        day_options = get_options_for_day(dag)
+
+        # Als er geen opties zijn voor deze dag, check de standaard tijden (backwards compatibility)
+        if not day_options:
+            return not self.get_poll_option_state(
+                dag, "19:00"
+            ) and not self.get_poll_option_state(dag, "20:30")
+
+        # Check of er minstens één tijd enabled is voor deze dag
+        # We moeten zowel long form ("om 19:00 uur") als short form ("19:00") checken
+        options_data = self._ch.get("__poll_options__", {})
+        for opt in day_options:
+            # Skip special options zoals "misschien" en "niet meedoen"
+            if opt.tijd in ["misschien", "niet meedoen"]:
+                continue
+
+            # Extract short form (bijv. "om 19:00 uur" -> "19:00")
+            short_form = opt.tijd.replace("om ", "").replace(" uur", "").strip()
+            key_long = f"{dag.lower()}_{opt.tijd}"
+            key_short = f"{dag.lower()}_{short_form}"
+
+            # Kijk of één van de twee keys een expliciete setting heeft
+            if key_long in options_data:
+                if options_data[key_long]:
+                    return False
+            elif key_short in options_data:
+                if options_data[key_short]:
+                    return False
+            elif dag.lower() in DEFAULT_ENABLED_DAYS:
+                # Geen expliciete setting: alleen vrijdag, zaterdag, zondag enabled
+                return False
+
+        return True
+
+    @property
+    def enabled_poll_days(self) -> list[str]:
+        return [dag for dag in WEEK_DAYS if not self.is_day_completely_disabled(dag)]
+
+
+def get_channel_settings(channel_id: int) -> ChannelSettings:
+    """Alle instellingen van één kanaal in één keer (uit de cache)."""
+    data = _read_data()
+    return ChannelSettings(channel_id, data, _SETTINGS_GENERATION)
 
 
 def get_setting(channel_id: int, dag: str):
@@ -48,10 +312,7 @@ def get_setting(channel_id: int, dag: str):
     Geef de instelling voor zichtbaarheid en tijdstip terug.
     Standaard: {'modus': 'deadline', 'tijd': '18:00'}.
     """
-    data = _load_data()
-    return data.get(str(channel_id), {}).get(
-        dag, {"modus": "deadline", "tijd": "18:00"}
-    )
+    return get_channel_settings(channel_id).get_setting(dag)
 
 
 def set_visibility(channel_id: int, dag: str, modus: str, tijd: str = "18:00"):
@@ -183,16 +444,23 @@ def should_hide_ghosts(channel_id: int, dag: str, now: datetime) -> bool:
 
 
 def is_paused(channel_id: int) -> bool:
+    return get_channel_settings(channel_id).paused
+
+
+def _with_paused(channel_id: int, value: bool) -> dict:
     data = _load_data()
-    return bool(data.get(str(channel_id), {}).get("__paused__", False))
+    data.setdefault(str(channel_id), {})["__paused__"] = bool(value)
+    return data
 
 
 def set_paused(channel_id: int, value: bool) -> bool:
-    data = _load_data()
-    ch = data.setdefault(str(channel_id), {})
-    ch["__paused__"] = bool(value)
-    _save_data(data)
-    return ch["__paused__"]
+    _save_data(_with_paused(channel_id, value))
+    return bool(value)
+
+
+async def set_paused_async(channel_id: int, value: bool) -> bool:
+    await _save_data_async(_with_paused(channel_id, value))
+    return bool(value)
 
 
 def toggle_paused(channel_id: int) -> bool:
@@ -201,8 +469,11 @@ def toggle_paused(channel_id: int) -> bool:
 
 def reset_settings() -> None:
     """Verwijdert alle zichtbaarheid- en pauze-instellingen."""
-    if os.path.exists(SETTINGS_FILE):
+    if is_sqlite_backend():
+        get_store().clear_document("settings")
+    elif os.path.exists(SETTINGS_FILE):
         os.remove(SETTINGS_FILE)
+    _invalidate_settings_cache()
 
 
 # ========================================================================
@@ -223,8 +494,7 @@ def get_scheduled_activation(channel_id: int) -> dict | None:
             'tijd': 'HH:mm'
         }
     """
-    data = _load_data()
-    return data.get(str(channel_id), {}).get("__scheduled_activation__")
+    return get_channel_settings(channel_id).scheduled_activation
 
 
 def set_scheduled_activation(
@@ -265,15 +535,28 @@ def set_scheduled_activation(
     return schedule
 
 
+def _without_channel_key(channel_id: int, key: str) -> dict | None:
+    """Settings zonder 'key' voor dit kanaal, of None als er niets te wissen is."""
+    if key not in _read_data().get(str(channel_id), {}):
+        return None
+    data = _load_data()
+    del data[str(channel_id)][key]
+    return data
+
+
 def clear_scheduled_activation(channel_id: int) -> None:
     """Verwijder de geplande activatie voor een kanaal."""
-    data = _load_data()
-    ch = data.get(str(channel_id), {})
-    if "__scheduled_activation__" in ch:
-        del ch["__scheduled_activation__"]
+    data = _without_channel_key(channel_id, "__scheduled_activation__")
+    if data is not None:
         _save_data(data)
 
 
+async def clear_scheduled_activation_async(channel_id: int) -> None:
+    data = _without_channel_key(channel_id, "__scheduled_activation__")
+    if data is not None:
+        await _save_data_async(data)
+
+
 # ========================================================================
 # Scheduling Functions for Poll Deactivation (/dmk-poll-off)
 # ========================================================================
@@ -292,8 +575,7 @@ def get_scheduled_deactivation(channel_id: int) -> dict | None:
             'tijd': 'HH:mm'
         }
     """
-    data = _load_data()
-    return data.get(str(channel_id), {}).get("__scheduled_deactivation__")
+    return get_channel_settings(channel_id).scheduled_deactivation
 
 
 def set_scheduled_deactivation(
@@ -336,13 +618,17 @@ def set_scheduled_deactivation(
 
 def clear_scheduled_deactivation(channel_id: int) -> None:
     """Verwijder de geplande deactivatie voor een kanaal."""
-    data = _load_data()
-    ch = data.get(str(channel_id), {})
-    if "__scheduled_deactivation__" in ch:
-        del ch["__scheduled_deactivation__"]
+    data = _without_channel_key(channel_id, "__scheduled_deactivation__")
+    if data is not None:
         _save_data(data)
 
 
+async def clear_scheduled_deactivation_async(channel_id: int) -> None:
+    data = _without_channel_key(channel_id, "__scheduled_deactivation__")
+    if data is not None:
+        await _save_data_async(data)
+
+
 # ========================================================================
 # Global Default Schedules
 # ========================================================================
@@ -360,8 +646,7 @@ def get_default_activation() -> dict | None:
             'tijd': '20:00'
         }
     """
-    data = _load_data()
-    return data.get("defaults", {}).get("activation")
+    return copy.deepcopy(_read_data().get("defaults", {}).get("activation"))
 
 
 def get_default_deactivation() -> dict | None:
@@ -376,8 +661,7 @@ def get_default_deactivation() -> dict | None:
             'tijd': '00:00'
         }
     """
-    data = _load_data()
-    return data.get("defaults", {}).get("deactivation")
+    return copy.deepcopy(_read_data().get("defaults", {}).get("deactivation"))
 
 
 def set_default_activation(value: dict | None) -> None:
@@ -478,6 +762,34 @@ def get_effective_deactivation(channel_id: int) -> tuple[dict | None, bool]:
     return (None, False)
 
 
+def get_all_schedules() -> list[tuple[str, int | None, dict]]:
+    """
+    Alle geplande (de)activaties in één keer uit de cache.
+
+    Returns:
+        Lijst van (soort, kanaal-ID, schema) met soort 'activation' of
+        'deactivation'; kanaal-ID is None voor de globale defaults.
+    """
+    data = _read_data()
+    result: list[tuple[str, int | None, dict]] = []
+    defaults = data.get("defaults", {}) or {}
+    for kind in ("activation", "deactivation"):
+        if isinstance(defaults.get(kind), dict):
+            result.append((kind, None, copy.deepcopy(defaults[kind])))
+    for key, ch in data.items():
+        if key == "defaults" or not isinstance(ch, dict):
+            continue
+        try:
+            cid = int(key)
+        except ValueError:
+            continue
+        for kind in ("activation", "deactivation"):
+            schedule = ch.get(f"__scheduled_{kind}__")
+            if isinstance(schedule, dict):
+                result.append((kind, cid, copy.deepcopy(schedule)))
+    return result
+
+
 # ========================================================================
 # Language Settings (per channel)
 # ========================================================================
@@ -493,8 +805,7 @@ def get_language(channel_id: int) -> str:
     Returns:
         Language code ('nl' or 'en'), default: 'nl'
     """
-    data = _load_data()
-    return data.get(str(channel_id), {}).get("__language__", DEFAULT_LANGUAGE)
+    return get_channel_settings(channel_id).language
 
 
 def set_language(channel_id: int, language: str) -> str:
@@ -535,24 +846,7 @@ def get_all_notification_states(channel_id: int) -> dict[str, bool]:
         Dict met keys: poll_opened, poll_reset, poll_closed, reminders,
         thursday_reminder, misschien, doorgaan, celebration
     """
-    data = _load_data()
-    ch_data = data.get(str(channel_id), {})
-    notif_data = ch_data.get("__notification_states__", {})
-
-    # Default states
-    defaults = {
-        "poll_opened": True,
-        "poll_reset": True,
-        "poll_closed": True,
-        "reminders": False,
-        "thursday_reminder": False,
-        "misschien": False,
-        "doorgaan": True,
-        "celebration": True,
-    }
-
-    # Merge met opgeslagen data
-    return {key: notif_data.get(key, default) for key, default in defaults.items()}
+    return get_channel_settings(channel_id).notification_states
 
 
 def toggle_notification_setting(channel_id: int, key: str) -> bool:
@@ -643,8 +937,7 @@ def is_notification_enabled(channel_id: int, key: str) -> bool:
     Returns:
         True als enabled, anders False
     """
-    states = get_all_notification_states(channel_id)
-    return states.get(key, False)
+    return get_channel_settings(channel_id).is_notification_enabled(key)
 
 
 # ========================================================================
@@ -659,17 +952,7 @@ def get_enabled_days(channel_id: int) -> list[str]:
     Returns:
         List van dag-namen, default: ['vrijdag', 'zaterdag', 'zondag']
     """
-    data = _load_data()
-    ch_data = data.get(str(channel_id), {})
-    enabled = ch_data.get("__enabled_days__")
-
-    # Default: alleen weekend dagen (vrijdag, zaterdag, zondag)
-    DEFAULT_ENABLED_DAYS = ["vrijdag", "zaterdag", "zondag"]
-
-    if enabled is None:
-        return DEFAULT_ENABLED_DAYS.copy()
-
-    return enabled if isinstance(enabled, list) else DEFAULT_ENABLED_DAYS.copy()
+    return get_channel_settings(channel_id).enabled_days
 
 
 def set_enabled_days(channel_id: int, dagen: list[str]) -> list[str]:
@@ -724,16 +1007,7 @@ def get_poll_option_state(channel_id: int, dag: str, tijd: str) -> bool:
     Returns:
         True als enabled, False als disabled
     """
-    data = _load_data()
-    ch_data = data.get(str(channel_id), {})
-    options = ch_data.get("__poll_options__", {})
-
-    # Key format: "vrijdag_19:00" of "zaterdag_20:30"
-    key = f"{dag.lower()}_{tijd}"
-
-    # Default: alleen vrijdag, zaterdag, zondag enabled
-    default_enabled = dag.lower() in ["vrijdag", "zaterdag", "zondag"]
-    return options.get(key, default_enabled)
+    return get_channel_settings(channel_id).get_poll_option_state(dag, tijd)
 
 
 def set_poll_option_state(channel_id: int, dag: str, tijd: str, enabled: bool) -> bool:
@@ -795,20 +1069,8 @@ def get_all_poll_options_state(channel_id: int) -> dict:
     Returns:
         Dict met keys zoals "vrijdag_19:00" en values True/False
     """
-    data = _load_data()
-    ch_data = data.get(str(channel_id), {})
-    options = ch_data.get("__poll_options__", {})
-
-    # Return all 14 options met defaults (alleen weekend dagen enabled)
-    result = {}
-    for dag in WEEK_DAYS:
-        for tijd in ["19:00", "20:30"]:
-            key = f"{dag}_{tijd}"
-            # Default: alleen vrijdag, zaterdag, zondag enabled
-            default_enabled = dag in ["vrijdag", "zaterdag", "zondag"]
-            result[key] = options.get(key, default_enabled)
-
-    return result
+    # Alle 14 opties met defaults (alleen weekend dagen enabled)
+    return get_channel_settings(channel_id).poll_options_state
 
 
 def get_enabled_times_for_day(channel_id: int, dag: str) -> list[str]:
@@ -844,54 +1106,7 @@ def is_day_completely_disabled(channel_id: int, dag: str) -> bool:
     Returns:
         True als alle tijdslots voor deze dag disabled zijn, anders False
     """
-    from apps.entities.poll_option import get_poll_options
-
-    # Haal alle poll opties op voor deze dag
-    day_options = [opt for opt in get_poll_options() if opt.dag == dag]
-
-    # Als er geen opties zijn voor deze dag, check de standaard tijden (backwards compatibility)
-    if not day_options:
-        # Fallback naar hardcoded tijden voor backwards compatibility
-        has_19 = get_poll_option_state(channel_id, dag, "19:00")
-        has_2030 = get_poll_option_state(channel_id, dag, "20:30")
-        return not has_19 and not has_2030
-
-    # Check of er minstens één tijd enabled is voor deze dag
-    # We moeten zowel long form ("om 19:00 uur") als short form ("19:00") checken
-    data = _load_data()
-    ch_data = data.get(str(channel_id), {})
-    options_data = ch_data.get("__poll_options__", {})
-
-    has_enabled = False
-    for opt in day_options:
-        # Skip special options zoals "misschien" en "niet meedoen"
-        if opt.tijd in ["misschien", "niet meedoen"]:
-            continue
-
-        # Extract short form (bijv. "om 19:00 uur" -> "19:00")
-        short_form = opt.tijd.replace("om ", "").replace(" uur", "").strip()
-
-        # Check beide keys
-        key_long = f"{dag.lower()}_{opt.tijd}"
-        key_short = f"{dag.lower()}_{short_form}"
-
-        # Kijk of één van de twee keys een expliciete setting heeft
-        if key_long in options_data:
-            if options_data[key_long]:
-                has_enabled = True
-                break
-        elif key_short in options_data:
-            if options_data[key_short]:
-                has_enabled = True
-                break
-        else:
-            # Geen expliciete setting, gebruik default
-            # Default: alleen vrijdag, zaterdag, zondag enabled
-            if dag.lower() in ["vrijdag", "zaterdag", "zondag"]:
-                has_enabled = True
-                break
-
-    return not has_enabled
+    return get_channel_settings(channel_id).is_day_completely_disabled(dag)
 
 
 def get_enabled_poll_days(channel_id: int) -> list[str]:
@@ -904,7 +1119,7 @@ def get_enabled_poll_days(channel_id: int) -> list[str]:
     Returns:
         Lijst van enabled dagen (bijv. ['vrijdag', 'zondag'])
     """
-    return [dag for dag in WEEK_DAYS if not is_day_completely_disabled(channel_id, dag)]
+    return get_channel_settings(channel_id).enabled_poll_days
 
 
 # ========================================================================
@@ -912,6 +1127,44 @@ def get_enabled_poll_days(channel_id: int) -> list[str]:
 # ========================================================================
 
 
+def invalidate_category_scopes(guild_id: int | None = None) -> None:
+    """
+    Vergeet de gecachte categorie-indeling (bij aanmaken, verwijderen of
+    verplaatsen van kanalen). Zonder guild_id voor alle guilds.
+    """
+    global _CHANNEL_LAYOUT_EPOCH
+    if guild_id is None:
+        _CATEGORY_SCOPES.clear()
+        _CHANNEL_LAYOUT_EPOCH += 1
+    else:
+        _CATEGORY_SCOPES.pop(guild_id, None)
+
+
+def _category_scope_stamp() -> tuple:
+    from apps.utils.poll_message import get_data_generation
+
+    # Settings (pauze/activatie) en poll_message.json (stopzetten) bepalen wie meedoet
+    return (get_settings_generation(), get_data_generation(), _CHANNEL_LAYOUT_EPOCH)
+
+
+def _build_category_scopes(guild) -> dict[int, list[int]]:
+    from apps.utils.poll_message import is_channel_disabled
+
+    scopes: dict[int, list[int]] = {}
+    data = _read_data()
+    for channel in guild.text_channels:
+        category_id = getattr(channel, "category_id", None)
+        if not category_id:
+            continue
+        if is_channel_disabled(channel.id):
+            continue
+        # Check if channel has been activated (has poll settings and not paused)
+        settings = data.get(str(channel.id), {})
+        if settings and not settings.get("__paused__", True):
+            scopes.setdefault(category_id, []).append(channel.id)
+    return scopes
+
+
 def get_activated_channels_in_category(guild, category_id: int) -> list[int]:
     """
     Return list of channel IDs in this category that have active polls.
@@ -921,6 +1174,9 @@ def get_activated_channels_in_category(guild, category_id: int) -> list[int]:
     - It's not permanently disabled (via /dmk-poll-stopzetten)
     - It has settings and is not paused
 
+    The category → channels map is built once per guild and reused until
+    the settings, poll_message data or the guild's channel layout change.
+
     Args:
         guild: Discord guild object
         category_id: The Discord category ID
@@ -928,19 +1184,16 @@ def get_activated_channels_in_category(guild, category_id: int) -> list[int]:
     Returns:
         List of channel IDs with active polls in this category
     """
-    from apps.utils.poll_message import is_channel_disabled
-
-    activated = []
-    for channel in guild.text_channels:
-        if channel.category_id != category_id:
-            continue
-        if is_channel_disabled(channel.id):
-            continue
-        # Check if channel has been activated (has poll settings and not paused)
-        settings = _load_data().get(str(channel.id), {})
-        if settings and not settings.get("__paused__", True):
-            activated.append(channel.id)
-    return activated
+    guild_id = getattr(guild, "id", None)
+    stamp = _category_scope_stamp()
+    cached = _CATEGORY_SCOPES.get(guild_id) if guild_id is not None else None
+    if cached is not None and cached[0] == stamp:
+        scopes = cached[1]
+    else:
+        scopes = _build_category_scopes(guild)
+        if guild_id is not None:
+            _CATEGORY_SCOPES[guild_id] = (stamp, scopes)
+    return list(scopes.get(category_id, []))
 
 
 def get_vote_scope_channels(channel) -> list[int]:
@@ -1063,10 +1316,11 @@ def get_enabled_rolling_window_days(
     window = get_rolling_window_days(dag_als_vandaag)
 
     # Filter op enabled dagen (volgens poll option settings)
+    settings = get_channel_settings(channel_id)
     enabled_days = []
     for day_info in window:
         dag = day_info["dag"]
-        if not is_day_completely_disabled(channel_id, dag):
+        if not settings.is_day_completely_disabled(dag):
             enabled_days.append({
                 "dag": dag,
                 "datum_iso": day_info["datum"].strftime("%Y-%m-%d"),
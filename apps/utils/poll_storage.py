@@ -1,7 +1,7 @@
 # apps/utils/poll_storage.py
 #
 # Scoped opslag van stemmen: per guild_id → per channel_id → per user_id.
-# Geen legacy, geen migratie: dit bestand verwacht alleen de nieuwe structuur.
+# Geen legacy-structuur: dit bestand verwacht alleen guilds → channels → users.
 #
 # Publieke API (async):
 # - load_votes(guild_id: int|str | None = None, channel_id: int|str | None = None) -> dict
@@ -18,24 +18,151 @@
 # - add_guest_votes(owner_user_id, dag, tijd, namen, guild_id, channel_id) -> (list[str], list[str])
 # - remove_guest_votes(owner_user_id, dag, tijd, namen, guild_id, channel_id) -> (list[str], list[str])
 # - update_non_voters(guild_id, channel_id, channel) -> None
-# - get_non_voters_for_day(dag, guild_id, channel_id) -> (int, list[str])
+# - get_non_voters_for_day(dag, guild_id, channel_id, channel=None) -> (int | None, list[str])
+# - get_scope_version(guild_id, channel_id) -> (int, int)
+# - get_scope_snapshot(guild_id, scope_channel_ids) -> ScopeSnapshot
+# - warm_votes_cache() -> None
+# - compact_votes_journal() -> bool
+# - migrate_votes_to_shards(src_path=None, dst_dir=None) -> int
+#
+# Opslag: de root wordt één keer van schijf geladen en daarna in het geheugen
+# gehouden (authoritatief zolang de bot draait). Lezen gaat uit het geheugen,
+# elke mutatie wordt direct (write-through) weggeschreven:
+# - VOTES_PERSISTENCE=snapshot (standaard): hele root atomisch naar votes.json.
+# - VOTES_PERSISTENCE=journal: alleen de gewijzigde gebruikers als JSON-regel
+#   achter votes.json.journal; compactie naar votes.json bij VOTES_JOURNAL_MAX_BYTES
+#   of via compact_votes_journal() (scheduler). Bij laden wordt het journal
+#   over de snapshot afgespeeld.
+# - VOTES_DIR=<map> (gesharded): één bestand per scope onder
+#   <map>/guilds/<gid>/channels/<cid>.json met een lock per scope, zodat
+#   kanalen elkaar niet blokkeren. Een bestaande votes.json wordt bij de eerste
+#   start automatisch gemigreerd (of handmatig via migrate_votes.py).
+# - STORAGE_BACKEND=sqlite: stemmen in SQLite (zie sqlite_store.py), met een
+#   lock per scope.
+#   Importeren/exporteren van de JSON-bestanden gaat via storage_tool.py.
+#
+# Tellingen: per (guild, kanaal, dag, tijd) wordt een teller bijgehouden die bij
+# elke mutatie alleen voor de gewijzigde gebruikers wordt bijgewerkt, plus per
+# dag de set stemmers. get_counts_for_day() leest die tellers (O(opties), los
+# van het aantal leden). Niet-stemmers worden niet opgeslagen maar berekend als
+# leden (bijgehouden door update_non_voters) min stemmers.
 
 import asyncio
+import contextlib
+import copy
+import itertools
 import json
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
 from apps.entities.poll_option import get_poll_options, is_valid_option
+from apps.utils.atomic_json import write_json_atomic
+from apps.utils.member_roster import channel_roster, roster_member_ids
+from apps.utils.sqlite_store import get_sqlite_path, get_store, is_sqlite_backend
 
 SPECIALS = {"misschien", "niet meedoen"}
 
 _VOTES_LOCK = asyncio.Lock()
 
+# Lock per (guild_id, channel_id); alleen gebruikt in gesharde modus
+_SCOPE_LOCKS: Dict[tuple[str, str], asyncio.Lock] = {}
+
+# In-memory root, gekoppeld aan het pad waarvan hij geladen is.
+# Wisselt het pad (VOTES_FILE), dan wordt opnieuw van schijf geladen.
+_ROOT_CACHE: Optional[Dict[str, Any]] = None
+_ROOT_CACHE_PATH: Optional[str] = None
+
+# Index per (guild_id, channel_id) met tellers en stemmers per dag, horend bij
+# de root in _TALLIES_ROOT. Een nieuwe root maakt alle indexen ongeldig.
+_TALLIES: Dict[tuple[str, str], "_ScopeIndex"] = {}
+_TALLIES_ROOT: Optional[Dict[str, Any]] = None
+
+# Leden (zonder bots) per (guild_id, channel_id), bijgewerkt door
+# update_non_voters(). Alleen in het geheugen: niet-stemmers worden berekend.
+_MEMBERS: Dict[tuple[str, str], Dict[str, None]] = {}
+
+# Versie per (guild_id, channel_id): verandert bij elke mutatie van stemmen of
+# leden, zodat render-caches weten wanneer een bericht opnieuw moet.
+_VERSION_COUNTER = itertools.count(1)
+_SCOPE_VERSIONS: Dict[tuple[str, str], int] = {}
+_VERSIONS_ROOT: Optional[Dict[str, Any]] = None
+_VERSIONS_EPOCH = 0
+
+# Laatste snapshot per (guild, kanalen in scope); geldig zolang de versies van
+# alle kanalen in de scope gelijk blijven (zie get_scope_snapshot)
+_SNAPSHOTS: Dict[tuple[str, tuple[str, ...]], "ScopeSnapshot"] = {}
+
 
 def get_votes_path() -> str:
     return os.getenv("VOTES_FILE", "votes.json")
 
 
+def get_votes_dir() -> Optional[str]:
+    """Map voor gesharde opslag (VOTES_DIR); None betekent één votes.json."""
+    votes_dir = os.getenv("VOTES_DIR", "").strip()
+    return votes_dir or None
+
+
+def _storage_key() -> str:
+    """Identificeert de opslaglocatie waar de in-memory root bij hoort."""
+    if is_sqlite_backend():
+        return f"sqlite:{get_sqlite_path()}"
+    return get_votes_dir() or get_votes_path()
+
+
+def _per_scope_locks() -> bool:
+    """Schrijven per kanaal is onafhankelijk bij shards en SQLite."""
+    return is_sqlite_backend() or bool(get_votes_dir())
+
+
+def _tracks_ops() -> bool:
+    """Backends die mutaties als losse ops (per gebruiker) persisteren."""
+    return is_sqlite_backend() or (_journal_enabled() and not get_votes_dir())
+
+
+def _safe_segment(value: str) -> str:
+    if not value or value in {".", ".."} or "/" in value or "\\" in value:
+        raise ValueError(f"Ongeldige scope voor bestandsnaam: {value!r}")
+    return value
+
+
+def get_shard_path(
+    guild_id: int | str, channel_id: int | str, votes_dir: Optional[str] = None
+) -> str:
+    return os.path.join(
+        votes_dir or get_votes_dir() or "votes",
+        "guilds",
+        _safe_segment(str(guild_id)),
+        "channels",
+        f"{_safe_segment(str(channel_id))}.json",
+    )
+
+
+def _scope_lock(guild_id: str, channel_id: str) -> asyncio.Lock:
+    """Schrijflock voor één scope: per kanaal bij shards/SQLite, anders de globale lock."""
+    if not _per_scope_locks():
+        return _VOTES_LOCK
+    lock = _SCOPE_LOCKS.get((guild_id, channel_id))
+    if lock is None:
+        lock = _SCOPE_LOCKS[(guild_id, channel_id)] = asyncio.Lock()
+    return lock
+
+
+def get_journal_path() -> str:
+    return f"{get_votes_path()}.journal"
+
+
+def _journal_enabled() -> bool:
+    return os.getenv("VOTES_PERSISTENCE", "snapshot").strip().lower() == "journal"
+
+
+def _journal_max_bytes() -> int:
+    try:
+        return int(os.getenv("VOTES_JOURNAL_MAX_BYTES", "1048576"))
+    except ValueError:  # pragma: no cover
+        return 1048576
+
+
 # -----------------------------
 # Interne I/O helpers
 # -----------------------------
@@ -57,27 +184,111 @@ async def _read_json(path: Optional[str] = None) -> Dict[str, Any]:
 
 
 async def _write_json(path: str, data: Dict[str, Any]) -> None:
-    def _write():
-        import time
-        tmp_path = f"{path}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+    await asyncio.to_thread(write_json_atomic, path, data)
+
+
+async def _append_journal(path: str, ops: list[Dict[str, Any]]) -> int:
+    """Schrijf mutaties als JSON-regels achter het journal; geeft de nieuwe grootte terug."""
+
+    def _append() -> int:
+        lines = "".join(
+            json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for op in ops
+        )
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
             f.flush()
             os.fsync(f.fileno())
+            return f.tell()
+
+    return await asyncio.to_thread(_append)
+
+
+async def _read_journal(path: str) -> list[Dict[str, Any]]:
+    """Lees alle complete journal-regels; kapotte (half geschreven) regels worden overgeslagen."""
+    if not os.path.exists(path):
+        return []
+
+    def _read() -> list[Dict[str, Any]]:
+        ops: list[Dict[str, Any]] = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    op = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(op, dict):
+                    ops.append(op)
+        return ops
+
+    return await asyncio.to_thread(_read)
+
 
-        # Retry logic for Windows file locking issues
-        max_retries = 5
-        for attempt in range(max_retries):  # pragma: no branch
+async def _remove_journal(path: str) -> None:
+    def _remove() -> None:
+        if os.path.exists(path):
+            os.remove(path)
+
+    await asyncio.to_thread(_remove)
+
+
+async def _read_shards(votes_dir: str) -> Dict[str, Any]:
+    """Bouw de root op uit alle shard-bestanden onder votes_dir."""
+
+    def _read() -> Dict[str, Any]:
+        root: Dict[str, Any] = {}
+        guilds_dir = os.path.join(votes_dir, "guilds")
+        if not os.path.isdir(guilds_dir):
+            return root
+        for gid in sorted(os.listdir(guilds_dir)):
+            channels_dir = os.path.join(guilds_dir, gid, "channels")
+            if not os.path.isdir(channels_dir):
+                continue
+            for name in sorted(os.listdir(channels_dir)):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(channels_dir, name), "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, json.JSONDecodeError):  # pragma: no cover
+                    continue
+                if isinstance(data, dict):
+                    _set_scoped(root, gid, name[: -len(".json")], data)
+        return root
+
+    return await asyncio.to_thread(_read)
+
+
+async def _remove_shard(path: str) -> None:
+    def _remove() -> None:
+        if os.path.exists(path):
+            os.remove(path)
+        # Lege mappen opruimen (channels/ en de guild-map)
+        channels_dir = os.path.dirname(path)
+        for d in (channels_dir, os.path.dirname(channels_dir)):
             try:
-                os.replace(tmp_path, path)
+                os.rmdir(d)
+            except OSError:
                 break
-            except PermissionError:  # pragma: no cover
-                if attempt < max_retries - 1:  # pragma: no cover
-                    time.sleep(0.01 * (attempt + 1))  # Exponential backoff
-                else:  # pragma: no cover
-                    raise
 
-    await asyncio.to_thread(_write)
+    await asyncio.to_thread(_remove)
+
+
+async def _write_shard(path: str, data: Dict[str, Any]) -> None:
+    await asyncio.to_thread(os.makedirs, os.path.dirname(path), exist_ok=True)
+    await _write_json(path, data)
+
+
+async def _clear_shards(votes_dir: str) -> None:
+    def _clear() -> None:
+        import shutil
+
+        shutil.rmtree(os.path.join(votes_dir, "guilds"), ignore_errors=True)
+
+    await asyncio.to_thread(_clear)
 
 
 def _ensure_root_structure(root: Dict[str, Any]) -> Dict[str, Any]:
@@ -96,7 +307,7 @@ def _ensure_guild_channel(root: Dict[str, Any], guild_id: str, channel_id: str)
 def _get_scoped(root: Dict[str, Any], guild_id: str, channel_id: str) -> Dict[str, Any]:
     g = root.get("guilds", {}).get(guild_id, {})
     ch = g.get("channels", {}).get(channel_id, {})
-    return dict(ch) if isinstance(ch, dict) else {}
+    return _copy_scoped(ch)
 
 
 def _set_scoped(
@@ -106,12 +317,374 @@ def _set_scoped(
     root["guilds"][guild_id]["channels"][channel_id] = dict(scoped_dict)
 
 
+def _drop_scope(root: Dict[str, Any], guild_id: str, channel_id: str) -> None:
+    """Verwijder één kanaal (en de guild als die daarna leeg is)."""
+    guilds = root.get("guilds")
+    if not isinstance(guilds, dict) or guild_id not in guilds:
+        return
+    guild_data = guilds[guild_id]
+    if "channels" in guild_data and channel_id in guild_data["channels"]:  # pragma: no branch
+        del guild_data["channels"][channel_id]
+        # Als guild geen channels meer heeft, verwijder de guild ook
+        if not guild_data.get("channels"):  # pragma: no branch
+            del guilds[guild_id]
+
+
+# -----------------------------
+# Journal (append-only mutaties)
+# -----------------------------
+#
+# Elke regel is idempotent (zet/verwijder één gebruiker, reset één kanaal), zodat
+# opnieuw afspelen over een nieuwere snapshot veilig is.
+
+
+def _diff_scoped_ops(
+    guild_id: str, channel_id: str, old: Any, new: Dict[str, Any]
+) -> list[Dict[str, Any]]:
+    """Bepaal de journal-regels die 'old' in 'new' veranderen (per gebruiker)."""
+    old = old if isinstance(old, dict) else {}
+    ops: list[Dict[str, Any]] = []
+    for uid, per_dag in new.items():
+        if old.get(uid) != per_dag:
+            ops.append({"op": "user", "g": guild_id, "c": channel_id, "u": uid, "v": per_dag})
+    for uid in old:
+        if uid not in new:
+            ops.append({"op": "del", "g": guild_id, "c": channel_id, "u": uid})
+    return ops
+
+
+def _apply_op(root: Dict[str, Any], op: Dict[str, Any]) -> None:
+    kind = op.get("op")
+    if kind == "reset_all":
+        root.clear()
+        return
+    gid, cid = str(op.get("g")), str(op.get("c"))
+    if kind == "user":
+        _ensure_guild_channel(root, gid, cid)
+        root["guilds"][gid]["channels"][cid][str(op.get("u"))] = op.get("v")
+    elif kind == "del":
+        ch = root.get("guilds", {}).get(gid, {}).get("channels", {}).get(cid)
+        if isinstance(ch, dict):
+            ch.pop(str(op.get("u")), None)
+    elif kind == "reset":
+        _drop_scope(root, gid, cid)
+
+
+# -----------------------------
+# Index per kanaal: tellers per dag/tijd en stemmers per dag
+# -----------------------------
+
+
+class _ScopeIndex:
+    """
+    counts:  {dag: {tijd: aantal stemmers}}
+    voters:  {dag: {lid-ID: aantal entries}}; een gast telt voor zijn eigenaar,
+             dus een lid blijft stemmer zolang er nog één entry over is.
+    legacy_non_voters: aantal oude, opgeslagen '_non_voter::'-entries.
+    """
+
+    __slots__ = ("counts", "voters", "legacy_non_voters")
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.voters: Dict[str, Dict[str, int]] = {}
+        self.legacy_non_voters = 0
+
+
+def _bump(table: Dict[str, Dict[str, int]], dag: str, key: str, delta: int) -> None:
+    per_key = table.setdefault(dag, {})
+    n = per_key.get(key, 0) + delta
+    if n:
+        per_key[key] = n
+    else:
+        per_key.pop(key, None)
+
+
+def _tally_user(tally: _ScopeIndex, uid: str, per_dag: Any, delta: int) -> None:
+    """Tel (delta=1) of ontel (delta=-1) de stemmen van één gebruiker."""
+    if _is_non_voter_id(uid):
+        tally.legacy_non_voters += delta
+    if not isinstance(per_dag, dict):
+        return
+    # Speciale entries ('_non_voter::', '_was_misschien::') zijn geen stemmers
+    owner = None if uid.startswith("_") else uid.split("_guest::", 1)[0]
+    for dag, tijden in per_dag.items():
+        if not isinstance(tijden, list) or not tijden:
+            continue
+        # Een gebruiker telt één keer per tijd, ook als die dubbel in de lijst staat
+        for tijd in {t for t in tijden if isinstance(t, str)}:
+            _bump(tally.counts, dag, tijd, delta)
+        if owner is not None:
+            _bump(tally.voters, dag, owner, delta)
+
+
+def _tallies_for(root: Dict[str, Any]) -> Dict[tuple[str, str], _ScopeIndex]:
+    global _TALLIES_ROOT
+    if _TALLIES_ROOT is not root:
+        _TALLIES.clear()
+        _TALLIES_ROOT = root
+    return _TALLIES
+
+
+def _get_tally(root: Dict[str, Any], guild_id: str, channel_id: str) -> _ScopeIndex:
+    """Index van één kanaal; de eerste keer opgebouwd uit de root."""
+    tallies = _tallies_for(root)
+    tally = tallies.get((guild_id, channel_id))
+    if tally is None:
+        tally = _ScopeIndex()
+        ch = root.get("guilds", {}).get(guild_id, {}).get("channels", {}).get(channel_id)
+        if isinstance(ch, dict):
+            for uid, per_dag in ch.items():
+                _tally_user(tally, str(uid), per_dag, 1)
+        tallies[(guild_id, channel_id)] = tally
+    return tally
+
+
+def _retally(
+    root: Dict[str, Any], guild_id: str, channel_id: str, old: Any, new: Any
+) -> None:
+    """Werk de tellers bij voor gebruikers die van 'old' naar 'new' gaan."""
+    tally = _tallies_for(root).get((guild_id, channel_id))
+    if tally is None:
+        return  # Nog niet opgebouwd: volgt bij de eerste leesactie
+    old = old if isinstance(old, dict) else {}
+    new = new if isinstance(new, dict) else {}
+    for uid, per_dag in new.items():
+        prev = old.get(uid)
+        if prev != per_dag or (prev is None and uid not in old):
+            if uid in old:
+                _tally_user(tally, str(uid), prev, -1)
+            _tally_user(tally, str(uid), per_dag, 1)
+    for uid, prev in old.items():
+        if uid not in new:
+            _tally_user(tally, str(uid), prev, -1)
+
+
+def _rebuild_tallies(root: Dict[str, Any]) -> None:
+    """Bouw de tellers van alle kanalen opnieuw op (startup)."""
+    global _TALLIES_ROOT
+    _TALLIES.clear()
+    _TALLIES_ROOT = root
+    for gid, guild_data in (root.get("guilds") or {}).items():
+        for cid in (guild_data.get("channels") or {}):
+            _get_tally(root, gid, cid)
+
+
+def _versions_for(root: Optional[Dict[str, Any]]) -> Dict[tuple[str, str], int]:
+    global _VERSIONS_ROOT, _VERSIONS_EPOCH
+    if _VERSIONS_ROOT is not root:
+        _SCOPE_VERSIONS.clear()
+        _VERSIONS_ROOT = root
+        _VERSIONS_EPOCH = next(_VERSION_COUNTER)
+    return _SCOPE_VERSIONS
+
+
+def _touch_scope(root: Dict[str, Any], guild_id: str, channel_id: str) -> None:
+    _versions_for(root)[(guild_id, channel_id)] = next(_VERSION_COUNTER)
+
+
+def get_scope_version(guild_id: int | str, channel_id: int | str) -> tuple[int, int]:
+    """
+    Versie van de stemmen + leden van één kanaal. Gelijk gebleven versie
+    betekent: niets veranderd sinds de vorige aanroep (ook niet na herladen).
+    """
+    versions = _versions_for(_cached_root())
+    return _VERSIONS_EPOCH, versions.get((str(guild_id), str(channel_id)), 0)
+
+
+def _cached_root() -> Optional[Dict[str, Any]]:
+    """Geef de in-memory root terug als die bij het huidige pad hoort."""
+    if _ROOT_CACHE is not None and _ROOT_CACHE_PATH == _storage_key():
+        return _ROOT_CACHE
+    return None
+
+
+def _invalidate_cache() -> None:
+    """Vergeet de in-memory root; de volgende toegang leest opnieuw van schijf."""
+    global _ROOT_CACHE, _ROOT_CACHE_PATH
+    _ROOT_CACHE = None
+    _ROOT_CACHE_PATH = None
+
+
 async def _get_root() -> Dict[str, Any]:
-    return await _read_json(get_votes_path())
+    """
+    Geef de (gedeelde) in-memory root terug; laadt hem één keer van schijf.
+    Aanroepers die muteren moeten _VOTES_LOCK vasthouden en daarna _save_root aanroepen.
+    """
+    global _ROOT_CACHE, _ROOT_CACHE_PATH
+    root = _cached_root()
+    if root is None:
+        key = _storage_key()
+        votes_dir = get_votes_dir()
+        if is_sqlite_backend():
+            root = await asyncio.to_thread(lambda: get_store().load_votes_root())
+        elif votes_dir:
+            root = await _read_shards(votes_dir)
+        else:
+            root = await _read_monolith(key)
+        _ROOT_CACHE, _ROOT_CACHE_PATH = root, key
+    return root
+
+
+async def _read_monolith(path: str) -> Dict[str, Any]:
+    root = await _read_json(path)
+    # Journal altijd afspelen (ook in snapshot-modus), anders gaan mutaties verloren
+    for op in await _read_journal(f"{path}.journal"):
+        _apply_op(root, op)
+    return root
+
+
+async def _ensure_root() -> Dict[str, Any]:
+    """In-memory root; een koude load gebeurt één keer onder _VOTES_LOCK."""
+    root = _cached_root()
+    if root is None:
+        async with _VOTES_LOCK:
+            root = await _get_root()
+    return root
 
 
 async def _save_root(root: Dict[str, Any]) -> None:
-    await _write_json(get_votes_path(), root)
+    """
+    Write-through: root wordt het geheugenbeeld én atomisch naar schijf geschreven.
+    Een volledige snapshot maakt het journal overbodig, dus dat wordt daarna verwijderd.
+    """
+    global _ROOT_CACHE, _ROOT_CACHE_PATH
+    key = _storage_key()
+    try:
+        if is_sqlite_backend():
+            await asyncio.to_thread(get_store().replace_votes_root, root)
+        elif get_votes_dir():
+            for gid, guild_data in (root.get("guilds") or {}).items():
+                for cid, ch in (guild_data.get("channels") or {}).items():
+                    await _write_shard(get_shard_path(gid, cid), ch)
+        else:
+            await _write_json(key, root)
+            await _remove_journal(get_journal_path())
+    except Exception:
+        # Geheugen mag niet vóórlopen op schijf: val terug op wat er staat
+        _invalidate_cache()
+        raise
+    _ROOT_CACHE, _ROOT_CACHE_PATH = root, key
+
+
+async def _commit(
+    root: Dict[str, Any], guild_id: str, channel_id: str, ops: list[Dict[str, Any]]
+) -> None:
+    """
+    Persisteer een mutatie van één scope in de in-memory root.
+    SQLite past alleen 'ops' toe; gesharded schrijft alleen het bestand van dat
+    kanaal; snapshot-modus de hele root; journal-modus alleen 'ops' (O(wijziging)).
+    """
+    if is_sqlite_backend():
+        if not ops:
+            return
+        try:
+            await asyncio.to_thread(get_store().apply_ops, ops)
+        except Exception:
+            _invalidate_cache()
+            raise
+        return
+    if get_votes_dir():
+        ch = root.get("guilds", {}).get(guild_id, {}).get("channels", {}).get(channel_id)
+        path = get_shard_path(guild_id, channel_id)
+        try:
+            if ch is None:
+                await _remove_shard(path)
+            else:
+                await _write_shard(path, ch)
+        except Exception:
+            _invalidate_cache()
+            raise
+        return
+    if not _journal_enabled():
+        await _save_root(root)
+        return
+    if not ops:
+        return
+    try:
+        size = await _append_journal(get_journal_path(), ops)
+    except Exception:
+        _invalidate_cache()
+        raise
+    if size >= _journal_max_bytes():
+        await _save_root(root)
+
+
+async def compact_votes_journal() -> bool:
+    """
+    Schrijf de in-memory root als snapshot naar votes.json en leeg het journal.
+    Geeft True terug als er een journal was om te compacteren.
+    """
+    if _per_scope_locks():
+        return False
+    async with _VOTES_LOCK:
+        if not os.path.exists(get_journal_path()):
+            return False
+        root = await _get_root()
+        await _save_root(root)
+        return True
+
+
+async def migrate_votes_to_shards(
+    src_path: Optional[str] = None, dst_dir: Optional[str] = None
+) -> int:
+    """
+    Zet een monolithische votes.json (plus eventueel journal) om naar shard-bestanden.
+    Het bronbestand blijft staan. Geeft het aantal geschreven kanalen terug.
+    """
+    src_path = src_path or get_votes_path()
+    dst_dir = dst_dir or get_votes_dir() or "votes"
+    root = await _read_monolith(src_path)
+    written = 0
+    for gid, guild_data in (root.get("guilds") or {}).items():
+        for cid, ch in (guild_data.get("channels") or {}).items():
+            path = get_shard_path(gid, cid, dst_dir)
+            await _write_shard(path, ch if isinstance(ch, dict) else {})
+            written += 1
+    return written
+
+
+def _has_shards(votes_dir: str) -> bool:
+    guilds_dir = os.path.join(votes_dir, "guilds")
+    return os.path.isdir(guilds_dir) and bool(os.listdir(guilds_dir))
+
+
+def _copy_user(per_dag: Any) -> Any:
+    if isinstance(per_dag, dict):
+        return {
+            dag: list(v) if isinstance(v, list) else copy.deepcopy(v)
+            for dag, v in per_dag.items()
+        }
+    return copy.deepcopy(per_dag)
+
+
+def _copy_scoped(ch: Any) -> Dict[str, Any]:
+    """Kopie van een kanaal-dict zodat aanroepers het geheugenbeeld niet muteren."""
+    if not isinstance(ch, dict):
+        return {}
+    return {uid: _copy_user(per_dag) for uid, per_dag in ch.items()}
+
+
+async def warm_votes_cache() -> None:
+    """
+    Laad votes.json (plus journal) bij startup in het geheugen (idempotent).
+    Een achtergebleven journal wordt meteen gecompacteerd.
+    """
+    async with _VOTES_LOCK:
+        votes_dir = get_votes_dir()
+        if votes_dir and not is_sqlite_backend():
+            if not _has_shards(votes_dir) and os.path.exists(get_votes_path()):
+                count = await migrate_votes_to_shards(get_votes_path(), votes_dir)
+                print(f"📦 votes.json gemigreerd naar {count} shard(s) in {votes_dir}")
+                _invalidate_cache()
+        root = await _get_root()
+        if (
+            not votes_dir
+            and not is_sqlite_backend()
+            and os.path.exists(get_journal_path())
+        ):
+            await _save_root(root)
+        _rebuild_tallies(root)
 
 
 def _empty_days() -> Dict[str, list]:
@@ -130,30 +703,82 @@ async def load_votes(
     """
     Zonder scope → volledige root (met 'guilds').
     Met scope → map {user_id -> {dag: [tijden]}} in die guild+channel.
+
+    Leest uit het geheugen; het resultaat is een kopie.
     """
-    async with _VOTES_LOCK:
-        root = await _get_root()
-        if guild_id is None or channel_id is None:
-            return root
-        gid, cid = str(guild_id), str(channel_id)
-        return _get_scoped(root, gid, cid)
+    root = await _ensure_root()
+    if guild_id is None or channel_id is None:
+        return copy.deepcopy(root)
+    gid, cid = str(guild_id), str(channel_id)
+    return _get_scoped(root, gid, cid)
 
 
 async def save_votes_scoped(
     guild_id: int | str, channel_id: int | str, scoped: Dict[str, Any]
 ) -> None:
-    async with _VOTES_LOCK:
-        gid, cid = str(guild_id), str(channel_id)
+    gid, cid = str(guild_id), str(channel_id)
+    await _ensure_root()
+    async with _scope_lock(gid, cid):
         root = await _get_root()
+        ops: list[Dict[str, Any]] = []
+        old = root.get("guilds", {}).get(gid, {}).get("channels", {}).get(cid)
+        if _tracks_ops():
+            ops = _diff_scoped_ops(gid, cid, old, scoped)
+        _retally(root, gid, cid, old, scoped)
         _set_scoped(root, gid, cid, scoped)
-        await _save_root(root)
+        _touch_scope(root, gid, cid)
+        await _commit(root, gid, cid, ops)
+
+
+def _peek_user(guild_id: str, channel_id: str, user_id: str) -> Any:
+    """Kopie van de stemmen van één gebruiker uit de in-memory root (of None)."""
+    root = _cached_root() or {}
+    ch = root.get("guilds", {}).get(guild_id, {}).get("channels", {}).get(channel_id)
+    if not isinstance(ch, dict) or user_id not in ch:
+        return None
+    return _copy_user(ch[user_id])
+
+
+async def _update_user(
+    guild_id: str,
+    channel_id: str,
+    user_id: str,
+    fn: Callable[[Optional[Dict[str, Any]]], Optional[Dict[str, Any]]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Lees-wijzig-schrijf van één gebruiker onder de scope-lock, zonder het hele
+    kanaal te kopiëren. 'fn' krijgt een kopie van de huidige stemmen (of None)
+    en geeft de nieuwe terug; None betekent: niets wijzigen.
+    Geeft een kopie van de opgeslagen stemmen terug (of None).
+    """
+    await _ensure_root()
+    async with _scope_lock(guild_id, channel_id):
+        root = await _get_root()
+        ch = root.get("guilds", {}).get(guild_id, {}).get("channels", {}).get(channel_id)
+        existed = isinstance(ch, dict) and user_id in ch
+        old = ch.get(user_id) if existed else None
+        new = fn(_copy_user(old) if old is not None else None)
+        if new is None:
+            return None
+        _ensure_guild_channel(root, guild_id, channel_id)
+        root["guilds"][guild_id]["channels"][channel_id][user_id] = new
+        tally = _tallies_for(root).get((guild_id, channel_id))
+        if tally is not None:
+            if existed:
+                _tally_user(tally, user_id, old, -1)
+            _tally_user(tally, user_id, new, 1)
+        _touch_scope(root, guild_id, channel_id)
+        ops = [{"op": "user", "g": guild_id, "c": channel_id, "u": user_id, "v": new}]
+        await _commit(root, guild_id, channel_id, ops)
+        return _copy_user(new)
 
 
 async def get_user_votes(
     user_id: str, guild_id: int | str, channel_id: int | str
 ) -> Dict[str, list]:
-    scoped = await load_votes(guild_id, channel_id)
-    return scoped.get(str(user_id), _empty_days())
+    await _ensure_root()
+    user = _peek_user(str(guild_id), str(channel_id), str(user_id))
+    return user if user is not None else _empty_days()
 
 
 async def add_vote(
@@ -162,14 +787,14 @@ async def add_vote(
     if not is_valid_option(dag, tijd):
         print(f"⚠️ Ongeldige combinatie in add_vote: {dag}, {tijd}")
         return
-    gid, cid = str(guild_id), str(channel_id)
-    scoped = await load_votes(gid, cid)
-    uid = str(user_id)
-    user = scoped.setdefault(uid, _empty_days())
-    if tijd not in user.get(dag, []):
-        user.setdefault(dag, []).append(tijd)
-    scoped[uid] = user
-    await save_votes_scoped(gid, cid, scoped)
+
+    def _add(user: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        user = user if user is not None else _empty_days()
+        if tijd not in user.get(dag, []):
+            user.setdefault(dag, []).append(tijd)
+        return user
+
+    await _update_user(str(guild_id), str(channel_id), str(user_id), _add)
 
 
 async def toggle_vote(
@@ -197,29 +822,33 @@ async def toggle_vote(
         scope_ids = [int(channel_id)]
 
     # Perform the toggle on the primary channel
-    scoped = await load_votes(gid, cid)
     uid = str(user_id)
-    user = scoped.setdefault(uid, _empty_days())
     if not is_valid_option(dag, tijd):
+        await _ensure_root()
+        user = _peek_user(gid, cid, uid) or _empty_days()
         return user.get(dag, [])
 
-    day_votes = user.setdefault(dag, [])
+    def _toggle(user: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        user = user if user is not None else _empty_days()
+        day_votes = user.setdefault(dag, [])
 
-    if tijd in SPECIALS:
-        if tijd in day_votes and all(v in SPECIALS for v in day_votes):
-            day_votes = [v for v in day_votes if v != tijd]
-        else:
-            day_votes = [tijd]
-    else:
-        day_votes = [v for v in day_votes if v not in SPECIALS]
-        if tijd in day_votes:
-            day_votes = [v for v in day_votes if v != tijd]
+        if tijd in SPECIALS:
+            if tijd in day_votes and all(v in SPECIALS for v in day_votes):
+                day_votes = [v for v in day_votes if v != tijd]
+            else:
+                day_votes = [tijd]
         else:
-            day_votes.append(tijd)
+            day_votes = [v for v in day_votes if v not in SPECIALS]
+            if tijd in day_votes:
+                day_votes = [v for v in day_votes if v != tijd]
+            else:
+                day_votes.append(tijd)
 
-    user[dag] = day_votes
-    scoped[uid] = user
-    await save_votes_scoped(gid, cid, scoped)
+        user[dag] = day_votes
+        return user
+
+    saved = await _update_user(gid, cid, uid, _toggle) or {}
+    day_votes = saved.get(dag, [])
 
     # Sync vote to all other linked channels in the category
     if len(scope_ids) > 1:
@@ -239,11 +868,13 @@ async def _sync_user_vote_to_channel(
     This is used for category-based vote sharing to keep all linked channels
     in sync when a vote changes.
     """
-    scoped = await load_votes(guild_id, channel_id)
-    user = scoped.setdefault(user_id, _empty_days())
-    user[dag] = day_votes.copy()  # Copy to avoid shared references
-    scoped[user_id] = user
-    await save_votes_scoped(guild_id, channel_id, scoped)
+
+    def _sync(user: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        user = user if user is not None else _empty_days()
+        user[dag] = day_votes.copy()  # Copy to avoid shared references
+        return user
+
+    await _update_user(guild_id, channel_id, user_id, _sync)
 
 
 async def remove_vote(
@@ -252,30 +883,23 @@ async def remove_vote(
     if not is_valid_option(dag, tijd):
         print(f"⚠️ Ongeldige combinatie in remove_vote: {dag}, {tijd}")
         return
-    gid, cid = str(guild_id), str(channel_id)
-    scoped = await load_votes(gid, cid)
-    uid = str(user_id)
-    if uid in scoped and tijd in scoped[uid].get(dag, []):  # pragma: no branch
-        scoped[uid][dag].remove(tijd)
-        await save_votes_scoped(gid, cid, scoped)
+
+    def _remove(user: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if user is None or tijd not in user.get(dag, []):
+            return None
+        user[dag].remove(tijd)
+        return user
+
+    await _update_user(str(guild_id), str(channel_id), str(user_id), _remove)
 
 
 async def get_counts_for_day(
     dag: str, guild_id: int | str, channel_id: int | str
 ) -> Dict[str, int]:
-    """Telt alle opties voor deze dag in de gegeven scope."""
-    scoped = await load_votes(guild_id, channel_id)
-    counts: Dict[str, int] = {}
-    for o in get_poll_options():
-        if o.dag != dag:
-            continue
-        c = 0
-        for per_user in scoped.values():
-            tijden = per_user.get(dag, [])
-            if isinstance(tijden, list) and o.tijd in tijden:
-                c += 1
-        counts[o.tijd] = c
-    return counts
+    """Telt alle opties voor deze dag in de gegeven scope (uit de bijgehouden tellers)."""
+    root = await _ensure_root()
+    per_tijd = _get_tally(root, str(guild_id), str(channel_id)).counts.get(dag, {})
+    return {o.tijd: per_tijd.get(o.tijd, 0) for o in get_poll_options() if o.dag == dag}
 
 
 async def get_votes_for_option(
@@ -325,27 +949,41 @@ async def calculate_leading_time(
 
 async def reset_votes() -> None:
     """Reset ALLE stemmen van alle guilds/channels."""
+    global _ROOT_CACHE, _ROOT_CACHE_PATH
+    _MEMBERS.clear()
     async with _VOTES_LOCK:
-        await _write_json(get_votes_path(), {})
+        if _per_scope_locks():
+            # Alle kanaal-locks vasthouden zodat er niets tussendoor schrijft
+            async with contextlib.AsyncExitStack() as stack:
+                for lock in list(_SCOPE_LOCKS.values()):
+                    await stack.enter_async_context(lock)
+                votes_dir = get_votes_dir()
+                if is_sqlite_backend():
+                    await _save_root({})
+                elif votes_dir:
+                    await _clear_shards(votes_dir)
+                    _ROOT_CACHE, _ROOT_CACHE_PATH = {}, _storage_key()
+            return
+        # Lege snapshot; _save_root ruimt ook een eventueel journal op
+        await _save_root({})
 
 
 async def reset_votes_scoped(guild_id: int | str, channel_id: int | str) -> None:
     """Reset stemmen voor één specifiek guild+channel."""
-    async with _VOTES_LOCK:
-        gid, cid = str(guild_id), str(channel_id)
+    gid, cid = str(guild_id), str(channel_id)
+    await _ensure_root()
+    async with _scope_lock(gid, cid):
         root = await _get_root()
         # Verwijder alleen deze channel uit de structuur
+        _MEMBERS.pop((gid, cid), None)
         try:
-            if "guilds" in root and gid in root["guilds"]:
-                guild_data = root["guilds"][gid]
-                if "channels" in guild_data and cid in guild_data["channels"]:  # pragma: no branch
-                    del guild_data["channels"][cid]
-                    # Als guild geen channels meer heeft, verwijder de guild ook
-                    if not guild_data.get("channels"):  # pragma: no branch
-                        del root["guilds"][gid]
-            await _save_root(root)
+            _tallies_for(root).pop((gid, cid), None)
+            _touch_scope(root, gid, cid)
+            _drop_scope(root, gid, cid)
+            await _commit(root, gid, cid, [{"op": "reset", "g": gid, "c": cid}])
         except Exception:  # pragma: no cover
             # Bij fouten, val terug op lege dict voor dit kanaal
+            root = await _get_root()
             _set_scoped(root, gid, cid, {})
             await _save_root(root)
 
@@ -603,24 +1241,27 @@ async def get_was_misschien_user_ids(
     - List of user IDs (as strings)
     """
     gid, cid = str(guild_id), str(channel_id)
-    scoped = await load_votes(gid, cid)
+    await _ensure_root()
 
     tracking_id = _was_misschien_id(cid)
-    if tracking_id in scoped:
-        per_dag = scoped[tracking_id]
-        if isinstance(per_dag, dict) and dag in per_dag:
-            tijden = per_dag[dag]
-            if isinstance(tijden, list):
-                # Backwards compatibility: old format stored count as single element
-                # New format stores list of user IDs
-                if len(tijden) == 1:
-                    try:
-                        # Als het een getal is, is het de oude count-only format
-                        int(tijden[0])
-                        return []  # Geen user IDs beschikbaar in oude format
-                    except (ValueError, TypeError):
-                        pass  # Niet een getal, dus waarschijnlijk een user ID
-                return list(tijden)
+    return _was_misschien_ids_from(_peek_user(gid, cid, tracking_id), dag)
+
+
+def _was_misschien_ids_from(per_dag: Any, dag: str) -> list[str]:
+    """User IDs uit een '_was_misschien::'-entry voor één dag."""
+    if isinstance(per_dag, dict) and dag in per_dag:
+        tijden = per_dag[dag]
+        if isinstance(tijden, list):
+            # Backwards compatibility: old format stored count as single element
+            # New format stores list of user IDs
+            if len(tijden) == 1:
+                try:
+                    # Als het een getal is, is het de oude count-only format
+                    int(tijden[0])
+                    return []  # Geen user IDs beschikbaar in oude format
+                except (ValueError, TypeError):
+                    pass  # Niet een getal, dus waarschijnlijk een user ID
+            return list(tijden)
 
     return []
 
@@ -641,16 +1282,14 @@ async def set_was_misschien_user_ids(
     - channel_id: Discord channel ID
     """
     gid, cid = str(guild_id), str(channel_id)
-    scoped = await load_votes(gid, cid)
-
-    tracking_id = _was_misschien_id(cid)
-    if tracking_id not in scoped:
-        scoped[tracking_id] = _empty_days()
 
-    # Store the user IDs as a list
-    scoped[tracking_id][dag] = list(user_ids)
+    def _set(per_dag: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        per_dag = per_dag if per_dag is not None else _empty_days()
+        # Store the user IDs as a list
+        per_dag[dag] = list(user_ids)
+        return per_dag
 
-    await save_votes_scoped(gid, cid, scoped)
+    await _update_user(gid, cid, _was_misschien_id(cid), _set)
 
 
 async def set_was_misschien_count(
@@ -671,16 +1310,14 @@ async def set_was_misschien_count(
     # Backwards compatibility: create dummy list with count placeholders
     # Deze functie zou niet meer aangeroepen moeten worden
     gid, cid = str(guild_id), str(channel_id)
-    scoped = await load_votes(gid, cid)
-
-    tracking_id = _was_misschien_id(cid)
-    if tracking_id not in scoped:
-        scoped[tracking_id] = _empty_days()
 
-    # Store the count as a list with a single element (old format)
-    scoped[tracking_id][dag] = [str(count)]
+    def _set(per_dag: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        per_dag = per_dag if per_dag is not None else _empty_days()
+        # Store the count as a list with a single element (old format)
+        per_dag[dag] = [str(count)]
+        return per_dag
 
-    await save_votes_scoped(gid, cid, scoped)
+    await _update_user(gid, cid, _was_misschien_id(cid), _set)
 
 
 async def reset_was_misschien_counts(guild_id: int | str, channel_id: int | str) -> None:
@@ -726,14 +1363,16 @@ async def update_non_voters(
     guild_id: int | str, channel_id: int | str, channel
 ) -> None:
     """
-    Update non-voters in storage based on channel members.
+    Update the member set used for non-voter computation.
 
     This function:
     1. Gets all channel members (excluding bots)
-    2. Checks who has voted (including via guests)
-    3. Stores non-voters with special IDs in the votes structure
+    2. Remembers them for this scope (in memory only)
+    3. Removes legacy '_non_voter::' entries that older versions stored
 
-    Non-voters are stored per day with "niet gestemd" as their vote.
+    Non-voters are no longer stored: get_non_voters_for_day() computes them as
+    members minus the voters index. Nothing is written unless legacy entries
+    have to be cleaned up.
 
     Parameters:
     - guild_id: Discord guild ID
@@ -744,112 +1383,231 @@ async def update_non_voters(
         return
 
     gid, cid = str(guild_id), str(channel_id)
-    scoped = await load_votes(gid, cid)
-
-    # Get all channel members (excluding bots)
-    members = getattr(channel, "members", [])
-    all_member_ids = set()
-
-    for member in members:
-        if getattr(member, "bot", False):
-            continue
-        member_id = str(getattr(member, "id", ""))
-        if member_id:
-            all_member_ids.add(member_id)
-
-    # For each day, determine who voted and who didn't
-    unieke_dagen = {opt.dag for opt in get_poll_options()}
-
-    for dag in unieke_dagen:
-        # Collect IDs that voted for this day (including guests via their owner)
-        voted_ids: set[str] = set()
-
-        for uid, per_dag in scoped.items():
-            # Skip non-voter entries when checking who voted
-            if _is_non_voter_id(uid):
-                continue
-
-            try:
-                tijden = (per_dag or {}).get(dag, [])
-                if isinstance(tijden, list) and tijden:
-                    # Extract owner ID (handle guests)
-                    actual_uid = (
-                        uid.split("_guest::", 1)[0]
-                        if isinstance(uid, str) and "_guest::" in uid
-                        else uid
-                    )
-                    voted_ids.add(str(actual_uid))
-            except Exception:  # pragma: no cover
-                continue
 
-        # Determine non-voters
-        non_voter_ids = all_member_ids - voted_ids
-
-        # Remove old non-voter entries for this day
-        keys_to_remove = []
-        for uid in scoped.keys():
-            if _is_non_voter_id(uid):
-                # Extract actual user ID
-                actual_id = _extract_user_id_from_non_voter(uid)
-                # If this member is no longer a non-voter, remove the entry
-                if actual_id not in non_voter_ids:
-                    if dag in scoped[uid]:
-                        del scoped[uid][dag]
-                    # If no more days, mark for removal
-                    if not scoped[uid]:
-                        keys_to_remove.append(uid)
-
-        for key in keys_to_remove:
-            del scoped[key]
-
-        # Add/update non-voter entries for this day
-        for member_id in non_voter_ids:
-            non_voter_key = _non_voter_id(member_id)
-            if non_voter_key not in scoped:
-                scoped[non_voter_key] = _empty_days()
-            scoped[non_voter_key][dag] = ["niet gestemd"]
+    # Get all channel members (excluding bots), from the roster cache
+    members: Dict[str, None] = dict.fromkeys(channel_roster(channel))
+    root = await _ensure_root()
+    previous = _MEMBERS.get((gid, cid))
+    _MEMBERS[(gid, cid)] = members
+    if previous is None or list(previous) != list(members):
+        _touch_scope(root, gid, cid)
 
-    await save_votes_scoped(gid, cid, scoped)
+    # Opgeslagen niet-stemmers uit oudere versies éénmalig opruimen
+    if _get_tally(root, gid, cid).legacy_non_voters > 0:
+        scoped = await load_votes(gid, cid)
+        await save_votes_scoped(
+            gid, cid, {uid: v for uid, v in scoped.items() if not _is_non_voter_id(uid)}
+        )
 
 
 async def get_non_voters_for_day(
-    dag: str, guild_id: int | str, channel_id: int | str
-) -> tuple[int, list[str]]:
+    dag: str, guild_id: int | str, channel_id: int | str, channel=None
+) -> tuple[Optional[int], list[str]]:
     """
-    Get non-voters for a specific day from storage.
+    Get non-voters for a specific day: known members minus the voters index.
+
+    Members are only kept in memory, so after a restart they are unknown until
+    update_non_voters() runs. If a channel is given they are filled from its
+    roster right away.
 
     Returns:
     - (count, list of user_ids) of non-voters for this day
+    - (None, []) if no members are known for this scope; callers must not
+      read this as "everyone voted"
 
     Parameters:
     - dag: 'vrijdag' | 'zaterdag' | 'zondag'
     - guild_id: Discord guild ID
     - channel_id: Discord channel ID
+    - channel: Discord channel object (optional, roster fallback)
     """
     gid, cid = str(guild_id), str(channel_id)
-    scoped = await load_votes(gid, cid)
+    members = _MEMBERS.get((gid, cid))
+    if not members and channel is not None:
+        await update_non_voters(gid, cid, channel)
+        members = _MEMBERS.get((gid, cid))
+    if not members:
+        # Een lege roster betekent vrijwel altijd "nog niet geladen"
+        return None, []
+    root = await _ensure_root()
+    voted = _get_tally(root, gid, cid).voters.get(dag, {})
+    non_voter_ids = [uid for uid in members if uid not in voted]
+    return len(non_voter_ids), non_voter_ids
 
-    non_voter_ids = []
 
-    for uid, per_dag in scoped.items():
-        if not _is_non_voter_id(uid):
-            continue
+class ChannelTally:
+    """
+    Bevroren tellers van één kanaal (zie snapshot_channel_tallies):
 
-        try:
-            tijden = (per_dag or {}).get(dag, [])
-            if isinstance(tijden, list) and "niet gestemd" in tijden:
-                # Extract actual user ID
-                actual_id = _extract_user_id_from_non_voter(uid)
-                non_voter_ids.append(actual_id)
-        except Exception:  # pragma: no cover
-            continue
+    counts:        {dag: {tijd: aantal}}
+    voters:        {dag: set(lid-IDs)}
+    members:       bekende leden (update_non_voters), None als onbekend
+    was_misschien: {dag: aantal}
+    """
 
-    return len(non_voter_ids), non_voter_ids
+    __slots__ = ("counts", "voters", "members", "was_misschien")
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.voters: Dict[str, set[str]] = {}
+        self.members: Optional[list[str]] = None
+        self.was_misschien: Dict[str, int] = {}
+
+
+async def snapshot_channel_tallies(
+    scopes: Iterable[tuple[int | str, int | str]],
+) -> Dict[tuple[str, str], ChannelTally]:
+    """
+    Eén consistent beeld van de tellers van veel kanalen tegelijk, voor het
+    archiveren bij de deactivatie-sweep. Na het laden van de root gebeurt alles
+    zonder await, dus er kan geen stem tussendoor komen; gelezen wordt uit de
+    bijgehouden tellers, niet uit een herlaad van de stemmen.
+    """
+    root = await _ensure_root()
+    channels_by_guild = {
+        gid: (guild_data.get("channels") or {})
+        for gid, guild_data in (root.get("guilds") or {}).items()
+    }
+    result: Dict[tuple[str, str], ChannelTally] = {}
+    for guild_id, channel_id in scopes:
+        gid, cid = str(guild_id), str(channel_id)
+        if (gid, cid) in result:
+            continue
+        snap = ChannelTally()
+        tally = _get_tally(root, gid, cid)
+        snap.counts = {dag: dict(per_tijd) for dag, per_tijd in tally.counts.items()}
+        snap.voters = {dag: set(owners) for dag, owners in tally.voters.items()}
+        members = _MEMBERS.get((gid, cid))
+        snap.members = list(members) if members else None
+        tracking = (channels_by_guild.get(gid) or {}).get(cid, {}).get(_was_misschien_id(cid))
+        if isinstance(tracking, dict):
+            snap.was_misschien = {
+                dag: len(_was_misschien_ids_from(tracking, dag)) for dag in tracking
+            }
+        result[(gid, cid)] = snap
+    return result
 
 
 # === CATEGORY-BASED VOTE SCOPE (DUAL LANGUAGE SUPPORT) =======================
 
 
+class ScopeSnapshot:
+    """
+    Alleen-lezen beeld van de stemmen in een (gekoppelde) scope, in één keer
+    opgebouwd uit de root:
+
+    votes:   {user_id: {dag: [tijden]}}, samengevoegd (eerste kanaal wint),
+             zonder '_'-entries; niet muteren
+    counts:  {dag: {tijd: aantal}}
+    voters:  {dag: set(lid-IDs)}; een gast telt voor zijn eigenaar
+    members: bekende leden (update_non_voters) van alle kanalen in de scope
+    """
+
+    __slots__ = ("guild_id", "channel_ids", "stamp", "votes", "counts", "voters", "members")
+
+    def __init__(self, guild_id: str, channel_ids: tuple[str, ...], stamp: tuple) -> None:
+        self.guild_id = guild_id
+        self.channel_ids = channel_ids
+        self.stamp = stamp
+        self.votes: Dict[str, Any] = {}
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.voters: Dict[str, set[str]] = {}
+        self.members: Dict[str, None] = {}
+
+    def counts_for_day(self, dag: str) -> Dict[str, int]:
+        per_tijd = self.counts.get(dag, {})
+        return {o.tijd: per_tijd.get(o.tijd, 0) for o in get_poll_options() if o.dag == dag}
+
+    def leading_time(self, dag: str) -> str | None:
+        counts = self.counts.get(dag, {})
+        c19 = counts.get("om 19:00 uur", 0)
+        c2030 = counts.get("om 20:30 uur", 0)
+        if c19 == 0 and c2030 == 0:
+            return None
+        return "20:30" if c2030 >= c19 else "19:00"
+
+    def non_voters(self, dag: str) -> list[str]:
+        """Bekende leden zonder stem voor deze dag (leeg als er geen leden bekend zijn)."""
+        voted = self.voters.get(dag, set())
+        return [uid for uid in self.members if uid not in voted]
+
+    def voters_for(self, dag: str, tijd: str) -> list[str]:
+        return [
+            uid
+            for uid, per_user in self.votes.items()
+            if isinstance(per_user, dict) and tijd in (per_user.get(dag) or [])
+        ]
+
+    def guest_groups(self, dag: str, tijd: str) -> Dict[str, list[str]]:
+        """{eigenaar-ID: [gastnamen]} voor gasten die op dit tijdslot stemden."""
+        groups: Dict[str, list[str]] = {}
+        for uid in self.voters_for(dag, tijd):
+            if "_guest::" in uid:
+                owner, name = uid.split("_guest::", 1)
+                groups.setdefault(owner, []).append(name)
+        for names in groups.values():
+            names.sort()
+        return groups
+
+
+def _build_snapshot(
+    root: Dict[str, Any], gid: str, cids: tuple[str, ...], stamp: tuple
+) -> ScopeSnapshot:
+    snap = ScopeSnapshot(gid, cids, stamp)
+    channels = root.get("guilds", {}).get(gid, {}).get("channels", {})
+    for cid in cids:
+        ch = channels.get(cid)
+        if isinstance(ch, dict):
+            for uid, per_dag in ch.items():
+                # '_'-entries zijn kanaal-specifiek; eerste kanaal wint per gebruiker
+                if isinstance(uid, str) and uid.startswith("_"):
+                    continue
+                if uid not in snap.votes:
+                    snap.votes[uid] = _copy_user(per_dag)
+        tally = _get_tally(root, gid, cid)
+        for dag, owners in tally.voters.items():
+            if owners:
+                snap.voters.setdefault(dag, set()).update(owners)
+        snap.members.update(_MEMBERS.get((gid, cid)) or {})
+
+    if len(cids) == 1:
+        # Eén kanaal: de bijgehouden tellers zijn al exact
+        tally = _get_tally(root, gid, cids[0])
+        snap.counts = {dag: dict(per_tijd) for dag, per_tijd in tally.counts.items()}
+    else:
+        # Gekoppeld: een gebruiker telt alleen mee in zijn eerste kanaal
+        for per_user in snap.votes.values():
+            if not isinstance(per_user, dict):
+                continue
+            for dag, tijden in per_user.items():
+                if not isinstance(tijden, list):
+                    continue
+                for tijd in {t for t in tijden if isinstance(t, str)}:
+                    _bump(snap.counts, dag, tijd, 1)
+    return snap
+
+
+async def get_scope_snapshot(
+    guild_id: int | str, scope_channel_ids: list[int] | list[str]
+) -> ScopeSnapshot:
+    """
+    Stemmen, tellingen, stemmers en leden van alle kanalen in de scope, in één
+    doorgang uit de root gelezen. Zolang geen van de kanalen verandert (zie
+    get_scope_version) krijgen alle aanroepers hetzelfde snapshot-object, dus
+    builder, beslissingsregel en notificaties van één render delen het.
+    """
+    root = await _ensure_root()
+    gid = str(guild_id)
+    cids = tuple(str(c) for c in scope_channel_ids)
+    stamp = tuple(get_scope_version(gid, cid) for cid in cids)
+    key = (gid, cids)
+    snap = _SNAPSHOTS.get(key)
+    if snap is None or snap.stamp != stamp:
+        snap = _build_snapshot(root, gid, cids, stamp)
+        _SNAPSHOTS[key] = snap
+    return snap
+
+
 async def load_votes_for_scope(
     guild_id: int | str, scope_channel_ids: list[int]
 ) -> Dict[str, Any]:
@@ -866,17 +1624,8 @@ async def load_votes_for_scope(
     Returns:
     - Merged dict of {user_id -> {dag: [tijden]}}
     """
-    merged: Dict[str, Any] = {}
-    for channel_id in scope_channel_ids:
-        channel_votes = await load_votes(guild_id, channel_id)
-        for user_id, votes in channel_votes.items():
-            # Skip special tracking entries (they're channel-specific)
-            if isinstance(user_id, str) and user_id.startswith("_"):
-                continue
-            # First occurrence wins (user's home channel)
-            if user_id not in merged:
-                merged[user_id] = votes
-    return merged
+    snap = await get_scope_snapshot(guild_id, scope_channel_ids)
+    return _copy_scoped(snap.votes)
 
 
 async def get_counts_for_day_scoped(
@@ -893,20 +1642,8 @@ async def get_counts_for_day_scoped(
     Returns:
     - Dict of {tijd: count} for all time options on this day
     """
-    all_votes = await load_votes_for_scope(guild_id, scope_channel_ids)
-    counts: Dict[str, int] = {}
-
-    for o in get_poll_options():
-        if o.dag != dag:
-            continue
-        c = 0
-        for per_user in all_votes.values():
-            tijden = per_user.get(dag, [])
-            if isinstance(tijden, list) and o.tijd in tijden:
-                c += 1
-        counts[o.tijd] = c
-
-    return counts
+    snap = await get_scope_snapshot(guild_id, scope_channel_ids)
+    return snap.counts_for_day(dag)
 
 
 async def calculate_leading_time_scoped(
@@ -928,20 +1665,8 @@ async def calculate_leading_time_scoped(
     Returns:
     - "19:00", "20:30", or None if no votes
     """
-    T19 = "om 19:00 uur"
-    T2030 = "om 20:30 uur"
-
-    counts = await get_counts_for_day_scoped(dag, guild_id, scope_channel_ids)
-    c19 = counts.get(T19, 0)
-    c2030 = counts.get(T2030, 0)
-
-    if c19 == 0 and c2030 == 0:
-        return None
-
-    if c2030 >= c19:
-        return "20:30"
-    else:
-        return "19:00"
+    snap = await get_scope_snapshot(guild_id, scope_channel_ids)
+    return snap.leading_time(dag)
 
 
 async def get_non_voters_for_day_scoped(
@@ -962,34 +1687,12 @@ async def get_non_voters_for_day_scoped(
     Returns:
     - (count, list of user_ids) of non-voters for this day
     """
-    # Get all users who HAVE voted in any scope channel
-    voted_users: set[str] = set()
+    # Get all users who HAVE voted in any scope channel (guests count for their owner)
+    snap = await get_scope_snapshot(guild_id, scope_channel_ids)
+    voted_users = snap.voters.get(dag, set())
 
-    for cid in scope_channel_ids:
-        votes = await load_votes(guild_id, cid)
-        for user_id, user_votes in votes.items():
-            # Skip special tracking entries
-            if isinstance(user_id, str) and user_id.startswith("_"):
-                continue
-            # Handle guest votes - count the owner as having voted
-            actual_uid = (
-                user_id.split("_guest::", 1)[0]
-                if isinstance(user_id, str) and "_guest::" in user_id
-                else user_id
-            )
-            if dag in user_votes and user_votes[dag]:
-                voted_users.add(str(actual_uid))
-
-    # Get all members from all channels (union of all members)
-    all_members: set[str] = set()
-    for channel in channels:
-        members = getattr(channel, "members", [])
-        for member in members:
-            if getattr(member, "bot", False):
-                continue
-            member_id = str(getattr(member, "id", ""))
-            if member_id:
-                all_members.add(member_id)
+    # Get all members from all channels (union of the channel rosters)
+    all_members = set(roster_member_ids(channels))
 
     non_voter_ids = list(all_members - voted_users)
     return len(non_voter_ids), non_voter_ids
@@ -1010,12 +1713,5 @@ async def get_voters_for_time_scoped(
     Returns:
     - List of user_ids who voted for this time
     """
-    all_votes = await load_votes_for_scope(guild_id, scope_channel_ids)
-    voter_ids: list[str] = []
-
-    for user_id, per_user in all_votes.items():
-        tijden = per_user.get(dag, [])
-        if isinstance(tijden, list) and tijd in tijden:
-            voter_ids.append(str(user_id))
-
-    return voter_ids
+    snap = await get_scope_snapshot(guild_id, scope_channel_ids)
+    return snap.voters_for(dag, tijd)
@@ -0,0 +1,210 @@
+# apps/utils/schedule_timer.py
+#
+# Eventgestuurde timer voor geplande (de)activaties van polls.
+#
+# In plaats van elke minuut alle kanalen af te lopen, zetten we de effectieve
+# schema's (kanaal-overrides en defaults, type 'datum' en 'wekelijks') om naar
+# een heap met eerstvolgende vuurmomenten. Eén taak slaapt tot het vroegste
+# moment en draait dan de bijbehorende sweep (activate_scheduled_polls /
+# deactivate_scheduled_polls), die per kanaal nog steeds zelf beslist.
+#
+# Elke settings-wijziging (set_/clear_scheduled_*, set_default_*, of een
+# extern gewijzigd bestand) wekt de timer via poll_settings.add_settings_listener,
+# waarna de heap opnieuw wordt opgebouwd. Tussen events doet de timer niets.
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+import pytz
+
+from apps.utils.poll_settings import (
+    DAYS_INDEX,
+    add_settings_listener,
+    get_all_schedules,
+    remove_settings_listener,
+)
+
+TZ = pytz.timezone("Europe/Amsterdam")
+
+# Bovengrens voor één slaapbeurt; vangt klokverschuivingen en gemiste signalen op
+MAX_SLEEP_SECONDS = 3600.0
+
+Sweep = Callable[[Any], Awaitable[Any]]
+
+
+def _parse_hhmm(tijd: str) -> tuple[int, int] | None:
+    try:
+        hh, mm = str(tijd).split(":", 1)
+        return int(hh), int(mm)
+    except (ValueError, TypeError):
+        return None
+
+
+def next_fire_time(schedule: dict, after: datetime) -> Optional[datetime]:
+    """
+    Eerstvolgende minuut (>= 'after', afgerond op de minuut) waarop dit schema
+    vuurt, of None als het nooit meer vuurt. 'datum' in het verleden geeft het
+    oorspronkelijke tijdstip terug; de aanroeper beslist over catch-up.
+    """
+    hm = _parse_hhmm(schedule.get("tijd", ""))
+    if hm is None:
+        return None
+    hour, minute = hm
+    kind = schedule.get("type")
+
+    if kind == "datum":
+        try:
+            day = datetime.strptime(str(schedule.get("datum")), "%Y-%m-%d")
+        except ValueError:
+            return None
+        return TZ.localize(day.replace(hour=hour, minute=minute))
+
+    if kind == "wekelijks":
+        target = DAYS_INDEX.get(str(schedule.get("dag", "")).lower())
+        if target is None:
+            return None
+        floor = after.astimezone(TZ).replace(second=0, microsecond=0)
+        days_ahead = (target - floor.weekday()) % 7
+        naive = floor.replace(tzinfo=None) + timedelta(days=days_ahead)
+        candidate = TZ.localize(naive.replace(hour=hour, minute=minute))
+        if candidate < floor:
+            candidate = TZ.localize(
+                (naive + timedelta(days=7)).replace(hour=hour, minute=minute)
+            )
+        return candidate
+
+    return None
+
+
+class ScheduleTimer:
+    """Heap met vuurmomenten voor 'activation' en 'deactivation' plus één slapende taak."""
+
+    def __init__(self, bot: Any, sweeps: dict[str, Sweep]) -> None:
+        self.bot = bot
+        self.sweeps = sweeps
+        self._heap: list[tuple[datetime, str]] = []
+        self._done_until: Optional[datetime] = None
+        self._fired_past: set[tuple] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- heap ----------
+
+    def compile(self, now: datetime) -> list[tuple[datetime, str]]:
+        """Bouw de heap opnieuw op uit de huidige schema's."""
+        floor = now.astimezone(TZ).replace(second=0, microsecond=0)
+        after = floor
+        if self._done_until is not None and self._done_until >= floor:
+            after = self._done_until + timedelta(minutes=1)
+
+        best: dict[tuple[str, datetime], None] = {}
+        for kind, cid, schedule in get_all_schedules():
+            if kind not in self.sweeps:
+                continue
+            fire_at = next_fire_time(schedule, after)
+            if fire_at is None:
+                continue
+            if fire_at < after:
+                # 'datum' in het verleden: activatie haalt hem één keer in
+                # (zoals activate_scheduled_polls doet), deactivatie nooit.
+                marker = (kind, cid, schedule.get("datum"), schedule.get("tijd"))
+                if kind != "activation" or marker in self._fired_past:
+                    continue
+                self._fired_past.add(marker)
+                fire_at = floor
+            best[(kind, fire_at)] = None
+
+        heap = [(fire_at, kind) for kind, fire_at in best]
+        heapq.heapify(heap)
+        self._heap = heap
+        return heap
+
+    def next_due(self) -> Optional[tuple[datetime, str]]:
+        return self._heap[0] if self._heap else None
+
+    # ---------- lifecycle ----------
+
+    def _on_settings_change(self) -> None:
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wake.set()
+        else:
+            loop.call_soon_threadsafe(wake.set)
+
+    def start(self) -> asyncio.Task:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        add_settings_listener(self._on_settings_change)
+        self._task = asyncio.create_task(self._run())
+        return self._task
+
+    def stop(self) -> None:
+        remove_settings_listener(self._on_settings_change)
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def _run_due(self, now: datetime, force: Optional[str] = None) -> None:
+        """Draai alle sweeps die nu aan de beurt zijn (deactivatie vóór activatie)."""
+        floor = now.astimezone(TZ).replace(second=0, microsecond=0)
+        due = {kind for fire_at, kind in self._heap if fire_at <= floor}
+        if force:
+            due.add(force)
+        self._done_until = floor
+        for kind in ("deactivation", "activation"):
+            if kind in due:
+                try:
+                    await self.sweeps[kind](self.bot)
+                except Exception as e:  # pragma: no cover
+                    print(f"❌ Fout in geplande {kind}: {e}")
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        # Bij start één activatie-ronde: haalt gemiste schema's in (bot was down)
+        now = datetime.now(TZ)
+        self.compile(now)
+        await self._run_due(now, force="activation")
+        while True:
+            self._wake.clear()
+            now = datetime.now(TZ)
+            self.compile(now)
+            nxt = self.next_due()
+            if nxt is None:
+                delay = MAX_SLEEP_SECONDS
+            else:
+                # Net ná het begin van de minuut vuren, zodat HH:MM klopt
+                delay = (nxt[0] - now).total_seconds() + 0.5
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=min(delay, MAX_SLEEP_SECONDS)
+                    )
+                    continue  # Schema's gewijzigd: opnieuw opbouwen
+                except asyncio.TimeoutError:
+                    pass
+                if nxt is None or datetime.now(TZ) < nxt[0]:
+                    continue
+            await self._run_due(datetime.now(TZ))
+
+
+_timer: Optional[ScheduleTimer] = None
+
+
+def start_schedule_timer(bot: Any, activate: Sweep, deactivate: Sweep) -> ScheduleTimer:
+    """Start (of herstart) de gedeelde timer voor geplande (de)activaties."""
+    global _timer
+    if _timer is not None:
+        _timer.stop()
+    _timer = ScheduleTimer(bot, {"activation": activate, "deactivation": deactivate})
+    _timer.start()
+    return _timer
@@ -0,0 +1,337 @@
+# apps/utils/sqlite_store.py
+#
+# SQLite-backend (WAL) voor stemmen, instellingen en bericht-IDs.
+# Actief met STORAGE_BACKEND=sqlite; de JSON-bestanden blijven de standaard.
+# Database-pad: SQLITE_PATH (standaard dmk_poll.db).
+#
+# Tabellen:
+# - votes(guild_id, channel_id, user_id, dag, pos, tijd)
+#     één rij per gekozen tijd; een lege dag-lijst is één rij met tijd NULL.
+#     Index op (guild_id, channel_id, dag, tijd) voor tellingen.
+# - message_ids(channel_id, key, message_id)        → poll_message "per_channel"
+# - documents(doc, key, value)                     → overige top-level JSON-keys
+#     (doc = "settings" of "poll_message"; value is JSON)
+#
+# Alle methoden zijn synchroon; async code roept ze aan via asyncio.to_thread.
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS votes (
+    guild_id   TEXT NOT NULL,
+    channel_id TEXT NOT NULL,
+    user_id    TEXT NOT NULL,
+    dag        TEXT NOT NULL,
+    pos        INTEGER NOT NULL,
+    tijd,
+    PRIMARY KEY (guild_id, channel_id, user_id, dag, pos)
+);
+CREATE INDEX IF NOT EXISTS idx_votes_slot
+    ON votes (guild_id, channel_id, dag, tijd);
+CREATE TABLE IF NOT EXISTS message_ids (
+    channel_id TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    message_id INTEGER,
+    PRIMARY KEY (channel_id, key)
+);
+CREATE TABLE IF NOT EXISTS documents (
+    doc   TEXT NOT NULL,
+    key   TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (doc, key)
+);
+"""
+
+
+def get_storage_backend() -> str:
+    """'json' (standaard) of 'sqlite'."""
+    return os.getenv("STORAGE_BACKEND", "json").strip().lower() or "json"
+
+
+def is_sqlite_backend() -> bool:
+    return get_storage_backend() == "sqlite"
+
+
+def get_sqlite_path() -> str:
+    return os.getenv("SQLITE_PATH", "dmk_poll.db")
+
+
+class SQLiteStore:
+    """Eén verbinding per databasebestand, gedeeld tussen threads achter een lock."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, statements: Iterable[tuple[str, tuple]]) -> None:
+        """Voer statements uit in één transactie."""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    cur.execute(sql, params)
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            cur.execute("COMMIT")
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # -----------------------------
+    # Stemmen
+    # -----------------------------
+
+    @staticmethod
+    def _user_rows(gid: str, cid: str, uid: str, per_dag: Any) -> list[tuple[str, tuple]]:
+        rows: list[tuple[str, tuple]] = []
+        if not isinstance(per_dag, dict):
+            return rows
+        for dag, tijden in per_dag.items():
+            if not isinstance(tijden, list) or not tijden:
+                rows.append(
+                    ("INSERT INTO votes VALUES (?, ?, ?, ?, ?, ?)", (gid, cid, uid, dag, -1, None))
+                )
+                continue
+            for pos, tijd in enumerate(tijden):
+                rows.append(
+                    ("INSERT INTO votes VALUES (?, ?, ?, ?, ?, ?)", (gid, cid, uid, dag, pos, tijd))
+                )
+        return rows
+
+    def load_votes_root(self) -> Dict[str, Any]:
+        """Bouw de volledige root {guilds: {gid: {channels: {cid: {uid: {dag: [..]}}}}}}."""
+        root: Dict[str, Any] = {}
+        # Een gebruiker wordt altijd in zijn geheel (in pos-volgorde) herschreven,
+        # dus rowid-volgorde is ook de volgorde van de tijden
+        rows = self._query(
+            "SELECT guild_id, channel_id, user_id, dag, pos, tijd FROM votes "
+            "ORDER BY rowid"
+        )
+        for gid, cid, uid, dag, pos, tijd in rows:
+            guilds = root.setdefault("guilds", {})
+            ch = guilds.setdefault(gid, {}).setdefault("channels", {}).setdefault(cid, {})
+            tijden = ch.setdefault(uid, {}).setdefault(dag, [])
+            if pos >= 0:
+                tijden.append(tijd)
+        return root
+
+    def apply_ops(self, ops: list[Dict[str, Any]]) -> None:
+        """
+        Verwerk mutaties in het journal-formaat van poll_storage:
+        {"op": "user"|"del"|"reset", "g", "c", ["u"], ["v"]}.
+        """
+        statements: list[tuple[str, tuple]] = []
+        for op in ops:
+            kind = op.get("op")
+            gid, cid = str(op.get("g")), str(op.get("c"))
+            if kind in ("user", "del"):
+                uid = str(op.get("u"))
+                statements.append(
+                    (
+                        "DELETE FROM votes WHERE guild_id=? AND channel_id=? AND user_id=?",
+                        (gid, cid, uid),
+                    )
+                )
+                if kind == "user":
+                    statements.extend(self._user_rows(gid, cid, uid, op.get("v")))
+            elif kind == "reset":
+                statements.append(
+                    ("DELETE FROM votes WHERE guild_id=? AND channel_id=?", (gid, cid))
+                )
+        if statements:
+            self._write(statements)
+
+    def replace_votes_root(self, root: Dict[str, Any]) -> int:
+        """Vervang alle stemmen door 'root'. Geeft het aantal kanalen terug."""
+        statements: list[tuple[str, tuple]] = [("DELETE FROM votes", ())]
+        channels = 0
+        for gid, guild_data in (root.get("guilds") or {}).items():
+            for cid, ch in (guild_data.get("channels") or {}).items():
+                channels += 1
+                for uid, per_dag in (ch or {}).items():
+                    statements.extend(self._user_rows(str(gid), str(cid), str(uid), per_dag))
+        self._write(statements)
+        return channels
+
+    # -----------------------------
+    # Documenten (settings / poll_message)
+    # -----------------------------
+
+    def load_document(self, doc: str) -> Dict[str, Any]:
+        rows = self._query("SELECT key, value FROM documents WHERE doc=? ORDER BY rowid", (doc,))
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_document(self, doc: str, data: Dict[str, Any]) -> None:
+        """Schrijf alleen gewijzigde top-level keys; verdwenen keys worden verwijderd."""
+        current = {
+            key: value
+            for key, value in self._query(
+                "SELECT key, value FROM documents WHERE doc=?", (doc,)
+            )
+        }
+        statements: list[tuple[str, tuple]] = []
+        for key, value in data.items():
+            encoded = json.dumps(value, ensure_ascii=False, sort_keys=True)
+            if current.get(str(key)) != encoded:
+                statements.append(
+                    (
+                        "INSERT OR REPLACE INTO documents (doc, key, value) VALUES (?, ?, ?)",
+                        (doc, str(key), encoded),
+                    )
+                )
+        for key in current:
+            if key not in data:
+                statements.append(("DELETE FROM documents WHERE doc=? AND key=?", (doc, key)))
+        if statements:
+            self._write(statements)
+
+    def clear_document(self, doc: str) -> None:
+        self._write([("DELETE FROM documents WHERE doc=?", (doc,))])
+
+    # -----------------------------
+    # Bericht-IDs
+    # -----------------------------
+
+    def load_message_ids(self) -> Dict[str, Dict[str, Any]]:
+        per_channel: Dict[str, Dict[str, Any]] = {}
+        for cid, key, mid in self._query(
+            "SELECT channel_id, key, message_id FROM message_ids ORDER BY rowid"
+        ):
+            per_channel.setdefault(cid, {})[key] = mid
+        return per_channel
+
+    def replace_message_ids(self, per_channel: Dict[str, Dict[str, Any]]) -> None:
+        statements: list[tuple[str, tuple]] = [("DELETE FROM message_ids", ())]
+        for cid, keys in (per_channel or {}).items():
+            for key, mid in (keys or {}).items():
+                statements.append(
+                    (
+                        "INSERT INTO message_ids (channel_id, key, message_id) VALUES (?, ?, ?)",
+                        (str(cid), str(key), mid),
+                    )
+                )
+        self._write(statements)
+
+    # -----------------------------
+    # poll_message-document
+    # -----------------------------
+
+    def poll_message_statements(
+        self, previous: Dict[str, Any], data: Dict[str, Any]
+    ) -> list[tuple[str, tuple]]:
+        """Upserts/deletes voor alleen de keys die tussen 'previous' en 'data' verschillen."""
+        statements: list[tuple[str, tuple]] = []
+        old_ids = {
+            (str(cid), str(key)): mid
+            for cid, keys in (previous.get("per_channel") or {}).items()
+            for key, mid in (keys or {}).items()
+        }
+        new_ids = {
+            (str(cid), str(key)): mid
+            for cid, keys in (data.get("per_channel") or {}).items()
+            for key, mid in (keys or {}).items()
+        }
+        for (cid, key), mid in new_ids.items():
+            if (cid, key) not in old_ids or old_ids[(cid, key)] != mid:
+                statements.append(
+                    (
+                        "INSERT OR REPLACE INTO message_ids (channel_id, key, message_id) "
+                        "VALUES (?, ?, ?)",
+                        (cid, key, mid),
+                    )
+                )
+        for cid, key in old_ids.keys() - new_ids.keys():
+            statements.append(
+                ("DELETE FROM message_ids WHERE channel_id=? AND key=?", (cid, key))
+            )
+
+        old_rest = {str(k): v for k, v in previous.items() if k != "per_channel"}
+        new_rest = {str(k): v for k, v in data.items() if k != "per_channel"}
+        for key, value in new_rest.items():
+            if key not in old_rest or old_rest[key] != value:
+                statements.append(
+                    (
+                        "INSERT OR REPLACE INTO documents (doc, key, value) VALUES (?, ?, ?)",
+                        ("poll_message", key, json.dumps(value, ensure_ascii=False, sort_keys=True)),
+                    )
+                )
+        for key in old_rest.keys() - new_rest.keys():
+            statements.append(
+                ("DELETE FROM documents WHERE doc=? AND key=?", ("poll_message", key))
+            )
+        return statements
+
+
+_STORE: Optional[SQLiteStore] = None
+
+
+def get_store() -> SQLiteStore:
+    """Gedeelde store voor het huidige SQLITE_PATH (opnieuw geopend als het pad wisselt)."""
+    global _STORE
+    path = get_sqlite_path()
+    if _STORE is None or _STORE.path != path:
+        if _STORE is not None:
+            _STORE.close()
+        _STORE = SQLiteStore(path)
+        with _WRITTEN_LOCK:
+            _POLL_MESSAGE_WRITTEN.pop(path, None)
+    return _STORE
+
+
+# -----------------------------
+# poll_message-document (per_channel apart in message_ids)
+# -----------------------------
+
+# Laatst gelezen/geschreven poll_message-data per databasepad. Opslaan schrijft
+# alleen het verschil hiermee, zodat één bericht-ID één upsert is.
+_POLL_MESSAGE_WRITTEN: Dict[str, Dict[str, Any]] = {}
+_WRITTEN_LOCK = threading.Lock()
+
+
+def _read_poll_message_data(store: SQLiteStore) -> Dict[str, Any]:
+    data = store.load_document("poll_message")
+    per_channel = store.load_message_ids()
+    if per_channel:
+        data["per_channel"] = per_channel
+    return data
+
+
+def load_poll_message_data() -> Dict[str, Any]:
+    """Volledige poll_message-data (één keer per cache-vulling in poll_message.py)."""
+    store = get_store()
+    with _WRITTEN_LOCK:
+        data = _read_poll_message_data(store)
+        _POLL_MESSAGE_WRITTEN[store.path] = copy.deepcopy(data)
+    return data
+
+
+def save_poll_message_data(data: Dict[str, Any]) -> None:
+    """
+    Schrijf alleen de keys die sinds de laatste lees/schrijfactie gewijzigd zijn.
+    Geserialiseerd: wie als laatste schrijft, vergelijkt met de echte DB-stand.
+    """
+    store = get_store()
+    with _WRITTEN_LOCK:
+        previous = _POLL_MESSAGE_WRITTEN.get(store.path)
+        if previous is None:
+            previous = _read_poll_message_data(store)
+        statements = store.poll_message_statements(previous, data)
+        if statements:
+            store._write(statements)
+        _POLL_MESSAGE_WRITTEN[store.path] = copy.deepcopy(data)
@@ -0,0 +1,80 @@
+# apps/utils/sweep.py
+#
+# Gedeelde executor voor scheduler-sweeps over alle guilds × kanalen.
+#
+# Kanalen worden gelijktijdig verwerkt (maximaal SWEEP_CONCURRENCY tegelijk,
+# standaard 8), zodat de duur van een sweep bepaald wordt door het traagste
+# kanaal in plaats van de som van alle kanalen. Een fout in één kanaal wordt
+# gelogd en stopt de andere kanalen niet. Na afloop logt run_sweep de duur via
+# log_job(status="timing") en geeft een SweepReport terug.
+#
+# Gedeelde Discord-limieten worden bewaakt door outbound_queue; de concurrency
+# hier begrenst vooral hoeveel kanalen tegelijk state laden en berichten bouwen.
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Iterable, NamedTuple, Optional
+
+from apps.utils.logger import log_job
+
+
+def _default_concurrency() -> int:
+    try:
+        return max(1, int(os.getenv("SWEEP_CONCURRENCY", "8")))
+    except ValueError:
+        return 8
+
+
+class SweepReport(NamedTuple):
+    name: str
+    channels: int
+    failed: int
+    duration: float  # wandtijd van de hele sweep (seconden)
+    slowest: float  # duur van het traagste kanaal (seconden)
+    slowest_channel_id: Optional[int]
+
+
+async def run_sweep(
+    name: str,
+    targets: Iterable[tuple[Any, Any]],
+    handler: Callable[[Any, Any], Awaitable[Any]],
+    *,
+    concurrency: Optional[int] = None,
+) -> SweepReport:
+    """
+    Roep handler(guild, channel) aan voor elk paar in 'targets', begrensd
+    gelijktijdig. Fouten per kanaal worden gelogd en geteld, niet doorgegeven.
+    """
+    limit = concurrency or _default_concurrency()
+    semaphore = asyncio.Semaphore(limit)
+    slowest = 0.0
+    slowest_cid: Optional[int] = None
+    failed = 0
+
+    async def _one(guild: Any, channel: Any) -> None:
+        nonlocal slowest, slowest_cid, failed
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await handler(guild, channel)
+            except Exception as e:
+                failed += 1
+                cid = getattr(channel, "id", None)
+                print(f"❌ Fout in {name} voor kanaal {cid}: {e}")
+            finally:
+                elapsed = time.perf_counter() - started
+                if elapsed >= slowest:
+                    slowest = elapsed
+                    slowest_cid = getattr(channel, "id", None)
+
+    started = time.perf_counter()
+    pairs = list(targets)
+    await asyncio.gather(*(_one(g, ch) for g, ch in pairs))
+    duration = time.perf_counter() - started
+
+    report = SweepReport(name, len(pairs), failed, duration, slowest, slowest_cid)
+    log_job(name, status="timing", duration=round(duration, 3))
+    return report
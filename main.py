@@ -29,12 +29,37 @@ TOKEN: str = TOKEN_ENV
 intents = discord.Intents.default()
 intents.members = True
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+
+class DMKBot(commands.Bot):
+    async def close(self) -> None:
+        # Samengevoegde edits die nog wachten eerst wegschrijven
+        from apps.utils.outbound_queue import outbound_queue
+
+        try:
+            await outbound_queue.flush(timeout=5.0)
+        except Exception as e:
+            print(f"⚠️ Outbound-wachtrij niet volledig geleegd: {e}")
+        await super().close()
+
+
+bot = DMKBot(command_prefix="!", intents=intents)
 
 
 @bot.event
 async def on_ready():
     print(f"Bot is online als {bot.user}")
+    # Kanaalindex vullen zodra de guild-cache er is; sweeps gebruiken hem daarna
+    from apps.scheduler import prime_channel_index
+
+    try:
+        prime_channel_index(bot)
+    except Exception as e:
+        print(f"⚠️ Kanaalindex opbouwen mislukt: {e}")
+    # Ledenlijsten per kanaal cachen; de member-events hieronder houden ze bij
+    from apps.utils.member_roster import enable_member_roster
+
+    enable_member_roster()
     try:
         synced = await bot.tree.sync()
         print(f"Slash-commando's gesynchroniseerd: {len(synced)}")
@@ -42,10 +67,72 @@ async def on_ready():
         print(f"Fout bij het synchroniseren van slash-commando's: {e}")
 
 
+def _forget_category_layout(channel) -> None:
+    from apps.utils.poll_settings import invalidate_category_scopes
+
+    invalidate_category_scopes(getattr(getattr(channel, "guild", None), "id", None))
+
+
+@bot.event
+async def on_guild_channel_create(channel):
+    _forget_category_layout(channel)
+
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    from apps.utils.member_roster import forget_channel
+
+    _forget_category_layout(channel)
+    forget_channel(channel)
+
+
+@bot.event
+async def on_guild_channel_update(before, after):
+    from apps.utils import member_roster
+
+    # Alleen verplaatsen naar een andere categorie verandert de stem-scope
+    if getattr(before, "category_id", None) != getattr(after, "category_id", None):
+        _forget_category_layout(after)
+    # Gewijzigde overwrites veranderen wie het kanaal ziet
+    member_roster.on_channel_update(before, after)
+
+
+@bot.event
+async def on_member_join(member):
+    from apps.utils import member_roster
+
+    member_roster.on_member_join(member)
+
+
+@bot.event
+async def on_member_remove(member):
+    from apps.utils import member_roster
+
+    member_roster.on_member_remove(member)
+
+
+@bot.event
+async def on_member_update(before, after):
+    from apps.utils import member_roster
+
+    member_roster.on_member_update(before, after)
+
+
+@bot.event
+async def on_guild_role_update(before, after):
+    from apps.utils import member_roster
+
+    member_roster.on_role_update(before, after)
+
+
 async def main():
     from apps.scheduler import setup_scheduler
+    from apps.utils.poll_storage import warm_votes_cache
     from apps.utils.tenor_sync import sync_tenor_links
 
+    # Laad stemmen één keer in het geheugen (daarna write-through naar schijf)
+    await warm_votes_cache()
+
     # Sync tenor links bij startup (creëert tenor-links.json als niet bestaat)
     try:
         sync_tenor_links()
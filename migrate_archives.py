@@ -1,22 +1,98 @@
 #!/usr/bin/env python
 """
-One-time migration script to update all existing archive CSV files
-to include the new niet_gestemd and was_misschien columns,
-and convert old week numbers to ISO week format.
+Migration tool to bring all archive CSV files to the current format:
+the niet_gestemd and was_misschien columns, and ISO week numbers.
 
-Run this script once to migrate all archive files:
-    py migrate_archives.py
+Run this once (or after restoring old backups) to migrate all archive files:
+    py migrate_archives.py                 # all CPU cores
+    py migrate_archives.py --workers 4
+    py migrate_archives.py --restart       # ignore the resume state
 
-Supported CSV versions:
+Supported CSV versions (weekend archive):
 - V1 (16 columns): no niet_gestemd, no was_misschien, old week format
 - V2 (19 columns): has niet_gestemd, no was_misschien, old week format
 - V3 (22 columns): has niet_gestemd and was_misschien, old week format
 - V4 (22 columns): has niet_gestemd and was_misschien, ISO week format (YYYY-Www)
+
+Weekday archives (*_weekdays.csv) were introduced in the current format and
+are only checked, never rewritten.
+
+Files are discovered as archive/dmk_archive_*.csv (plus the legacy global
+files) and migrated in a process pool. Each file is streamed row by row into
+a temp file and swapped in with os.replace, so an interrupted run never
+leaves a half-written archive. Files whose header fingerprint is already
+current are skipped after reading two lines, and finished files are recorded
+in a state file so a restarted run continues where it stopped.
+
+The bot itself no longer migrates archives while writing; run this tool
+before starting a new version on old archives.
 """
 
+import argparse
 import csv
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import Optional
+
+ARCHIVE_DIR = "archive"
+STATE_FILE = os.path.join(ARCHIVE_DIR, ".migration_state.json")
+
+# Progress line every N files
+REPORT_EVERY = 100
+
+# V4 header with niet_gestemd and was_misschien columns (see apps/utils/archive.py)
+WEEKEND_HEADER = [
+    "week",
+    "datum_vrijdag",
+    "datum_zaterdag",
+    "datum_zondag",
+    "vr_19",
+    "vr_2030",
+    "vr_misschien",
+    "vr_was_misschien",
+    "vr_niet",
+    "vr_niet_gestemd",
+    "za_19",
+    "za_2030",
+    "za_misschien",
+    "za_was_misschien",
+    "za_niet",
+    "za_niet_gestemd",
+    "zo_19",
+    "zo_2030",
+    "zo_misschien",
+    "zo_was_misschien",
+    "zo_niet",
+    "zo_niet_gestemd",
+]
+
+WEEKDAY_HEADER = [
+    "week",
+    "datum_maandag",
+    "datum_dinsdag",
+    "datum_woensdag",
+    "datum_donderdag",
+    *(
+        f"{day}_{col}"
+        for day in ("ma", "di", "wo", "do")
+        for col in ("19", "2030", "misschien", "was_misschien", "niet", "niet_gestemd")
+    ),
+]
+
+
+def header_fingerprint(header: list[str]) -> str:
+    """Short hash of a header row; equal fingerprints mean equal column layout."""
+    return hashlib.sha1(",".join(header).encode("utf-8")).hexdigest()[:16]
+
+
+CURRENT_FINGERPRINTS = {
+    header_fingerprint(WEEKEND_HEADER),
+    header_fingerprint(WEEKDAY_HEADER),
+}
 
 
 def _convert_week_to_iso(week_str: str, friday_date: str) -> str:
@@ -43,203 +119,239 @@ def _convert_week_to_iso(week_str: str, friday_date: str) -> str:
         return week_str
 
 
-def migrate_csv_file(csv_path: str) -> bool:
+def migrate_row(old_row: list[str], has_v3_columns: bool) -> Optional[list[str]]:
     """
-    Migrate a single CSV file to the newest format (V4 - 22 columns with ISO week format).
+    Migrate one weekend data row to V4. Returns None for rows that are too
+    short to be data (they are dropped, as before).
+    """
+    if not old_row or len(old_row) < 4:
+        return None
+
+    new_week = _convert_week_to_iso(old_row[0], old_row[1])
+
+    if len(old_row) >= 22 and has_v3_columns:
+        # V3 format: alleen week conversie nodig
+        return [new_week, *old_row[1:]]
+    if len(old_row) >= 19:
+        # V2 format with niet_gestemd (19 columns): add was_misschien columns
+        # (empty = data not tracked)
+        return [
+            new_week, *old_row[1:7], "", old_row[7], old_row[8],
+            *old_row[9:12], "", old_row[12], old_row[13],
+            *old_row[14:17], "", old_row[17], old_row[18],
+        ]
+    if len(old_row) >= 16:
+        # V1 format without niet_gestemd (16 columns): add niet_gestemd and
+        # was_misschien columns (empty = data not tracked)
+        return [
+            new_week, *old_row[1:7], "", old_row[7], "",
+            *old_row[8:11], "", old_row[11], "",
+            *old_row[12:15], "", old_row[15], "",
+        ]
+    return old_row
+
+
+def _read_head(csv_path: str) -> tuple[list[str], Optional[list[str]]]:
+    """Header and first data row, without reading the rest of the file."""
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        first = next((row for row in reader if row), None)
+    return header, first
 
-    Supported CSV versions:
-    - V1 (16 columns): no niet_gestemd, no was_misschien, old week format
-    - V2 (19 columns): has niet_gestemd, no was_misschien, old week format
-    - V3 (22 columns): has niet_gestemd and was_misschien, old week format
-    - V4 (22 columns): has niet_gestemd and was_misschien, ISO week format (current)
 
-    Returns True if migration was performed, False if file was already migrated or doesn't exist.
+def is_current(header: list[str], first_row: Optional[list[str]]) -> bool:
+    """Current column layout and (if there is data) ISO week numbers."""
+    if header_fingerprint(header) not in CURRENT_FINGERPRINTS:
+        return False
+    return first_row is None or "-W" in first_row[0]
+
+
+def _migrate_file(csv_path: str) -> tuple[str, int]:
+    """
+    Migrate one file. Returns (status, rows) with status "migrated",
+    "current", "unknown" (not a weekend archive; left untouched) or "missing".
     """
     if not os.path.exists(csv_path):
-        return False
+        return "missing", 0
 
-    # Read existing CSV
-    with open(csv_path, "r", newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        rows = list(reader)
+    header, first = _read_head(csv_path)
+    if not header or is_current(header, first):
+        return "current", 0
+    if not any(col.startswith("vr_") for col in header):
+        return "unknown", 0
 
-    if not rows:
-        return False
+    has_v3_columns = "vr_was_misschien" in header
+    tmp_path = f"{csv_path}.migrating"
+    rows = 0
+    try:
+        with open(csv_path, "r", newline="", encoding="utf-8") as src, open(
+            tmp_path, "w", newline="", encoding="utf-8"
+        ) as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            next(reader, None)
+            writer.writerow(WEEKEND_HEADER)
+            for old_row in reader:
+                new_row = migrate_row(old_row, has_v3_columns)
+                if new_row is not None:
+                    writer.writerow(new_row)
+                    rows += 1
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, csv_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return "migrated", rows
 
-    existing_header = rows[0]
 
-    # Check if already has V3/V4 columns AND ISO week format
-    has_v3_columns = "vr_was_misschien" in existing_header
+def migrate_csv_file(csv_path: str) -> bool:
+    """
+    Migrate a single CSV file to the newest format (V4 - 22 columns with ISO week format).
 
-    # Check if week format is already ISO (check first data row)
-    has_iso_week = False
-    if len(rows) > 1 and rows[1]:
-        week_value = rows[1][0]
-        has_iso_week = "-W" in week_value  # ISO format contains "-W"
+    Returns True if migration was performed, False if file was already migrated or doesn't exist.
+    """
+    status, _ = _migrate_file(csv_path)
+    return status == "migrated"
+
+
+def _migrate_one(csv_path: str) -> tuple[str, str, int, int, str]:
+    """Pool worker: (path, status, rows, bytes, error)."""
+    try:
+        size = os.path.getsize(csv_path) if os.path.exists(csv_path) else 0
+        status, rows = _migrate_file(csv_path)
+        return csv_path, status, rows, size, ""
+    except Exception as e:  # noqa: BLE001 - reported per file
+        return csv_path, "error", 0, 0, str(e)
 
-    if has_v3_columns and has_iso_week:
-        print(f"  [OK] Already migrated to V4: {csv_path}")
-        return False
 
-    # V4 header with niet_gestemd and was_misschien columns
-    new_header = [
-        "week",
-        "datum_vrijdag",
-        "datum_zaterdag",
-        "datum_zondag",
-        "vr_19",
-        "vr_2030",
-        "vr_misschien",
-        "vr_was_misschien",
-        "vr_niet",
-        "vr_niet_gestemd",
-        "za_19",
-        "za_2030",
-        "za_misschien",
-        "za_was_misschien",
-        "za_niet",
-        "za_niet_gestemd",
-        "zo_19",
-        "zo_2030",
-        "zo_misschien",
-        "zo_was_misschien",
-        "zo_niet",
-        "zo_niet_gestemd",
-    ]
-
-    # Update header
-    rows[0] = new_header
-
-    # Migrate data rows
-    migrated_count = 0
-    week_converted_count = 0
-
-    for i in range(1, len(rows)):
-        old_row = rows[i]
-
-        # Skip empty rows
-        if not old_row or len(old_row) < 4:
+def find_archive_files(archive_dir: str = ARCHIVE_DIR) -> list[str]:
+    """Find all archive CSV files (scoped dmk_archive_*.csv plus legacy files)."""
+    archive_files = []
+
+    # Legacy global files
+    for legacy in ("poll_archive.csv", os.path.join(archive_dir, "dmk_archive.csv")):
+        if os.path.exists(legacy):
+            archive_files.append(legacy)
+
+    # Scoped archives: archive/dmk_archive_<guild>_<channel>[_weekdays].csv
+    for archives_dir in (archive_dir, "archives"):
+        if not os.path.isdir(archives_dir):
             continue
+        with os.scandir(archives_dir) as it:
+            for entry in it:
+                if (
+                    entry.is_file()
+                    and entry.name.startswith("dmk_archive_")
+                    and entry.name.endswith(".csv")
+                ):
+                    archive_files.append(entry.path)
 
-        if len(old_row) >= 22 and has_v3_columns:
-            # V3 format: alleen week conversie nodig
-            old_week = old_row[0]
-            friday_date = old_row[1]
-            new_week = _convert_week_to_iso(old_week, friday_date)
-
-            if new_week != old_week:
-                old_row[0] = new_week
-                week_converted_count += 1
-
-            rows[i] = old_row
-            migrated_count += 1
-        elif len(old_row) >= 19:
-            # V2 format with niet_gestemd (19 columns)
-            # Migrate to V4: Add was_misschien columns + convert week format
-            old_week = old_row[0]
-            friday_date = old_row[1]
-            new_week = _convert_week_to_iso(old_week, friday_date)
-
-            if new_week != old_week:
-                week_converted_count += 1
-
-            new_row = [
-                new_week,  # week (converted to ISO)
-                old_row[1],  # datum_vrijdag
-                old_row[2],  # datum_zaterdag
-                old_row[3],  # datum_zondag
-                old_row[4],  # vr_19
-                old_row[5],  # vr_2030
-                old_row[6],  # vr_misschien
-                "",  # vr_was_misschien (V4 - empty = data not tracked)
-                old_row[7],  # vr_niet
-                old_row[8],  # vr_niet_gestemd
-                old_row[9],  # za_19
-                old_row[10],  # za_2030
-                old_row[11],  # za_misschien
-                "",  # za_was_misschien (V4 - empty = data not tracked)
-                old_row[12],  # za_niet
-                old_row[13],  # za_niet_gestemd
-                old_row[14],  # zo_19
-                old_row[15],  # zo_2030
-                old_row[16],  # zo_misschien
-                "",  # zo_was_misschien (V4 - empty = data not tracked)
-                old_row[17],  # zo_niet
-                old_row[18],  # zo_niet_gestemd
-            ]
-            rows[i] = new_row
-            migrated_count += 1
-        elif len(old_row) >= 16:
-            # V1 format without niet_gestemd (16 columns)
-            # Migrate to V4: Add both niet_gestemd and was_misschien columns + convert week format
-            old_week = old_row[0]
-            friday_date = old_row[1]
-            new_week = _convert_week_to_iso(old_week, friday_date)
-
-            if new_week != old_week:
-                week_converted_count += 1
-
-            new_row = [
-                new_week,  # week (converted to ISO)
-                old_row[1],  # datum_vrijdag
-                old_row[2],  # datum_zaterdag
-                old_row[3],  # datum_zondag
-                old_row[4],  # vr_19
-                old_row[5],  # vr_2030
-                old_row[6],  # vr_misschien
-                "",  # vr_was_misschien (V4 - empty = data not tracked)
-                old_row[7],  # vr_niet
-                "",  # vr_niet_gestemd (V4 - empty = data not tracked)
-                old_row[8],  # za_19
-                old_row[9],  # za_2030
-                old_row[10],  # za_misschien
-                "",  # za_was_misschien (V4 - empty = data not tracked)
-                old_row[11],  # za_niet
-                "",  # za_niet_gestemd (V4 - empty = data not tracked)
-                old_row[12],  # zo_19
-                old_row[13],  # zo_2030
-                old_row[14],  # zo_misschien
-                "",  # zo_was_misschien (V4 - empty = data not tracked)
-                old_row[15],  # zo_niet
-                "",  # zo_niet_gestemd (V4 - empty = data not tracked)
-            ]
-            rows[i] = new_row
-            migrated_count += 1
-
-    # Write migrated CSV
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerows(rows)
-
-    if week_converted_count > 0:
-        print(
-            f"  [OK] Migrated {migrated_count} rows ({week_converted_count} weeks converted to ISO format): {csv_path}"
-        )
-    else:
-        print(f"  [OK] Migrated {migrated_count} rows: {csv_path}")
-    return True
+    return sorted(set(archive_files))
 
 
-def find_archive_files() -> list[str]:
-    """Find all archive CSV files in the archives directory."""
-    archive_files = []
+# ---------- resume state ----------
+
 
-    # Look for poll_archive.csv (legacy global file)
-    if os.path.exists("poll_archive.csv"):
-        archive_files.append("poll_archive.csv")
+def _stamp(path: str) -> Optional[list[int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
 
-    # Look for scoped archives in archives/ and archive/ directories
-    for archives_dir in ["archives", "archive"]:
-        if os.path.exists(archives_dir) and os.path.isdir(archives_dir):
-            for root, _, files in os.walk(archives_dir):
-                for file in files:
-                    if file.endswith(".csv"):
-                        archive_files.append(os.path.join(root, file))
 
-    return archive_files
+def load_state(state_file: str) -> dict[str, list[int]]:
+    """Finished files from an earlier run: path -> [mtime_ns, size]."""
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return dict(json.load(f).get("done", {}))
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_state(state_file: str, done: dict[str, list[int]]) -> None:
+    os.makedirs(os.path.dirname(state_file) or ".", exist_ok=True)
+    tmp_path = f"{state_file}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"done": done}, f)
+    os.replace(tmp_path, state_file)
+
+
+def run_migration(
+    archive_files: list[str],
+    workers: int = 0,
+    state_file: str = STATE_FILE,
+    restart: bool = False,
+) -> dict[str, float]:
+    """
+    Migrate archive_files in a process pool (workers=1: in this process) and
+    return counters plus throughput.
+    """
+    done = {} if restart else load_state(state_file)
+    todo = [p for p in archive_files if done.get(p) is None or done[p] != _stamp(p)]
+    stats: dict[str, float] = {
+        "total": len(archive_files),
+        "resumed": len(archive_files) - len(todo),
+        "migrated": 0,
+        "current": 0,
+        "unknown": 0,
+        "missing": 0,
+        "error": 0,
+        "rows": 0,
+        "bytes": 0,
+    }
+
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+
+    def _handle(result: tuple[str, str, int, int, str], n: int) -> None:
+        path, status, rows, size, error = result
+        stats[status] += 1
+        stats["rows"] += rows
+        stats["bytes"] += size
+        if status == "error":
+            print(f"  [ERROR] Error migrating {path}: {error}")
+        else:
+            done[path] = _stamp(path) or []
+        if n % REPORT_EVERY == 0:
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            print(
+                f"  [{n}/{len(todo)}] {n / elapsed:.1f} files/s, "
+                f"{stats['bytes'] / elapsed / 1e6:.2f} MB/s"
+            )
+            save_state(state_file, done)
+
+    if workers == 1 or len(todo) <= 1:
+        for n, path in enumerate(todo, start=1):
+            _handle(_migrate_one(path), n)
+    else:
+        chunksize = max(1, min(64, len(todo) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for n, result in enumerate(
+                pool.map(_migrate_one, todo, chunksize=chunksize), start=1
+            ):
+                _handle(result, n)
+
+    save_state(state_file, done)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    stats["seconds"] = elapsed
+    stats["files_per_second"] = len(todo) / elapsed
+    stats["rows_per_second"] = stats["rows"] / elapsed
+    stats["mb_per_second"] = stats["bytes"] / elapsed / 1e6
+    return stats
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Migrate archive CSV files to V4.")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--workers", type=int, default=0, help="0 = all CPU cores")
+    parser.add_argument("--state-file", default=None)
+    parser.add_argument("--restart", action="store_true", help="ignore earlier progress")
+    args = parser.parse_args()
+    state_file = args.state_file or os.path.join(args.archive_dir, ".migration_state.json")
+
     print("=" * 70)
     print("Archive CSV Migration Tool - V4")
     print("=" * 70)
@@ -255,37 +367,31 @@ def main():
     print("(Empty = data was not tracked in those weeks)")
     print()
 
-    # Find all archive files
-    archive_files = find_archive_files()
+    archive_files = find_archive_files(args.archive_dir)
 
     if not archive_files:
         print("No archive files found. Nothing to migrate.")
         return
 
-    print(f"Found {len(archive_files)} archive file(s):\n")
-    for file in archive_files:
-        print(f"  - {file}")
-
+    print(f"Found {len(archive_files)} archive file(s).")
     print("\nStarting migration...\n")
 
-    migrated = 0
-    already_migrated = 0
-
-    for csv_path in archive_files:
-        try:
-            if migrate_csv_file(csv_path):
-                migrated += 1
-            else:
-                already_migrated += 1
-        except Exception as e:
-            print(f"  [ERROR] Error migrating {csv_path}: {e}")
+    stats = run_migration(archive_files, args.workers, state_file, args.restart)
 
     print("\n" + "=" * 70)
     print("Migration Complete!")
     print("=" * 70)
-    print(f"  Files migrated: {migrated}")
-    print(f"  Already migrated: {already_migrated}")
-    print(f"  Total files: {len(archive_files)}")
+    print(f"  Files migrated: {int(stats['migrated'])}")
+    print(f"  Already migrated: {int(stats['current'])}")
+    print(f"  Skipped (done in earlier run): {int(stats['resumed'])}")
+    print(f"  Unknown format (untouched): {int(stats['unknown'])}")
+    print(f"  Errors: {int(stats['error'])}")
+    print(f"  Total files: {int(stats['total'])}")
+    print(
+        f"  Throughput: {stats['files_per_second']:.1f} files/s, "
+        f"{stats['rows_per_second']:.0f} rows/s, {stats['mb_per_second']:.2f} MB/s "
+        f"({stats['seconds']:.2f}s)"
+    )
     print()
 
 
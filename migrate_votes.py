@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""
+One-time migration script to split the monolithic votes.json into
+one file per guild/channel scope (sharded layout).
+
+Run this script once before starting the bot with VOTES_DIR set:
+    py migrate_votes.py [votes.json] [votes_dir]
+
+Defaults come from the VOTES_FILE and VOTES_DIR environment variables
+(votes.json and votes/). The source file is left untouched.
+
+Layout after migration:
+    <votes_dir>/guilds/<guild_id>/channels/<channel_id>.json
+"""
+
+import asyncio
+import os
+import sys
+
+from apps.utils.poll_storage import migrate_votes_to_shards
+
+
+def main():
+    src = sys.argv[1] if len(sys.argv) > 1 else os.getenv("VOTES_FILE", "votes.json")
+    dst = sys.argv[2] if len(sys.argv) > 2 else os.getenv("VOTES_DIR", "") or "votes"
+
+    print("=" * 70)
+    print("Votes Migration Tool - sharded layout")
+    print("=" * 70)
+
+    if not os.path.exists(src):
+        print(f"No votes file found at {src}. Nothing to migrate.")
+        return
+
+    print(f"\nSource: {src}")
+    print(f"Target: {dst}\n")
+
+    count = asyncio.run(migrate_votes_to_shards(src, dst))
+
+    print("=" * 70)
+    print("Migration Complete!")
+    print("=" * 70)
+    print(f"  Channels written: {count}")
+    print(f"\nStart the bot with VOTES_DIR={dst} to use the sharded files.")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Import/export tool between the JSON files and the SQLite storage backend.
+
+Usage:
+    py storage_tool.py import    # JSON files  -> SQLite database
+    py storage_tool.py export    # SQLite database -> JSON files
+
+Paths come from the usual environment variables:
+    VOTES_FILE (or VOTES_DIR for sharded votes), SETTINGS_FILE,
+    POLL_MESSAGE_FILE and SQLITE_PATH.
+
+Import replaces the contents of the database; export overwrites the JSON
+files. Start the bot with STORAGE_BACKEND=sqlite to use the database.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+from apps.utils.sqlite_store import SQLiteStore, get_sqlite_path
+
+
+def _read_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _paths() -> dict[str, str]:
+    return {
+        "votes": os.getenv("VOTES_FILE", "votes.json"),
+        "settings": os.getenv("SETTINGS_FILE", "poll_settings.json"),
+        "messages": os.getenv("POLL_MESSAGE_FILE", "poll_message.json"),
+        "sqlite": get_sqlite_path(),
+    }
+
+
+def import_json(store: SQLiteStore, paths: dict[str, str]) -> dict[str, int]:
+    """Lees de JSON-opslag (inclusief journal of shards) en vervang de database-inhoud."""
+    # Stemmen via poll_storage laden, zodat journal en VOTES_DIR meegenomen worden
+    from apps.utils.poll_storage import load_votes
+
+    previous = os.environ.get("STORAGE_BACKEND")
+    os.environ["STORAGE_BACKEND"] = "json"
+    try:
+        votes_root = asyncio.run(load_votes())
+    finally:
+        if previous is None:
+            os.environ.pop("STORAGE_BACKEND", None)
+        else:
+            os.environ["STORAGE_BACKEND"] = previous
+    settings = _read_json(paths["settings"])
+    messages = _read_json(paths["messages"])
+
+    channels = store.replace_votes_root(votes_root)
+    store.clear_document("settings")
+    store.save_document("settings", settings)
+    store.replace_message_ids(messages.get("per_channel") or {})
+    store.clear_document("poll_message")
+    store.save_document(
+        "poll_message", {k: v for k, v in messages.items() if k != "per_channel"}
+    )
+    return {"channels": channels, "settings": len(settings), "messages": len(messages)}
+
+
+def export_json(store: SQLiteStore, paths: dict[str, str]) -> dict[str, int]:
+    """Schrijf de database-inhoud terug naar de JSON-bestanden."""
+    votes_root = store.load_votes_root()
+    settings = store.load_document("settings")
+    messages = store.load_document("poll_message")
+    per_channel = store.load_message_ids()
+    if per_channel:
+        messages["per_channel"] = per_channel
+
+    _write_json(paths["votes"], votes_root)
+    _write_json(paths["settings"], settings)
+    _write_json(paths["messages"], messages)
+    channels = sum(
+        len(g.get("channels", {})) for g in votes_root.get("guilds", {}).values()
+    )
+    return {"channels": channels, "settings": len(settings), "messages": len(messages)}
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in {"import", "export"}:
+        print(__doc__)
+        sys.exit(1)
+
+    mode = sys.argv[1]
+    paths = _paths()
+
+    print("=" * 70)
+    print(f"Storage Tool - {mode}")
+    print("=" * 70)
+    for name, path in paths.items():
+        print(f"  {name:<9} {path}")
+    print()
+
+    store = SQLiteStore(paths["sqlite"])
+    try:
+        if mode == "import":
+            result = import_json(store, paths)
+        else:
+            result = export_json(store, paths)
+    finally:
+        store.close()
+
+    print(f"  Vote channels:     {result['channels']}")
+    print(f"  Settings keys:     {result['settings']}")
+    print(f"  Poll message keys: {result['messages']}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # tests/base.py
 
 import os
+import shutil
 import tempfile
 import unittest
 
@@ -42,6 +43,14 @@ class BaseTestCase(unittest.IsolatedAsyncioTestCase):
         poll_message.POLL_MESSAGE_FILE = self.temp_message_file.name
         poll_settings.SETTINGS_FILE = self.temp_settings_file.name
 
+        # Archieven (CSV + kolomopslag) in een eigen map, niet in archive/
+        from apps.utils import archive, archive_stats
+
+        self.temp_archive_dir = tempfile.mkdtemp(suffix="_archive")
+        self.original_archive_dir = archive.ARCHIVE_DIR
+        archive.ARCHIVE_DIR = self.temp_archive_dir
+        archive_stats.reset_archive_stats()
+
         # Reset votes (uses env var via get_votes_path())
         from apps.utils.poll_storage import reset_votes
         await reset_votes()
@@ -53,6 +62,13 @@ class BaseTestCase(unittest.IsolatedAsyncioTestCase):
         poll_message.POLL_MESSAGE_FILE = self.original_message_file
         poll_settings.SETTINGS_FILE = self.original_settings_file
 
+        from apps.utils import archive, archive_stats, archive_writer
+
+        archive.ARCHIVE_DIR = self.original_archive_dir
+        archive_stats.reset_archive_stats()
+        archive_writer.forget_index()
+        shutil.rmtree(self.temp_archive_dir, ignore_errors=True)
+
         # Restore environment variables
         if self.original_votes_env is not None:
             os.environ["VOTES_FILE"] = self.original_votes_env
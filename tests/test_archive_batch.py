@@ -0,0 +1,143 @@
+# tests/test_archive_batch.py
+"""
+Tests voor archive.archive_channels: archiveren bij de deactivatie-sweep
+vanuit één momentopname van de tellers, met alle rijen in één batch geschreven.
+"""
+
+import os
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytz
+
+from apps.utils import archive, archive_stats, poll_settings
+from apps.utils.poll_storage import (
+    add_vote,
+    set_was_misschien_user_ids,
+    update_non_voters,
+)
+from tests.base import BaseTestCase
+
+NOW = pytz.timezone("Europe/Amsterdam").localize(datetime(2025, 11, 25, 20, 1))
+
+
+def mk_channel(cid: int, member_ids):
+    members = [SimpleNamespace(id=m, bot=False, display_name=str(m)) for m in member_ids]
+    return SimpleNamespace(id=cid, members=members)
+
+
+class TestArchiveBatch(BaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir_patch = patch.object(archive, "ARCHIVE_DIR", self.tmp.name)
+        self.dir_patch.start()
+        archive_stats.reset_archive_stats()
+
+    async def asyncTearDown(self):
+        archive_stats.reset_archive_stats()
+        self.dir_patch.stop()
+        self.tmp.cleanup()
+        await super().asyncTearDown()
+
+    def _read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    async def test_batch_matches_per_channel_snapshot(self):
+        ch_a = mk_channel(10, [1, 2, 3])
+        ch_b = mk_channel(20, [4, 5])
+        await update_non_voters(1, 10, ch_a)
+        await add_vote("1", "vrijdag", "om 19:00 uur", 1, 10)
+        await add_vote("2", "vrijdag", "om 20:30 uur", 1, 10)
+        await add_vote("1_guest::Mario", "vrijdag", "om 20:30 uur", 1, 10)
+        await add_vote("3", "maandag", "misschien", 1, 10)
+        await set_was_misschien_user_ids("zaterdag", ["2", "3"], 1, 10)
+        await add_vote("4", "zondag", "niet meedoen", 1, 20)
+        poll_settings.set_poll_option_state(10, "maandag", "19:00", True)
+
+        scopes = [(1, 10, ch_a), (1, 20, ch_b)]
+        writes = []
+        real_batch = archive._write_archive_batch
+        with patch.object(archive, "load_votes", side_effect=AssertionError("geen herlaad")), \
+             patch.object(archive, "_write_archive_batch", side_effect=lambda jobs: (writes.append(len(jobs)), real_batch(jobs))[1]):
+            written = await archive.archive_channels(scopes, NOW)
+
+        # Weekend voor beide kanalen, weekdagen alleen voor kanaal 10
+        self.assertEqual(written, 3)
+        self.assertEqual(writes, [3])
+        batch = {
+            path: self._read(path)
+            for path in (
+                archive.get_archive_path_scoped(1, 10),
+                archive.get_archive_path_scoped(1, 10, weekday=True),
+                archive.get_archive_path_scoped(1, 20),
+            )
+        }
+        self.assertFalse(os.path.exists(archive.get_archive_path_scoped(1, 20, weekday=True)))
+
+        # Zelfde rijen als de losse per-kanaal archivering
+        for path in batch:
+            os.remove(path)
+        for gid, cid, channel in scopes:
+            await archive.append_week_snapshot_scoped(gid, cid, now=NOW, channel=channel)
+        for path, content in batch.items():
+            self.assertEqual(self._read(path), content)
+
+        row = batch[archive.get_archive_path_scoped(1, 10)].splitlines()[1].split(",")
+        # vr: 1x 19:00, 2x 20:30 (gast telt), 1 niet-stemmer (lid 3); za: was_misschien 2
+        self.assertEqual(row[4:10], ["1", "2", "0", "0", "0", "1"])
+        self.assertEqual(row[13], "2")
+        self.assertEqual(archive_stats.attendance_trend(1, 10, dag="vrijdag"), [("2025-W47", 3)])
+
+    async def test_current_week_is_replaced(self):
+        ch = mk_channel(10, [1, 2])
+        await add_vote("1", "vrijdag", "om 19:00 uur", 1, 10)
+        await archive.archive_channels([(1, 10, ch)], NOW)
+
+        await add_vote("2", "vrijdag", "om 19:00 uur", 1, 10)
+        self.assertEqual(await archive.archive_channels([(1, 10, ch)], NOW), 1)
+        lines = self._read(archive.get_archive_path_scoped(1, 10)).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1].split(",")[4], "2")
+
+    async def test_unknown_members_match_per_channel(self):
+        # Geen update_non_voters: leden onbekend → kanaalleden, zonder kanaal 0
+        await add_vote("1", "vrijdag", "om 19:00 uur", 1, 10)
+        await add_vote("3", "vrijdag", "om 19:00 uur", 1, 20)
+        scopes = [(1, 10, mk_channel(10, [1, 2])), (1, 20, None)]
+        await archive.archive_channels(scopes, NOW)
+        paths = [archive.get_archive_path_scoped(1, cid) for cid in (10, 20)]
+        batch = [self._read(path) for path in paths]
+
+        for path in paths:
+            os.remove(path)
+        for gid, cid, channel in scopes:
+            await archive.append_week_snapshot_scoped(gid, cid, now=NOW, channel=channel)
+        self.assertEqual([self._read(path) for path in paths], batch)
+
+        self.assertEqual(batch[0].splitlines()[1].split(",")[9], "1")
+        self.assertEqual(batch[1].splitlines()[1].split(",")[9], "0")
+
+    async def test_failing_channel_does_not_stop_batch(self):
+        scopes = [(1, 10, mk_channel(10, [1])), (1, 20, mk_channel(20, [2]))]
+        real_upsert = archive.upsert_week_row
+
+        def upsert(path, *args):
+            if path == archive.get_archive_path_scoped(1, 10):
+                raise OSError("schijf vol")
+            return real_upsert(path, *args)
+
+        with patch.object(archive, "upsert_week_row", side_effect=upsert), patch(
+            "builtins.print"
+        ) as mock_print:
+            self.assertEqual(await archive.archive_channels(scopes, NOW), 1)
+
+        self.assertTrue(os.path.exists(archive.get_archive_path_scoped(1, 20)))
+        self.assertIn("schijf vol", mock_print.call_args[0][0])
+
+    async def test_empty_batch_writes_nothing(self):
+        self.assertEqual(await archive.archive_channels([], NOW), 0)
+        self.assertEqual(os.listdir(self.tmp.name), [])
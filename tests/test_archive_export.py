@@ -0,0 +1,97 @@
+# tests/test_archive_export.py
+"""
+Tests voor de gestreamde CSV-export in apps/utils/archive.py: quoting per
+delimiter, cache tot het archief wijzigt en een preview die alleen de eerste
+regels leest.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from apps.utils import archive
+
+
+class TestArchiveExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patches = [
+            patch.object(archive, "ARCHIVE_DIR", os.path.join(self.tmp.name, "archive")),
+            patch.object(archive, "EXPORT_DIR", os.path.join(self.tmp.name, "exports")),
+            patch.dict(archive._EXPORTS, clear=True),
+        ]
+        for p in self.patches:
+            p.start()
+        os.makedirs(archive.ARCHIVE_DIR)
+        self.csv_path = archive.get_archive_path_scoped(1, 2)
+        with open(self.csv_path, "w", encoding="utf-8", newline="") as f:
+            f.write("week,notitie,vr_19\r\n")
+            f.write('2025-W40,"a;b",3\r\n')
+            f.write('2025-W41,"zei ""hoi""",4\r\n')
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmp.cleanup()
+
+    def _read(self, path):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return f.read()
+
+    def test_export_quotes_per_delimiter_and_is_cached(self):
+        comma = archive.export_archive(1, 2, ",")
+        semi = archive.export_archive(1, 2, ";")
+        self.assertEqual(
+            self._read(comma), 'week,notitie,vr_19\n2025-W40,a;b,3\n2025-W41,"zei ""hoi""",4\n'
+        )
+        self.assertEqual(
+            self._read(semi), 'week;notitie;vr_19\n2025-W40;"a;b";3\n2025-W41;"zei ""hoi""";4\n'
+        )
+
+        # Ongewijzigd archief: dezelfde export, zonder opnieuw te lezen
+        with patch.object(archive, "iter_archive_rows", side_effect=AssertionError):
+            self.assertEqual(archive.export_archive(1, 2, ";"), semi)
+
+        # Archief gewijzigd: export wordt opnieuw opgebouwd
+        with open(self.csv_path, "a", encoding="utf-8", newline="") as f:
+            f.write("2025-W42,x,5\r\n")
+        self.assertTrue(self._read(archive.export_archive(1, 2, ";")).endswith("2025-W42;x;5\n"))
+        self.assertEqual(archive.create_archive(1, 2, ";"), self._read(semi).encode("utf-8"))
+
+    def test_concurrent_exports_do_not_collide(self):
+        real_rows = archive.iter_archive_rows
+
+        def slow_rows(*args):
+            for row in real_rows(*args):
+                time.sleep(0.01)  # exports laten overlappen
+                yield row
+
+        with patch.object(archive, "iter_archive_rows", side_effect=slow_rows), \
+                ThreadPoolExecutor(max_workers=4) as pool:
+            paths = list(pool.map(lambda _: archive.export_archive(1, 2, ";"), range(4)))
+        self.assertEqual(len(set(paths)), 1)
+        self.assertTrue(self._read(paths[0]).startswith("week;notitie;vr_19\n"))
+        # Geen tijdelijke bestanden achtergebleven
+        self.assertEqual([f for f in os.listdir(archive.EXPORT_DIR) if f.endswith(".tmp")], [])
+
+    def test_preview_reads_only_first_lines(self):
+        read = []
+        real_iter = archive.iter_archive_rows
+
+        def counting(*args, **kwargs):
+            for row in real_iter(*args, **kwargs):
+                read.append(row)
+                yield row
+
+        with patch.object(archive, "iter_archive_rows", counting):
+            preview = archive.generate_csv_preview(1, 2, delimiter=";", max_lines=2)
+        self.assertEqual(preview, 'week;notitie;vr_19\n2025-W40;"a;b";3')
+        self.assertEqual(len(read), 2)
+        self.assertIsNone(archive.export_archive(9, 9))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# tests/test_archive_stats.py
+"""
+Tests voor apps/utils/archive_stats.py: kolomopslag naast de CSV-archieven
+en de aggregaties (opkomsttrend, voortschrijdend gemiddelde, go-rate).
+"""
+
+import os
+import tempfile
+from datetime import datetime
+from unittest.mock import patch
+
+import pytz
+
+from apps.utils import archive_stats
+from apps.utils.archive import (
+    append_week_snapshot_scoped,
+    delete_archive_scoped,
+    get_archive_path_scoped,
+)
+from apps.utils.poll_storage import add_vote, reset_votes
+from tests.base import BaseTestCase
+
+TZ = pytz.timezone("Europe/Amsterdam")
+GID, CID = 7001, 7002
+
+
+class TestArchiveStats(BaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir_patch = patch("apps.utils.archive.ARCHIVE_DIR", self.tmp.name)
+        self.dir_patch.start()
+        archive_stats.reset_archive_stats()
+
+    async def asyncTearDown(self):
+        archive_stats.reset_archive_stats()
+        self.dir_patch.stop()
+        self.tmp.cleanup()
+        await super().asyncTearDown()
+
+    async def _archive_week(self, now: datetime, vrijdag_20: int, zaterdag_19: int):
+        await reset_votes()
+        for n in range(vrijdag_20):
+            await add_vote(str(100 + n), "vrijdag", "om 20:30 uur", GID, CID)
+        for n in range(zaterdag_19):
+            await add_vote(str(200 + n), "zaterdag", "om 19:00 uur", GID, CID)
+        await append_week_snapshot_scoped(GID, CID, now=now)
+
+    async def test_snapshots_feed_aggregates(self):
+        # Drie opeenvolgende maandagen → weekends van week 45, 46, 47
+        await self._archive_week(TZ.localize(datetime(2025, 11, 10, 20, 0)), 6, 2)
+        await self._archive_week(TZ.localize(datetime(2025, 11, 17, 20, 0)), 3, 7)
+        await self._archive_week(TZ.localize(datetime(2025, 11, 24, 20, 0)), 8, 0)
+
+        expected_trend = [("2025-W45", 8), ("2025-W46", 10), ("2025-W47", 8)]
+        self.assertEqual(archive_stats.attendance_trend(GID, CID), expected_trend)
+        self.assertEqual(
+            [total for _, total in archive_stats.attendance_trend(GID, CID, dag="vrijdag")],
+            [6, 3, 8],
+        )
+        self.assertEqual(
+            archive_stats.rolling_average(GID, CID, window=2),
+            [("2025-W45", 8.0), ("2025-W46", 9.0), ("2025-W47", 9.0)],
+        )
+        rates = archive_stats.go_rate(GID, CID)
+        self.assertAlmostEqual(rates["vrijdag"], 2 / 3)
+        self.assertAlmostEqual(rates["zaterdag"], 1 / 3)
+        self.assertEqual(rates["zondag"], 0.0)
+
+        # Zelfde week opnieuw archiveren vervangt de rijen
+        await self._archive_week(TZ.localize(datetime(2025, 11, 24, 21, 0)), 1, 0)
+        self.assertEqual(archive_stats.attendance_trend(GID, CID)[-1], ("2025-W47", 1))
+
+        # Na herstart: zelfde antwoorden uit het kolombestand
+        path = archive_stats.get_stats_path(GID, CID)
+        self.assertTrue(os.path.exists(path))
+        archive_stats.reset_archive_stats()
+        with patch.object(archive_stats, "_build_from_csv", side_effect=AssertionError):
+            self.assertEqual(len(archive_stats.attendance_trend(GID, CID)), 3)
+
+        self.assertTrue(delete_archive_scoped(GID, CID))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(archive_stats.attendance_trend(GID, CID), [])
+
+    async def test_backfills_once_from_existing_csv(self):
+        # Oud V1-archief (zonder niet_gestemd/was_misschien), nog geen kolombestand
+        csv_path = get_archive_path_scoped(GID, CID)
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write(
+                "week,datum_vrijdag,datum_zaterdag,datum_zondag,"
+                "vr_19,vr_2030,vr_misschien,vr_niet,za_19,za_2030,za_misschien,za_niet,"
+                "zo_19,zo_2030,zo_misschien,zo_niet\n"
+            )
+            f.write("41,2025-10-10,2025-10-11,2025-10-12,1,6,0,0,1,3,0,0,2,2,0,0\n")
+            f.write("42,2025-10-17,2025-10-18,2025-10-19,0,2,0,0,6,0,0,0,0,0,1,0\n")
+
+        self.assertEqual(archive_stats.attendance_trend(GID, CID), [("41", 15), ("42", 8)])
+        self.assertEqual(
+            archive_stats.go_rate(GID, CID),
+            {"vrijdag": 0.5, "zaterdag": 0.5, "zondag": 0.0},
+        )
+        self.assertTrue(os.path.exists(archive_stats.get_stats_path(GID, CID)))
+
+        # Niet-bijgehouden kolommen blijven herkenbaar als ontbrekend
+        cols = archive_stats._columns(GID, CID)
+        self.assertEqual(set(cols.counts["niet gestemd"]), {archive_stats.MISSING})
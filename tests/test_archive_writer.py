@@ -0,0 +1,76 @@
+# tests/test_archive_writer.py
+"""
+Tests voor apps/utils/archive_writer.py: weken toevoegen zonder het bestand
+te herschrijven en de huidige week ter plekke bijwerken.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from apps.utils import archive_writer
+
+HEADER = ["week", "datum_maandag", "ma_19", "ma_2030"]
+
+
+class TestArchiveWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "archief.csv")
+        archive_writer.forget_index()
+
+    def tearDown(self):
+        archive_writer.forget_index()
+        self.tmp.cleanup()
+
+    def _lines(self):
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            return f.read().splitlines()
+
+    def test_new_week_is_appended_without_rewrite(self):
+        self.assertEqual(
+            archive_writer.upsert_week_row(self.path, HEADER, ["2025-W40", "d", 1, 2], "2025-W40"),
+            "created",
+        )
+        with open(self.path, "rb") as f:
+            before = f.read()
+
+        # Geen volledige herschrijving: _atomic_write wordt niet meer gebruikt
+        with patch.object(archive_writer, "_atomic_write", side_effect=AssertionError):
+            result = archive_writer.upsert_week_row(
+                self.path, HEADER, ["2025-W41", "d", 3, 4], "2025-W41"
+            )
+        self.assertEqual(result, "appended")
+        with open(self.path, "rb") as f:
+            after = f.read()
+        self.assertTrue(after.startswith(before))
+        self.assertEqual(self._lines()[-1], "2025-W41,d,3,4")
+
+    def test_same_week_is_replaced_in_place(self):
+        for week in ("2025-W40", "2025-W41"):
+            archive_writer.upsert_week_row(self.path, HEADER, [week, "d", 0, 0], week)
+
+        # Laatste week bijwerken (ook met langere rij), daarna een oudere week
+        archive_writer.upsert_week_row(self.path, HEADER, ["2025-W41", "d", 10, 20], "2025-W41")
+        archive_writer.upsert_week_row(self.path, HEADER, ["2025-W40", "d", 5, 6], "2025-W40")
+        archive_writer.upsert_week_row(self.path, HEADER, ["2025-W41", "d", 11, 21], "2025-W41")
+
+        self.assertEqual(
+            self._lines(),
+            ["week,datum_maandag,ma_19,ma_2030", "2025-W40,d,5,6", "2025-W41,d,11,21"],
+        )
+
+    def test_external_change_triggers_rescan(self):
+        archive_writer.upsert_week_row(self.path, HEADER, ["2025-W40", "d", 1, 2], "2025-W40")
+        # Iemand anders voegt een week toe (zonder afsluitende newline)
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            f.write("2025-W41,d,7,7")
+
+        archive_writer.upsert_week_row(self.path, HEADER, ["2025-W41", "d", 8, 8], "2025-W41")
+        archive_writer.upsert_week_row(self.path, HEADER, ["2025-W42", "d", 9, 9], "2025-W42")
+        self.assertEqual(self._lines()[1:], ["2025-W40,d,1,2", "2025-W41,d,8,8", "2025-W42,d,9,9"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# tests/test_atomic_json.py
+"""
+Tests voor apps/utils/atomic_json.py en de async setters die erop leunen.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from apps.utils import poll_message, poll_settings
+from apps.utils.atomic_json import JsonWriter, write_json_atomic
+from tests.base import BaseTestCase
+
+
+class TestJsonWriter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(suffix="_atomic_json")
+        self.path = os.path.join(self.tmpdir, "data.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _read(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_write_json_atomic_leaves_no_tmp_file(self):
+        write_json_atomic(self.path, {"a": 1})
+        self.assertEqual(self._read(), {"a": 1})
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+    async def test_concurrent_async_writes_end_with_latest_data(self):
+        writer = JsonWriter()
+        with patch(
+            "apps.utils.atomic_json.write_json_atomic", wraps=write_json_atomic
+        ) as mock_write:
+            await asyncio.gather(
+                *(writer.write_async(self.path, {"n": i}) for i in range(10))
+            )
+        self.assertEqual(self._read(), {"n": 9})
+        # Wachtende schrijfacties worden samengevoegd
+        self.assertLessEqual(mock_write.call_count, 10)
+
+    async def test_sync_write_after_async_is_not_overwritten(self):
+        writer = JsonWriter()
+        await writer.write_async(self.path, {"n": 1})
+        writer.write(self.path, {"n": 2})
+        await writer.write_async(self.path, {"n": 3})
+        self.assertEqual(self._read(), {"n": 3})
+
+
+class TestAsyncSetters(BaseTestCase):
+    async def test_settings_async_setters_update_cache_and_file(self):
+        await poll_settings.set_paused_async(1, True)
+        self.assertTrue(poll_settings.is_paused(1))
+
+        poll_settings.set_scheduled_activation(1, "wekelijks", "20:00", dag="maandag")
+        await poll_settings.clear_scheduled_activation_async(1)
+        self.assertIsNone(poll_settings.get_scheduled_activation(1))
+
+        with open(poll_settings.SETTINGS_FILE, "r", encoding="utf-8") as f:
+            on_disk = json.load(f)
+        self.assertTrue(on_disk["1"]["__paused__"])
+        self.assertNotIn("__scheduled_activation__", on_disk["1"])
+
+    async def test_message_id_async_setters(self):
+        await asyncio.gather(
+            poll_message.save_message_id_async(5, "vrijdag", 111),
+            poll_message.save_message_id_async(5, "zaterdag", 222),
+            poll_message.set_channel_disabled_async(6, True),
+        )
+        self.assertEqual(poll_message.get_message_id(5, "vrijdag"), 111)
+        self.assertEqual(poll_message.get_message_id(5, "zaterdag"), 222)
+        self.assertTrue(poll_message.is_channel_disabled(6))
+
+        await poll_message.clear_message_id_async(5, "vrijdag")
+        self.assertIsNone(poll_message.get_message_id(5, "vrijdag"))
+
+        with open(poll_message.POLL_MESSAGE_FILE, "r", encoding="utf-8") as f:
+            on_disk = json.load(f)
+        self.assertEqual(on_disk["per_channel"]["5"], {"zaterdag": 222})
@@ -0,0 +1,71 @@
+# tests/test_category_scope_cache.py
+"""
+Tests voor de gecachte categorie → gekoppelde-kanalen map achter
+get_vote_scope_channels / get_activated_channels_in_category.
+"""
+
+from types import SimpleNamespace
+
+from apps.utils import poll_message, poll_settings
+from tests.base import BaseTestCase
+
+
+class CountingGuild:
+    def __init__(self, gid: int, channels: list[tuple[int, int | None]]):
+        self.id = gid
+        self.scans = 0
+        self._channels = [
+            SimpleNamespace(id=cid, category_id=cat, guild=self) for cid, cat in channels
+        ]
+
+    @property
+    def text_channels(self):
+        self.scans += 1
+        return list(self._channels)
+
+    def channel(self, cid: int):
+        return next(ch for ch in self._channels if ch.id == cid)
+
+
+class TestCategoryScopeCache(BaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        poll_settings.invalidate_category_scopes()
+        self.guild = CountingGuild(1, [(10, 500), (11, 500), (12, 500), (20, None)])
+        for cid in (10, 11, 12):
+            poll_settings.set_paused(cid, False)
+
+    async def asyncTearDown(self):
+        poll_settings.invalidate_category_scopes()
+        await super().asyncTearDown()
+
+    def test_repeated_lookups_scan_once(self):
+        ch = self.guild.channel(10)
+        for _ in range(5):
+            self.assertEqual(poll_settings.get_vote_scope_channels(ch), [10, 11, 12])
+        self.assertEqual(poll_settings.get_vote_scope_channels(self.guild.channel(20)), [20])
+        self.assertEqual(self.guild.scans, 1)
+
+    def test_pause_and_disable_changes_are_picked_up(self):
+        ch = self.guild.channel(10)
+        self.assertEqual(poll_settings.get_vote_scope_channels(ch), [10, 11, 12])
+
+        poll_settings.set_paused(12, True)
+        self.assertEqual(poll_settings.get_vote_scope_channels(ch), [10, 11])
+
+        poll_message.set_channel_disabled(11, True)
+        self.assertEqual(poll_settings.get_vote_scope_channels(ch), [10])
+
+    def test_channel_move_requires_invalidation(self):
+        ch = self.guild.channel(10)
+        poll_settings.get_vote_scope_channels(ch)
+
+        self.guild.channel(11).category_id = 600
+        self.guild.channel(12).category_id = 600
+        poll_settings.invalidate_category_scopes(self.guild.id)
+
+        self.assertEqual(poll_settings.get_vote_scope_channels(ch), [10])
+        self.assertEqual(
+            poll_settings.get_activated_channels_in_category(self.guild, 600), [11, 12]
+        )
+        self.assertEqual(self.guild.scans, 2)
@@ -194,6 +194,26 @@ class TestCheckAllVotedCelebration(BaseTestCase):
                         # Geen fetch/delete
                         mock_fetch.assert_not_called()
 
+    async def test_unknown_members_do_not_celebrate(self):
+        """Zonder bekende leden (bv. na herstart) geen celebration en niets verwijderen."""
+        from apps.utils.poll_storage import add_vote
+
+        await add_vote("123", "vrijdag", "om 19:00 uur", 1, 100)
+        channel = MagicMock()
+        channel.id = 100
+        channel.members = []
+        channel.send = AsyncMock()
+
+        with patch(
+            "apps.utils.poll_message.get_enabled_poll_days", return_value=EXPECTED_DAYS
+        ), patch("apps.utils.poll_message.get_message_id", return_value=None), patch(
+            "apps.utils.poll_message.clear_message_id"
+        ) as mock_clear:
+            await check_all_voted_celebration(channel, 1, 100)
+
+        channel.send.assert_not_called()
+        mock_clear.assert_not_called()
+
     async def test_checks_all_three_days(self):
         """Test dat alle drie dagen worden gecheckt."""
         channel = MagicMock()
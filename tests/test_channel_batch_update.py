@@ -0,0 +1,112 @@
+# tests/test_channel_batch_update.py
+"""
+Tests voor poll_message.update_channel_polls: alle dagen van een kanaal in één
+ronde, oude dag-berichten opruimen en de per-dag locks respecteren.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from apps.utils import poll_message
+from tests.base import BaseTestCase
+
+WINDOW = [
+    {"dag": "zaterdag", "datum_iso": "2025-12-06"},
+    {"dag": "zondag", "datum_iso": "2025-12-07"},
+]
+
+
+class FakeMsg:
+    def __init__(self, mid: int):
+        self.id = mid
+        self.edits: list[str] = []
+        self.deleted = False
+
+    async def edit(self, *, content=None, view=None):
+        self.edits.append(content)
+
+    async def delete(self):
+        self.deleted = True
+
+
+def mk_channel(messages: dict[int, FakeMsg]):
+    sent: list[FakeMsg] = []
+
+    async def fetch_message(mid):
+        return messages.get(mid)
+
+    async def send(content=None, view=None):
+        msg = FakeMsg(5000 + len(sent))
+        sent.append(msg)
+        return msg
+
+    guild = SimpleNamespace(id=1, get_member=lambda _id: None)
+    return SimpleNamespace(
+        id=10, guild=guild, members=[], fetch_message=fetch_message, send=send, sent=sent
+    )
+
+
+async def _passthrough(fn, *args, **kwargs):
+    res = fn(*args, **kwargs)
+    if asyncio.iscoroutine(res):
+        return await res
+    return res
+
+
+class TestChannelBatchUpdate(BaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.messages = {100: FakeMsg(100), 300: FakeMsg(300)}
+        self.channel = mk_channel(self.messages)
+        poll_message.save_message_id(10, "maandag", 100)  # buiten de window
+        poll_message.save_message_id(10, "zondag", 300)
+        poll_message.mark_render_dirty(10)
+
+    def _patches(self, update_non_voters=None):
+        return (
+            patch(
+                "apps.utils.poll_settings.get_enabled_rolling_window_days",
+                return_value=WINDOW,
+            ),
+            patch("apps.utils.poll_message.safe_call", side_effect=_passthrough),
+            patch("apps.utils.discord_client.safe_call", side_effect=_passthrough),
+            patch(
+                "apps.utils.poll_message.update_non_voters",
+                update_non_voters or AsyncMock(),
+            ),
+        )
+
+    async def test_one_pass_cleans_up_and_renders_window(self):
+        non_voters = AsyncMock()
+        p1, p2, p3, p4 = self._patches(non_voters)
+        with p1, p2, p3, p4:
+            await poll_message.update_channel_polls(self.channel)
+
+        # Oude maandag weg, zondag geëdit, zaterdag nieuw aangemaakt
+        self.assertTrue(self.messages[100].deleted)
+        self.assertIsNone(poll_message.get_message_id(10, "maandag"))
+        self.assertEqual(len(self.messages[300].edits), 1)
+        self.assertEqual(len(self.channel.sent), 1)
+        self.assertEqual(poll_message.get_message_id(10, "zaterdag"), 5000)
+        non_voters.assert_awaited_once()
+
+        # Tweede ronde zonder wijzigingen: geen edits of creates
+        with p1, p2, p3, p4:
+            await poll_message.update_channel_polls(self.channel)
+        self.assertEqual(len(self.messages[300].edits), 1)
+        self.assertEqual(len(self.channel.sent), 1)
+
+    async def test_waits_for_day_lock_held_by_vote_update(self):
+        p1, p2, p3, p4 = self._patches()
+        with p1, p2, p3, p4:
+            lock = poll_message._day_lock(10, "zondag")
+            await lock.acquire()
+            task = asyncio.create_task(poll_message.update_channel_polls(self.channel))
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.messages[300].edits, [])
+            self.assertFalse(task.done())
+
+            lock.release()
+            await asyncio.wait_for(task, timeout=2)
+        self.assertEqual(len(self.messages[300].edits), 1)
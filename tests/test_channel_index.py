@@ -0,0 +1,104 @@
+# tests/test_channel_index.py
+"""
+Tests voor apps/utils/channel_index.py: classificatie, prime/refresh en het
+beperken van scheduler-sweeps tot geïndexeerde kanalen.
+"""
+
+from types import SimpleNamespace
+
+from apps import scheduler
+from apps.utils import channel_index, poll_message, poll_settings
+from tests.base import BaseTestCase
+
+
+def mk_guild(gid: int, cids: list[int]):
+    guild = SimpleNamespace(id=gid)
+    guild.text_channels = [SimpleNamespace(id=cid, guild=guild, name=f"c{cid}") for cid in cids]
+    guild.get_channel = lambda cid: next(
+        (ch for ch in guild.text_channels if ch.id == cid), None
+    )
+    return guild
+
+
+def list_channels(guild):
+    return list(guild.text_channels)
+
+
+class TestChannelIndex(BaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        channel_index.reset_channel_index()
+
+    async def asyncTearDown(self):
+        channel_index.reset_channel_index()
+        await super().asyncTearDown()
+
+    def test_classify_channel_states(self):
+        poll_message.save_message_id(1, "vrijdag", 100)
+        poll_message.save_message_id(2, "stemmen", 200)
+        poll_settings.set_paused(2, True)
+        poll_message.set_channel_disabled(3, True)
+        poll_settings.set_scheduled_activation(4, "wekelijks", "20:00", dag="dinsdag")
+        poll_message.save_message_id(5, "opening", 500)  # geen poll
+
+        self.assertEqual(channel_index.classify_channel(1), channel_index.ACTIVE)
+        self.assertEqual(channel_index.classify_channel(2), channel_index.PAUSED)
+        self.assertEqual(channel_index.classify_channel(3), channel_index.DISABLED)
+        self.assertEqual(channel_index.classify_channel(4), channel_index.SCHEDULED)
+        self.assertIsNone(channel_index.classify_channel(5))
+
+    def test_prime_and_reclassify_during_sweep(self):
+        guild = mk_guild(10, [1, 2, 3])
+        poll_message.save_message_id(1, "vrijdag", 100)
+        poll_message.save_message_id(2, "vrijdag", 200)
+
+        self.assertEqual(channel_index.prime_channel_index([guild], list_channels), 2)
+        self.assertEqual(
+            channel_index.get_index_snapshot(),
+            {10: {1: channel_index.ACTIVE, 2: channel_index.ACTIVE}},
+        )
+
+        # Pauze werkt door zonder expliciete refresh
+        poll_settings.set_paused(2, True)
+        active = channel_index.indexed_channels(guild, [channel_index.ACTIVE], list_channels)
+        self.assertEqual([ch.id for ch in active], [1])
+        self.assertEqual(channel_index.get_channel_state(10, 2), channel_index.PAUSED)
+
+        # Kanaal 3 komt er pas bij na een lifecycle-refresh
+        poll_message.save_message_id(3, "vrijdag", 300)
+        self.assertNotIn(3, channel_index.get_index_snapshot()[10])
+        channel_index.refresh_channel(guild.text_channels[2])
+        active = channel_index.indexed_channels(guild, [channel_index.ACTIVE], list_channels)
+        self.assertEqual([ch.id for ch in active], [1, 3])
+
+        # Verwijderd kanaal valt uit de index
+        guild.text_channels.pop(0)
+        active = channel_index.indexed_channels(guild, [channel_index.ACTIVE], list_channels)
+        self.assertEqual([ch.id for ch in active], [3])
+        self.assertNotIn(1, channel_index.get_index_snapshot()[10])
+
+    def test_new_guild_is_scanned_on_first_use(self):
+        channel_index.prime_channel_index([], list_channels)
+        guild = mk_guild(20, [7, 8])
+        poll_message.save_message_id(8, "zondag", 800)
+
+        found = channel_index.indexed_channels(guild, [channel_index.ACTIVE], list_channels)
+        self.assertEqual([ch.id for ch in found], [8])
+
+    def test_scheduler_sweeps_use_index_once_primed(self):
+        guild = mk_guild(30, [1, 2, 3])
+        bot = SimpleNamespace(guilds=[guild])
+        poll_message.save_message_id(2, "vrijdag", 200)
+        poll_settings.set_scheduled_activation(3, "wekelijks", "20:00", dag="dinsdag")
+
+        # Zonder index: alle kanalen (oud gedrag)
+        pairs = scheduler._guild_channels(bot, scheduler.ACTIVE_STATES)
+        self.assertEqual([ch.id for _g, ch in pairs], [1, 2, 3])
+
+        scheduler.prime_channel_index(bot)
+        active = scheduler._guild_channels(bot, scheduler.ACTIVE_STATES)
+        self.assertEqual([ch.id for _g, ch in active], [2])
+        activatable = scheduler._guild_channels(bot, scheduler.ACTIVATABLE_STATES)
+        self.assertEqual([ch.id for _g, ch in activatable], [2, 3])
+        # Zonder statusfilter blijft het een volledige scan
+        self.assertEqual(len(scheduler._guild_channels(bot)), 3)
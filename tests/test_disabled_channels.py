@@ -87,7 +87,7 @@ class DisabledChannelsTests(BaseTestCase):
         # Patch alles wat side-effects kan geven
         # - build_poll_message_for_day_async: simpele string
         # - build_decision_line: geen besluit
-        # - save_message_id: mag NIET worden aangeroepen
+        # - save_message_id_async: mag NIET worden aangeroepen
         # - channel.send: mag NIET worden aangeroepen
         with patch(
             "apps.utils.poll_message.build_poll_message_for_day_async",
@@ -96,7 +96,7 @@ class DisabledChannelsTests(BaseTestCase):
             "apps.utils.poll_message.build_decision_line",
             new=AsyncMock(return_value=""),
         ), patch(
-            "apps.utils.poll_message.save_message_id"
+            "apps.utils.poll_message.save_message_id_async", new_callable=AsyncMock
         ) as save_mid, patch.object(
             ch, "send", new=AsyncMock()
         ) as send_mock:
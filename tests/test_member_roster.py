@@ -0,0 +1,125 @@
+# tests/test_member_roster.py
+"""
+Tests voor apps/utils/member_roster.py: gecachte ledenlijst per kanaal,
+bijgehouden via gateway-events, en batch-prefetch van onbekende leden.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from apps.utils import member_roster, poll_storage
+from apps.utils.message_builder import build_grouped_names_for
+from tests.base import BaseTestCase
+
+
+def mk_member(mid: int, name: str, guild=None, bot: bool = False, roles=()):
+    return SimpleNamespace(
+        id=mid, display_name=name, bot=bot, mention=f"<@{mid}>", guild=guild, roles=list(roles)
+    )
+
+
+class CountingChannel:
+    def __init__(self, cid: int, guild, members):
+        self.id = cid
+        self.guild = guild
+        self._members = list(members)
+        self.reads = 0
+
+    @property
+    def members(self):
+        self.reads += 1
+        return list(self._members)
+
+
+class TestMemberRoster(BaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        member_roster.reset_member_roster()
+        member_roster.enable_member_roster()
+        self.guild = SimpleNamespace(id=1, get_member=lambda _id: None)
+        self.alice = mk_member(11, "Alice", self.guild)
+        self.bob = mk_member(12, "Bob", self.guild)
+        self.bot = mk_member(13, "Botje", self.guild, bot=True)
+        self.channel = CountingChannel(10, self.guild, [self.alice, self.bob, self.bot])
+
+    async def asyncTearDown(self):
+        member_roster.reset_member_roster()
+        await super().asyncTearDown()
+
+    async def test_roster_is_cached_and_maintained_by_events(self):
+        for _ in range(3):
+            await poll_storage.update_non_voters(1, 10, self.channel)
+        self.assertEqual(list(member_roster.channel_roster(self.channel)), ["11", "12"])
+        self.assertEqual(self.channel.reads, 1)
+
+        # Naamwijziging werkt in place door
+        member_roster.on_member_update(self.alice, mk_member(11, "Alicia", self.guild))
+        self.assertEqual(member_roster.channel_roster(self.channel)["11"][0], "Alicia")
+
+        # Vertrek haalt het lid eruit zonder herbouw
+        member_roster.on_member_remove(self.bob)
+        self.assertEqual(list(member_roster.channel_roster(self.channel)), ["11"])
+        self.assertEqual(self.channel.reads, 1)
+
+        # Nieuw lid of gewijzigde overwrites: roster wordt opnieuw opgebouwd
+        carol = mk_member(14, "Carol", self.guild)
+        self.channel._members.append(carol)
+        member_roster.on_member_join(carol)
+        self.assertIn("14", member_roster.channel_roster(self.channel))
+        self.assertEqual(self.channel.reads, 2)
+
+        member_roster.on_channel_update(
+            SimpleNamespace(id=10, overwrites={}), SimpleNamespace(id=10, overwrites={"x": 1})
+        )
+        member_roster.channel_roster(self.channel)
+        self.assertEqual(self.channel.reads, 3)
+
+    async def test_unknown_voters_are_prefetched_in_one_batch(self):
+        query = AsyncMock(return_value=[mk_member(21, "Mario"), mk_member(22, "Luigi")])
+        fetch = AsyncMock(side_effect=AssertionError("geen REST per lid"))
+        guild = SimpleNamespace(
+            id=2, get_member=lambda _id: None, query_members=query, fetch_member=fetch
+        )
+        votes = {
+            "21": {"vrijdag": ["om 19:00 uur"]},
+            "22": {"vrijdag": ["om 19:00 uur"]},
+            "23_guest::Peach": {"vrijdag": ["om 19:00 uur"]},
+        }
+
+        for _ in range(2):
+            total, text = await build_grouped_names_for("vrijdag", "om 19:00 uur", guild, votes)
+            self.assertEqual(total, 3)
+            self.assertEqual(text, "@Mario, @Luigi, (Gast: Peach)")
+
+        query.assert_awaited_once()
+        self.assertEqual(sorted(query.await_args.kwargs["user_ids"]), [21, 22, 23])
+        fetch.assert_not_awaited()
+
+    async def test_failed_lookup_is_retried(self):
+        query = AsyncMock(side_effect=TimeoutError)
+        fetch = AsyncMock(side_effect=TimeoutError)
+        guild = SimpleNamespace(
+            id=3, get_member=lambda _id: None, query_members=query, fetch_member=fetch
+        )
+        self.assertEqual(await member_roster.resolve_names(guild, ["31"]), {"31": None})
+
+        # Tijdelijke fout: niet als ontbrekend onthouden
+        query.side_effect = None
+        query.return_value = [mk_member(31, "Yoshi")]
+        self.assertEqual(await member_roster.resolve_names(guild, ["31"]), {"31": "Yoshi"})
+
+        # Query gelukt zonder het lid: wel ontbrekend, tot de volgende on_ready
+        query.return_value = []
+        await member_roster.resolve_names(guild, ["32"])
+        calls = query.await_count
+        await member_roster.resolve_names(guild, ["32"])
+        self.assertEqual(query.await_count, calls)
+        member_roster.enable_member_roster()
+        await member_roster.resolve_names(guild, ["32"])
+        self.assertEqual(query.await_count, calls + 1)
+
+    async def test_without_enable_nothing_is_cached(self):
+        member_roster.reset_member_roster()
+        member_roster.channel_roster(self.channel)
+        member_roster.channel_roster(self.channel)
+        self.assertEqual(self.channel.reads, 2)
@@ -0,0 +1,114 @@
+# tests/test_migrate_archives.py
+"""
+Tests voor migrate_archives.py: bulk-migratie naar V4 met overslaan van
+actuele bestanden, atomisch schrijven en hervatten na een onderbreking.
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import migrate_archives
+
+V1_HEADER = (
+    "week,datum_vrijdag,datum_zaterdag,datum_zondag,"
+    "vr_19,vr_2030,vr_misschien,vr_niet,za_19,za_2030,za_misschien,za_niet,"
+    "zo_19,zo_2030,zo_misschien,zo_niet"
+)
+
+
+class TestMigrateArchives(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmp.name, "archive")
+        os.makedirs(self.dir)
+        self.state = os.path.join(self.dir, ".migration_state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name: str, lines: list[str]) -> str:
+        path = os.path.join(self.dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def _rows(self, path: str) -> list[list[str]]:
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    def test_bulk_migration_skips_current_and_resumes(self):
+        old = self._write(
+            "dmk_archive_1_2.csv",
+            [V1_HEADER, "41,2025-10-10,2025-10-11,2025-10-12,1,3,0,0,1,3,0,0,2,2,0,0"],
+        )
+        current = self._write(
+            "dmk_archive_1_3.csv",
+            [",".join(migrate_archives.WEEKEND_HEADER), "2025-W41," + ",".join(["1"] * 21)],
+        )
+        weekday = self._write(
+            "dmk_archive_1_3_weekdays.csv",
+            [",".join(migrate_archives.WEEKDAY_HEADER), "2025-W41," + ",".join(["1"] * 28)],
+        )
+        self._write("andere_export.csv", ["x,y"])
+        before_current = open(current, "rb").read()
+
+        files = migrate_archives.find_archive_files(self.dir)
+        self.assertEqual(files, sorted([old, current, weekday]))
+
+        stats = migrate_archives.run_migration(files, workers=1, state_file=self.state)
+        self.assertEqual((stats["migrated"], stats["current"], stats["resumed"]), (1, 2, 0))
+        self.assertGreater(stats["files_per_second"], 0)
+
+        rows = self._rows(old)
+        self.assertEqual(rows[0], migrate_archives.WEEKEND_HEADER)
+        self.assertEqual(rows[1][0], "2025-W41")
+        self.assertEqual(len(rows[1]), 22)
+        self.assertEqual(open(current, "rb").read(), before_current)
+        self.assertFalse(os.path.exists(old + ".migrating"))
+
+        # Tweede run: alles staat in de state, niets wordt nog geopend
+        with patch.object(migrate_archives, "_migrate_file", side_effect=AssertionError):
+            stats = migrate_archives.run_migration(files, workers=1, state_file=self.state)
+        self.assertEqual(stats["resumed"], 3)
+
+        # Gewijzigd bestand wordt opnieuw bekeken (en is al actueel)
+        with open(old, "a", encoding="utf-8") as f:
+            f.write("2025-W42," + ",".join(["0"] * 21) + "\n")
+        stats = migrate_archives.run_migration(files, workers=1, state_file=self.state)
+        self.assertEqual((stats["resumed"], stats["current"]), (2, 1))
+
+    def test_interrupted_write_keeps_original(self):
+        path = self._write(
+            "dmk_archive_5_6.csv",
+            [V1_HEADER, "41,2025-10-10,2025-10-11,2025-10-12,1,3,0,0,1,3,0,0,2,2,0,0"],
+        )
+        original = open(path, "rb").read()
+
+        with patch.object(migrate_archives, "migrate_row", side_effect=RuntimeError("stop")):
+            stats = migrate_archives.run_migration([path], workers=1, state_file=self.state)
+        self.assertEqual(stats["error"], 1)
+        self.assertEqual(open(path, "rb").read(), original)
+        self.assertFalse(os.path.exists(path + ".migrating"))
+
+        # Hervatten: het mislukte bestand staat niet in de state en wordt alsnog gedaan
+        stats = migrate_archives.run_migration([path], workers=1, state_file=self.state)
+        self.assertEqual(stats["migrated"], 1)
+
+    def test_process_pool(self):
+        paths = [
+            self._write(
+                f"dmk_archive_9_{n}.csv",
+                [V1_HEADER, "41,2025-10-10,2025-10-11,2025-10-12,1,3,0,0,1,3,0,0,2,2,0,0"],
+            )
+            for n in range(4)
+        ]
+        stats = migrate_archives.run_migration(paths, workers=2, state_file=self.state)
+        self.assertEqual(stats["migrated"], 4)
+        self.assertTrue(all(self._rows(p)[1][0] == "2025-W41" for p in paths))
+
+
+if __name__ == "__main__":
+    unittest.main()
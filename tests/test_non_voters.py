@@ -196,9 +196,10 @@ class TestUpdateNonVoters(unittest.IsolatedAsyncioTestCase):
         # Should not crash
         await update_non_voters(1, 123, mock_channel)
 
-        # No non-voters should be tracked (member has no valid ID)
+        # No members tracked (member has no valid ID), so the count is unknown
         count, ids = await get_non_voters_for_day("vrijdag", 1, 123)
-        self.assertEqual(count, 0)
+        self.assertIsNone(count)
+        self.assertEqual(ids, [])
 
     async def test_update_non_voters_with_empty_member_id(self):
         """Test handling of members with empty ID"""
@@ -209,9 +210,10 @@ class TestUpdateNonVoters(unittest.IsolatedAsyncioTestCase):
         # Should not crash
         await update_non_voters(1, 123, mock_channel)
 
-        # No non-voters should be tracked (member has empty ID)
+        # No members tracked (member has empty ID), so the count is unknown
         count, ids = await get_non_voters_for_day("vrijdag", 1, 123)
-        self.assertEqual(count, 0)
+        self.assertIsNone(count)
+        self.assertEqual(ids, [])
 
 
 class TestGetNonVotersForDay(unittest.IsolatedAsyncioTestCase):
@@ -223,12 +225,20 @@ class TestGetNonVotersForDay(unittest.IsolatedAsyncioTestCase):
     async def asyncTearDown(self):
         await reset_votes_scoped(1, 123)
 
-    async def test_get_non_voters_empty(self):
-        """Test getting non-voters when there are none"""
+    async def test_get_non_voters_unknown_members(self):
+        """Without known members the result is 'unknown', not 'everyone voted'"""
         count, ids = await get_non_voters_for_day("vrijdag", 1, 123)
-        self.assertEqual(count, 0)
+        self.assertIsNone(count)
         self.assertEqual(ids, [])
 
+    async def test_get_non_voters_falls_back_to_channel_roster(self):
+        """With a channel the members are filled from its roster"""
+        mock_channel = SimpleNamespace(members=[SimpleNamespace(id=100, bot=False)])
+        count, ids = await get_non_voters_for_day("vrijdag", 1, 123, mock_channel)
+        self.assertEqual((count, ids), (1, ["100"]))
+        # Daarna ook zonder kanaal bekend
+        self.assertEqual(await get_non_voters_for_day("vrijdag", 1, 123), (1, ["100"]))
+
     async def test_get_non_voters_with_data(self):
         """Test getting non-voters when they exist"""
         # Create mock members
@@ -269,37 +279,23 @@ class TestGetNonVotersForDay(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(count_za, 1)
         self.assertIn("100", ids_za)
 
-    async def test_get_non_voters_handles_none_per_dag(self):
-        """Test handling of None in per_dag dictionary"""
+    async def test_get_non_voters_ignores_stored_entries(self):
+        """Legacy '_non_voter::' entries are not read; non-voters are computed"""
         from apps.utils.poll_storage import save_votes_scoped
 
-        # Manually create a non-voter entry with None per_dag (edge case)
         scoped = {
             "_non_voter::100": None,  # Edge case: None instead of dict
-            "_non_voter::200": {"vrijdag": ["niet gestemd"]},
+            "_non_voter::200": {"vrijdag": "niet gestemd"},  # String instead of list
+            "_non_voter::300": {"vrijdag": ["niet gestemd"]},
         }
         await save_votes_scoped(1, 123, scoped)
 
-        # Should not crash and should only return member 200
-        count, ids = await get_non_voters_for_day("vrijdag", 1, 123)
-        self.assertEqual(count, 1)
-        self.assertIn("200", ids)
-
-    async def test_get_non_voters_handles_non_list_tijden(self):
-        """Test handling of non-list tijden values"""
-        from apps.utils.poll_storage import save_votes_scoped
+        # Zonder bekende leden is het aantal onbekend
+        self.assertEqual(await get_non_voters_for_day("vrijdag", 1, 123), (None, []))
 
-        # Manually create a non-voter entry with non-list tijden (edge case)
-        scoped = {
-            "_non_voter::100": {"vrijdag": "niet gestemd"},  # String instead of list
-            "_non_voter::200": {"vrijdag": ["niet gestemd"]},
-        }
-        await save_votes_scoped(1, 123, scoped)
-
-        # Should not crash and should only return member 200
-        count, ids = await get_non_voters_for_day("vrijdag", 1, 123)
-        self.assertEqual(count, 1)
-        self.assertIn("200", ids)
+        mock_channel = SimpleNamespace(members=[SimpleNamespace(id=400, bot=False)])
+        await update_non_voters(1, 123, mock_channel)
+        self.assertEqual(await get_non_voters_for_day("vrijdag", 1, 123), (1, ["400"]))
 
 
 class TestNonVoterEdgeCases(unittest.IsolatedAsyncioTestCase):
@@ -349,61 +345,55 @@ class TestNonVoterEdgeCases(unittest.IsolatedAsyncioTestCase):
         votes = await load_votes(1, 123)
         self.assertNotIn("_non_voter::100", votes)
 
-    async def test_update_non_voters_partial_day_cleanup(self):
-        """Test that only specific days are removed from non-voter entry"""
-        from apps.utils.poll_storage import save_votes_scoped
-
-        # Create mock members
+    async def test_update_non_voters_does_not_store_entries(self):
+        """Non-voters are computed, never written to storage"""
         member1 = SimpleNamespace(id=100, bot=False)
-        mock_channel = SimpleNamespace(members=[member1])
-
-        # Manually create a non-voter entry for multiple days
-        scoped = {
-            "_non_voter::100": {
-                "vrijdag": ["niet gestemd"],
-                "zaterdag": ["niet gestemd"],
-                "zondag": ["niet gestemd"],
-            }
-        }
-        await save_votes_scoped(1, 123, scoped)
+        member2 = SimpleNamespace(id=200, bot=False)
+        mock_channel = SimpleNamespace(members=[member1, member2])
 
-        # Member votes only for vrijdag
         await toggle_vote("100", "vrijdag", "om 19:00 uur", 1, 123)
-
-        # Update should remove only vrijdag from non-voter entry
         await update_non_voters(1, 123, mock_channel)
 
-        # Verify vrijdag is removed but others remain
         votes = await load_votes(1, 123)
-        self.assertIn("_non_voter::100", votes)
-        self.assertNotIn("vrijdag", votes["_non_voter::100"])
-        self.assertIn("zaterdag", votes["_non_voter::100"])
-        self.assertIn("zondag", votes["_non_voter::100"])
+        self.assertEqual(list(votes), ["100"])
+        self.assertEqual(await get_non_voters_for_day("vrijdag", 1, 123), (1, ["200"]))
+        self.assertEqual(
+            await get_non_voters_for_day("zaterdag", 1, 123), (2, ["100", "200"])
+        )
+
+    async def test_update_non_voters_skips_write_when_nothing_stored(self):
+        """Without legacy entries update_non_voters never saves"""
+        from unittest.mock import patch
+
+        mock_channel = SimpleNamespace(members=[SimpleNamespace(id=100, bot=False)])
+        await toggle_vote("100", "vrijdag", "om 19:00 uur", 1, 123)
+
+        with patch("apps.utils.poll_storage.save_votes_scoped") as mock_save:
+            await update_non_voters(1, 123, mock_channel)
+            await update_non_voters(1, 123, mock_channel)
+            mock_save.assert_not_called()
 
-    async def test_update_non_voters_with_existing_non_voter_entries(self):
-        """Test that existing non-voter entries are properly updated"""
+    async def test_update_non_voters_removes_legacy_entries(self):
+        """Stored non-voter entries from older versions are removed once"""
         from apps.utils.poll_storage import save_votes_scoped
 
-        # Create mock members
         member1 = SimpleNamespace(id=100, bot=False)
         member2 = SimpleNamespace(id=200, bot=False)
         mock_channel = SimpleNamespace(members=[member1, member2])
 
-        # Start with old non-voter data
         scoped = {
             "_non_voter::100": {"vrijdag": ["niet gestemd"]},
             "_non_voter::999": {"vrijdag": ["niet gestemd"]},  # Member no longer in channel
+            "300": {"vrijdag": ["om 19:00 uur"]},
         }
         await save_votes_scoped(1, 123, scoped)
 
-        # Update non-voters
         await update_non_voters(1, 123, mock_channel)
 
-        # Member 999 should be removed, members 100 and 200 should be non-voters
         votes = await load_votes(1, 123)
-        self.assertNotIn("_non_voter::999", votes)
-        self.assertIn("_non_voter::100", votes)
-        self.assertIn("_non_voter::200", votes)
+        self.assertEqual(list(votes), ["300"])
+        count, ids = await get_non_voters_for_day("vrijdag", 1, 123)
+        self.assertEqual((count, sorted(ids)), (2, ["100", "200"]))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+# tests/test_outbound_queue.py
+"""
+Tests voor apps/utils/outbound_queue.py: token buckets, prioriteiten,
+samenvoegen van edits en 429-coördinatie.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from apps.utils import discord_client as dc
+from apps.utils.outbound_queue import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    OutboundQueue,
+    TokenBucket,
+    background_priority,
+)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_refill(self):
+        bucket = TokenBucket(rate=2.0, capacity=2)
+        now = bucket.stamp
+        bucket.take(now)
+        bucket.take(now)
+        self.assertAlmostEqual(bucket.delay(now), 0.5)
+        self.assertEqual(bucket.delay(now + 0.5), 0.0)
+
+    def test_block_pauses_bucket(self):
+        bucket = TokenBucket(rate=100.0, capacity=5)
+        now = bucket.stamp
+        bucket.block(now, 2.0)
+        self.assertAlmostEqual(bucket.delay(now + 1.0), 1.0)
+        self.assertEqual(bucket.delay(now + 2.1), 0.0)
+
+
+class TestOutboundQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_interactive_jumps_ahead_of_background(self):
+        q = OutboundQueue(route_rate=1000.0, route_burst=1, global_rate=50.0, global_burst=1)
+        order = []
+
+        def call(name):
+            async def _run():
+                order.append(name)
+                return name
+
+            return _run
+
+        # Eerste call verbruikt de globale burst; de rest moet wachten en wordt
+        # daarna op prioriteit uitgevoerd.
+        first = asyncio.create_task(q.submit(("edit", 1), call("first")))
+        await asyncio.sleep(0)
+        with background_priority():
+            bg = [asyncio.create_task(q.submit(("edit", i), call(f"bg{i}"))) for i in (2, 3)]
+        await asyncio.sleep(0)
+        fg = asyncio.create_task(q.submit(("edit", 4), call("vote")))
+        await asyncio.gather(first, fg, *bg)
+
+        self.assertEqual(order, ["first", "vote", "bg2", "bg3"])
+        metrics = q.get_metrics()
+        self.assertEqual(metrics["executed"], 4)
+        self.assertEqual(metrics["queue_depth"], 0)
+
+    async def test_pending_edits_to_same_message_are_coalesced(self):
+        q = OutboundQueue(route_rate=1000.0, route_burst=1, coalesce_interval=0.0)
+        calls = []
+
+        def edit(content):
+            async def _run():
+                calls.append(content)
+                return content
+
+            return _run
+
+        await q.submit(("edit", 1), edit("v0"), coalesce_key=("edit", 9))  # burst op
+        results = await asyncio.gather(
+            *(q.submit(("edit", 1), edit(f"v{i}"), coalesce_key=("edit", 9)) for i in (1, 2, 3))
+        )
+
+        self.assertEqual(calls, ["v0", "v3"])
+        self.assertEqual(results, ["v3", "v3", "v3"])
+        self.assertEqual(q.get_metrics()["coalesced"], 2)
+
+    async def test_edit_rate_per_message_with_final_flush(self):
+        q = OutboundQueue(route_rate=1000.0, route_burst=10, coalesce_interval=0.2)
+        calls = []
+
+        def edit(key, content):
+            async def _run():
+                calls.append((key, content))
+
+            return _run
+
+        await q.submit(("edit", 1), edit(9, "a"), coalesce_key=("edit", 9))
+        # Binnen de tussenpoos: samenvoegen, andere berichten gaan gewoon door
+        for content in ("b", "c", "d"):
+            q.enqueue(("edit", 1), edit(9, content), coalesce_key=("edit", 9))
+        await q.submit(("edit", 1), edit(8, "x"), coalesce_key=("edit", 8))
+        self.assertEqual(calls, [(9, "a"), (8, "x")])
+
+        self.assertTrue(await q.flush(timeout=2.0))
+        self.assertEqual(calls, [(9, "a"), (8, "x"), (9, "d")])
+
+    async def test_errors_reach_the_caller(self):
+        q = OutboundQueue()
+
+        async def boom():
+            raise ValueError("x")
+
+        with self.assertRaises(ValueError):
+            await q.submit(("send", 1), boom, priority=PRIORITY_BACKGROUND)
+        self.assertEqual(q.get_metrics()["failed"], 1)
+        res = await q.submit(
+            ("send", 1), lambda: asyncio.sleep(0, "ok"), priority=PRIORITY_INTERACTIVE
+        )
+        self.assertEqual(res, "ok")
+
+    async def test_safe_call_429_blocks_the_route(self):
+        q = OutboundQueue(route_rate=1000.0, route_burst=5)
+
+        class _E(Exception):
+            status = 429
+            retry_after = 0.05
+
+        attempts = {"n": 0}
+
+        def flaky():
+            attempts["n"] += 1
+            if attempts["n"] == 1:
+                raise _E()
+            return "OK"
+
+        with patch.object(dc, "HTTPExc", _E), patch.object(dc, "outbound_queue", q):
+            res = await q.submit(("edit", 7), lambda: dc.safe_call(flaky))
+
+        self.assertEqual(res, "OK")
+        self.assertEqual(q.get_metrics()["rate_limited"], 1)
+        self.assertGreater(q._bucket(("edit", 7)).blocked_until, 0.0)
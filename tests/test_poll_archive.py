@@ -4,6 +4,7 @@ Tests voor poll_archive.py om coverage te verhogen van 52% naar 80%+
 """
 
 import os
+import tempfile
 from typing import Any, cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -11,6 +12,14 @@ from apps.commands.poll_archive import PollArchive
 from tests.base import BaseTestCase
 
 
+def _tmp_csv(data: bytes) -> str:
+    """Schrijf CSV-bytes naar een tijdelijk bestand (zoals export_archive teruggeeft)."""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+
 def _mk_interaction(channel: Any = None, guild: Any = None) -> Any:
     """Maakt een interaction-mock met response.defer en followup.send."""
     interaction = MagicMock()
@@ -90,11 +99,11 @@ class TestPollArchive(BaseTestCase):
         ), patch(
             "apps.commands.poll_archive.ArchiveView"
         ) as mock_view_class, patch(
-            "apps.commands.poll_archive.create_archive"
-        ) as mock_create_archive:
+            "apps.commands.poll_archive.export_archive"
+        ) as mock_export_archive:
             # Eerste call (check voor weekday) returnt None
             # Tweede call (weekend data) returnt weekend_csv
-            mock_create_archive.side_effect = [weekend_csv, None]
+            mock_export_archive.side_effect = [_tmp_csv(weekend_csv), None]
 
             mock_view = MagicMock()
             mock_view.selected_delimiter = ","
@@ -144,12 +153,14 @@ class TestPollArchive(BaseTestCase):
         ), patch(
             "apps.commands.poll_archive.ArchiveView"
         ) as mock_view_class, patch(
-            "apps.commands.poll_archive.create_archive"
-        ) as mock_create_archive:
+            "apps.commands.poll_archive.export_archive"
+        ) as mock_export_archive:
             # Eerste call (weekend data): weekend_csv
             # Tweede call (check weekday): weekday_csv (bestaat!)
             # Derde call (weekday data): weekday_csv
-            mock_create_archive.side_effect = [weekend_csv, weekday_csv, weekday_csv]
+            mock_export_archive.side_effect = [
+                _tmp_csv(weekend_csv), _tmp_csv(weekday_csv), _tmp_csv(weekday_csv)
+            ]
 
             mock_weekend_view = MagicMock()
             mock_weekend_view.selected_delimiter = ","
@@ -278,8 +289,9 @@ class TestPollArchiveSetup(BaseTestCase):
 class TestArchiveDelimiterFunctionality(BaseTestCase):
     """Tests voor nieuwe delimiter functionaliteit in archive.py"""
 
-    def setUp(self):
+    async def asyncSetUp(self):
         """Setup test archief"""
+        await super().asyncSetUp()
         from apps.utils.archive import ARCHIVE_DIR
 
         import os
@@ -293,12 +305,13 @@ class TestArchiveDelimiterFunctionality(BaseTestCase):
             f.write("1,2024-01-05,2024-01-06,2024-01-07,5,3\n")
             f.write("2,2024-01-12,2024-01-13,2024-01-14,7,2\n")
 
-    def tearDown(self):
+    async def asyncTearDown(self):
         """Cleanup test bestanden"""
         import os
 
         if os.path.exists(self.test_csv_path):
             os.remove(self.test_csv_path)
+        await super().asyncTearDown()
 
     def test_create_archive_with_comma_delimiter(self):
         """Test dat create_archive werkt met comma delimiter"""
@@ -430,7 +443,7 @@ class TestArchiveView(BaseTestCase):
         csv_data = b"week;datum\n1;2024-01-01"
 
         # Roep callback aan met gemockte values
-        with patch("apps.ui.archive_view.create_archive", return_value=csv_data), \
+        with patch("apps.ui.archive_view.export_archive", return_value=_tmp_csv(csv_data)), \
              patch.object(type(select_menu), "values", new_callable=PropertyMock, return_value=[";"]):
             await select_menu.callback(interaction)
 
@@ -475,7 +488,7 @@ class TestArchiveView(BaseTestCase):
         interaction.response.send_message = AsyncMock()
 
         # Roep callback aan met None return (fout)
-        with patch("apps.ui.archive_view.create_archive", return_value=None), \
+        with patch("apps.ui.archive_view.export_archive", return_value=None), \
              patch.object(type(select_menu), "values", new_callable=PropertyMock, return_value=[";"]):
             await select_menu.callback(interaction)
 
@@ -510,11 +523,11 @@ class TestArchiveView(BaseTestCase):
         csv_data = b"week;datum_maandag\n1;2024-01-01"
 
         # Roep callback aan met gemockte values
-        with patch("apps.ui.archive_view.create_archive", return_value=csv_data) as mock_create, \
+        with patch("apps.ui.archive_view.export_archive", return_value=_tmp_csv(csv_data)) as mock_create, \
              patch.object(type(select_menu), "values", new_callable=PropertyMock, return_value=[";"]):
             await select_menu.callback(interaction)
 
-        # Check dat create_archive aangeroepen is met weekday=True
+        # Check dat export_archive aangeroepen is met weekday=True
         mock_create.assert_called_once_with(123, 456, ";", True)
 
         # Check dat delimiter is gewijzigd
@@ -669,8 +682,9 @@ class TestArchiveWithNonVoters(BaseTestCase):
                 os.remove(csv_path)
 
     async def test_append_migrates_old_csv_header(self):
-        """Test dat oude CSV bestanden automatisch gemigreerd worden naar nieuwe header"""
+        """Test dat oude CSV bestanden na migrate_archives.py de nieuwe header hebben"""
         from apps.utils.archive import append_week_snapshot_scoped, get_archive_path_scoped
+        from migrate_archives import migrate_csv_file
         import os
 
         guild_id = 555
@@ -690,7 +704,8 @@ class TestArchiveWithNonVoters(BaseTestCase):
                 f.write(old_header + "\n")
                 f.write(old_data + "\n")
 
-            # Append nieuwe week (dit zou header moeten migreren)
+            # Eenmalige offline migratie, daarna append nieuwe week
+            assert migrate_csv_file(csv_path)
             await append_week_snapshot_scoped(guild_id, channel_id, channel=None)
 
             # Lees CSV en check
@@ -708,10 +723,10 @@ class TestArchiveWithNonVoters(BaseTestCase):
 
             # Check dat oude data rij is gemigreerd met nieuwe kolommen (niet_gestemd en was_misschien = empty)
             # Oude: 41,2025-10-10,2025-10-11,2025-10-12,1,3,0,0,1,3,0,0,2,2,0,0 (16 kolommen)
-            # Nieuw: 41,2025-10-10,2025-10-11,2025-10-12,1,3,0,,0,,1,3,0,,0,,2,2,0,,0, (22 kolommen)
+            # Nieuw: 2025-W41,2025-10-10,2025-10-11,2025-10-12,1,3,0,,0,,1,3,0,,0,,2,2,0,,0, (22 kolommen)
             migrated_old_row = lines[1].strip().split(",")
             assert len(migrated_old_row) == 22, f"Migrated row should have 22 columns, got {len(migrated_old_row)}"
-            assert migrated_old_row[0] == "41"  # week preserved
+            assert migrated_old_row[0] == "2025-W41"  # week omgezet naar ISO
             assert migrated_old_row[4] == "1"   # vr_19 preserved
             assert migrated_old_row[7] == ""    # vr_was_misschien added (empty = data not tracked)
             assert migrated_old_row[9] == ""    # vr_niet_gestemd added (empty = data not tracked)
@@ -0,0 +1,128 @@
+# tests/test_poll_message_render_cache.py
+"""
+Tests voor de render-cache in update_poll_message: ongewijzigde dagen worden
+niet opnieuw gebouwd en identieke content wordt niet opnieuw ge-edit.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from apps.utils import member_roster, poll_message, poll_settings, poll_storage
+from apps.utils.outbound_queue import outbound_queue
+from tests.base import BaseTestCase
+
+
+def mk_channel(channel_id: int = 222, guild_id: int = 111):
+    ch = SimpleNamespace(id=channel_id, guild=SimpleNamespace(id=guild_id), members=[])
+    ch.edits = []
+
+    async def edit(*, content=None, view=None):
+        ch.edits.append(content)
+
+    ch.msg = SimpleNamespace(id=777, edit=edit)
+    ch.fetch_message = AsyncMock(return_value=ch.msg)
+    return ch
+
+
+class TestRenderCache(BaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        poll_message._render_cache.clear()
+        poll_message.save_message_id(222, "vrijdag", 777)
+        self.build = AsyncMock(return_value="CONTENT")
+        self.patches = [
+            patch("apps.utils.poll_message.build_poll_message_for_day_async", self.build),
+            patch("apps.utils.poll_message.build_decision_line", return_value=""),
+            patch.object(outbound_queue, "coalesce_interval", 0.0),
+        ]
+        for p in self.patches:
+            p.start()
+
+    async def asyncTearDown(self):
+        for p in self.patches:
+            p.stop()
+        poll_message._render_cache.clear()
+        await super().asyncTearDown()
+
+    async def test_unchanged_day_is_not_rebuilt_or_edited(self):
+        ch = mk_channel()
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+
+        self.assertEqual(self.build.await_count, 1)
+        self.assertEqual(ch.edits, ["CONTENT"])
+
+    async def test_vote_rebuilds_but_identical_content_skips_edit(self):
+        ch = mk_channel()
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+
+        await poll_storage.toggle_vote("u1", "vrijdag", "om 19:00 uur", 111, 222)
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+        self.assertEqual(self.build.await_count, 2)
+        self.assertEqual(ch.edits, ["CONTENT"])
+
+        self.build.return_value = "CONTENT 2"
+        await poll_storage.toggle_vote("u2", "vrijdag", "om 19:00 uur", 111, 222)
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+        self.assertEqual(ch.edits, ["CONTENT", "CONTENT 2"])
+
+    async def test_settings_change_and_mark_dirty_trigger_rebuild(self):
+        ch = mk_channel()
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+
+        poll_settings.set_language(222, "en")
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+        self.assertEqual(self.build.await_count, 2)
+
+        poll_message.mark_render_dirty(222)
+        self.build.return_value = "NEW"
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+        self.assertEqual(ch.edits, ["CONTENT", "NEW"])
+
+    async def test_name_change_triggers_rebuild(self):
+        ch = mk_channel()
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+
+        member_roster.enable_member_roster()
+        try:
+            guild = SimpleNamespace(id=111)
+            before = SimpleNamespace(id=5, bot=False, display_name="Oud", guild=guild)
+            after = SimpleNamespace(id=5, bot=False, display_name="Nieuw", guild=guild)
+            generation = member_roster.roster_generation()
+            member_roster.on_member_update(before, after)
+            self.assertNotEqual(member_roster.roster_generation(), generation)
+        finally:
+            member_roster.reset_member_roster()
+
+        self.build.return_value = "NIEUWE NAAM"
+        await poll_message.update_poll_message(ch, dag="vrijdag")
+        self.assertEqual(self.build.await_count, 2)
+        self.assertEqual(ch.edits, ["CONTENT", "NIEUWE NAAM"])
+
+    async def test_failed_edit_does_not_drop_other_edits(self):
+        poll_message.save_message_id(222, "zaterdag", 778)
+        ch = mk_channel()
+        edited: list[str] = []
+
+        async def edit(msg, content, *args):
+            if msg.id == 777:
+                raise RuntimeError("boom")
+            edited.append(content)
+
+        msgs = {777: SimpleNamespace(id=777), 778: SimpleNamespace(id=778)}
+        with patch(
+            "apps.utils.poll_message.fetch_message_or_none",
+            new=AsyncMock(side_effect=lambda _ch, mid: msgs[mid]),
+        ), patch("apps.utils.poll_message._apply_edit", new=edit), patch(
+            "builtins.print"
+        ) as mock_print:
+            await poll_message.update_poll_message(ch)
+
+        self.assertEqual(edited, ["CONTENT"])
+        mock_print.assert_any_call("❌ Fout bij updaten bericht voor vrijdag: boom")
+
+    async def test_failed_fetch_is_not_cached(self):
+        ch = mk_channel()
+        with patch("apps.utils.poll_message.fetch_message_or_none", new=AsyncMock(return_value=None)):
+            await poll_message.update_poll_message(ch, dag="vrijdag")
+        self.assertNotIn((222, "vrijdag"), poll_message._render_cache)
@@ -6,7 +6,7 @@ import asyncio
 import os
 from types import SimpleNamespace
 from typing import Callable, Optional
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from apps.utils import poll_message
 from tests.base import BaseTestCase
@@ -245,7 +245,7 @@ class TestPollMessage(BaseTestCase):
         ), patch(
             "apps.utils.poll_message.clear_message_id"
         ) as clear_id, patch(
-            "apps.utils.poll_message.save_message_id"
+            "apps.utils.poll_message.save_message_id_async", new_callable=AsyncMock
         ) as save_id:
 
             async def fake_fetch(mid):
@@ -280,7 +280,7 @@ class TestPollMessage(BaseTestCase):
         ), patch(
             "apps.utils.poll_message.clear_message_id"
         ) as clear_id, patch(
-            "apps.utils.poll_message.save_message_id"
+            "apps.utils.poll_message.save_message_id_async", new_callable=AsyncMock
         ) as save_id:
 
             async def fake_send(*, content=None, view=None):
@@ -382,7 +382,7 @@ class TestPollMessage(BaseTestCase):
         ), patch(
             "apps.utils.poll_message.safe_call", side_effect=_safe_call_passthrough
         ), patch(
-            "apps.utils.poll_message.save_message_id"
+            "apps.utils.poll_message.save_message_id_async", new_callable=AsyncMock
         ) as save_id:
 
             created = []
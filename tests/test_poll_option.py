@@ -117,3 +117,29 @@ class TestPollOption(BaseTestCase):
             # Onbestaande combinatie
             assert po.is_valid_option("zondag", "om 19:00 uur") is False
             assert po.is_valid_option("vrijdag", "niet meedoen") is False
+
+    #  Catalogus-cache: alleen opnieuw inlezen bij bestandswijziging -
+    def test_catalogue_is_cached_until_file_changes(self):
+        data = [{"dag": "vrijdag", "tijd": "om 19:00 uur", "emoji": "🟢"}]
+        self.tmpfile.write_text(json.dumps(data), encoding="utf-8")
+        with patch.object(po, "OPTIONS_FILE", str(self.tmpfile)):
+            first = po.get_poll_options()
+            with patch.object(po, "_load_raw_options") as mock_load:
+                second = po.get_poll_options()
+                assert po.is_valid_option("vrijdag", "om 19:00 uur") is True
+                assert po.list_days() == ["vrijdag"]
+                mock_load.assert_not_called()
+            # Dezelfde (gedeelde) objecten, maar een nieuwe lijst
+            assert first[0] is second[0] and first is not second
+
+            data.append({"dag": "zaterdag", "tijd": "misschien", "emoji": "Ⓜ️"})
+            self.tmpfile.write_text(json.dumps(data), encoding="utf-8")
+            assert po.list_days() == ["vrijdag", "zaterdag"]
+            assert [o.tijd for o in po.get_options_for_day("zaterdag")] == ["misschien"]
+
+    #  PollOption is onveranderlijk -
+    def test_poll_option_is_immutable(self):
+        with patch.object(po, "OPTIONS_FILE", str(self.tmpfile)):
+            o = po.get_poll_options()[0]
+        with self.assertRaises(AttributeError):
+            o.label = "hack"
@@ -0,0 +1,83 @@
+# tests/test_poll_settings_cache.py
+"""
+Tests voor de settings-cache en ChannelSettings in apps/utils/poll_settings.py
+"""
+
+import json
+from unittest.mock import patch
+
+from apps.utils import poll_settings
+from tests.base import BaseTestCase
+
+
+class TestPollSettingsCache(BaseTestCase):
+    async def test_getters_do_not_reparse_unchanged_file(self):
+        poll_settings.set_paused(1, True)
+        poll_settings.get_language(1)
+
+        with patch("apps.utils.poll_settings.json.load") as mock_load:
+            for _ in range(5):
+                self.assertTrue(poll_settings.is_paused(1))
+                poll_settings.get_language(1)
+                poll_settings.get_setting(1, "vrijdag")
+            mock_load.assert_not_called()
+
+    async def test_external_file_change_is_picked_up(self):
+        poll_settings.set_paused(1, False)
+        self.assertFalse(poll_settings.is_paused(1))
+
+        with open(poll_settings.SETTINGS_FILE, "w", encoding="utf-8") as f:
+            json.dump({"1": {"__paused__": True, "__language__": "en"}}, f)
+
+        self.assertTrue(poll_settings.is_paused(1))
+        self.assertEqual(poll_settings.get_language(1), "en")
+
+    async def test_setters_bump_generation(self):
+        before = poll_settings.get_settings_generation()
+        poll_settings.set_language(1, "en")
+        after = poll_settings.get_settings_generation()
+        self.assertGreater(after, before)
+        # Lezen zonder wijziging laat de generatie ongemoeid
+        poll_settings.get_language(1)
+        self.assertEqual(poll_settings.get_settings_generation(), after)
+
+    async def test_returned_values_do_not_alias_cache(self):
+        poll_settings.set_visibility(1, "vrijdag", "altijd")
+        poll_settings.set_enabled_days(1, ["vrijdag"])
+
+        poll_settings.get_setting(1, "vrijdag")["modus"] = "hack"
+        poll_settings.get_enabled_days(1).append("zondag")
+        poll_settings._load_data()["1"]["__paused__"] = True
+
+        self.assertEqual(poll_settings.get_setting(1, "vrijdag")["modus"], "altijd")
+        self.assertEqual(poll_settings.get_enabled_days(1), ["vrijdag"])
+        self.assertFalse(poll_settings.is_paused(1))
+
+    async def test_channel_settings_snapshot(self):
+        poll_settings.set_paused(7, True)
+        poll_settings.set_language(7, "en")
+        poll_settings.set_poll_option_state(7, "vrijdag", "19:00", False)
+        poll_settings.set_poll_option_state(7, "vrijdag", "20:30", False)
+        poll_settings.set_notification_setting(7, "reminders", True)
+
+        cs = poll_settings.get_channel_settings(7)
+        self.assertTrue(cs.paused)
+        self.assertEqual(cs.language, "en")
+        self.assertFalse(cs.get_poll_option_state("vrijdag", "19:00"))
+        self.assertTrue(cs.is_day_completely_disabled("vrijdag"))
+        self.assertNotIn("vrijdag", cs.enabled_poll_days)
+        self.assertTrue(cs.is_notification_enabled("reminders"))
+        self.assertEqual(cs.get_setting("zaterdag"), {"modus": "deadline", "tijd": "18:00"})
+
+        # Snapshot verandert niet mee; de module-getters wel
+        poll_settings.set_paused(7, False)
+        self.assertTrue(cs.paused)
+        self.assertFalse(poll_settings.is_paused(7))
+        self.assertGreater(
+            poll_settings.get_channel_settings(7).generation, cs.generation
+        )
+
+    async def test_reset_settings_clears_cache(self):
+        poll_settings.set_paused(1, True)
+        poll_settings.reset_settings()
+        self.assertFalse(poll_settings.is_paused(1))
@@ -822,3 +822,75 @@ class TestGuestVotesScoped(BaseTestCase):
                 456, "vrijdag", "om 19:00 uur", 1, 2
             )
             self.assertEqual(names_456, ["Luigi"])
+
+
+class TestPollStorageMemoryStore(BaseTestCase):
+    """In-memory root: één keer laden, lezen uit geheugen, write-through naar schijf."""
+
+    async def test_reads_are_served_from_memory(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+
+        # Externe wijziging op schijf wordt genegeerd zolang de cache warm is
+        with open(os.environ["VOTES_FILE"], "w", encoding="utf-8") as f:
+            f.write("{}")
+
+        with patch("apps.utils.poll_storage._read_json") as mock_read:
+            scoped = await poll_storage.load_votes(1, 2)
+            mock_read.assert_not_called()
+        self.assertEqual(scoped["u1"]["vrijdag"], ["om 19:00 uur"])
+
+    async def test_mutations_are_written_through(self):
+        import json
+
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.toggle_vote("u1", "zaterdag", "om 20:30 uur", 1, 2)
+
+        with open(os.environ["VOTES_FILE"], "r", encoding="utf-8") as f:
+            on_disk = json.load(f)
+        self.assertEqual(
+            on_disk["guilds"]["1"]["channels"]["2"]["u1"]["zaterdag"],
+            ["om 20:30 uur"],
+        )
+
+    async def test_returned_dict_does_not_alias_store(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+
+        scoped = await poll_storage.load_votes(1, 2)
+        scoped["u1"]["vrijdag"].append("hack")
+        scoped["u2"] = {}
+
+        fresh = await poll_storage.load_votes(1, 2)
+        self.assertEqual(fresh["u1"]["vrijdag"], ["om 19:00 uur"])
+        self.assertNotIn("u2", fresh)
+
+    async def test_failed_write_invalidates_cache(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+            with patch(
+                "apps.utils.poll_storage._write_json", side_effect=OSError("disk")
+            ):
+                with self.assertRaises(OSError):
+                    await poll_storage.add_vote("u2", "vrijdag", "om 19:00 uur", 1, 2)
+
+        # Geheugen loopt niet vóór op schijf: u2 is niet opgeslagen
+        scoped = await poll_storage.load_votes(1, 2)
+        self.assertIn("u1", scoped)
+        self.assertNotIn("u2", scoped)
+
+    async def test_path_switch_reloads_from_disk(self):
+        import json
+        import tempfile
+
+        with tempfile.NamedTemporaryFile(
+            "w", suffix="_votes.json", delete=False, encoding="utf-8"
+        ) as f:
+            json.dump({"guilds": {"9": {"channels": {"8": {"x": {}}}}}}, f)
+            other = f.name
+        try:
+            with patch.dict(os.environ, {"VOTES_FILE": other}, clear=False):
+                scoped = await poll_storage.load_votes(9, 8)
+                self.assertIn("x", scoped)
+        finally:
+            os.remove(other)
@@ -0,0 +1,96 @@
+# tests/test_poll_storage_journal.py
+
+import json
+import os
+from unittest.mock import patch
+
+from apps.utils import poll_storage
+from tests.base import BaseTestCase
+
+
+class TestPollStorageJournal(BaseTestCase):
+    """VOTES_PERSISTENCE=journal: append-only mutaties + compactie naar votes.json."""
+
+    async def asyncSetUp(self):
+        self.env = patch.dict(os.environ, {"VOTES_PERSISTENCE": "journal"})
+        self.env.start()
+        await super().asyncSetUp()
+        self.journal = poll_storage.get_journal_path()
+
+    async def asyncTearDown(self):
+        if os.path.exists(self.journal):
+            os.remove(self.journal)
+        await super().asyncTearDown()
+        self.env.stop()
+
+    def _read_ops(self):
+        with open(self.journal, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    async def test_vote_appends_only_changed_user(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+            await poll_storage.add_vote("u2", "vrijdag", "om 20:30 uur", 1, 2)
+
+        ops = self._read_ops()
+        self.assertEqual([op["u"] for op in ops], ["u1", "u2"])
+        self.assertEqual(ops[1]["v"]["vrijdag"], ["om 20:30 uur"])
+
+        # Snapshot is niet herschreven
+        with open(os.environ["VOTES_FILE"], "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {})
+
+    async def test_journal_is_replayed_on_cold_load(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+            await poll_storage.add_vote("u2", "zaterdag", "om 19:00 uur", 1, 3)
+            await poll_storage.remove_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+        await poll_storage.reset_votes_scoped(1, 3)
+
+        poll_storage._invalidate_cache()
+        root = await poll_storage.load_votes()
+        self.assertEqual(root["guilds"]["1"]["channels"]["2"]["u1"]["vrijdag"], [])
+        self.assertNotIn("3", root["guilds"]["1"]["channels"])
+
+    async def test_truncated_last_line_is_skipped(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+        with open(self.journal, "a", encoding="utf-8") as f:
+            f.write('{"op":"user","g":"1","c":"2","u":"u9"')
+
+        poll_storage._invalidate_cache()
+        scoped = await poll_storage.load_votes(1, 2)
+        self.assertEqual(list(scoped), ["u1"])
+
+    async def test_compaction_writes_snapshot_and_clears_journal(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+
+        self.assertTrue(await poll_storage.compact_votes_journal())
+        self.assertFalse(os.path.exists(self.journal))
+        with open(os.environ["VOTES_FILE"], "r", encoding="utf-8") as f:
+            on_disk = json.load(f)
+        self.assertEqual(
+            on_disk["guilds"]["1"]["channels"]["2"]["u1"]["vrijdag"], ["om 19:00 uur"]
+        )
+        # Niets meer te compacteren
+        self.assertFalse(await poll_storage.compact_votes_journal())
+
+    async def test_size_threshold_triggers_compaction(self):
+        with patch.dict(os.environ, {"VOTES_JOURNAL_MAX_BYTES": "1"}):
+            with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+                await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+
+        self.assertFalse(os.path.exists(self.journal))
+        with open(os.environ["VOTES_FILE"], "r", encoding="utf-8") as f:
+            self.assertIn("u1", json.load(f)["guilds"]["1"]["channels"]["2"])
+
+    async def test_warm_cache_compacts_leftover_journal(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+
+        poll_storage._invalidate_cache()
+        await poll_storage.warm_votes_cache()
+        self.assertFalse(os.path.exists(self.journal))
+        scoped = await poll_storage.load_votes(1, 2)
+        self.assertIn("u1", scoped)
@@ -0,0 +1,104 @@
+# tests/test_poll_storage_sharded.py
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from apps.utils import poll_storage
+from tests.base import BaseTestCase
+
+
+class TestPollStorageSharded(BaseTestCase):
+    """VOTES_DIR: één bestand per guild/channel en een lock per scope."""
+
+    async def asyncSetUp(self):
+        self.votes_dir = tempfile.mkdtemp(suffix="_votes")
+        self.env = patch.dict(os.environ, {"VOTES_DIR": self.votes_dir})
+        self.env.start()
+        await super().asyncSetUp()
+
+    async def asyncTearDown(self):
+        await super().asyncTearDown()
+        self.env.stop()
+        poll_storage._invalidate_cache()
+        shutil.rmtree(self.votes_dir, ignore_errors=True)
+
+    def _read_shard(self, gid, cid):
+        with open(poll_storage.get_shard_path(gid, cid), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    async def test_write_only_touches_own_channel(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+            await poll_storage.add_vote("u2", "vrijdag", "om 20:30 uur", 1, 3)
+
+        self.assertEqual(list(self._read_shard(1, 2)), ["u1"])
+        self.assertEqual(list(self._read_shard(1, 3)), ["u2"])
+
+        # Monolithisch bestand wordt niet gebruikt
+        with open(os.environ["VOTES_FILE"], "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "")
+
+    async def test_cold_load_rebuilds_root_from_shards(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "zaterdag", "om 19:00 uur", 5, 6)
+
+        poll_storage._invalidate_cache()
+        root = await poll_storage.load_votes()
+        self.assertEqual(
+            root["guilds"]["5"]["channels"]["6"]["u1"]["zaterdag"], ["om 19:00 uur"]
+        )
+
+    async def test_reset_scoped_removes_shard(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+        await poll_storage.reset_votes_scoped(1, 2)
+
+        self.assertFalse(os.path.exists(poll_storage.get_shard_path(1, 2)))
+        self.assertEqual(await poll_storage.load_votes(1, 2), {})
+
+    async def test_unrelated_channels_do_not_block_each_other(self):
+        await poll_storage.load_votes()
+        lock = poll_storage._scope_lock("1", "2")
+        await lock.acquire()
+        try:
+            # Kanaal 1/2 is bezet; kanaal 1/3 moet gewoon doorgaan
+            await asyncio.wait_for(
+                poll_storage.save_votes_scoped(1, 3, {"u9": {"vrijdag": []}}), timeout=1
+            )
+        finally:
+            lock.release()
+        self.assertIn("u9", self._read_shard(1, 3))
+
+    async def test_invalid_scope_is_rejected(self):
+        with self.assertRaises(ValueError):
+            poll_storage.get_shard_path("..", "2")
+
+    async def test_migration_from_root_layout(self):
+        legacy = {
+            "guilds": {
+                "1": {"channels": {"2": {"u1": {"vrijdag": ["om 19:00 uur"]}}}},
+                "7": {"channels": {"8": {"u2": {"zondag": ["misschien"]}}}},
+            }
+        }
+        with open(os.environ["VOTES_FILE"], "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+
+        poll_storage._invalidate_cache()
+        await poll_storage.warm_votes_cache()
+
+        self.assertEqual(self._read_shard(7, 8), {"u2": {"zondag": ["misschien"]}})
+        root = await poll_storage.load_votes()
+        self.assertEqual(root, legacy)
+
+    async def test_migration_skipped_when_shards_exist(self):
+        await poll_storage.save_votes_scoped(1, 2, {"u1": {"vrijdag": []}})
+        with open(os.environ["VOTES_FILE"], "w", encoding="utf-8") as f:
+            json.dump({"guilds": {"9": {"channels": {"9": {}}}}}, f)
+
+        poll_storage._invalidate_cache()
+        await poll_storage.warm_votes_cache()
+        self.assertNotIn("9", (await poll_storage.load_votes())["guilds"])
@@ -0,0 +1,82 @@
+# tests/test_poll_storage_tally.py
+
+from unittest.mock import patch
+
+from apps.utils import poll_storage
+from tests.base import BaseTestCase
+
+
+class TestPollStorageTally(BaseTestCase):
+    """Bijgehouden tellers per (guild, kanaal, dag, tijd)."""
+
+    async def _recount(self, dag, gid, cid):
+        """Referentie: tel opnieuw over alle stemmen (het oude gedrag)."""
+        scoped = await poll_storage.load_votes(gid, cid)
+        counts = {}
+        for o in poll_storage.get_poll_options():
+            if o.dag != dag:
+                continue
+            counts[o.tijd] = sum(
+                1
+                for per_user in scoped.values()
+                if isinstance(per_user.get(dag), list) and o.tijd in per_user[dag]
+            )
+        return counts
+
+    async def test_toggles_keep_counts_in_sync(self):
+        await poll_storage.get_counts_for_day("vrijdag", 1, 2)  # tellers opbouwen
+        await poll_storage.toggle_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+        await poll_storage.toggle_vote("u2", "vrijdag", "om 19:00 uur", 1, 2)
+        await poll_storage.toggle_vote("u2", "vrijdag", "om 20:30 uur", 1, 2)
+        await poll_storage.toggle_vote("u1", "vrijdag", "misschien", 1, 2)
+        await poll_storage.toggle_vote("u3", "vrijdag", "om 20:30 uur", 1, 2)
+        await poll_storage.toggle_vote("u3", "vrijdag", "om 20:30 uur", 1, 2)
+
+        counts = await poll_storage.get_counts_for_day("vrijdag", 1, 2)
+        self.assertEqual(counts, await self._recount("vrijdag", 1, 2))
+        self.assertEqual(counts["om 19:00 uur"], 1)
+        self.assertEqual(counts["om 20:30 uur"], 1)
+        self.assertEqual(counts["misschien"], 1)
+
+    async def test_guests_and_bulk_saves_are_counted(self):
+        await poll_storage.get_counts_for_day("zaterdag", 1, 2)
+        await poll_storage.add_guest_votes("u1", "zaterdag", "om 19:00 uur", ["Ann", "Bob"], 1, 2)
+        await poll_storage.save_votes_scoped(
+            1,
+            2,
+            {
+                **(await poll_storage.load_votes(1, 2)),
+                "u5": {"zaterdag": ["om 19:00 uur", "om 19:00 uur"]},
+            },
+        )
+        counts = await poll_storage.get_counts_for_day("zaterdag", 1, 2)
+        self.assertEqual(counts["om 19:00 uur"], 3)
+        self.assertEqual(counts, await self._recount("zaterdag", 1, 2))
+
+        await poll_storage.remove_guest_votes("u1", "zaterdag", "om 19:00 uur", ["Ann"], 1, 2)
+        counts = await poll_storage.get_counts_for_day("zaterdag", 1, 2)
+        self.assertEqual(counts["om 19:00 uur"], 2)
+
+    async def test_reads_do_not_copy_the_channel(self):
+        await poll_storage.toggle_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+        with patch("apps.utils.poll_storage.load_votes") as mock_load:
+            await poll_storage.get_counts_for_day("vrijdag", 1, 2)
+            await poll_storage.toggle_vote("u2", "vrijdag", "om 19:00 uur", 1, 2)
+            mock_load.assert_not_called()
+        counts = await poll_storage.get_counts_for_day("vrijdag", 1, 2)
+        self.assertEqual(counts["om 19:00 uur"], 2)
+
+    async def test_reset_and_cold_load_rebuild_counts(self):
+        await poll_storage.toggle_vote("u1", "zondag", "om 19:00 uur", 1, 2)
+        self.assertEqual((await poll_storage.get_counts_for_day("zondag", 1, 2))["om 19:00 uur"], 1)
+
+        await poll_storage.reset_votes_scoped(1, 2)
+        self.assertEqual((await poll_storage.get_counts_for_day("zondag", 1, 2))["om 19:00 uur"], 0)
+
+        await poll_storage.toggle_vote("u1", "zondag", "om 20:30 uur", 1, 2)
+        poll_storage._invalidate_cache()
+        await poll_storage.warm_votes_cache()
+        self.assertEqual((await poll_storage.get_counts_for_day("zondag", 1, 2))["om 20:30 uur"], 1)
+
+        await poll_storage.reset_votes()
+        self.assertEqual((await poll_storage.get_counts_for_day("zondag", 1, 2))["om 20:30 uur"], 0)
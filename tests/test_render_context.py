@@ -0,0 +1,96 @@
+# tests/test_render_context.py
+"""
+Tests voor poll_message.RenderContext: één gedeelde context per update-ronde,
+en dezelfde output als de losse lookups.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from apps.logic.decision import build_decision_line
+from apps.utils import poll_message, poll_settings, poll_storage
+from apps.utils.message_builder import build_poll_message_for_day_async
+from tests.base import BaseTestCase
+
+ALL_DAYS = ["maandag", "dinsdag", "woensdag", "donderdag", "vrijdag", "zaterdag", "zondag"]
+
+
+def mk_channel(channel_id: int = 222, guild_id: int = 111):
+    sent = []
+
+    async def send(content=None, view=None):
+        msg = SimpleNamespace(id=1000 + len(sent), content=content)
+        sent.append(msg)
+        return msg
+
+    guild = SimpleNamespace(id=guild_id, get_member=lambda _id: None)
+    return SimpleNamespace(id=channel_id, guild=guild, members=[], send=send, sent=sent)
+
+
+def counting(fn):
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return fn(*args, **kwargs)
+
+    wrapper.calls = calls
+    return wrapper
+
+
+class TestRenderContext(BaseTestCase):
+    async def test_full_channel_update_shares_one_context(self):
+        ch = mk_channel()
+        poll_settings.set_enabled_days(ch.id, ALL_DAYS)
+        for dag in ALL_DAYS:
+            for tijd in ("19:00", "20:30"):
+                poll_settings.set_poll_option_state(ch.id, dag, tijd, True)
+
+        scope = counting(poll_settings.get_vote_scope_channels)
+        setting = counting(poll_settings.get_setting)
+        hide = counting(poll_settings.should_hide_counts)
+        with patch("apps.utils.poll_settings.get_vote_scope_channels", scope), patch(
+            "apps.utils.message_builder.get_setting", setting
+        ), patch("apps.utils.poll_message.should_hide_counts", hide):
+            await poll_message.update_poll_message(ch)
+
+        self.assertEqual(len(ch.sent), 7)
+        self.assertEqual(len(scope.calls), 1)
+        self.assertEqual(setting.calls, [])  # builder leest de momentopname uit ctx
+        # Deadline-vlag één keer per dag, ook al gebruiken render-key,
+        # builder en beslissingsregel hem alle drie
+        self.assertEqual(sorted(args[1] for args in hide.calls), sorted(ALL_DAYS))
+
+    async def test_context_render_matches_plain_lookups(self):
+        ch = mk_channel()
+        poll_settings.set_language(ch.id, "en")
+        for uid in ("1", "2", "3", "4", "5", "6"):
+            await poll_storage.add_vote(uid, "vrijdag", "om 20:30 uur", ch.guild.id, ch.id)
+        await poll_storage.add_vote("7", "vrijdag", "om 19:00 uur", ch.guild.id, ch.id)
+
+        # Vrijdag 20:00: ná de deadline, dus aantallen en beslissing zichtbaar
+        now = datetime(2025, 11, 28, 20, 0, tzinfo=ZoneInfo("Europe/Amsterdam"))
+        ctx = poll_message.RenderContext(ch, now=now)
+        await ctx.load_snapshot()
+
+        kwargs = dict(
+            guild_id=ch.guild.id,
+            channel_id=ch.id,
+            hide_counts=ctx.hide_counts("vrijdag"),
+            hide_ghosts=ctx.hide_ghosts("vrijdag"),
+            pauze=ctx.paused,
+            guild=ch.guild,
+            channel=ch,
+            datum_iso="2025-11-28",
+        )
+        plain = await build_poll_message_for_day_async("vrijdag", **kwargs)
+        shared = await build_poll_message_for_day_async("vrijdag", ctx=ctx, **kwargs)
+        self.assertEqual(plain, shared)
+        self.assertIn("(6 votes)", shared)
+
+        self.assertEqual(
+            await build_decision_line(ch.guild.id, ch.id, "vrijdag", now, channel=ch),
+            await build_decision_line(ch.guild.id, ch.id, "vrijdag", now, channel=ch, ctx=ctx),
+        )
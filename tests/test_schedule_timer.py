@@ -0,0 +1,81 @@
+# tests/test_schedule_timer.py
+"""
+Tests voor apps/utils/schedule_timer.py: vuurmomenten uit schema's en het
+opnieuw instellen van de timer bij settings-wijzigingen.
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from apps.utils import poll_settings, schedule_timer
+from apps.utils.schedule_timer import TZ, ScheduleTimer, next_fire_time
+from tests.base import BaseTestCase
+
+
+def nl(*args):
+    return TZ.localize(datetime(*args))
+
+
+class TestNextFireTime(BaseTestCase):
+    async def test_weekly_same_day_later_and_next_week(self):
+        # 2024-05-14 is een dinsdag
+        sched = {"type": "wekelijks", "dag": "dinsdag", "tijd": "20:00"}
+        self.assertEqual(next_fire_time(sched, nl(2024, 5, 14, 19, 59, 30)), nl(2024, 5, 14, 20, 0))
+        self.assertEqual(next_fire_time(sched, nl(2024, 5, 14, 20, 0, 40)), nl(2024, 5, 14, 20, 0))
+        self.assertEqual(next_fire_time(sched, nl(2024, 5, 14, 20, 1)), nl(2024, 5, 21, 20, 0))
+
+    async def test_date_and_invalid(self):
+        sched = {"type": "datum", "datum": "2024-06-01", "tijd": "09:30"}
+        self.assertEqual(next_fire_time(sched, nl(2024, 5, 1, 0, 0)), nl(2024, 6, 1, 9, 30))
+        self.assertIsNone(next_fire_time({"type": "wekelijks", "dag": "x", "tijd": "1:00"}, nl(2024, 5, 1)))
+        self.assertIsNone(next_fire_time({"type": "datum", "tijd": "bad"}, nl(2024, 5, 1)))
+
+
+class TestScheduleTimer(BaseTestCase):
+    def _timer(self):
+        return ScheduleTimer(
+            object(), {"activation": AsyncMock(), "deactivation": AsyncMock()}
+        )
+
+    async def test_compile_orders_earliest_first(self):
+        poll_settings.set_default_activation({"type": "wekelijks", "dag": "dinsdag", "tijd": "20:00"})
+        poll_settings.set_default_deactivation({"type": "wekelijks", "dag": "maandag", "tijd": "00:00"})
+        poll_settings.set_scheduled_deactivation(5, "datum", "18:00", datum="2024-05-14")
+
+        timer = self._timer()
+        timer.compile(nl(2024, 5, 13, 12, 0))  # maandag
+        self.assertEqual(timer.next_due(), (nl(2024, 5, 14, 18, 0), "deactivation"))
+        self.assertEqual(len(timer._heap), 3)
+
+    async def test_past_date_activation_catches_up_once(self):
+        poll_settings.set_default_activation(None)
+        poll_settings.set_default_deactivation(None)
+        poll_settings.set_scheduled_activation(5, "datum", "18:00", datum="2024-05-01")
+
+        timer = self._timer()
+        now = nl(2024, 5, 13, 12, 0, 10)
+        timer.compile(now)
+        self.assertEqual(timer.next_due(), (nl(2024, 5, 13, 12, 0), "activation"))
+        await timer._run_due(now)
+        timer.sweeps["activation"].assert_awaited_once()
+
+        timer.compile(now)
+        self.assertIsNone(timer.next_due())
+
+    async def test_setting_change_rearms_running_timer(self):
+        poll_settings.set_default_activation(None)
+        poll_settings.set_default_deactivation(None)
+        activate = AsyncMock()
+        timer = ScheduleTimer(object(), {"activation": activate, "deactivation": AsyncMock()})
+        with patch.object(schedule_timer, "datetime") as mock_dt:
+            mock_dt.now.return_value = nl(2024, 5, 14, 19, 59, 59, 500000)
+            timer.start()
+            await asyncio.sleep(0.01)
+            activate.assert_awaited_once()  # start-ronde
+            self.assertIsNone(timer.next_due())
+
+            poll_settings.set_scheduled_activation(5, "wekelijks", "20:00", dag="dinsdag")
+            await asyncio.sleep(0.01)
+            self.assertEqual(timer.next_due(), (nl(2024, 5, 14, 20, 0), "activation"))
+            timer.stop()
@@ -48,15 +48,17 @@ class SchedulerSetupTestCase(unittest.IsolatedAsyncioTestCase):
             patch.object(scheduler.scheduler, "start") as mock_start,
             patch("asyncio.create_task", side_effect=fake_create_task),
             patch.object(scheduler, "_run_catch_up_with_lock", new_callable=AsyncMock),
+            patch.object(scheduler, "start_schedule_timer") as mock_timer,
         ):
             scheduler.setup_scheduler(bot)
 
         # Dynamisch op basis van REMINDER_DAYS (standaard: vr/za/zo = 3 dagen)
         # Per dag: herinnering + notificatie + convert misschien = 3 jobs
         # Vaste jobs: dagelijkse update + wekelijkse reset + tenor sync +
-        #   vroege herinnering + activation + deactivation + retry = 7
+        #   vroege herinnering + retry + journal-compactie = 6
+        # (activatie/deactivatie lopen via de schedule-timer)
         num_days = len(scheduler.REMINDER_DAYS)
-        expected_jobs = num_days * 3 + 7
+        expected_jobs = num_days * 3 + 6
         self.assertEqual(len(added_jobs), expected_jobs)
 
         # Controleer dat juiste functies zijn geregistreerd
@@ -67,8 +69,7 @@ class SchedulerSetupTestCase(unittest.IsolatedAsyncioTestCase):
         self.assertIn(scheduler.notify_voters_if_avond_gaat_door, job_funcs)
         self.assertIn(scheduler.notify_non_voters_thursday, job_funcs)
         self.assertIn(scheduler.convert_remaining_misschien, job_funcs)
-        self.assertIn(scheduler.activate_scheduled_polls, job_funcs)
-        self.assertIn(scheduler.deactivate_scheduled_polls, job_funcs)
+        self.assertIn(scheduler.compact_votes_journal_job, job_funcs)
         self.assertIn(scheduler.sync_tenor_links_weekly, job_funcs)
 
         # Controleer notify_non_or_maybe_voters per geconfigureerde dag
@@ -111,17 +112,17 @@ class SchedulerSetupTestCase(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(thursday_jobs), 1)
         self.assertEqual(thursday_jobs[0]["args"], [bot])
 
-        # Controleer activate_scheduled_polls (1x, elke minuut)
-        activation_jobs = [
-            j for j in added_jobs if j["func"] == scheduler.activate_scheduled_polls
-        ]
-        self.assertEqual(len(activation_jobs), 1)
-        self.assertEqual(activation_jobs[0]["args"], [bot])
+        # Geplande (de)activaties: geen minuut-jobs maar de schedule-timer
+        self.assertNotIn(scheduler.activate_scheduled_polls, job_funcs)
+        self.assertNotIn(scheduler.deactivate_scheduled_polls, job_funcs)
+        mock_timer.assert_called_once_with(
+            bot,
+            scheduler.activate_scheduled_polls,
+            scheduler.deactivate_scheduled_polls,
+        )
 
         # Controleer misfire_grace_time voor minuut-jobs (30s)
         minute_job_funcs = [
-            scheduler.activate_scheduled_polls,
-            scheduler.deactivate_scheduled_polls,
             scheduler.retry_failed_operations,
         ]
         for func in minute_job_funcs:
@@ -41,12 +41,12 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
                 scheduler, "is_channel_disabled", return_value=True
             ),  # Kanaal disabled
             patch.object(
-                scheduler, "schedule_poll_update", new_callable=AsyncMock
+                scheduler, "update_channel_polls", new_callable=AsyncMock
             ) as mock_schedule,
         ):
             await scheduler.update_all_polls(bot)
 
-        # Assert: schedule_poll_update NIET aangeroepen
+        # Assert: update_channel_polls NIET aangeroepen
         mock_schedule.assert_not_awaited()
 
     async def test_update_all_polls_skips_deny_channel_names(self):
@@ -78,13 +78,13 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
             patch.object(scheduler, "get_channels", side_effect=fake_get_channels),
             patch.object(scheduler, "is_channel_disabled", return_value=False),
             patch.object(
-                scheduler, "schedule_poll_update", new_callable=AsyncMock
+                scheduler, "update_channel_polls", new_callable=AsyncMock
             ) as mock_schedule,
             patch.dict(os.environ, {"DENY_CHANNEL_NAMES": "dmk"}, clear=False),
         ):
             await scheduler.update_all_polls(bot)
 
-        # Assert: schedule_poll_update NIET aangeroepen
+        # Assert: update_channel_polls NIET aangeroepen
         mock_schedule.assert_not_awaited()
 
     async def test_update_all_polls_skips_when_allow_per_channel_and_no_poll(self):
@@ -120,7 +120,7 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
             patch.object(scheduler, "is_channel_disabled", return_value=False),
             patch.object(scheduler, "get_message_id", side_effect=fake_get_message_id),
             patch.object(
-                scheduler, "schedule_poll_update", new_callable=AsyncMock
+                scheduler, "update_channel_polls", new_callable=AsyncMock
             ) as mock_schedule,
             patch.dict(
                 os.environ, {"ALLOW_FROM_PER_CHANNEL_ONLY": "true"}, clear=False
@@ -128,7 +128,7 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
         ):
             await scheduler.update_all_polls(bot)
 
-        # Assert: schedule_poll_update NIET aangeroepen
+        # Assert: update_channel_polls NIET aangeroepen
         mock_schedule.assert_not_awaited()
 
     async def test_update_all_polls_schedules_updates_when_poll_exists(self):
@@ -178,7 +178,7 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
             patch.object(scheduler, "is_channel_disabled", return_value=False),
             patch.object(scheduler, "get_message_id", side_effect=fake_get_message_id),
             patch.object(
-                scheduler, "schedule_poll_update", new_callable=AsyncMock
+                scheduler, "update_channel_polls", new_callable=AsyncMock
             ) as mock_schedule,
             patch("asyncio.gather", side_effect=fake_gather),
             patch.dict(
@@ -187,11 +187,11 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
         ):
             await scheduler.update_all_polls(bot)
 
-        # Assert: schedule_poll_update aangeroepen voor weekend dagen (default enabled)
-        self.assertEqual(mock_schedule.call_count, 3)
-        # Assert: gather is aangeroepen met 3 tasks
+        # Assert: één batch-update voor het kanaal (alle dagen in één ronde)
+        self.assertEqual(mock_schedule.call_count, 1)
+        # Assert: gather is aangeroepen met 1 task
         self.assertEqual(len(gather_calls), 1)
-        self.assertEqual(gather_calls[0], 3)
+        self.assertEqual(gather_calls[0], 1)
 
     async def test_update_all_polls_schedules_when_allow_false(self):
         """Test dat updates worden gepland als ALLOW_FROM_PER_CHANNEL_ONLY=false."""
@@ -240,7 +240,7 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
             patch.object(scheduler, "is_channel_disabled", return_value=False),
             patch.object(scheduler, "get_message_id", side_effect=fake_get_message_id),
             patch.object(
-                scheduler, "schedule_poll_update", new_callable=AsyncMock
+                scheduler, "update_channel_polls", new_callable=AsyncMock
             ) as mock_schedule,
             patch("asyncio.gather", side_effect=fake_gather),
             patch.dict(
@@ -249,11 +249,11 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
         ):
             await scheduler.update_all_polls(bot)
 
-        # Assert: schedule_poll_update aangeroepen voor weekend dagen (default enabled)
-        self.assertEqual(mock_schedule.call_count, 3)
-        # Assert: gather is aangeroepen met 3 tasks
+        # Assert: één batch-update voor het kanaal (alle dagen in één ronde)
+        self.assertEqual(mock_schedule.call_count, 1)
+        # Assert: gather is aangeroepen met 1 task
         self.assertEqual(len(gather_calls), 1)
-        self.assertEqual(gather_calls[0], 3)
+        self.assertEqual(gather_calls[0], 1)
 
     async def test_update_all_polls_handles_exception_in_get_message_id(self):
         """Test dat exceptions in get_message_id worden afgehandeld."""
@@ -288,7 +288,7 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
             patch.object(scheduler, "is_channel_disabled", return_value=False),
             patch.object(scheduler, "get_message_id", side_effect=fake_get_message_id),
             patch.object(
-                scheduler, "schedule_poll_update", new_callable=AsyncMock
+                scheduler, "update_channel_polls", new_callable=AsyncMock
             ) as mock_schedule,
             patch.dict(
                 os.environ, {"ALLOW_FROM_PER_CHANNEL_ONLY": "true"}, clear=False
@@ -296,7 +296,7 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
         ):
             await scheduler.update_all_polls(bot)
 
-        # Assert: schedule_poll_update NIET aangeroepen (exception → has_poll=False)
+        # Assert: update_channel_polls NIET aangeroepen (exception → has_poll=False)
         mock_schedule.assert_not_awaited()
 
     async def test_update_all_polls_respects_enabled_days_setting(self):
@@ -360,7 +360,7 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
             patch("apps.utils.discord_client.fetch_message_or_none", side_effect=fake_fetch_message),
             patch("apps.utils.discord_client.safe_call", side_effect=fake_safe_call),
             patch.object(
-                scheduler, "schedule_poll_update", new_callable=AsyncMock
+                scheduler, "update_channel_polls", new_callable=AsyncMock
             ) as mock_schedule,
             patch("asyncio.gather", side_effect=fake_gather),
             patch.dict(
@@ -369,12 +369,11 @@ class UpdateAllPollsTestCase(unittest.IsolatedAsyncioTestCase):
         ):
             await scheduler.update_all_polls(bot)
 
-        # Assert: schedule_poll_update aangeroepen voor alleen zondag (1x, niet 3x)
+        # Assert: één batch-update voor het kanaal; de rolling window (alleen
+        # zondag) wordt daarbinnen bepaald, zie tests/test_channel_batch_update.py
         self.assertEqual(mock_schedule.call_count, 1)
-        # Verifieer dat het zondag was
-        call_args = mock_schedule.call_args_list[0]
-        self.assertEqual(call_args[0][1], "zondag")  # Tweede argument is dag
-        # Assert: gather is aangeroepen met 1 task (alleen zondag)
+        self.assertEqual(mock_schedule.call_args_list[0][0][0].id, 10)
+        # Assert: gather is aangeroepen met 1 task
         self.assertEqual(len(gather_calls), 1)
         self.assertEqual(gather_calls[0], 1)
 
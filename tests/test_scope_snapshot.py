@@ -0,0 +1,57 @@
+# tests/test_scope_snapshot.py
+"""
+Tests voor poll_storage.get_scope_snapshot: één doorgang over de gekoppelde
+kanalen, gedeeld door alle aanroepers zolang de scope niet verandert.
+"""
+
+from types import SimpleNamespace
+
+from apps.utils import poll_storage
+from tests.base import BaseTestCase
+
+T19 = "om 19:00 uur"
+T2030 = "om 20:30 uur"
+
+
+class TestScopeSnapshot(BaseTestCase):
+    async def test_snapshot_is_shared_until_a_scope_channel_changes(self):
+        await poll_storage.add_vote("u1", "vrijdag", T19, 1, 2)
+
+        first = await poll_storage.get_scope_snapshot(1, [2, 3])
+        again = await poll_storage.get_scope_snapshot(1, [2, 3])
+        self.assertIs(first, again)
+
+        await poll_storage.add_vote("u2", "vrijdag", T2030, 1, 3)
+        changed = await poll_storage.get_scope_snapshot(1, [2, 3])
+        self.assertIsNot(first, changed)
+        self.assertEqual(changed.counts_for_day("vrijdag")[T2030], 1)
+
+    async def test_merge_counts_voters_and_guests_in_one_pass(self):
+        await poll_storage.add_vote("u1", "vrijdag", T19, 1, 2)
+        await poll_storage.add_vote("u1", "vrijdag", T2030, 1, 3)  # eerste kanaal wint
+        await poll_storage.add_vote("u2", "vrijdag", T2030, 1, 3)
+        await poll_storage.add_guest_votes("u3", "vrijdag", T19, ["Mario", "Luigi"], 1, 3)
+        await poll_storage.set_was_misschien_user_ids("vrijdag", ["u9"], 1, 2)
+
+        snap = await poll_storage.get_scope_snapshot(1, [2, 3])
+
+        self.assertEqual(snap.votes["u1"]["vrijdag"], [T19])
+        self.assertFalse(any(uid.startswith("_") for uid in snap.votes))
+        counts = snap.counts_for_day("vrijdag")
+        self.assertEqual((counts[T19], counts[T2030]), (3, 1))
+        self.assertEqual(snap.leading_time("vrijdag"), "19:00")
+        self.assertEqual(snap.voters["vrijdag"], {"u1", "u2", "u3"})
+        self.assertEqual(snap.guest_groups("vrijdag", T19), {"u3": ["Luigi", "Mario"]})
+        self.assertEqual(
+            await poll_storage.get_counts_for_day_scoped("vrijdag", 1, [2, 3]), counts
+        )
+
+    async def test_non_voters_from_known_members(self):
+        await poll_storage.add_vote("111", "zaterdag", T19, 1, 2)
+        members = [SimpleNamespace(id=i, bot=False) for i in (111, 222, 333)]
+        await poll_storage.update_non_voters(1, 2, SimpleNamespace(members=members[:2]))
+        await poll_storage.update_non_voters(1, 3, SimpleNamespace(members=members[1:]))
+
+        snap = await poll_storage.get_scope_snapshot(1, [2, 3])
+        self.assertEqual(sorted(snap.non_voters("zaterdag")), ["222", "333"])
+        self.assertEqual(sorted(snap.non_voters("zondag")), ["111", "222", "333"])
@@ -0,0 +1,191 @@
+# tests/test_sqlite_store.py
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from apps.utils import poll_message, poll_settings, poll_storage
+from apps.utils.sqlite_store import SQLiteStore, get_store
+from tests.base import BaseTestCase
+
+
+class TestSQLiteBackend(BaseTestCase):
+    """STORAGE_BACKEND=sqlite: stemmen, instellingen en bericht-IDs in één database."""
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.mkdtemp(suffix="_sqlite")
+        self.env = patch.dict(
+            os.environ,
+            {
+                "STORAGE_BACKEND": "sqlite",
+                "SQLITE_PATH": os.path.join(self.tmpdir, "dmk_poll.db"),
+            },
+        )
+        self.env.start()
+        await super().asyncSetUp()
+
+    async def asyncTearDown(self):
+        await super().asyncTearDown()
+        get_store().close()
+        self.env.stop()
+        poll_storage._invalidate_cache()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    async def test_votes_survive_cold_load(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 20:30 uur", 1, 2)
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+            await poll_storage.add_vote("u2", "zaterdag", "misschien", 1, 3)
+
+        poll_storage._invalidate_cache()
+        scoped = await poll_storage.load_votes(1, 2)
+        self.assertEqual(scoped["u1"]["vrijdag"], ["om 20:30 uur", "om 19:00 uur"])
+        self.assertEqual(scoped["u1"]["zaterdag"], [])
+        self.assertEqual(list(await poll_storage.load_votes(1, 3)), ["u2"])
+
+    async def test_counts_do_not_reload_votes(self):
+        with patch("apps.utils.poll_storage.is_valid_option", return_value=True):
+            await poll_storage.add_vote("u1", "vrijdag", "om 19:00 uur", 1, 2)
+            await poll_storage.add_vote("u2", "vrijdag", "om 19:00 uur", 1, 2)
+            await poll_storage.add_vote("u3", "vrijdag", "om 20:30 uur", 1, 2)
+            await poll_storage.add_vote("u4", "vrijdag", "om 20:30 uur", 1, 9)
+
+        with patch("apps.utils.poll_storage.load_votes") as mock_load:
+            counts = await poll_storage.get_counts_for_day("vrijdag", 1, 2)
+            mock_load.assert_not_called()
+        self.assertEqual(counts["om 19:00 uur"], 2)
+        self.assertEqual(counts["om 20:30 uur"], 1)
+        self.assertEqual(counts["misschien"], 0)
+
+    async def test_non_voters_are_computed_not_stored(self):
+        await poll_storage.save_votes_scoped(
+            1,
+            2,
+            {
+                "_non_voter::10": {"vrijdag": ["niet gestemd"]},
+                "u1": {"vrijdag": ["om 19:00 uur"]},
+            },
+        )
+        channel = SimpleNamespace(
+            members=[SimpleNamespace(id=10, bot=False), SimpleNamespace(id=11, bot=False)]
+        )
+        await poll_storage.update_non_voters(1, 2, channel)
+
+        count, ids = await poll_storage.get_non_voters_for_day("vrijdag", 1, 2)
+        self.assertEqual((count, sorted(ids)), (2, ["10", "11"]))
+        poll_storage._invalidate_cache()
+        self.assertEqual(list(await poll_storage.load_votes(1, 2)), ["u1"])
+
+    async def test_reset_scoped_and_reset_all(self):
+        await poll_storage.save_votes_scoped(1, 2, {"u1": {"vrijdag": ["misschien"]}})
+        await poll_storage.save_votes_scoped(1, 3, {"u2": {"vrijdag": ["misschien"]}})
+        await poll_storage.reset_votes_scoped(1, 2)
+
+        poll_storage._invalidate_cache()
+        self.assertEqual(await poll_storage.load_votes(1, 2), {})
+        self.assertIn("u2", await poll_storage.load_votes(1, 3))
+
+        await poll_storage.reset_votes()
+        poll_storage._invalidate_cache()
+        self.assertEqual(await poll_storage.load_votes(), {})
+
+    async def test_settings_roundtrip(self):
+        poll_settings.set_paused(123, True)
+        poll_settings.set_language(123, "en")
+        self.assertTrue(poll_settings.is_paused(123))
+        self.assertEqual(poll_settings.get_language(123), "en")
+        # JSON-bestand wordt niet gebruikt
+        with open(poll_settings.SETTINGS_FILE, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "")
+
+        poll_settings.reset_settings()
+        self.assertFalse(poll_settings.is_paused(123))
+
+    async def test_message_ids_and_documents(self):
+        poll_message.save_message_id(5, "vrijdag", 111)
+        poll_message.set_channel_disabled(5, True)
+        self.assertEqual(poll_message.get_message_id(5, "vrijdag"), 111)
+        self.assertTrue(poll_message.is_channel_disabled(5))
+
+        poll_message.clear_message_id(5, "vrijdag")
+        self.assertIsNone(poll_message.get_message_id(5, "vrijdag"))
+        self.assertTrue(poll_message.is_channel_disabled(5))
+
+    async def test_message_ids_are_cached_and_saved_per_key(self):
+        poll_message.save_message_id(5, "vrijdag", 111)
+        poll_message.save_message_id(6, "zaterdag", 222)
+        store = get_store()
+
+        with patch.object(store, "_query", side_effect=AssertionError):
+            self.assertEqual(poll_message.get_message_id(5, "vrijdag"), 111)
+            self.assertEqual(poll_message.get_message_id(6, "zaterdag"), 222)
+
+        with patch.object(store, "_write", wraps=store._write) as mock_write:
+            await poll_message.save_message_id_async(5, "vrijdag", 333)
+        (statements,), _ = mock_write.call_args
+        self.assertEqual(len(statements), 1)
+        self.assertIn("INSERT OR REPLACE INTO message_ids", statements[0][0])
+
+        # Koude start leest dezelfde stand terug uit de database
+        poll_message._DATA_CACHE = None
+        self.assertEqual(poll_message.get_message_id(5, "vrijdag"), 333)
+        self.assertEqual(poll_message.get_message_id(6, "zaterdag"), 222)
+
+
+class TestStorageTool(unittest.TestCase):
+    """storage_tool.py: JSON ↔ SQLite."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(suffix="_storage_tool")
+        self.paths = {
+            "votes": os.path.join(self.tmpdir, "votes.json"),
+            "settings": os.path.join(self.tmpdir, "poll_settings.json"),
+            "messages": os.path.join(self.tmpdir, "poll_message.json"),
+            "sqlite": os.path.join(self.tmpdir, "dmk_poll.db"),
+        }
+        self.votes = {
+            "guilds": {"1": {"channels": {"2": {"u1": {"vrijdag": ["om 19:00 uur"]}}}}}
+        }
+        self.settings = {"123": {"paused": True}, "defaults": {"activation": None}}
+        self.messages = {
+            "per_channel": {"2": {"vrijdag": 42}},
+            "permanently_shutdown_channels": ["7"],
+        }
+        for key, data in (
+            ("votes", self.votes),
+            ("settings", self.settings),
+            ("messages", self.messages),
+        ):
+            with open(self.paths[key], "w", encoding="utf-8") as f:
+                json.dump(data, f)
+
+    def tearDown(self):
+        poll_storage._invalidate_cache()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_import_then_export_roundtrip(self):
+        import storage_tool
+
+        with patch.dict(os.environ, {"VOTES_FILE": self.paths["votes"]}):
+            store = SQLiteStore(self.paths["sqlite"])
+            try:
+                result = storage_tool.import_json(store, self.paths)
+                self.assertEqual(result["channels"], 1)
+
+                for key in ("votes", "settings", "messages"):
+                    os.remove(self.paths[key])
+                storage_tool.export_json(store, self.paths)
+            finally:
+                store.close()
+
+        for key, expected in (
+            ("votes", self.votes),
+            ("settings", self.settings),
+            ("messages", self.messages),
+        ):
+            with open(self.paths[key], "r", encoding="utf-8") as f:
+                self.assertEqual(json.load(f), expected)
@@ -0,0 +1,52 @@
+# tests/test_sweep.py
+"""
+Tests voor apps/utils/sweep.py: begrensde, gelijktijdige sweeps met
+foutisolatie per kanaal.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from apps.utils.sweep import run_sweep
+
+
+def _targets(n):
+    guild = SimpleNamespace(id=1)
+    return [(guild, SimpleNamespace(id=100 + i)) for i in range(n)]
+
+
+class TestRunSweep(unittest.IsolatedAsyncioTestCase):
+    async def test_channels_run_concurrently_with_limit(self):
+        running = {"now": 0, "max": 0}
+
+        async def handler(guild, channel):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.05)
+            running["now"] -= 1
+
+        with patch("apps.utils.sweep.log_job"):
+            report = await run_sweep("test", _targets(6), handler, concurrency=3)
+
+        self.assertEqual(running["max"], 3)
+        self.assertEqual(report.channels, 6)
+        # Twee rondes van ~0.05s, niet zes
+        self.assertLess(report.duration, 0.25)
+
+    async def test_failing_channel_does_not_stop_others(self):
+        done = []
+
+        async def handler(guild, channel):
+            if channel.id == 101:
+                raise RuntimeError("boom")
+            done.append(channel.id)
+
+        with patch("apps.utils.sweep.log_job") as mock_log:
+            report = await run_sweep("test", _targets(3), handler)
+
+        self.assertEqual(sorted(done), [100, 102])
+        self.assertEqual(report.failed, 1)
+        mock_log.assert_called_once()
+        self.assertEqual(mock_log.call_args.kwargs["status"], "timing")
@@ -97,10 +97,10 @@ class TestVisibilityButtons(BaseTestCase):
         )
 
     async def test_specials_no_times_available_returns_false(self):
-        # Patch get_poll_options zodat er GEEN tijden voor vrijdag zijn
+        # Patch get_options_for_day zodat er GEEN tijden voor vrijdag zijn
         with patch(
-            "apps.logic.visibility.get_poll_options",
-            return_value=[DummyOpt("zaterdag", "om 19:00 uur")],
+            "apps.logic.visibility.get_options_for_day",
+            return_value=[DummyOpt("vrijdag", "misschien")],
         ):
             now = datetime(2025, 8, 15, 12, 0, tzinfo=AMS)  # vrijdag
             self.assertFalse(
@@ -197,9 +197,9 @@ class TestVisibilityButtons(BaseTestCase):
                 )
             )
 
-    async def test_is_visible_handles_get_poll_options_exception(self):
+    async def test_is_visible_handles_get_options_for_day_exception(self):
         with patch(
-            "apps.logic.visibility.get_poll_options", side_effect=RuntimeError("kapot")
+            "apps.logic.visibility.get_options_for_day", side_effect=RuntimeError("kapot")
         ):
             # Specials met exception → tijden = [] → False
             now = datetime(2025, 8, 15, 19, 10, tzinfo=AMS)